@@ -17,6 +17,7 @@ from .action_executors import (
     FileActionExecutor,
     LoggingActionExecutor
 )
+from .directive_modules.profiler import profile_span
 
 logger = logging.getLogger(__name__)
 
@@ -111,7 +112,11 @@ class ActionExecutor:
                 # Find the appropriate executor for this action type
                 executor = self.action_mapping.get(action_type)
                 if executor:
-                    result = await executor.execute_action(action_type, parameters)
+                    async with profile_span(f"action:{action_type}", category="action",
+                                            executor=executor.__class__.__name__, index=i) as span:
+                        result = await executor.execute_action(action_type, parameters)
+                        if span:
+                            span.attributes["status"] = result.get("status")
                 else:
                     result = {
                         "status": "error",
@@ -64,6 +64,14 @@ class ProjectConfig(BaseModel):
     theme_discovery: bool = True
     backup_enabled: bool = True
     management_folder_name: str = "projectManagement"
+    context_budget_mb: int = 100
+    context_budget_tokens: int = 0  # 0 = limit by bytes only
+    context_prefetch_enabled: bool = True
+    context_prefetch_budget_ms: int = 50
+    context_prefetch_budget_mb: int = 8
+    context_prefetch_assemble_budget_ms: int = 250  # 0 = do not pre-assemble predicted contexts
+    theme_discovery_budget_seconds: int = 120  # 0 = no time limit
+    theme_discovery_budget_mb: int = 512  # bytes read per discovery, 0 = no limit
 
 
 class ServerConfig(BaseModel):
@@ -175,6 +183,13 @@ class ConfigManager:
             "AI_PM_LOG_LEVEL": ("logging.level", str),
             "AI_PM_LOG_RETENTION": ("logging.retention_days", int),
             "AI_PM_MANAGEMENT_FOLDER": ("project.management_folder_name", str),
+            "AI_PM_CONTEXT_BUDGET_MB": ("project.context_budget_mb", int),
+            "AI_PM_CONTEXT_BUDGET_TOKENS": ("project.context_budget_tokens", int),
+            "AI_PM_CONTEXT_PREFETCH": ("project.context_prefetch_enabled", bool),
+            "AI_PM_CONTEXT_PREFETCH_BUDGET_MS": ("project.context_prefetch_budget_ms", int),
+            "AI_PM_CONTEXT_PREFETCH_ASSEMBLE_BUDGET_MS": ("project.context_prefetch_assemble_budget_ms", int),
+            "AI_PM_THEME_DISCOVERY_BUDGET_SECONDS": ("project.theme_discovery_budget_seconds", int),
+            "AI_PM_THEME_DISCOVERY_BUDGET_MB": ("project.theme_discovery_budget_mb", int),
         }
         
         applied_overrides = {}
@@ -0,0 +1,160 @@
+"""
+Cascade Guard Module for DirectiveProcessor.
+
+Protects directive execution against hook feedback loops. Actions write to
+the database, database writes fire directive hooks, and those directives can
+write again. The guard tracks the chain of directives in the current
+execution context and suppresses:
+
+- cascades deeper than a configurable limit
+- re-entry of a (directive_key, trigger) pair already in the chain (a cycle)
+- identical nested (directive_key, trigger, payload) executions repeated
+  within a short deduplication window
+
+Top-level executions (an empty chain) are never deduplicated: hook payloads
+such as a database write summary carry no row identity, so two distinct
+operations can look identical.
+"""
+
+import contextvars
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Chain of (directive_key, trigger) pairs executing in this context. Each
+# asyncio task inherits a copy, so concurrent hooks do not share a chain.
+_cascade_chain: contextvars.ContextVar[Tuple[Tuple[str, str], ...]] = contextvars.ContextVar(
+    "directive_cascade_chain", default=()
+)
+
+# Context keys that change on every hook invocation without changing meaning
+VOLATILE_CONTEXT_KEYS = {"timestamp", "project_context", "server_state", "session_state"}
+
+
+class CascadeGuard:
+    """
+    Decides whether a directive execution may proceed.
+
+    Keeps counters for every suppression reason so feedback loops show up in
+    get_stats() instead of as runaway CPU.
+    """
+
+    def __init__(self, max_depth: int = 3, dedup_window_seconds: float = 2.0, max_tracked: int = 1000):
+        """
+        Initialize the cascade guard.
+
+        Args:
+            max_depth: Maximum nested directive depth (1 = no hook cascades)
+            dedup_window_seconds: Window for suppressing identical nested executions
+            max_tracked: Maximum number of recent execution hashes retained
+        """
+        self.max_depth = max_depth
+        self.dedup_window_seconds = dedup_window_seconds
+        self.max_tracked = max_tracked
+        self._recent: "OrderedDict[str, float]" = OrderedDict()
+        self.stats = {
+            "executed": 0,
+            "suppressed_depth": 0,
+            "suppressed_cycle": 0,
+            "suppressed_duplicate": 0,
+            "max_depth_seen": 0
+        }
+        logger.info(f"CascadeGuard initialized (max_depth={max_depth}, dedup_window={dedup_window_seconds}s)")
+
+    def check(self, directive_key: str, context: Dict[str, Any]) -> Tuple[bool, str]:
+        """
+        Check whether a directive execution should run.
+
+        Args:
+            directive_key: Directive about to execute
+            context: Execution context passed to the directive
+
+        Returns:
+            Tuple of (allowed, reason)
+        """
+        trigger = str(context.get("trigger", "unknown"))
+        chain = _cascade_chain.get()
+
+        if len(chain) >= self.max_depth:
+            self.stats["suppressed_depth"] += 1
+            path = " -> ".join(key for key, _ in chain)
+            logger.warning(f"Directive cascade depth limit reached ({self.max_depth}): {path} -> {directive_key}")
+            return False, f"Cascade depth limit {self.max_depth} reached"
+
+        if (directive_key, trigger) in chain:
+            self.stats["suppressed_cycle"] += 1
+            logger.warning(f"Directive cascade cycle detected: {directive_key} ({trigger}) already executing")
+            return False, f"Cascade cycle detected for {directive_key} ({trigger})"
+
+        # Only executions triggered from inside another directive can be feedback
+        if chain and self.dedup_window_seconds > 0:
+            execution_hash = self._execution_hash(directive_key, trigger, context)
+            now = time.monotonic()
+            self._prune(now)
+            if execution_hash in self._recent:
+                self.stats["suppressed_duplicate"] += 1
+                logger.debug(f"Suppressed duplicate directive execution: {directive_key} ({trigger})")
+                return False, f"Duplicate execution within {self.dedup_window_seconds}s window"
+            self._recent[execution_hash] = now
+            if len(self._recent) > self.max_tracked:
+                self._recent.popitem(last=False)
+
+        return True, "allowed"
+
+    @contextmanager
+    def track(self, directive_key: str, context: Dict[str, Any]):
+        """Mark a directive as executing in the current context for its duration."""
+        chain = _cascade_chain.get() + ((directive_key, str(context.get("trigger", "unknown"))),)
+        token = _cascade_chain.set(chain)
+        self.stats["executed"] += 1
+        self.stats["max_depth_seen"] = max(self.stats["max_depth_seen"], len(chain))
+        try:
+            yield chain
+        finally:
+            _cascade_chain.reset(token)
+
+    def current_depth(self) -> int:
+        """Depth of the directive chain executing in the current context."""
+        return len(_cascade_chain.get())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get execution and suppression counters."""
+        suppressed = (self.stats["suppressed_depth"] + self.stats["suppressed_cycle"] +
+                      self.stats["suppressed_duplicate"])
+        return {
+            **self.stats,
+            "suppressed_total": suppressed,
+            "max_depth": self.max_depth,
+            "dedup_window_seconds": self.dedup_window_seconds,
+            "tracked_hashes": len(self._recent)
+        }
+
+    def reset(self):
+        """Clear deduplication state and counters."""
+        self._recent.clear()
+        for key in self.stats:
+            self.stats[key] = 0
+
+    def _prune(self, now: float):
+        """Drop execution hashes older than the deduplication window."""
+        cutoff = now - self.dedup_window_seconds
+        while self._recent:
+            oldest_hash, seen_at = next(iter(self._recent.items()))
+            if seen_at >= cutoff:
+                break
+            del self._recent[oldest_hash]
+
+    def _execution_hash(self, directive_key: str, trigger: str, context: Dict[str, Any]) -> str:
+        """Content hash of an execution, ignoring volatile context keys."""
+        payload = {key: value for key, value in context.items() if key not in VOLATILE_CONTEXT_KEYS}
+        try:
+            encoded = json.dumps([directive_key, trigger, payload], sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            encoded = f"{directive_key}|{trigger}|{payload!r}"
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
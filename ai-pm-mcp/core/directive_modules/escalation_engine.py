@@ -11,6 +11,8 @@ import logging
 from typing import Dict, Any
 from pathlib import Path
 
+from .profiler import profile_span
+
 logger = logging.getLogger(__name__)
 
 
@@ -71,17 +73,20 @@ class EscalationEngine:
         json_path = Path(__file__).parent.parent.parent / "reference" / "directives" / f"{actual_directive_name}.json"
         if json_path.exists():
             try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    json_content = json.load(f)
+                async with profile_span("escalation:load_json", category="escalation", tier=2,
+                                        directive_file=json_path.name):
+                    with open(json_path, 'r', encoding='utf-8') as f:
+                        json_content = json.load(f)
                 
                 logger.info(f"Escalated to JSON directive: {directive_key}")
                 
                 # AI analyzes detailed JSON directive + context
                 if self.action_determiner:
-                    actions = await self.action_determiner.determine_actions(
-                        directive_key, context, self.compressed_directives,
-                        directive_content=json_content, tier=2
-                    )
+                    async with profile_span("determine_actions", category="determination", tier=2):
+                        actions = await self.action_determiner.determine_actions(
+                            directive_key, context, self.compressed_directives,
+                            directive_content=json_content, tier=2
+                        )
                 else:
                     logger.warning("No action_determiner available for JSON escalation")
                     actions = {"actions": [], "analysis": "No action determiner available", "needs_escalation": False}
@@ -97,7 +102,9 @@ class EscalationEngine:
                 # Execute actions
                 execution_results = []
                 if self.action_executor:
-                    execution_results = await self.action_executor.execute_actions(actions.get("actions", []))
+                    async with profile_span("execute_actions", category="execution",
+                                            action_count=len(actions.get("actions", []))):
+                        execution_results = await self.action_executor.execute_actions(actions.get("actions", []))
                 
                 return {
                     "directive_key": directive_key,
@@ -147,17 +154,20 @@ class EscalationEngine:
         md_path = Path(__file__).parent.parent.parent / "reference" / "directivesmd" / f"{actual_directive_name}.md"
         if md_path.exists():
             try:
-                with open(md_path, 'r', encoding='utf-8') as f:
-                    md_content = f.read()
+                async with profile_span("escalation:load_markdown", category="escalation", tier=3,
+                                        directive_file=md_path.name):
+                    with open(md_path, 'r', encoding='utf-8') as f:
+                        md_content = f.read()
                 
                 logger.info(f"Escalated to MD directive: {directive_key}")
                 
                 # AI analyzes comprehensive Markdown directive + context  
                 if self.action_determiner:
-                    actions = await self.action_determiner.determine_actions(
-                        directive_key, context, self.compressed_directives,
-                        directive_content=md_content, tier=3
-                    )
+                    async with profile_span("determine_actions", category="determination", tier=3):
+                        actions = await self.action_determiner.determine_actions(
+                            directive_key, context, self.compressed_directives,
+                            directive_content=md_content, tier=3
+                        )
                 else:
                     logger.warning("No action_determiner available for MD escalation")
                     actions = {"actions": [], "analysis": "No action determiner available", "needs_escalation": False}
@@ -165,7 +175,9 @@ class EscalationEngine:
                 # Execute actions
                 execution_results = []
                 if self.action_executor:
-                    execution_results = await self.action_executor.execute_actions(actions.get("actions", []))
+                    async with profile_span("execute_actions", category="execution",
+                                            action_count=len(actions.get("actions", []))):
+                        execution_results = await self.action_executor.execute_actions(actions.get("actions", []))
                 
                 return {
                     "directive_key": directive_key,
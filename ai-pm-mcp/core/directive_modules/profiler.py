@@ -0,0 +1,256 @@
+"""
+Directive Profiler Module for DirectiveProcessor.
+
+Opt-in timeline profiler for directive execution. Records a nested span tree
+for every execute_directive(), escalate_directive() and escalate_to_markdown()
+run (action determination, escalation tiers,
+individual actions and the database hooks they trigger) and keeps the most
+recent runs in a ring buffer for export as Chrome trace-event JSON.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Span currently open in this execution context (None when not profiling).
+# Context variables follow awaits, so database hooks fired from inside an
+# action nest under that action's span without any explicit plumbing.
+_current_span: contextvars.ContextVar[Optional["ProfileSpan"]] = contextvars.ContextVar(
+    "directive_profile_span", default=None
+)
+
+
+@dataclass
+class ProfileSpan:
+    """A single timed section inside a directive run."""
+    name: str
+    category: str
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    children: List["ProfileSpan"] = field(default_factory=list)
+
+    @property
+    def duration_ms(self) -> float:
+        """Elapsed time in milliseconds (0 while the span is still open)."""
+        if self.end_ns is None:
+            return 0.0
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the span tree to a JSON-serializable dictionary."""
+        return {
+            "name": self.name,
+            "category": self.category,
+            "duration_ms": round(self.duration_ms, 3),
+            "attributes": self.attributes,
+            "children": [child.to_dict() for child in self.children]
+        }
+
+
+class DirectiveProfiler:
+    """
+    Records span trees for directive executions.
+
+    Disabled by default. Enable it with enable() or by setting the
+    AI_PM_PROFILE_DIRECTIVES environment variable before the processor starts.
+    """
+
+    def __init__(self, max_runs: int = 50):
+        """
+        Initialize the profiler.
+
+        Args:
+            max_runs: Number of completed runs kept in the ring buffer
+        """
+        self.enabled = os.getenv("AI_PM_PROFILE_DIRECTIVES", "").lower() in ('true', '1', 'yes', 'on')
+        self._runs = deque(maxlen=max_runs)
+        self._lock = threading.Lock()
+        self._epoch_ns = time.perf_counter_ns()
+        logger.info(f"DirectiveProfiler initialized (enabled={self.enabled}, max_runs={max_runs})")
+
+    def enable(self, max_runs: Optional[int] = None):
+        """Start recording directive runs."""
+        if max_runs is not None and max_runs != self._runs.maxlen:
+            with self._lock:
+                self._runs = deque(self._runs, maxlen=max_runs)
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording directive runs (already recorded runs are kept)."""
+        self.enabled = False
+
+    def clear(self):
+        """Drop all recorded runs."""
+        with self._lock:
+            self._runs.clear()
+
+    @asynccontextmanager
+    async def directive_run(self, directive_key: str, context: Dict[str, Any], tier: int = 1):
+        """
+        Profile one directive execution or escalation.
+
+        Opens a new root run, or a nested span when the directive was triggered
+        from inside another profiled run (e.g. by a database hook).
+
+        Args:
+            directive_key: Directive being run
+            context: Execution context (its trigger is recorded)
+            tier: 1 for execute_directive, 2/3 for JSON/Markdown escalations
+
+        Yields:
+            The span for this directive (None when profiling is disabled)
+        """
+        if not self.enabled:
+            yield None
+            return
+
+        parent = _current_span.get()
+        span = ProfileSpan(
+            name=f"directive:{directive_key}" if tier == 1 else f"escalation:{directive_key}:tier{tier}",
+            category="directive" if tier == 1 else "escalation",
+            start_ns=time.perf_counter_ns(),
+            attributes={
+                "directive_key": directive_key,
+                "trigger": context.get("trigger", "unknown"),
+                "tier": tier,
+                "nested": parent is not None
+            }
+        )
+        if parent is not None:
+            parent.children.append(span)
+
+        token = _current_span.set(span)
+        try:
+            yield span
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            _current_span.reset(token)
+            if parent is None:
+                with self._lock:
+                    self._runs.append(span)
+
+    def get_runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get recorded runs, most recent last."""
+        with self._lock:
+            runs = list(self._runs)
+        if limit:
+            runs = runs[-limit:]
+        return [run.to_dict() for run in runs]
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Aggregate recorded runs into per-span-name totals."""
+        totals: Dict[str, Dict[str, Any]] = {}
+
+        def visit(span: ProfileSpan):
+            entry = totals.setdefault(span.name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["max_ms"] = max(entry["max_ms"], span.duration_ms)
+            for child in span.children:
+                visit(child)
+
+        with self._lock:
+            runs = list(self._runs)
+        for run in runs:
+            visit(run)
+
+        for entry in totals.values():
+            entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 3)
+            entry["total_ms"] = round(entry["total_ms"], 3)
+            entry["max_ms"] = round(entry["max_ms"], 3)
+
+        return {
+            "enabled": self.enabled,
+            "runs_recorded": len(runs),
+            "max_runs": self._runs.maxlen,
+            "spans": dict(sorted(totals.items(), key=lambda item: item[1]["total_ms"], reverse=True))
+        }
+
+    def export_chrome_trace(self, output_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Export recorded runs as Chrome trace-event JSON.
+
+        The result loads in chrome://tracing or Perfetto. Each run is placed on
+        its own track (tid) so overlapping runs stay readable.
+
+        Args:
+            output_path: Optional file to write the trace to
+
+        Returns:
+            Trace dictionary in the Trace Event Format
+        """
+        events = []
+
+        def emit(span: ProfileSpan, track: int):
+            end_ns = span.end_ns if span.end_ns is not None else span.start_ns
+            events.append({
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - self._epoch_ns) / 1000,
+                "dur": (end_ns - span.start_ns) / 1000,
+                "pid": os.getpid(),
+                "tid": track,
+                "args": {key: _trace_safe(value) for key, value in span.attributes.items()}
+            })
+            for child in span.children:
+                emit(child, track)
+
+        with self._lock:
+            runs = list(self._runs)
+        for track, run in enumerate(runs, start=1):
+            emit(run, track)
+
+        trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+
+        if output_path:
+            output_path = Path(output_path)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_text(json.dumps(trace))
+            logger.info(f"Exported {len(runs)} directive runs to {output_path}")
+
+        return trace
+
+
+@asynccontextmanager
+async def profile_span(name: str, category: str = "span", **attributes):
+    """
+    Record a child span under the currently profiled directive run.
+
+    A no-op when no profiled run is active, so callers (action executors,
+    escalation engine, database hooks) can use it unconditionally.
+
+    Yields:
+        The span (None when not profiling); attributes may be added to it
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    span = ProfileSpan(name=name, category=category, start_ns=time.perf_counter_ns(), attributes=attributes)
+    parent.children.append(span)
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        span.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+
+
+def _trace_safe(value: Any) -> Any:
+    """Reduce attribute values to JSON-friendly primitives for trace export."""
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
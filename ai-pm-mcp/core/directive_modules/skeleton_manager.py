@@ -5,12 +5,165 @@ NEW module for implementing database-first skeleton creation approach
 to fix recursion issues in project initialization.
 """
 
+import hashlib
 import logging
-from typing import Dict, Any
+import os
+import tempfile
+from typing import Dict, Any, Iterable, Optional, Tuple
 from pathlib import Path
 
+try:
+    from ...utils.paths import load_template
+except ImportError:
+    from utils.paths import load_template
+
 logger = logging.getLogger(__name__)
 
+# Management folder layout shared by every skeleton writer
+SKELETON_DIRECTORIES = (
+    "ProjectBlueprint",
+    "ProjectFlow",
+    "ProjectLogic",
+    "Themes",
+    "Tasks/active",
+    "Tasks/sidequests",
+    "Tasks/archive/tasks",
+    "Tasks/archive/sidequests",
+    "Implementations/active",
+    "Implementations/completed",
+    "Logs/archived",
+    "Placeholders",
+    "database"
+)
+
+# Minimal skeleton file contents, keyed by path relative to the management folder
+SKELETON_FILES = {
+    "ProjectBlueprint/blueprint.md": "# Project Blueprint\n\nTo be defined...\n",
+    "ProjectFlow/flow-index.json": '{"flowFiles": [], "metadata": {"version": "1.0.0", "description": "Master flow index"}}',
+    "ProjectLogic/projectlogic.jsonl": "",
+    "Themes/themes.json": "{}",
+    "Tasks/completion-path.json": '{"completionObjective": "To be defined", "steps": []}',
+    "Logs/noteworthy.json": "[]",
+    "Placeholders/todos.jsonl": "",
+    ".ai-pm-config.json": '{"project": {"max_file_lines": 900, "auto_modularize": true, "management_folder_name": "projectManagement"}}'
+}
+
+# Skeleton files rendered from reference/templates when available
+SKELETON_TEMPLATES = {
+    "ProjectBlueprint/blueprint.md": "blueprint.md"
+}
+
+# Skeleton files materialized for each directive type
+DIRECTIVE_SKELETON_FILES = {
+    "initialization": tuple(SKELETON_FILES),
+    "blueprint": ("ProjectBlueprint/blueprint.md",),
+    "themes": ("Themes/themes.json",),
+    "flows": ("ProjectFlow/flow-index.json",),
+    "logic": ("ProjectLogic/projectlogic.jsonl",),
+    "tasks": ("Tasks/completion-path.json", "Placeholders/todos.jsonl"),
+    "logs": ("Logs/noteworthy.json",)
+}
+
+
+def _render_files(files: Dict[str, str], substitutions: Dict[str, str],
+                  templates: Dict[str, str]) -> Dict[str, Tuple[bytes, str]]:
+    """Relative path -> (encoded content, sha256 hex digest) after templates and substitutions."""
+    rendered = {}
+    for relative_path, content in files.items():
+        template_name = templates.get(relative_path)
+        if template_name:
+            try:
+                content = load_template(template_name)
+            except (FileNotFoundError, IOError, RuntimeError) as e:
+                logger.debug(f"Skeleton template '{template_name}' unavailable, using inline default: {e}")
+        for placeholder, value in substitutions.items():
+            content = content.replace(placeholder, value)
+        data = content.encode("utf-8")
+        rendered[relative_path] = (data, hashlib.sha256(data).hexdigest())
+    return rendered
+
+
+def materialize_files(base_dir: Path, files: Dict[str, str], directories: Iterable[str] = (),
+                      substitutions: Optional[Dict[str, str]] = None,
+                      templates: Optional[Dict[str, str]] = None,
+                      overwrite: bool = False, replace_empty: bool = False) -> Dict[str, Any]:
+    """
+    Write a skeleton file set under base_dir in one batch.
+    
+    Every file is written to a temporary sibling and moved into place with
+    os.replace, so readers never see a half-written file. Existing files are
+    left alone unless overwrite is set (or replace_empty and the file is empty),
+    and files whose content hash already matches are never rewritten.
+    
+    Args:
+        base_dir: Directory the relative paths are resolved against
+        files: Relative path -> inline content
+        directories: Relative directories to create before writing
+        substitutions: Placeholder -> value replacements
+        templates: Relative path -> reference template name overriding inline content
+        overwrite: Replace existing files whose content differs
+        replace_empty: Replace existing files that are empty
+        
+    Returns:
+        Dictionary listing created, updated and skipped relative paths
+    """
+    base_dir = Path(base_dir)
+    rendered = _render_files(files, substitutions or {}, templates or {})
+    result = {"created": [], "updated": [], "skipped_identical": [], "skipped_existing": []}
+    
+    # Plan the batch first so each parent directory is created once
+    pending = []
+    for relative_path, (data, digest) in rendered.items():
+        target = base_dir / relative_path
+        try:
+            stat = target.stat()
+        except FileNotFoundError:
+            pending.append((relative_path, target, data, "created"))
+            continue
+        
+        if stat.st_size == len(data) and _file_sha256(target) == digest:
+            result["skipped_identical"].append(relative_path)
+        elif overwrite or (replace_empty and stat.st_size == 0):
+            pending.append((relative_path, target, data, "updated"))
+        else:
+            result["skipped_existing"].append(relative_path)
+    
+    parents = {base_dir / directory for directory in directories}
+    parents.update(target.parent for _, target, _, _ in pending)
+    for parent in sorted(parents):
+        parent.mkdir(parents=True, exist_ok=True)
+    
+    for relative_path, target, data, outcome in pending:
+        _atomic_write(target, data)
+        result[outcome].append(relative_path)
+    
+    logger.debug(f"Materialized skeleton in {base_dir}: {len(result['created'])} created, "
+                 f"{len(result['updated'])} updated, {len(result['skipped_identical'])} identical")
+    return result
+
+
+def _file_sha256(path: Path) -> Optional[str]:
+    """Content hash of an existing file (None if it cannot be read)."""
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def _atomic_write(target: Path, data: bytes):
+    """Write data to a temporary file beside target and rename it into place."""
+    fd, temp_path = tempfile.mkstemp(dir=str(target.parent), prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, target)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
 
 class SkeletonManager:
     """
@@ -70,13 +223,30 @@ class SkeletonManager:
         """
         logger.info(f"Creating skeleton files for {directive_type} in {mgmt_dir}")
         
-        # TODO: Implement skeleton file creation:
-        # 1. Create appropriate skeleton files for directive type
-        # 2. Add "AI consultation pending" markers
-        # 3. Create proper directory structure
+        relative_paths = DIRECTIVE_SKELETON_FILES.get(directive_type)
+        if relative_paths is None:
+            return {
+                "status": "error",
+                "files_created": [],
+                "message": f"No skeleton files defined for directive type '{directive_type}'"
+            }
+        
+        directories = SKELETON_DIRECTORIES if directive_type == "initialization" else ()
+        try:
+            result = materialize_files(
+                Path(mgmt_dir),
+                {path: SKELETON_FILES[path] for path in relative_paths},
+                directories=directories,
+                substitutions={"[Project Name]": project_name},
+                templates=SKELETON_TEMPLATES
+            )
+        except OSError as e:
+            logger.error(f"Error creating skeleton files in {mgmt_dir}: {e}")
+            return {"status": "error", "files_created": [], "message": str(e)}
         
         return {
             "status": "success",
-            "files_created": [],
-            "message": "Skeleton file creation - placeholder implementation"
+            "files_created": result["created"],
+            "files_skipped": result["skipped_identical"] + result["skipped_existing"],
+            "message": f"Created {len(result['created'])} skeleton files for {directive_type}"
         }
\ No newline at end of file
@@ -15,6 +15,8 @@ from pathlib import Path
 from typing import Dict, Any, List, Optional
 import logging
 
+from .directive_modules.profiler import profile_span
+
 # MCP framework imports (will be added when available)
 try:
     from mcp import types
@@ -56,12 +58,13 @@ class DirectiveProcessor:
         self._state_manager = None
         self._escalation_engine = None
         self._action_determiner = None
+        self._profiler = None
+        self._cascade_guard = None
         
         # Legacy support during transition (may be removed later)
         self._event_queue = asyncio.Queue()
         self._processing_events = False
         self._event_processor_task = None
-        self._execution_stack = []  # Legacy recursion tracking
         
         logger.info("DirectiveProcessor initialized with modular architecture")
     
@@ -98,44 +101,85 @@ class DirectiveProcessor:
         """
         logger.info(f"DirectiveProcessor executing directive: {directive_key}")
         
-        try:
-            # Phase 1: Get action determiner (lazy load)
-            action_determiner = self._get_action_determiner()
-            
-            # Phase 2: Determine actions needed (delegate to module)
-            actions_result = await action_determiner.determine_actions(
-                directive_key, context, self.compressed_directives,
-                directive_content=None, tier=1
-            )
-            
-            # Phase 3: Execute actions using EXISTING action_executor integration
-            if self.action_executor and actions_result.get("actions"):
-                logger.info(f"Executing {len(actions_result['actions'])} actions via action_executor")
-                execution_results = await self.action_executor.execute_actions(actions_result["actions"])
-                actions_result["execution_results"] = execution_results
-            else:
-                logger.warning("No action_executor available or no actions to execute")
-            
-            return actions_result
-            
-        except Exception as e:
-            logger.error(f"Error executing directive {directive_key}: {e}")
+        # Guard against hook feedback loops before doing any work
+        cascade_guard = self._get_cascade_guard()
+        allowed, reason = cascade_guard.check(directive_key, context)
+        if not allowed:
+            async with profile_span(f"suppressed:{directive_key}", category="suppressed", reason=reason):
+                pass
             return {
                 "directive_key": directive_key,
-                "error": str(e),
+                "suppressed": True,
+                "suppression_reason": reason,
                 "actions_taken": [],
                 "escalated": False
             }
+        
+        with cascade_guard.track(directive_key, context):
+            async with self._get_profiler().directive_run(directive_key, context) as run_span:
+                try:
+                    # Phase 1: Get action determiner (lazy load)
+                    action_determiner = self._get_action_determiner()
+                    
+                    # Phase 2: Determine actions needed (delegate to module)
+                    async with profile_span("determine_actions", category="determination", tier=1) as span:
+                        actions_result = await action_determiner.determine_actions(
+                            directive_key, context, self.compressed_directives,
+                            directive_content=None, tier=1
+                        )
+                        if span:
+                            span.attributes["action_count"] = len(actions_result.get("actions", []))
+                            span.attributes["needs_escalation"] = actions_result.get("needs_escalation", False)
+                    
+                    if run_span:
+                        run_span.attributes["tier"] = actions_result.get("tier", 1)
+                    
+                    # Phase 3: Execute actions using EXISTING action_executor integration
+                    if self.action_executor and actions_result.get("actions"):
+                        logger.info(f"Executing {len(actions_result['actions'])} actions via action_executor")
+                        async with profile_span("execute_actions", category="execution",
+                                                action_count=len(actions_result["actions"])):
+                            execution_results = await self.action_executor.execute_actions(actions_result["actions"])
+                        actions_result["execution_results"] = execution_results
+                    else:
+                        logger.warning("No action_executor available or no actions to execute")
+                    
+                    return actions_result
+                    
+                except Exception as e:
+                    logger.error(f"Error executing directive {directive_key}: {e}")
+                    if run_span:
+                        run_span.attributes["error"] = str(e)
+                    return {
+                        "directive_key": directive_key,
+                        "error": str(e),
+                        "actions_taken": [],
+                        "escalated": False
+                    }
     
     async def escalate_directive(self, directive_key: str, context: Dict[str, Any], reason: str) -> Dict[str, Any]:
         """Escalate directive to JSON level (preserve existing API)."""
         escalation_engine = self._get_escalation_engine()
-        return await escalation_engine.escalate_to_json(directive_key, context, reason)
+        async with self._get_profiler().directive_run(directive_key, context, tier=2) as run_span:
+            result = await escalation_engine.escalate_to_json(directive_key, context, reason)
+            self._annotate_escalation(run_span, result)
+            return result
     
     async def escalate_to_markdown(self, directive_key: str, context: Dict[str, Any], reason: str) -> Dict[str, Any]:
         """Escalate directive to markdown level (preserve existing API)."""
         escalation_engine = self._get_escalation_engine()
-        return await escalation_engine.escalate_to_markdown(directive_key, context, reason)
+        async with self._get_profiler().directive_run(directive_key, context, tier=3) as run_span:
+            result = await escalation_engine.escalate_to_markdown(directive_key, context, reason)
+            self._annotate_escalation(run_span, result)
+            return result
+    
+    @staticmethod
+    def _annotate_escalation(run_span, result: Dict[str, Any]):
+        """Record the escalation outcome on its profile span (no-op when not profiling)."""
+        if run_span:
+            run_span.attributes["escalation_level"] = result.get("escalation_level")
+            if result.get("error"):
+                run_span.attributes["error"] = result["error"]
     
     def get_available_directives(self) -> List[str]:
         """Get list of available directives (preserve existing API)."""
@@ -147,6 +191,38 @@ class DirectiveProcessor:
         """Check if directive is available (preserve existing API)."""
         return directive_key in self.get_available_directives()
     
+    def get_cascade_stats(self) -> Dict[str, Any]:
+        """Get directive cascade counters (executed and suppressed runs)."""
+        return self._get_cascade_guard().get_stats()
+    
+    def reset_cascade_guard(self):
+        """Clear cascade deduplication state and counters."""
+        self._get_cascade_guard().reset()
+    
+    # =================================================================
+    # PROFILING (opt-in)
+    # =================================================================
+    
+    def enable_profiling(self, max_runs: Optional[int] = None):
+        """Start recording span trees for directive runs."""
+        self._get_profiler().enable(max_runs)
+    
+    def disable_profiling(self):
+        """Stop recording directive runs."""
+        self._get_profiler().disable()
+    
+    def get_profile_runs(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Get recorded directive span trees, most recent last."""
+        return self._get_profiler().get_runs(limit)
+    
+    def get_profile_summary(self) -> Dict[str, Any]:
+        """Get per-span timing totals across recorded runs."""
+        return self._get_profiler().get_summary()
+    
+    def export_profile_trace(self, output_path: Optional[Path] = None) -> Dict[str, Any]:
+        """Export recorded runs as Chrome trace-event JSON."""
+        return self._get_profiler().export_chrome_trace(output_path)
+    
     async def shutdown(self):
         """Graceful shutdown (preserve existing API)."""
         logger.info("DirectiveProcessor shutting down")
@@ -176,6 +252,20 @@ class DirectiveProcessor:
             self._action_determiner = ActionDeterminer()
         return self._action_determiner
     
+    def _get_cascade_guard(self):
+        """Lazy load CascadeGuard module."""
+        if self._cascade_guard is None:
+            from .directive_modules.cascade_guard import CascadeGuard
+            self._cascade_guard = CascadeGuard()
+        return self._cascade_guard
+    
+    def _get_profiler(self):
+        """Lazy load DirectiveProfiler module."""
+        if self._profiler is None:
+            from .directive_modules.profiler import DirectiveProfiler
+            self._profiler = DirectiveProfiler()
+        return self._profiler
+    
     def _get_escalation_engine(self):
         """Lazy load EscalationEngine module.""" 
         if self._escalation_engine is None:
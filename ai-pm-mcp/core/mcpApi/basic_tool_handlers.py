@@ -9,6 +9,7 @@ from mcp.types import TextContent
 
 # Import project-specific utilities
 from ...utils.project_paths import get_project_management_path
+from ..directive_modules.skeleton_manager import SKELETON_DIRECTORIES, SKELETON_FILES, materialize_files
 
 logger = logging.getLogger(__name__)
 
@@ -169,43 +170,8 @@ class BasicToolHandlers:
         """Create the basic project management structure."""
         project_mgmt_dir = get_project_management_path(project_path, self.config_manager)
         
-        # Create directory structure
-        directories = [
-            "ProjectBlueprint",
-            "ProjectFlow", 
-            "ProjectLogic",
-            "Themes",
-            "Tasks/active",
-            "Tasks/sidequests", 
-            "Tasks/archive/tasks",
-            "Tasks/archive/sidequests",
-            "Implementations/active",
-            "Implementations/completed",
-            "Logs/archived",
-            "Placeholders",
-            ".ai-pm-config.json",
-            "database"
-        ]
-        
-        for dir_path in directories:
-            (project_mgmt_dir / dir_path).mkdir(parents=True, exist_ok=True)
-        
-        # Create basic files
-        files = {
-            "ProjectBlueprint/blueprint.md": "# Project Blueprint\n\nTo be defined...\n",
-            "ProjectFlow/flow-index.json": '{"flowFiles": [], "metadata": {"version": "1.0.0", "description": "Master flow index"}}',
-            "ProjectLogic/projectlogic.jsonl": "",
-            "Themes/themes.json": "{}",
-            "Tasks/completion-path.json": '{"completionObjective": "To be defined", "steps": []}',
-            "Logs/noteworthy.json": "[]",
-            "Placeholders/todos.jsonl": "",
-            ".ai-pm-config.json": '{"project": {"max_file_lines": 900, "auto_modularize": true, "management_folder_name": "projectManagement"}}'
-        }
-        
-        for file_path, content in files.items():
-            full_path = project_mgmt_dir / file_path
-            if not full_path.exists():
-                full_path.write_text(content)
+        # Create directories and basic files in one batch (existing files are kept)
+        materialize_files(project_mgmt_dir, SKELETON_FILES, directories=SKELETON_DIRECTORIES)
         
         # Initialize database
         await self.tool_registry.database_initializer._initialize_database(str(project_path))
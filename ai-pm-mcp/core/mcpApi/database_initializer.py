@@ -227,7 +227,8 @@ class DatabaseInitializer:
                 mcp_server_path=mcp_server_path,
                 theme_flow_queries=self.theme_flow_queries,
                 session_queries=self.session_queries,
-                file_metadata_queries=self.file_metadata_queries
+                file_metadata_queries=self.file_metadata_queries,
+                user_preference_queries=self.user_preference_queries
             )
             
             # Initialize task processor
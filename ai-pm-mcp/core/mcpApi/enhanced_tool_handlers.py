@@ -79,6 +79,10 @@ class EnhancedToolHandlers:
                         "session_id": {
                             "type": "string",
                             "description": "Session ID for analytics tracking"
+                        },
+                        "since_version": {
+                            "type": "string",
+                            "description": "Context version from a previous load in this session; returns only the changes"
                         }
                     },
                     "required": ["project_path", "primary_theme"]
@@ -295,6 +299,7 @@ class EnhancedToolHandlers:
             context_mode = arguments.get("context_mode", "theme-focused")
             task_id = arguments.get("task_id")
             session_id = arguments.get("session_id")
+            since_version = arguments.get("since_version")
             
             from core.scope_engine import ContextMode
             mode = ContextMode(context_mode)
@@ -304,7 +309,8 @@ class EnhancedToolHandlers:
                 primary_theme=primary_theme,
                 context_mode=mode,
                 task_id=task_id,
-                session_id=session_id
+                session_id=session_id,
+                since_version=since_version
             )
             
             summary = await self.scope_engine.get_context_summary(context)
@@ -14,7 +14,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import hashlib
 
 from ..database.db_manager import DatabaseManager
-from ..utils.project_paths import get_project_management_path, get_themes_path, get_flows_path
+from ..utils.project_paths import get_themes_path, get_flows_path
+from ..utils.project_size import ProjectSizeEstimate, get_project_size_estimate
 
 
 class PerformanceMetrics:
@@ -279,41 +280,25 @@ class LargeProjectOptimizer:
         self.optimization_interval = 3600   # 1 hour in seconds
         self.last_optimization = datetime.now()
     
+    def estimate_project_size(self, force: bool = False) -> ProjectSizeEstimate:
+        """
+        Estimated size class of the project, cached per project.
+        
+        The verdict is reused until it expires or the project changes, so
+        is_large_project() and should_optimize() are cheap to call repeatedly.
+        
+        Args:
+            force: Re-estimate even if a cached verdict is available
+        """
+        return get_project_size_estimate(
+            self.project_root, self.config_manager, force=force,
+            branch_threshold=self.large_project_threshold
+        )
+    
     def is_large_project(self) -> bool:
         """Determine if this is a large project requiring optimization"""
         try:
-            # Check Git branches instead of instances
-            import subprocess
-            result = subprocess.run(['git', 'branch', '--list', 'ai-pm-org-*'], 
-                                  capture_output=True, text=True, cwd=self.project_root)
-            
-            if result.returncode == 0:
-                branches = [line.strip() for line in result.stdout.split('\n') if line.strip()]
-                total_branches = len(branches)
-                
-                if total_branches > self.large_project_threshold:
-                    return True
-            
-            # Check project file count
-            project_files = list(self.project_root.rglob("*"))
-            if len(project_files) > 10000:  # 10k+ files
-                return True
-            
-            # Check database size
-            project_mgmt_dir = get_project_management_path(self.project_root, self.config_manager)
-            db_path = project_mgmt_dir / "project.db"
-            if db_path.exists() and db_path.stat().st_size > 100 * 1024 * 1024:  # 100MB+
-                return True
-            
-            # Check theme count
-            themes_dir = get_themes_path(self.project_root, self.config_manager)
-            if themes_dir.exists():
-                theme_files = list(themes_dir.glob("*.json"))
-                if len(theme_files) > 50:  # 50+ themes
-                    return True
-            
-            return False
-            
+            return self.estimate_project_size().is_large
         except Exception as e:
             print(f"Error checking if large project: {e}")
             return False
@@ -596,7 +581,8 @@ class LargeProjectOptimizer:
         return {
             "project_classification": {
                 "is_large_project": self.is_large_project(),
-                "optimization_needed": self.should_optimize()
+                "optimization_needed": self.should_optimize(),
+                "size_estimate": self.estimate_project_size().to_dict()
             },
             "metrics": {
                 "cache_stats": self.cache.get_stats(),
@@ -687,6 +673,7 @@ class LargeProjectOptimizer:
                 "recommendations": recommendations,
                 "project_metrics": {
                     "is_large_project": self.is_large_project(),
+                    "size_estimate": self.estimate_project_size().to_dict(),
                     "cache_hit_rate": cache_hit_rate,
                     "last_optimization": self.last_optimization.isoformat()
                 }
@@ -6,13 +6,17 @@ Contains the CompressedContextManager class and related data structures.
 
 import json
 import logging
+import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Pattern, Tuple, Any
+from dataclasses import dataclass, field
 from enum import Enum
 
 # Import utilities from parent module paths  
-from ...utils.project_paths import get_project_management_path
+try:
+    from ...utils.project_paths import get_project_management_path
+except ImportError:
+    from utils.project_paths import get_project_management_path
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +40,45 @@ class ContextResult:
     shared_files: Dict[str, List[str]]
     recommendations: List[str]
     memory_estimate: int
+    flows: List[str] = field(default_factory=list)
+    budget: Optional[Dict[str, Any]] = None
+    version: Optional[str] = None
+    delta: Optional[Dict[str, Any]] = None
+
+
+class _TriggerMatcher:
+    """Case-insensitive substring matcher for a fixed list of trigger phrases.
+    
+    All phrases are compiled into a single lookahead alternation in list
+    order, so a text is scanned once regardless of how many triggers there
+    are, and the reported trigger is the first listed one the text contains.
+    """
+    
+    def __init__(self, triggers: List[str]):
+        # First spelling in list order of each lowercased phrase
+        originals: Dict[str, str] = {}
+        for trigger in triggers:
+            if isinstance(trigger, str) and trigger:
+                originals.setdefault(trigger.lower(), trigger)
+        self._triggers: List[str] = list(originals.values())
+        self._pattern: Optional[Pattern] = None
+        if self._triggers:
+            # One group per trigger; at each position the first listed trigger starting there wins
+            alternation = "|".join(f"({re.escape(trigger)})" for trigger in self._triggers)
+            self._pattern = re.compile(f"(?=(?:{alternation}))", re.IGNORECASE)
+    
+    def search(self, text: str) -> Optional[str]:
+        """Return the first trigger (in list order) found in text, or None."""
+        if self._pattern is None or not text:
+            return None
+        best = None
+        for match in self._pattern.finditer(text):
+            index = match.lastindex - 1
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return self._triggers[best] if best is not None else None
 
 
 class CompressedContextManager:
@@ -53,6 +96,15 @@ class CompressedContextManager:
         # Core context (always loaded)
         self._core_context = {}
         self._loaded = False
+        
+        # Lookup indexes built once the core context is loaded
+        self._directive_key_index: Dict[str, str] = {}
+        self._implementation_note_keys = set()
+        self._forced_json_ids = frozenset()
+        self._base_escalation_levels: Dict[str, str] = {}
+        self._context_escalation_matcher = _TriggerMatcher([])
+        self._json_trigger_matcher = _TriggerMatcher([])
+        self._md_trigger_matcher = _TriggerMatcher([])
     
     async def load_core_context(self) -> Dict[str, Any]:
         """Load compressed core context files."""
@@ -76,6 +128,7 @@ class CompressedContextManager:
                 else:
                     logger.warning(f"Core context file not found: {file_path}")
             
+            self._build_indexes()
             self._loaded = True
             logger.info(f"Loaded {len(self._core_context)} core context files")
             
@@ -139,17 +192,64 @@ class CompressedContextManager:
             return False, "No escalation rules found"
         
         # Check if issue contains escalation trigger keywords
-        triggers = escalation_scenario.get('triggers', [])
-        issue_lower = issue_description.lower()
-        
-        for trigger in triggers:
-            if trigger.lower() in issue_lower:
-                return True, f"Issue matches escalation trigger: {trigger}"
+        trigger = self._context_escalation_matcher.search(issue_description)
+        if trigger:
+            return True, f"Issue matches escalation trigger: {trigger}"
         
         return False, "No escalation triggers found in issue"
     
+    def _build_indexes(self):
+        """Precompute directive lookups and trigger matchers from the loaded core context."""
+        directives = self._core_context.get('directive-compressed', {})
+        directive_escalation = directives.get('directiveEscalation', {})
+        when_to_escalate = directive_escalation.get('whenToEscalate', {})
+        
+        self._forced_json_ids = frozenset(
+            directive_escalation.get('escalationProtocol', {}).get('forcedJSONOperations', [])
+        )
+        self._implementation_note_keys = {
+            key for key, directive in directives.items() if self._has_implementation_note(directive)
+        }
+        
+        # Index every directive id we can know about up front: compressed keys,
+        # forced operations and the numbered reference directive files
+        directive_ids = set(directives) | set(self._forced_json_ids)
+        reference_dir = self.mcp_server_path / "reference" / "directives"
+        if reference_dir.is_dir():
+            directive_ids.update(path.stem for path in reference_dir.glob("*.json"))
+        
+        self._directive_key_index = {}
+        self._base_escalation_levels = {}
+        for directive_id in directive_ids:
+            self._base_escalation_levels[directive_id] = self._compute_base_escalation_level(directive_id)
+        
+        workflow_triggers = self._core_context.get('workflow-triggers', {})
+        escalation_scenario = workflow_triggers.get('commonScenarios', {}).get('context_escalation_needed') or {}
+        self._context_escalation_matcher = _TriggerMatcher(escalation_scenario.get('triggers', []))
+        self._json_trigger_matcher = _TriggerMatcher(
+            when_to_escalate.get('forceJSON', []) + when_to_escalate.get('autoJSON', [])
+        )
+        self._md_trigger_matcher = _TriggerMatcher(when_to_escalate.get('autoMD', []))
+    
+    def _compute_base_escalation_level(self, directive_id: str) -> str:
+        """Escalation level implied by the directive itself, before operation context."""
+        if directive_id in self._forced_json_ids:
+            return "json"
+        if self._directive_id_to_compressed_key(directive_id) in self._implementation_note_keys:
+            return "json"
+        return "compressed"
+    
     def _directive_id_to_compressed_key(self, directive_id: str) -> str:
         """Convert numbered directive ID to compressed directive key."""
+        compressed_key = self._directive_key_index.get(directive_id)
+        if compressed_key is None:
+            compressed_key = self._convert_directive_id(directive_id)
+            self._directive_key_index[directive_id] = compressed_key
+        return compressed_key
+    
+    @staticmethod
+    def _convert_directive_id(directive_id: str) -> str:
+        """Derive the compressed directive key from a numbered directive ID."""
         # Handle already converted keys
         if not directive_id.startswith(('0', '1', '2')):
             return directive_id
@@ -183,37 +283,24 @@ class CompressedContextManager:
         if not self._loaded:
             return "compressed"  # Default fallback
         
-        # Get escalation rules from compressed directives
-        directive_escalation = self._core_context.get('directive-compressed', {}).get('directiveEscalation', {})
-        escalation_protocol = directive_escalation.get('escalationProtocol', {})
-        
-        # Check for forced JSON operations
-        forced_json_ops = escalation_protocol.get('forcedJSONOperations', [])
-        if directive_id in forced_json_ops:
-            logger.info(f"Forcing JSON escalation for {directive_id} (complex system operation)")
+        # Forced JSON operations and implementationNote directives (precomputed)
+        base_level = self._base_escalation_levels.get(directive_id)
+        if base_level is None:
+            base_level = self._compute_base_escalation_level(directive_id)
+            self._base_escalation_levels[directive_id] = base_level
+        if base_level == "json":
+            if directive_id in self._forced_json_ids:
+                logger.info(f"Forcing JSON escalation for {directive_id} (complex system operation)")
+            else:
+                logger.info(f"Auto-escalating {directive_id} to JSON (implementationNote present)")
             return "json"
         
-        # Check for implementationNote in compressed directive (search recursively)
-        compressed_key = self._directive_id_to_compressed_key(directive_id)
-        compressed_directive = self.get_directive_summary(compressed_key)
-        if compressed_directive and self._has_implementation_note(compressed_directive):
-            logger.info(f"Auto-escalating {directive_id} to JSON (implementationNote present)")
+        # Check force JSON / auto JSON triggers
+        trigger = self._json_trigger_matcher.search(operation_context)
+        if trigger:
+            logger.info(f"Auto-escalating {directive_id} to JSON (trigger: {trigger})")
             return "json"
         
-        # Check escalation triggers
-        when_to_escalate = directive_escalation.get('whenToEscalate', {})
-        
-        # Check for force JSON triggers
-        force_json = when_to_escalate.get('forceJSON', [])
-        auto_json = when_to_escalate.get('autoJSON', [])
-        
-        operation_lower = operation_context.lower()
-        
-        for trigger in force_json + auto_json:
-            if trigger.lower() in operation_lower:
-                logger.info(f"Auto-escalating {directive_id} to JSON (trigger: {trigger})")
-                return "json"
-        
         # Default to compressed for routine operations
         logger.debug(f"Using compressed directives for {directive_id} (routine operation)")
         return "compressed"
@@ -230,16 +317,10 @@ class CompressedContextManager:
             return True
         
         # Check escalation triggers
-        directive_escalation = self._core_context.get('directive-compressed', {}).get('directiveEscalation', {})
-        when_to_escalate = directive_escalation.get('whenToEscalate', {})
-        auto_md = when_to_escalate.get('autoMD', [])
-        
-        error_lower = error_context.lower()
-        
-        for trigger in auto_md:
-            if trigger.lower() in error_lower:
-                logger.info(f"Auto-escalating {directive_id} to MD (trigger: {trigger})")
-                return True
+        trigger = self._md_trigger_matcher.search(error_context)
+        if trigger:
+            logger.info(f"Auto-escalating {directive_id} to MD (trigger: {trigger})")
+            return True
         
         return False
     
@@ -0,0 +1,302 @@
+"""
+Context Budget Module
+Measures the real size of assembled context and selects the most relevant
+subset that fits a byte/token budget.
+"""
+
+import logging
+import math
+import os
+import stat
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+from .compressed_context import ContextResult
+
+# Import utilities from parent module paths
+try:
+    from ...utils.project_paths import get_themes_path, get_flows_path
+    from ...utils.theme_cache import load_theme_view
+except ImportError:
+    from utils.project_paths import get_themes_path, get_flows_path
+    from utils.theme_cache import load_theme_view
+
+logger = logging.getLogger(__name__)
+
+# Rough bytes-per-token ratio for source code and prose
+BYTES_PER_TOKEN = 4
+
+# Relevance weights
+THEME_WEIGHT = 1.0
+RECENCY_WEIGHT = 0.5
+CRITICALITY_WEIGHT = 0.75
+RECENCY_HALF_LIFE_DAYS = 7.0
+CRITICALITY_SCORES = {"high": 1.0, "medium": 0.5}
+
+# Exact selection is used while items x weight buckets stays below this
+EXACT_SELECTION_LIMIT = 2_000_000
+WEIGHT_BUCKETS = 2000
+
+
+@dataclass
+class BudgetItem:
+    """One measurable piece of context (a file, README or flow)."""
+    kind: str
+    key: str
+    size_bytes: int
+    score: float
+
+    @property
+    def tokens(self) -> int:
+        """Approximate token count."""
+        return estimate_tokens(self.size_bytes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "key": self.key,
+            "bytes": self.size_bytes,
+            "tokens": self.tokens,
+            "score": round(self.score, 4)
+        }
+
+
+def estimate_tokens(size_bytes: int) -> int:
+    """Approximate token count for a byte size."""
+    return math.ceil(size_bytes / BYTES_PER_TOKEN)
+
+
+def select_within_budget(items: List[BudgetItem], capacity_bytes: int) -> Tuple[List[BudgetItem], List[BudgetItem], str]:
+    """
+    Choose the highest-value subset of items whose total size fits capacity.
+
+    Uses an exact 0/1 knapsack over bucketed sizes when the problem is small
+    enough, otherwise greedy selection by value density (compared against the
+    best single item, which bounds the greedy result at half the optimum).
+
+    Returns:
+        Tuple of (selected, dropped, method)
+    """
+    total = sum(item.size_bytes for item in items)
+    if total <= capacity_bytes:
+        return list(items), [], "all"
+
+    free = [item for item in items if item.size_bytes == 0]
+    sized = [item for item in items if 0 < item.size_bytes <= capacity_bytes]
+    oversized = [item for item in items if item.size_bytes > capacity_bytes]
+
+    buckets = min(capacity_bytes, WEIGHT_BUCKETS)
+    if sized and len(sized) * buckets <= EXACT_SELECTION_LIMIT:
+        chosen = _exact_selection(sized, capacity_bytes, buckets)
+        method = "exact"
+    else:
+        chosen = _greedy_selection(sized, capacity_bytes)
+        method = "greedy"
+
+    chosen_ids = {id(item) for item in chosen}
+    selected = free + [item for item in sized if id(item) in chosen_ids]
+    dropped = [item for item in sized if id(item) not in chosen_ids] + oversized
+    return selected, dropped, method
+
+
+def _exact_selection(items: List[BudgetItem], capacity_bytes: int, buckets: int) -> List[BudgetItem]:
+    """0/1 knapsack over sizes rounded up to capacity/buckets units."""
+    unit = capacity_bytes / buckets
+    weights = [max(1, math.ceil(item.size_bytes / unit)) for item in items]
+
+    best = [0.0] * (buckets + 1)
+    taken = []
+    for item, weight in zip(items, weights):
+        row = bytearray(buckets + 1)
+        for capacity in range(buckets, weight - 1, -1):
+            candidate = best[capacity - weight] + item.score
+            if candidate > best[capacity]:
+                best[capacity] = candidate
+                row[capacity] = 1
+        taken.append(row)
+
+    chosen = []
+    capacity = buckets
+    for index in range(len(items) - 1, -1, -1):
+        if taken[index][capacity]:
+            chosen.append(items[index])
+            capacity -= weights[index]
+    return chosen
+
+
+def _greedy_selection(items: List[BudgetItem], capacity_bytes: int) -> List[BudgetItem]:
+    """Greedy by score per byte, falling back to the single best item if better."""
+    chosen, used = [], 0
+    for item in sorted(items, key=lambda i: i.score / i.size_bytes, reverse=True):
+        if used + item.size_bytes <= capacity_bytes:
+            chosen.append(item)
+            used += item.size_bytes
+
+    if items:
+        best_single = max(items, key=lambda i: i.score)
+        if best_single.score > sum(item.score for item in chosen):
+            return [best_single]
+    return chosen
+
+
+class ContextBudget:
+    """Budgeting stage applied to an assembled ContextResult."""
+
+    def __init__(self, parent_instance):
+        self.parent = parent_instance
+        self.file_metadata_queries = parent_instance.file_metadata_queries
+
+    def get_budget_limits(self, default_mb: int = 100) -> Tuple[int, int]:
+        """Get (budget_bytes, budget_tokens) from configuration; 0 tokens means unlimited."""
+        budget_mb, budget_tokens = default_mb, 0
+        config_manager = getattr(self.parent, "config_manager", None)
+        if config_manager:
+            try:
+                project_config = config_manager.get_config().project
+                budget_mb = getattr(project_config, "context_budget_mb", budget_mb)
+                budget_tokens = getattr(project_config, "context_budget_tokens", budget_tokens)
+            except Exception as e:
+                logger.debug(f"Using default context budget: {e}")
+        return int(budget_mb * 1024 * 1024), int(budget_tokens or 0)
+
+    async def apply(self, project_path: Path, context: ContextResult,
+                    budget_bytes: int, budget_tokens: int = 0) -> Dict[str, Any]:
+        """
+        Measure the context, keep the most relevant subset within budget and
+        record a report of what was dropped on context.budget.
+
+        Args:
+            project_path: Project root
+            context: Assembled context (modified in place)
+            budget_bytes: Maximum total bytes of files, READMEs and flows
+            budget_tokens: Maximum approximate tokens (0 = bytes only)
+
+        Returns:
+            Budget report dictionary
+        """
+        capacity = budget_bytes
+        if budget_tokens:
+            capacity = min(capacity, budget_tokens * BYTES_PER_TOKEN)
+
+        distances = self._theme_distances(project_path, context)
+        recency = self._recency_scores()
+        criticality = self._criticality_scores(project_path)
+
+        items = []
+        for file_path in context.files:
+            theme_score = 1.0 / (1 + distances.get(file_path, 2))
+            score = (THEME_WEIGHT * theme_score +
+                     RECENCY_WEIGHT * recency.get(file_path, 0.0) +
+                     CRITICALITY_WEIGHT * criticality.get(file_path, 0.0))
+            items.append(BudgetItem("file", file_path, _file_size(project_path / file_path), score))
+
+        for path, content in context.readmes.items():
+            distance = 0 if path in ('.', '') else distances.get(path, 1)
+            items.append(BudgetItem("readme", path, len(content.encode("utf-8")),
+                                    THEME_WEIGHT * (1.0 / (1 + distance)) + 0.25))
+
+        flows_dir = get_flows_path(project_path, getattr(self.parent, "config_manager", None))
+        for flow_id in context.flows:
+            flow_file = flows_dir / (flow_id if flow_id.endswith(".json") else f"{flow_id}.json")
+            items.append(BudgetItem("flow", flow_id, _file_size(flow_file), THEME_WEIGHT * 0.5 + 0.1))
+
+        selected, dropped, method = select_within_budget(items, capacity)
+
+        dropped_keys = {(item.kind, item.key) for item in dropped}
+        if dropped_keys:
+            context.files = [f for f in context.files if ("file", f) not in dropped_keys]
+            context.readmes = {p: c for p, c in context.readmes.items() if ("readme", p) not in dropped_keys}
+            context.flows = [f for f in context.flows if ("flow", f) not in dropped_keys]
+
+        used_bytes = sum(item.size_bytes for item in selected)
+        report = {
+            "budget_bytes": budget_bytes,
+            "budget_tokens": budget_tokens,
+            "total_bytes": sum(item.size_bytes for item in items),
+            "total_tokens": sum(item.tokens for item in items),
+            "used_bytes": used_bytes,
+            "used_tokens": sum(item.tokens for item in selected),
+            "selected_count": len(selected),
+            "dropped_count": len(dropped),
+            "selection_method": method,
+            "dropped": [item.to_dict() for item in sorted(dropped, key=lambda i: i.score, reverse=True)]
+        }
+        context.budget = report
+
+        if dropped:
+            logger.info(f"Context budget dropped {len(dropped)} items "
+                        f"({report['total_bytes'] - used_bytes} bytes) using {method} selection")
+        return report
+
+    def _theme_distances(self, project_path: Path, context: ContextResult) -> Dict[str, int]:
+        """Distance of each file/path from the primary theme (0 primary, 1 linked, 2 other)."""
+        themes_dir = get_themes_path(project_path, getattr(self.parent, "config_manager", None))
+        distances: Dict[str, int] = {}
+        try:
+            primary = load_theme_view(themes_dir / f"{context.primary_theme}.json") or {}
+        except ValueError:
+            primary = {}
+        linked = set(primary.get('linkedThemes', []))
+
+        for theme_name in context.loaded_themes:
+            if theme_name == context.primary_theme:
+                distance, theme_data = 0, primary
+            else:
+                distance = 1 if theme_name in linked else 2
+                try:
+                    theme_data = load_theme_view(themes_dir / f"{theme_name}.json") or {}
+                except ValueError:
+                    continue
+            for key in list(theme_data.get('files', [])) + list(theme_data.get('paths', [])):
+                if distances.get(key, 3) > distance:
+                    distances[key] = distance
+        return distances
+
+    def _recency_scores(self) -> Dict[str, float]:
+        """Recency score per file from file_modifications (1.0 = modified now, halves weekly)."""
+        scores: Dict[str, float] = {}
+        if not self.file_metadata_queries:
+            return scores
+        try:
+            now = datetime.now(timezone.utc)
+            for row in self.file_metadata_queries.get_file_modifications(days=30) or []:
+                file_path, timestamp = row.get("file_path"), row.get("timestamp")
+                if not file_path or not timestamp:
+                    continue
+                age_days = max((now - _parse_utc(timestamp)).total_seconds() / 86400, 0.0)
+                score = 0.5 ** (age_days / RECENCY_HALF_LIFE_DAYS)
+                scores[file_path] = max(scores.get(file_path, 0.0), score)
+        except Exception as e:
+            logger.debug(f"Error loading file recency for context budget: {e}")
+        return scores
+
+    def _criticality_scores(self, project_path: Path) -> Dict[str, float]:
+        """Criticality score per file from get_critical_files."""
+        scores: Dict[str, float] = {}
+        if not self.file_metadata_queries:
+            return scores
+        try:
+            for entry in self.file_metadata_queries.get_critical_files(str(project_path)) or []:
+                scores[entry["file_path"]] = CRITICALITY_SCORES.get(entry.get("impact_level"), 0.0)
+        except Exception as e:
+            logger.debug(f"Error loading critical files for context budget: {e}")
+        return scores
+
+
+def _parse_utc(timestamp: Any) -> datetime:
+    """Parse a stored timestamp; naive values are UTC (SQLite CURRENT_TIMESTAMP)."""
+    parsed = datetime.fromisoformat(str(timestamp).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _file_size(path: Path) -> int:
+    """Size of a file in bytes (0 for missing files and directories)."""
+    try:
+        file_stat = os.stat(path)
+    except OSError:
+        return 0
+    return 0 if stat.S_ISDIR(file_stat.st_mode) else file_stat.st_size
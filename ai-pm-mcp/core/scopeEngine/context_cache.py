@@ -0,0 +1,276 @@
+"""
+Context Cache Module
+Content-addressed cache of assembled ContextResults shared by all sessions of
+a project, keyed by the request and by version stamps of its inputs.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Any, Tuple
+
+from .compressed_context import ContextResult
+
+# Import utilities from parent module paths
+try:
+    from ...utils.theme_graph import get_themes_signature
+except ImportError:
+    from utils.theme_graph import get_themes_signature
+
+logger = logging.getLogger(__name__)
+
+# Rough per-item overhead used when sizing entries
+ITEM_OVERHEAD_BYTES = 64
+
+
+def copy_context(context: ContextResult) -> ContextResult:
+    """Copy a ContextResult deeply enough that callers can mutate it freely."""
+    return replace(
+        context,
+        loaded_themes=list(context.loaded_themes),
+        files=list(context.files),
+        paths=list(context.paths),
+        flows=list(context.flows),
+        readmes=dict(context.readmes),
+        shared_files={path: list(themes) if isinstance(themes, list) else themes
+                      for path, themes in context.shared_files.items()},
+        recommendations=list(context.recommendations),
+        budget=dict(context.budget) if context.budget else context.budget,
+        delta=None,
+        version=None
+    )
+
+
+def estimate_context_bytes(context: ContextResult) -> int:
+    """Approximate memory held by a cached ContextResult."""
+    total = 0
+    for values in (context.loaded_themes, context.files, context.paths, context.flows, context.recommendations):
+        total += sum(len(value) + ITEM_OVERHEAD_BYTES for value in values)
+    total += sum(len(path) + len(content) + ITEM_OVERHEAD_BYTES for path, content in context.readmes.items())
+    total += sum(len(path) + ITEM_OVERHEAD_BYTES * (1 + len(themes))
+                 for path, themes in context.shared_files.items())
+    if context.budget:
+        total += len(context.budget.get("dropped", ())) * ITEM_OVERHEAD_BYTES * 2
+    return total
+
+
+class ContextResultCache:
+    """
+    Size-aware LRU of assembled ContextResults.
+
+    Keys combine the request (project, theme, mode, options) with input
+    version stamps: the stat signature of every theme file and of themes.json,
+    and the database data_version / change counter. Any theme edit or database
+    write therefore produces a new key. Files whose content is copied into a
+    result (README files) are passed to put() as watch paths; their
+    (mtime_ns, size) is recorded and re-checked on every lookup, so editing,
+    creating or deleting one drops the entry. Entries also expire after
+    max_age_seconds.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, max_age_seconds: float = 300.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Approximate memory budget for cached results
+            max_age_seconds: Maximum age of an entry (0 = no expiry)
+        """
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        # key -> (context, size, stored_at, token, watched file stamps)
+        self._entries: "OrderedDict[str, Tuple[ContextResult, int, float, int, Tuple]]" = OrderedDict()
+        self._bytes = 0
+        self._next_token = 0
+        self._lock = threading.Lock()
+        # db_manager -> (id of its connection, changes on it excluded from the stamp)
+        self._ignored_changes: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0, "stale": 0}
+
+    def make_key(self, kind: str, project_path: Path, themes_dir: Path,
+                 request: Dict[str, Any], db_manager=None) -> str:
+        """
+        Build a content-addressed key for a context request.
+
+        Args:
+            kind: Which stage is cached (e.g. "base", "enhanced")
+            project_path: Project root
+            themes_dir: Themes directory (its files are stamped)
+            request: Request parameters (theme, mode, options)
+            db_manager: Optional DatabaseManager whose version is stamped
+
+        Returns:
+            Hex digest key
+        """
+        stamps = {
+            "themes": get_themes_signature(themes_dir),
+            "index": self._stat_stamp(themes_dir / "themes.json"),
+            "db": self._db_stamp(db_manager)
+        }
+        payload = json.dumps([kind, str(project_path), request, stamps], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[ContextResult]:
+        """Get a private copy of a cached result (None on miss)."""
+        return self.lookup(key)[0]
+
+    def lookup(self, key: str) -> Tuple[Optional[ContextResult], Optional[int]]:
+        """
+        Get a private copy of a cached result and the token of its entry.
+
+        Tokens are unique per stored entry, so equal tokens mean identical
+        content even when a key is re-stored after expiry.
+
+        Returns:
+            (context, token), or (None, None) on miss
+        """
+        entry = self._live_entry(key)
+        with self._lock:
+            if entry is None:
+                self.stats["misses"] += 1
+                return None, None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return copy_context(entry[0]), entry[3]
+
+    def __contains__(self, key: str) -> bool:
+        """Whether a live entry exists for key, without counting a hit or miss."""
+        return self._live_entry(key) is not None
+
+    def put(self, key: str, context: ContextResult, watch_paths: Iterable[Path] = ()) -> Optional[int]:
+        """
+        Store a copy of a result, evicting least recently used entries to fit.
+
+        Args:
+            key: Key from make_key()
+            context: Result to cache
+            watch_paths: Files (present or not) whose change invalidates the entry
+
+        Returns:
+            Token of the stored entry (None when the result is too large to cache)
+        """
+        stored = copy_context(context)
+        size = estimate_context_bytes(stored)
+        if size > self.max_bytes:
+            return None
+        stamps = tuple((str(path), self._stat_stamp(Path(path))) for path in dict.fromkeys(watch_paths))
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._next_token += 1
+            token = self._next_token
+            self._entries[key] = (stored, size, time.monotonic(), token, stamps)
+            self._bytes += size
+            self.stats["stores"] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+        return token
+
+    @contextmanager
+    def untracked_writes(self, db_manager):
+        """
+        Exclude database writes made inside the block from the version stamp.
+
+        Used around session bookkeeping (usage tracking, escalation logs) that
+        does not affect assembled context, so it does not invalidate the cache.
+        The block must be synchronous: writes made by other coroutines during
+        an await inside it would be excluded as well. Exclusions apply only to
+        this db_manager's current connection.
+        """
+        connection = self._connection(db_manager)
+        before = connection.total_changes if connection is not None else None
+        try:
+            yield
+        finally:
+            if before is not None:
+                excluded = connection.total_changes - before
+                with self._lock:
+                    connection_id, ignored = self._ignored_changes.get(db_manager, (id(connection), 0))
+                    if connection_id != id(connection):
+                        ignored = 0
+                    self._ignored_changes[db_manager] = (id(connection), ignored + excluded)
+
+    def clear(self):
+        """Drop all cached results."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and memory use."""
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_rate": round(self.stats["hits"] / total, 3) if total else 0.0
+            }
+
+    def _live_entry(self, key: str) -> Optional[Tuple]:
+        """Entry for key, dropping it when expired or a watched file changed."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.max_age_seconds and time.monotonic() - entry[2] > self.max_age_seconds:
+                self._remove(key)
+                self.stats["expired"] += 1
+                return None
+        if entry is None:
+            return None
+        # Stat outside the lock; only drop the entry if it was not replaced meanwhile
+        if all(self._stat_stamp(Path(path)) == stamp for path, stamp in entry[4]):
+            return entry
+        with self._lock:
+            current = self._entries.get(key)
+            if current is not None and current[3] == entry[3]:
+                self._remove(key)
+            self.stats["stale"] += 1
+        return None
+
+    def _remove(self, key: str):
+        _, size, _, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    @staticmethod
+    def _stat_stamp(path: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _db_stamp(self, db_manager) -> Optional[Tuple[int, int]]:
+        """data_version changes on commits by other connections, total_changes on ours."""
+        if db_manager is None:
+            return None
+        try:
+            connection = db_manager.connect()
+            data_version = connection.execute("PRAGMA data_version").fetchone()[0]
+            with self._lock:
+                connection_id, ignored = self._ignored_changes.get(db_manager, (id(connection), 0))
+            if connection_id != id(connection):
+                ignored = 0
+            return (data_version, connection.total_changes - ignored)
+        except Exception as e:
+            logger.debug(f"Database version stamp unavailable: {e}")
+            return None
+
+    @staticmethod
+    def _connection(db_manager):
+        if db_manager is None:
+            return None
+        try:
+            return db_manager.connect()
+        except Exception:
+            return None
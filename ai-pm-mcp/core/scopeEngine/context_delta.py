@@ -0,0 +1,248 @@
+"""
+Context Delta Module
+Remembers the last context loaded per session and describes follow-up loads
+as a delta against a previously returned context version.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+
+from .compressed_context import ContextResult
+
+logger = logging.getLogger(__name__)
+
+# Fall back to a full context when the delta touches more than this share of it
+MAX_DELTA_RATIO = 0.5
+
+
+@dataclass
+class ContextSnapshot:
+    """Comparable state of one loaded context."""
+    version: str
+    mode: str
+    primary_theme: str
+    loaded_themes: Tuple[str, ...]
+    files: frozenset
+    paths: frozenset
+    flows: frozenset
+    readme_hashes: Dict[str, str]
+    # Identity of the inputs the context was built from (see ContextDeltaTracker.record)
+    input_key: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        """Number of items a full context response carries."""
+        return (len(self.loaded_themes) + len(self.files) + len(self.paths) +
+                len(self.flows) + len(self.readme_hashes))
+
+
+@dataclass
+class ContextDelta:
+    """Changes between a previous context version and the current one."""
+    base_version: str
+    version: str
+    mode_changed: bool = False
+    added_themes: List[str] = field(default_factory=list)
+    removed_themes: List[str] = field(default_factory=list)
+    added_files: List[str] = field(default_factory=list)
+    removed_files: List[str] = field(default_factory=list)
+    added_paths: List[str] = field(default_factory=list)
+    removed_paths: List[str] = field(default_factory=list)
+    added_flows: List[str] = field(default_factory=list)
+    removed_flows: List[str] = field(default_factory=list)
+    changed_readmes: Dict[str, str] = field(default_factory=dict)
+    removed_readmes: List[str] = field(default_factory=list)
+
+    @property
+    def change_count(self) -> int:
+        """Total number of changed items."""
+        return (len(self.added_themes) + len(self.removed_themes) +
+                len(self.added_files) + len(self.removed_files) +
+                len(self.added_paths) + len(self.removed_paths) +
+                len(self.added_flows) + len(self.removed_flows) +
+                len(self.changed_readmes) + len(self.removed_readmes))
+
+    @property
+    def unchanged(self) -> bool:
+        return self.base_version == self.version
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary, omitting empty fields."""
+        result = {"base_version": self.base_version, "version": self.version,
+                  "unchanged": self.unchanged, "change_count": self.change_count}
+        for key, value in self.__dict__.items():
+            if key not in result and value:
+                result[key] = value
+        return result
+
+
+def snapshot_context(context: ContextResult) -> ContextSnapshot:
+    """Build a snapshot (with a content-derived version id) of a context."""
+    readme_hashes = {
+        path: hashlib.sha1(content.encode("utf-8")).hexdigest()
+        for path, content in sorted(context.readmes.items())
+    }
+    state = {
+        "mode": context.mode.value,
+        "primary_theme": context.primary_theme,
+        "loaded_themes": list(context.loaded_themes),
+        "files": sorted(context.files),
+        "paths": sorted(context.paths),
+        "flows": sorted(context.flows),
+        "readmes": readme_hashes
+    }
+    version = hashlib.sha1(json.dumps(state, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return ContextSnapshot(
+        version=version,
+        mode=state["mode"],
+        primary_theme=context.primary_theme,
+        loaded_themes=tuple(context.loaded_themes),
+        files=frozenset(context.files),
+        paths=frozenset(context.paths),
+        flows=frozenset(context.flows),
+        readme_hashes=readme_hashes
+    )
+
+
+def diff_snapshots(base: ContextSnapshot, current: ContextSnapshot,
+                   readmes: Dict[str, str]) -> ContextDelta:
+    """
+    Compute the delta from base to current.
+
+    Args:
+        base: Snapshot of the previously returned context
+        current: Snapshot of the freshly loaded context
+        readmes: README contents of the current context (for changed entries)
+
+    Returns:
+        ContextDelta
+    """
+    return ContextDelta(
+        base_version=base.version,
+        version=current.version,
+        mode_changed=base.mode != current.mode or base.primary_theme != current.primary_theme,
+        added_themes=[t for t in current.loaded_themes if t not in base.loaded_themes],
+        removed_themes=[t for t in base.loaded_themes if t not in current.loaded_themes],
+        added_files=sorted(current.files - base.files),
+        removed_files=sorted(base.files - current.files),
+        added_paths=sorted(current.paths - base.paths),
+        removed_paths=sorted(base.paths - current.paths),
+        added_flows=sorted(current.flows - base.flows),
+        removed_flows=sorted(base.flows - current.flows),
+        changed_readmes={path: readmes[path] for path, digest in current.readme_hashes.items()
+                         if base.readme_hashes.get(path) != digest},
+        removed_readmes=sorted(set(base.readme_hashes) - set(current.readme_hashes))
+    )
+
+
+class ContextDeltaTracker:
+    """
+    Per-session memory of returned context versions.
+
+    Keeps the last few snapshots for each session so a caller holding any
+    recent version id can receive a delta; unknown or evicted versions, and
+    deltas larger than max_delta_ratio of the full context, fall back to a
+    full context.
+    """
+
+    def __init__(self, max_sessions: int = 128, versions_per_session: int = 4,
+                 max_delta_ratio: float = MAX_DELTA_RATIO):
+        """
+        Initialize the tracker.
+
+        Args:
+            max_sessions: Sessions remembered (LRU)
+            versions_per_session: Snapshots kept per session
+            max_delta_ratio: Largest delta (as a share of the full context) worth returning
+        """
+        self.max_sessions = max_sessions
+        self.versions_per_session = versions_per_session
+        self.max_delta_ratio = max_delta_ratio
+        self._sessions: "OrderedDict[str, OrderedDict[str, ContextSnapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"full": 0, "delta": 0, "unchanged": 0, "fallback_unknown": 0, "fallback_large": 0}
+
+    def record(self, session_id: str, context: ContextResult,
+               since_version: Optional[str] = None, input_key: Optional[str] = None) -> Optional[ContextDelta]:
+        """
+        Remember a freshly loaded context and compute its delta.
+
+        Sets context.version, and context.delta when a usable delta exists.
+
+        Args:
+            session_id: Session the context was loaded for
+            context: Freshly loaded full context
+            since_version: Version id the caller already holds
+            input_key: Identity of the exact inputs the context was built from
+                (e.g. a context cache entry); when since_version was recorded
+                with the same key the context is unchanged and is not re-snapshotted
+
+        Returns:
+            ContextDelta, or None when the caller needs the full context
+        """
+        if since_version and input_key is not None:
+            with self._lock:
+                versions = self._sessions.get(session_id)
+                base = versions.get(since_version) if versions else None
+                if base is not None and base.input_key == input_key:
+                    self._sessions.move_to_end(session_id)
+                    versions.move_to_end(since_version)
+                    self.stats["unchanged"] += 1
+                    delta = ContextDelta(base_version=since_version, version=since_version)
+                    context.version = since_version
+                    context.delta = delta.to_dict()
+                    return delta
+
+        current = snapshot_context(context)
+        current.input_key = input_key
+        context.version = current.version
+        context.delta = None
+
+        with self._lock:
+            versions = self._sessions.setdefault(session_id, OrderedDict())
+            self._sessions.move_to_end(session_id)
+            base = versions.get(since_version) if since_version else None
+
+            versions[current.version] = current
+            versions.move_to_end(current.version)
+            while len(versions) > self.versions_per_session:
+                versions.popitem(last=False)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+
+            if since_version is None:
+                self.stats["full"] += 1
+                return None
+            if base is None:
+                self.stats["fallback_unknown"] += 1
+                logger.debug(f"Context version {since_version} unknown for session {session_id}; full load")
+                return None
+
+            delta = diff_snapshots(base, current, context.readmes)
+            if delta.unchanged:
+                self.stats["unchanged"] += 1
+            elif delta.mode_changed or delta.change_count > self.max_delta_ratio * max(current.size, 1):
+                self.stats["fallback_large"] += 1
+                logger.debug(f"Context delta for session {session_id} too large "
+                             f"({delta.change_count} of {current.size} items); full load")
+                return None
+            else:
+                self.stats["delta"] += 1
+
+        context.delta = delta.to_dict()
+        return delta
+
+    def forget(self, session_id: str):
+        """Drop all remembered versions for a session."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get delta/full-load counters."""
+        with self._lock:
+            return {**self.stats, "sessions": len(self._sessions)}
@@ -9,9 +9,14 @@ from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple, Any
 import os
 from .compressed_context import ContextMode, ContextResult
+from .context_budget import ContextBudget
+from .context_prefetch import ContextPrefetcher
 
 # Import utilities from parent module paths
 from ...utils.project_paths import get_themes_path
+from ...utils.theme_cache import load_theme_view, thaw
+from ...utils.concurrent_io import get_listing_cache, read_prefix, run_io
+from ...utils.theme_graph import LINK_WEIGHT, get_theme_graph
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +34,17 @@ class ContextLoading:
         
         # Initialize flags and settings
         self._core_context_loaded = False
-        self.max_memory_mb = 100  # Maximum context memory in MB
+        self.max_memory_mb = 100  # Default context budget in MB (overridden by project.context_budget_mb)
+        self._budget = ContextBudget(parent_instance)
+        self.prefetcher = ContextPrefetcher(parent_instance)
         self.readme_priority_files = [
             'README.md', 'readme.md', 'Readme.md',
             'README.txt', 'readme.txt'
         ]
+        self.readme_max_chars = 2000
+        self.expansion_min_weight = 0.25  # Themes weaker than this are not reached by depth-k expansion
+        self.expansion_max_themes = 25
+        self._listings = get_listing_cache()
     
     async def ensure_core_context_loaded(self):
         """Ensure compressed core context is loaded."""
@@ -63,34 +74,37 @@ class ContextLoading:
     
     async def load_context(self, project_path: Path, primary_theme: str, 
                           context_mode: ContextMode = ContextMode.THEME_FOCUSED,
-                          force_mode: bool = False) -> ContextResult:
-        """Load context based on theme and context mode."""
+                          force_mode: bool = False,
+                          expansion_depth: Optional[int] = None) -> ContextResult:
+        """Load context based on theme and context mode.
+        
+        expansion_depth (theme-expanded mode only) follows weighted theme links
+        up to that many hops instead of only the primary theme's linkedThemes.
+        """
         try:
             themes_dir = get_themes_path(project_path, self.parent.config_manager)
+            budget_bytes, budget_tokens = self._budget.get_budget_limits(self.max_memory_mb)
             
-            # Load primary theme
-            primary_theme_data = await self._load_theme(themes_dir, primary_theme)
-            if not primary_theme_data:
-                raise ValueError(f"Primary theme '{primary_theme}' not found")
-            
-            # Determine actual context mode (may escalate if needed)
-            actual_mode = await self._determine_context_mode(
-                themes_dir, primary_theme_data, context_mode, force_mode
-            )
+            # Serve identical requests with unchanged inputs from the shared cache
+            context_cache = getattr(self.parent, 'context_cache', None)
+            cache_key = None
+            if context_cache:
+                cache_key = self._cache_key(context_cache, project_path, themes_dir, primary_theme,
+                                            context_mode, force_mode, expansion_depth,
+                                            budget_bytes, budget_tokens)
+                cached = context_cache.get(cache_key)
+                if cached is not None:
+                    self.prefetcher.on_context_loaded(project_path, primary_theme, context_mode.value)
+                    return cached
             
-            # Load context based on determined mode
-            context = await self._load_context_by_mode(
-                project_path, themes_dir, primary_theme, primary_theme_data, actual_mode
-            )
+            context = await self._assemble_context(project_path, themes_dir, primary_theme, context_mode,
+                                                   force_mode, expansion_depth, budget_bytes, budget_tokens)
             
-            # Load README files for context
-            context.readmes = await self._load_readmes(project_path, context.paths)
+            if cache_key:
+                context_cache.put(cache_key, context, self.readme_watch_paths(project_path, context))
             
-            # Estimate memory usage
-            context.memory_estimate = await self.parent._estimate_memory_usage(context)
-            
-            # Generate recommendations
-            context.recommendations = await self.parent._generate_recommendations(context, {}, project_path)
+            # Warm caches for the themes most likely to be loaded next
+            self.prefetcher.on_context_loaded(project_path, primary_theme, context_mode.value)
             
             return context
             
@@ -98,14 +112,98 @@ class ContextLoading:
             logger.error(f"Error loading context: {e}")
             raise
     
+    async def warm_context(self, project_path: Path, primary_theme: str,
+                           context_mode: str = ContextMode.THEME_FOCUSED.value) -> bool:
+        """Assemble a predicted context into the shared cache without recording it as a load.
+        
+        Returns True when a new result was cached, False when it was already
+        cached or there is no cache to fill.
+        """
+        context_cache = getattr(self.parent, 'context_cache', None)
+        if not context_cache:
+            return False
+        mode = ContextMode(context_mode)
+        themes_dir = get_themes_path(project_path, self.parent.config_manager)
+        budget_bytes, budget_tokens = self._budget.get_budget_limits(self.max_memory_mb)
+        cache_key = self._cache_key(context_cache, project_path, themes_dir, primary_theme,
+                                    mode, False, None, budget_bytes, budget_tokens)
+        if cache_key in context_cache:
+            return False
+        context = await self._assemble_context(project_path, themes_dir, primary_theme, mode,
+                                               False, None, budget_bytes, budget_tokens)
+        context_cache.put(cache_key, context, self.readme_watch_paths(project_path, context))
+        return True
+    
+    def readme_watch_paths(self, project_path: Path, context: ContextResult) -> List[Path]:
+        """README candidates in every directory a context takes READMEs from.
+        
+        Stamping absent candidates too means a newly created README also
+        invalidates a cached result.
+        """
+        directories = dict.fromkeys([str(Path('.'))] + list(context.paths) + list(context.readmes))
+        return [project_path / directory / name
+                for directory in directories for name in self.readme_priority_files]
+    
+    def _cache_key(self, context_cache, project_path: Path, themes_dir: Path, primary_theme: str,
+                   context_mode: ContextMode, force_mode: bool, expansion_depth: Optional[int],
+                   budget_bytes: int, budget_tokens: int) -> str:
+        """Result cache key for a load_context request."""
+        return context_cache.make_key("base", project_path, themes_dir, {
+            "primary_theme": primary_theme,
+            "context_mode": context_mode.value,
+            "force_mode": force_mode,
+            "expansion_depth": expansion_depth,
+            "budget": [budget_bytes, budget_tokens]
+        }, self._db_manager())
+    
+    async def _assemble_context(self, project_path: Path, themes_dir: Path, primary_theme: str,
+                                context_mode: ContextMode, force_mode: bool,
+                                expansion_depth: Optional[int], budget_bytes: int,
+                                budget_tokens: int) -> ContextResult:
+        """Load, budget and annotate the context for a theme (uncached)."""
+        # Load primary theme
+        primary_theme_data = await self._load_theme(themes_dir, primary_theme)
+        if not primary_theme_data:
+            raise ValueError(f"Primary theme '{primary_theme}' not found")
+        
+        # Determine actual context mode (may escalate if needed)
+        actual_mode = await self._determine_context_mode(
+            themes_dir, primary_theme_data, context_mode, force_mode
+        )
+        
+        # Load context based on determined mode
+        context = await self._load_context_by_mode(
+            project_path, themes_dir, primary_theme, primary_theme_data, actual_mode,
+            expansion_depth
+        )
+        
+        # Load README files for context
+        context.readmes = await self._load_readmes(project_path, context.paths)
+        
+        # Keep the most relevant files, READMEs and flows within the context budget
+        await self._budget.apply(project_path, context, budget_bytes, budget_tokens)
+        
+        # Estimate memory usage
+        context.memory_estimate = await self.parent._estimate_memory_usage(context)
+        
+        # Generate recommendations
+        context.recommendations = await self.parent._generate_recommendations(context, actual_mode, context_mode)
+        
+        return context
+    
+    def _db_manager(self):
+        """Database manager whose version stamps context cache keys (None without a database)."""
+        for queries in (self.file_metadata_queries, self.theme_flow_queries, self.session_queries):
+            db_manager = getattr(queries, 'db', None)
+            if db_manager is not None:
+                return db_manager
+        return None
+    
     async def _load_theme(self, themes_dir: Path, theme_name: str) -> Optional[Dict[str, Any]]:
-        """Load a theme definition."""
+        """Load a theme definition (read-only view from the shared theme cache)."""
         theme_file = themes_dir / f"{theme_name}.json"
-        if not theme_file.exists():
-            return None
-        
         try:
-            return json.loads(theme_file.read_text())
+            return load_theme_view(theme_file)
         except json.JSONDecodeError:
             logger.error(f"Invalid JSON in theme file: {theme_file}")
             return None
@@ -137,7 +235,8 @@ class ContextLoading:
     
     async def _load_context_by_mode(self, project_path: Path, themes_dir: Path, 
                                    primary_theme: str, primary_theme_data: Dict[str, Any],
-                                   mode: ContextMode) -> ContextResult:
+                                   mode: ContextMode,
+                                   expansion_depth: Optional[int] = None) -> ContextResult:
         """Load context based on the specified mode."""
         context = ContextResult(
             mode=mode,
@@ -145,6 +244,7 @@ class ContextLoading:
             loaded_themes=[primary_theme],
             files=list(primary_theme_data.get('files', [])),
             paths=list(primary_theme_data.get('paths', [])),
+            flows=list(primary_theme_data.get('flows', [])),
             readmes={},
             shared_files={},
             recommendations=[],
@@ -153,48 +253,44 @@ class ContextLoading:
         
         if mode == ContextMode.THEME_FOCUSED:
             # Only load primary theme
-            context.shared_files = primary_theme_data.get('sharedFiles', {})
+            context.shared_files = thaw(primary_theme_data.get('sharedFiles', {}))
             
-        elif mode == ContextMode.THEME_EXPANDED:
-            # Load primary theme + linked themes
-            linked_themes = primary_theme_data.get('linkedThemes', [])
+        else:
+            # Expanded and project-wide modes walk the precomputed theme graph
+            graph = get_theme_graph(themes_dir, self.theme_flow_queries)
+            if mode == ContextMode.PROJECT_WIDE:
+                expanded = [name for name in sorted(graph.nodes) if name != primary_theme]
+            elif expansion_depth:
+                # Expanded to depth k over all weighted links
+                expanded = [theme.name for theme in graph.expand(
+                    primary_theme, max_depth=expansion_depth,
+                    min_weight=self.expansion_min_weight, max_themes=self.expansion_max_themes
+                )]
+            else:
+                # Directly declared linkedThemes only
+                expanded = [theme.name for theme in graph.expand(primary_theme, max_depth=1, min_weight=LINK_WEIGHT)]
             
-            for linked_theme in linked_themes:
-                linked_data = await self._load_theme(themes_dir, linked_theme)
-                if linked_data:
-                    context.loaded_themes.append(linked_theme)
-                    context.files.extend(linked_data.get('files', []))
-                    context.paths.extend(linked_data.get('paths', []))
-                    
-                    # Merge shared files
-                    for file_path, sharing_info in linked_data.get('sharedFiles', {}).items():
-                        if file_path not in context.shared_files:
-                            context.shared_files[file_path] = []
-                        context.shared_files[file_path].extend(sharing_info.get('sharedWith', []))
-            
-        elif mode == ContextMode.PROJECT_WIDE:
-            # Load all themes
-            themes_index = themes_dir / "themes.json"
-            if themes_index.exists():
-                all_themes = json.loads(themes_index.read_text())
+            files, paths = set(context.files), set(context.paths)
+            shared_files: Dict[str, Dict[str, None]] = {}
+            for theme_name in expanded:
+                node = graph.nodes[theme_name]
+                context.loaded_themes.append(theme_name)
+                files |= node.files
+                paths |= node.paths
+                context.flows.extend(node.flows)
                 
-                for theme_name in all_themes.keys():
-                    if theme_name != primary_theme:
-                        theme_data = await self._load_theme(themes_dir, theme_name)
-                        if theme_data:
-                            context.loaded_themes.append(theme_name)
-                            context.files.extend(theme_data.get('files', []))
-                            context.paths.extend(theme_data.get('paths', []))
-                            
-                            # Merge shared files
-                            for file_path, sharing_info in theme_data.get('sharedFiles', {}).items():
-                                if file_path not in context.shared_files:
-                                    context.shared_files[file_path] = []
-                                context.shared_files[file_path].extend(sharing_info.get('sharedWith', []))
+                # Merge shared files (ordered, without duplicates)
+                for file_path, shared_with in node.shared_files.items():
+                    shared_files.setdefault(file_path, {}).update(dict.fromkeys(shared_with))
+            
+            context.files = list(files)
+            context.paths = list(paths)
+            context.shared_files = {file_path: list(themes) for file_path, themes in shared_files.items()}
         
         # Remove duplicates
         context.files = list(set(context.files))
         context.paths = list(set(context.paths))
+        context.flows = list(dict.fromkeys(flow for flow in context.flows if isinstance(flow, str)))
         
         # Add global files and paths that are always accessible
         global_paths = await self._get_global_paths(project_path)
@@ -219,16 +315,13 @@ class ContextLoading:
             "src/config", "src/constants", "src/types", "src/utils"
         ]
         
-        global_paths = []
+        # One scandir per parent directory answers every probe below it
+        parents = {str(project_path / pattern.rpartition('/')[0]) for pattern in global_patterns}
+        await run_io(self._listings.listing, sorted(parents))
         
+        global_paths = []
         for pattern in global_patterns:
-            # Check if it's a direct file
-            file_path = project_path / pattern
-            if file_path.exists():
-                if file_path.is_file():
-                    global_paths.append(pattern)
-                elif file_path.is_dir():
-                    global_paths.append(pattern)
+            global_paths.extend(self._listings.match(project_path, pattern))
         
         return global_paths
     
@@ -244,36 +337,30 @@ class ContextLoading:
             except Exception as e:
                 logger.debug(f"Error loading database metadata: {e}")
         
-        # Add project root README (fallback or supplement)
-        for readme_name in self.readme_priority_files:
-            root_readme = project_path / readme_name
-            if root_readme.exists():
-                try:
-                    content = root_readme.read_text(encoding='utf-8')
-                    # If not already in database metadata, add it
-                    root_key = str(Path('.'))
-                    if root_key not in readmes:
-                        readmes[root_key] = content[:2000]  # Limit to 2KB
-                    break
-                except Exception as e:
-                    logger.debug(f"Error reading {root_readme}: {e}")
+        # Project root README (fallback or supplement) plus READMEs from
+        # theme paths not covered by the database, probed and read in parallel
+        root_key = str(Path('.'))
+        jobs = []
+        if root_key not in readmes:
+            jobs.append((root_key, project_path))
+        for path in dict.fromkeys(paths):
+            if path not in readmes and path != root_key:
+                jobs.append((path, project_path / path))
         
-        # Load READMEs from theme paths (fallback for paths not in database)
-        for path in paths:
-            if path in readmes:  # Skip if already loaded from database
-                continue
-                
-            path_obj = project_path / path
-            if path_obj.is_dir():
-                for readme_name in self.readme_priority_files:
-                    readme_file = path_obj / readme_name
-                    if readme_file.exists():
-                        try:
-                            content = readme_file.read_text(encoding='utf-8')
-                            readmes[path] = content[:2000]  # Limit to 2KB
-                            break
-                        except Exception as e:
-                            logger.debug(f"Error reading {readme_file}: {e}")
+        results = await run_io(self._read_directory_readme, [directory for _, directory in jobs])
+        for (key, directory), content in zip(jobs, results):
+            if isinstance(content, Exception):
+                logger.debug(f"Error reading README in {directory}: {content}")
+            elif content is not None:
+                readmes[key] = content
         
         return readmes
-    
\ No newline at end of file
+    
+    def _read_directory_readme(self, directory: Path) -> Optional[str]:
+        """Read the start of the highest-priority README in a directory (blocking)."""
+        readme_name = self._listings.find_first(directory, self.readme_priority_files)
+        if readme_name is None:
+            return None
+        # 4 bytes per character covers any UTF-8 text up to the char limit
+        prefix = read_prefix(directory / readme_name, max_bytes=self.readme_max_chars * 4)
+        return prefix.text[:self.readme_max_chars]
@@ -0,0 +1,322 @@
+"""
+Context Prefetch Module
+Predicts the next theme a project is likely to load and warms the theme
+document and directory-listing caches for it in the background, then
+pre-assembles the most likely context into the shared result cache.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set, Tuple
+
+# Import utilities from parent module paths
+try:
+    from ...utils.project_paths import get_themes_path
+    from ...utils.theme_cache import get_theme_cache
+    from ...utils.theme_graph import get_theme_graph
+    from ...utils.concurrent_io import get_io_executor, get_listing_cache
+except ImportError:
+    from utils.project_paths import get_themes_path
+    from utils.theme_cache import get_theme_cache
+    from utils.theme_graph import get_theme_graph
+    from utils.concurrent_io import get_io_executor, get_listing_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ContextPrefetcher:
+    """
+    Background cache warmer driven by theme transitions, flows and sessions.
+
+    Predictions come from transitions seen in this process (which theme was
+    loaded after which), then from the database: themes sharing an incomplete
+    flow with the loaded theme and themes loaded by the project's latest
+    session, which survive a restart. The strongest theme-graph neighbours
+    fill any remaining slots. Prediction and file warming run on the shared
+    I/O pool within a wall-clock and a byte budget; the top prediction's
+    context is then assembled into the result cache within its own budget,
+    using the context mode learned from user preferences when one is
+    confident. A newer load cancels the run. Every subsequent load is scored
+    as a hit or miss so the prefetcher can be tuned or disabled.
+    """
+
+    def __init__(self, parent_instance, max_predictions: int = 3):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            parent_instance: ScopeEngine instance
+            max_predictions: Themes warmed after each load
+        """
+        self.parent = parent_instance
+        self.max_predictions = max_predictions
+        self.enabled = True
+        self.budget_ms = 50
+        self.budget_bytes = 8 * 1024 * 1024
+        self.assemble_budget_ms = 250
+        self._transitions: Dict[str, Dict[str, Counter]] = defaultdict(lambda: defaultdict(Counter))
+        self._last_theme: Dict[str, str] = {}
+        self._pending: Dict[str, Set[str]] = {}
+        self._tasks: Dict[str, Tuple[asyncio.Task, threading.Event]] = {}
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "runs": 0,
+            "predictions": 0,
+            "hits": 0,
+            "misses": 0,
+            "documents_warmed": 0,
+            "directories_warmed": 0,
+            "bytes_warmed": 0,
+            "contexts_warmed": 0,
+            "budget_exhausted": 0,
+            "cancelled": 0
+        }
+        self._load_config()
+
+    def _load_config(self):
+        """Read prefetch settings from project configuration when available."""
+        config_manager = getattr(self.parent, "config_manager", None)
+        if not config_manager:
+            return
+        try:
+            project_config = config_manager.get_config().project
+            self.enabled = bool(getattr(project_config, "context_prefetch_enabled", self.enabled))
+            self.budget_ms = int(getattr(project_config, "context_prefetch_budget_ms", self.budget_ms))
+            budget_mb = getattr(project_config, "context_prefetch_budget_mb", None)
+            if budget_mb is not None:
+                self.budget_bytes = int(budget_mb * 1024 * 1024)
+            self.assemble_budget_ms = int(getattr(project_config, "context_prefetch_assemble_budget_ms",
+                                                  self.assemble_budget_ms))
+        except Exception as e:
+            logger.debug(f"Using default context prefetch settings: {e}")
+
+    def on_context_loaded(self, project_path: Path, primary_theme: str,
+                          context_mode: str = "theme-focused"):
+        """
+        Record a completed context load and schedule prefetching for the next one.
+
+        Args:
+            project_path: Project root
+            primary_theme: Theme that was just loaded
+            context_mode: Requested mode of that load (used when no preference is learned)
+        """
+        key = str(project_path)
+        self._score(key, primary_theme)
+
+        previous = self._last_theme.get(key)
+        if previous and previous != primary_theme:
+            self._transitions[key][previous][primary_theme] += 1
+        self._last_theme[key] = primary_theme
+
+        previous = self._tasks.pop(key, None)
+        if previous is not None and not previous[0].done():
+            # Stop the superseded run, including its worker thread
+            previous[1].set()
+            previous[0].cancel()
+            self._count("cancelled")
+
+        if not self.enabled:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        themes_dir = get_themes_path(project_path, getattr(self.parent, "config_manager", None))
+        cancelled = threading.Event()
+        task = loop.create_task(self._prefetch(project_path, themes_dir, primary_theme, context_mode, cancelled))
+        self._tasks[key] = (task, cancelled)
+
+    def predict(self, project_path: Path, themes_dir: Path, primary_theme: str) -> List[str]:
+        """Most likely next themes after primary_theme, strongest source first (blocking)."""
+        predictions: List[str] = []
+
+        def add(candidates):
+            for theme in candidates:
+                if len(predictions) >= self.max_predictions:
+                    return
+                if theme and theme != primary_theme and theme not in predictions:
+                    predictions.append(theme)
+
+        observed = self._transitions.get(str(project_path), {}).get(primary_theme)
+        if observed:
+            add(theme for theme, _ in observed.most_common())
+
+        for source in (self._flow_themes, self._session_themes, self._graph_neighbours):
+            if len(predictions) >= self.max_predictions:
+                break
+            try:
+                add(source(project_path, themes_dir, primary_theme))
+            except Exception as e:
+                logger.debug(f"Prefetch prediction source {source.__name__} unavailable: {e}")
+        return predictions
+
+    def _flow_themes(self, project_path: Path, themes_dir: Path, primary_theme: str) -> List[str]:
+        """Themes of incomplete flows that include primary_theme, in flow relevance order."""
+        theme_flow_queries = getattr(self.parent, "theme_flow_queries", None)
+        if not theme_flow_queries:
+            return []
+        flow_ids = [flow["flow_id"] for flow in theme_flow_queries.get_flows_for_theme(primary_theme)]
+        statuses = theme_flow_queries.get_flow_statuses_bulk(flow_ids)
+        themes: List[str] = []
+        for flow_id in flow_ids:
+            status = statuses.get(flow_id)
+            if status and (status.get("completion_percentage") or 0) < 100:
+                themes.extend(status.get("primary_themes", []))
+                themes.extend(status.get("secondary_themes", []))
+        return themes
+
+    def _session_themes(self, project_path: Path, themes_dir: Path, primary_theme: str) -> List[str]:
+        """Themes loaded or active in the project's latest session."""
+        session_queries = getattr(self.parent, "session_queries", None)
+        if not session_queries:
+            return []
+        session = session_queries.get_latest_session(str(project_path))
+        if not session:
+            return []
+        session_context = session_queries.get_session_context(session["session_id"]) or {}
+        return list(session_context.get("loaded_themes", [])) + list(session.get("active_themes") or [])
+
+    def _graph_neighbours(self, project_path: Path, themes_dir: Path, primary_theme: str) -> List[str]:
+        """Theme-graph neighbours of primary_theme, strongest link first."""
+        graph = get_theme_graph(themes_dir, getattr(self.parent, "theme_flow_queries", None))
+        neighbours = graph.nodes[primary_theme].edges if primary_theme in graph.nodes else {}
+        return [theme for theme, _ in sorted(neighbours.items(), key=lambda item: -item[1])]
+
+    def _preferred_mode(self, context_mode: str) -> str:
+        """Context mode to pre-assemble: a confident learned preference, else the last load's mode."""
+        user_preference_queries = getattr(self.parent, "user_preference_queries", None)
+        if not user_preference_queries:
+            return context_mode
+        try:
+            recommendation = user_preference_queries.get_context_recommendations({"description": ""})
+        except Exception as e:
+            logger.debug(f"Context mode preference unavailable for prefetch: {e}")
+            return context_mode
+        if recommendation.get("should_suggest") and recommendation.get("recommended_mode"):
+            return recommendation["recommended_mode"]
+        return context_mode
+
+    async def _prefetch(self, project_path: Path, themes_dir: Path, primary_theme: str,
+                        context_mode: str, cancelled: threading.Event):
+        """Predict and warm caches for the next themes, then pre-assemble the top one."""
+        loop = asyncio.get_running_loop()
+        try:
+            predictions, mode = await loop.run_in_executor(
+                get_io_executor(), self._predict_and_warm, project_path, themes_dir, primary_theme,
+                context_mode, cancelled
+            )
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        except Exception as e:
+            logger.debug(f"Context prefetch failed: {e}")
+            return
+        if not predictions or cancelled.is_set():
+            return
+        self._pending[str(project_path)] = set(predictions)
+        self._count("predictions", len(predictions))
+        await self._assemble(project_path, predictions[0], mode, cancelled)
+
+    def _predict_and_warm(self, project_path: Path, themes_dir: Path, primary_theme: str,
+                          context_mode: str, cancelled: threading.Event) -> Tuple[List[str], str]:
+        """Predict the next themes and warm their caches (blocking)."""
+        predictions = self.predict(project_path, themes_dir, primary_theme)
+        if predictions and not cancelled.is_set():
+            self._warm(project_path, themes_dir, predictions, cancelled)
+        return predictions, (self._preferred_mode(context_mode) if predictions else context_mode)
+
+    async def _assemble(self, project_path: Path, theme: str, context_mode: str,
+                        cancelled: threading.Event):
+        """Assemble the predicted theme's context into the shared result cache within budget."""
+        context_loading = getattr(self.parent, "_context_loading", None)
+        if context_loading is None or self.assemble_budget_ms <= 0 or cancelled.is_set():
+            return
+        try:
+            warmed = await asyncio.wait_for(
+                context_loading.warm_context(project_path, theme, context_mode),
+                self.assemble_budget_ms / 1000
+            )
+        except asyncio.TimeoutError:
+            self._count("budget_exhausted")
+            return
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"Context pre-assembly failed for {theme}: {e}")
+            return
+        if warmed:
+            self._count("contexts_warmed")
+
+    def _warm(self, project_path: Path, themes_dir: Path, themes: List[str],
+              cancelled: Optional[threading.Event] = None):
+        """Load theme documents and directory listings within budget (blocking)."""
+        self._count("runs")
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        bytes_left = self.budget_bytes
+        theme_cache = get_theme_cache()
+        listings = get_listing_cache()
+
+        def within_budget() -> bool:
+            if cancelled is not None and cancelled.is_set():
+                return False
+            if time.perf_counter() > deadline or bytes_left <= 0:
+                self._count("budget_exhausted")
+                return False
+            return True
+
+        for theme in themes:
+            if not within_budget():
+                return
+            theme_file = themes_dir / f"{theme}.json"
+            bytes_left -= self._warm_document(theme_cache, theme_file)
+            theme_data = theme_cache.get(theme_file) or {}
+
+            for path in theme_data.get("paths", ()):
+                if not within_budget():
+                    return
+                listings.listing(project_path / path)
+                self._count("directories_warmed")
+
+    def _warm_document(self, theme_cache, path: Path) -> int:
+        """Parse a JSON document into the shared cache; returns the bytes parsed (0 if already cached)."""
+        try:
+            if not theme_cache.warm(path):
+                return 0
+            size = os.stat(path).st_size
+        except (OSError, ValueError):
+            return 0
+        self._count("documents_warmed")
+        self._count("bytes_warmed", size)
+        return size
+
+    def _count(self, name: str, amount: int = 1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _score(self, key: str, theme: str):
+        """Count the load as a hit when the theme was among the last predictions."""
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        self._count("hits" if theme in pending else "misses")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch counters and hit rate."""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        scored = stats["hits"] + stats["misses"]
+        return {
+            **stats,
+            "enabled": self.enabled,
+            "budget_ms": self.budget_ms,
+            "budget_bytes": self.budget_bytes,
+            "assemble_budget_ms": self.assemble_budget_ms,
+            "hit_rate": round(stats["hits"] / scored, 3) if scored else 0.0
+        }
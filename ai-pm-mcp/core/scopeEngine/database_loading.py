@@ -3,10 +3,16 @@ Database Loading Module
 Handles database optimization and metadata loading for context operations.
 """
 
+import inspect
 import logging
+from contextlib import nullcontext
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from .compressed_context import ContextMode, ContextResult
+from .context_delta import ContextDeltaTracker
+
+# Import utilities from parent module paths
+from ...utils.project_paths import get_themes_path
 
 logger = logging.getLogger(__name__)
 
@@ -20,18 +26,31 @@ class DatabaseLoading:
         self.theme_flow_queries = parent_instance.theme_flow_queries
         self.session_queries = parent_instance.session_queries
         self.file_metadata_queries = parent_instance.file_metadata_queries
+        self.delta_tracker = ContextDeltaTracker()
     
     async def _load_database_metadata(self, project_path: Path, paths: List[str]) -> Dict[str, str]:
-        """Load file metadata from database to replace README.json files."""
+        """Load file metadata from database to replace README.json files.
+        
+        Directory metadata and file relationships for every path (and the
+        project root) are fetched with bulk queries rather than per path.
+        """
         metadata_content = {}
         
         try:
-            # Get directory metadata for each path
-            for path in paths:
-                full_path = str(project_path / path)
-                
-                # Get directory metadata from database
-                dir_metadata = self.file_metadata_queries.get_directory_metadata(full_path)
+            full_paths = {path: str(project_path / path) for path in paths}
+            root_path = str(project_path)
+            
+            # One bulk metadata query for all paths plus the project root
+            directory_metadata = self.file_metadata_queries.get_directory_metadata_bulk(
+                list(full_paths.values()) + [root_path]
+            )
+            
+            # Relationships only for directories that actually have metadata
+            found_paths = [full_path for full_path in full_paths.values() if full_path in directory_metadata]
+            relationships = self.file_metadata_queries.get_file_relationships_bulk(found_paths) if found_paths else {}
+            
+            for path, full_path in full_paths.items():
+                dir_metadata = directory_metadata.get(full_path)
                 
                 if dir_metadata:
                     # Format metadata as README-like content
@@ -44,7 +63,7 @@ class DatabaseLoading:
                         content_parts.append(f"**Purpose**: {dir_metadata['purpose']}")
                     
                     # File relationships
-                    file_relationships = self.file_metadata_queries.get_file_relationships(full_path)
+                    file_relationships = relationships.get(full_path, [])
                     if file_relationships:
                         content_parts.append("\n**File Relationships**:")
                         for rel in file_relationships[:5]:  # Limit to top 5
@@ -68,8 +87,8 @@ class DatabaseLoading:
                         # Log that we're using database metadata
                         logger.debug(f"Using database metadata for {path} instead of README.json")
             
-            # Also try to get project root metadata
-            root_metadata = self.file_metadata_queries.get_directory_metadata(str(project_path))
+            # Project root metadata came back with the same bulk query
+            root_metadata = directory_metadata.get(root_path)
             if root_metadata and '.' not in metadata_content:
                 content_parts = []
                 
@@ -99,21 +118,56 @@ class DatabaseLoading:
     async def load_context_with_database_optimization(self, project_path: Path, primary_theme: str,
                                                     context_mode: ContextMode = ContextMode.THEME_FOCUSED,
                                                     task_id: Optional[str] = None,
-                                                    session_id: Optional[str] = None) -> ContextResult:
-        """Load context with database optimization for theme-flow relationships and session tracking."""
+                                                    session_id: Optional[str] = None,
+                                                    since_version: Optional[str] = None) -> ContextResult:
+        """Load context with database optimization for theme-flow relationships and session tracking.
+        
+        With a session_id the returned context carries a version id. Passing a
+        version previously returned for the same session as since_version also
+        sets context.delta (added/removed items and changed READMEs) unless the
+        change is too large, in which case the caller should use the full context.
+        A context served from the same cache entry as since_version is reported
+        unchanged without being re-snapshotted.
+        """
         try:
-            # Load context using existing method first
-            context = await self.parent.load_context(project_path, primary_theme, context_mode)
+            # Enhanced results are shared across sessions while their inputs are unchanged
+            context_cache = getattr(self.parent, 'context_cache', None)
+            db_manager = self.parent._context_loading._db_manager() if context_cache else None
+            cache_key = None
+            cache_token = None
+            context = None
+            if context_cache:
+                themes_dir = get_themes_path(project_path, self.parent.config_manager)
+                cache_key = context_cache.make_key("enhanced", project_path, themes_dir, {
+                    "primary_theme": primary_theme,
+                    "context_mode": context_mode.value
+                }, db_manager)
+                context, cache_token = context_cache.lookup(cache_key)
             
-            # Enhance with database information if available
-            if self.theme_flow_queries:
-                await self.parent._enhance_context_with_flows(context, primary_theme)
+            if context is None:
+                # Load context using existing method first
+                context = await self.parent.load_context(project_path, primary_theme, context_mode)
+                
+                # Enhance with database information if available
+                if self.theme_flow_queries:
+                    await self.parent._enhance_context_with_flows(context, primary_theme)
+                
+                if self.file_metadata_queries:
+                    await self._enhance_context_with_file_intelligence(project_path, context)
+                
+                if cache_key:
+                    watch_paths = self.parent._context_loading.readme_watch_paths(project_path, context)
+                    cache_token = context_cache.put(cache_key, context, watch_paths)
             
             if self.session_queries and session_id:
-                await self._track_context_usage(session_id, context, task_id)
+                # Session bookkeeping does not change assembled context
+                untracked = (lambda: context_cache.untracked_writes(db_manager)) if context_cache else nullcontext
+                await self._track_context_usage(session_id, context, task_id, untracked)
             
-            if self.file_metadata_queries:
-                await self._enhance_context_with_file_intelligence(project_path, context)
+            if session_id:
+                # The same cache entry (and task, which can escalate the mode) means identical content
+                input_key = f"{cache_key}:{cache_token}:{task_id}" if cache_token is not None else None
+                self.delta_tracker.record(session_id, context, since_version, input_key)
             
             return context
             
@@ -122,8 +176,14 @@ class DatabaseLoading:
             # Fallback to regular context loading
             return await self.parent.load_context(project_path, primary_theme, context_mode)
     
-    async def _track_context_usage(self, session_id: str, context: ContextResult, task_id: Optional[str]):
-        """Track context usage for analytics and learning."""
+    async def _track_context_usage(self, session_id: str, context: ContextResult, task_id: Optional[str],
+                                   untracked=nullcontext):
+        """Track context usage for analytics and learning.
+        
+        Args:
+            untracked: Factory of a context manager wrapped around each (synchronous)
+                bookkeeping write, e.g. to keep it out of the context cache stamp
+        """
         try:
             # Update session context tracking
             context_data = {
@@ -135,14 +195,16 @@ class DatabaseLoading:
                 "readmes_count": len(context.readmes)
             }
             
-            await self.session_queries.update_session_context(session_id, context_data)
+            await self._call_untracked(untracked, self.session_queries.update_session_context,
+                                       session_id, context_data)
             
             if task_id:
                 # Determine if context escalation is needed based on task complexity
                 target_mode = self._determine_required_mode_for_task(task_id, context)
                 
                 # Log context escalation if mode was changed
-                await self.session_queries.log_context_escalation(
+                await self._call_untracked(
+                    untracked, self.session_queries.log_context_escalation,
                     session_id=session_id,
                     from_mode=context.mode.value,
                     to_mode=target_mode.value,
@@ -159,6 +221,16 @@ class DatabaseLoading:
         except Exception as e:
             logger.debug(f"Error tracking context usage: {e}")
     
+    @staticmethod
+    async def _call_untracked(untracked, func, *args, **kwargs):
+        """Run a bookkeeping call inside untracked(); an awaitable result is awaited outside it."""
+        with untracked():
+            result = func(*args, **kwargs)
+        if inspect.isawaitable(result):
+            # Other coroutines may write while this one waits, so these writes stay tracked
+            await result
+        return result
+    
     def _determine_required_mode_for_task(self, task_id: str, current_context: ContextResult) -> ContextMode:
         """Determine the required context mode based on task complexity and requirements."""
         try:
@@ -12,6 +12,7 @@ from .compressed_context import ContextResult, ContextMode
 
 # Import utilities from parent module paths
 from ...utils.project_paths import get_flows_path
+from ...utils.relevance_scoring import get_term_index_cache, rank
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,11 @@ class FlowIntelligence:
         self.session_queries = parent_instance.session_queries
         self.file_metadata_queries = parent_instance.file_metadata_queries
     
+    @property
+    def max_memory_mb(self) -> int:
+        """Context memory budget in MB, shared with ContextLoading."""
+        return self.parent._context_loading.max_memory_mb
+    
     async def _enhance_context_with_flows(self, context: ContextResult, primary_theme: str):
         """Enhance context with flow information from database."""
         try:
@@ -372,41 +378,40 @@ class FlowIntelligence:
                                                      task_description: str,
                                                      max_flows: int,
                                                      session_id: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Select flows using database intelligence and historical patterns."""
+        """
+        Select flows using database intelligence and historical patterns.
+        
+        Theme flows come from one query, flow statuses from one bulk query,
+        and task keywords are scored against a cached term index of flow
+        file names, so selection stays linear in the number of candidate flows.
+        """
         selected_flows = []
         
         try:
-            # Get flows for each theme
-            theme_flows = []
-            for theme in task_themes:
-                flows = await self.theme_flow_queries.get_flows_for_theme(theme)
-                theme_flows.extend(flows)
+            # Get flows for all task themes at once
+            flows_by_theme = self.theme_flow_queries.get_flows_for_themes_optimized(list(task_themes))
             
             # Remove duplicates and score by relevance
             flows_by_id = {}
-            for flow in theme_flows:
-                flow_id = flow["flow_id"]
-                if flow_id not in flows_by_id:
-                    flows_by_id[flow_id] = flow
-                    flows_by_id[flow_id]["relevance_score"] = 0
-                
-                # Base relevance score from theme relationship
-                relevance_order = flow.get("relevance_order", 1)
-                flows_by_id[flow_id]["relevance_score"] += 1.0 / relevance_order
-            
-            # Enhanced scoring with task description
-            if task_description:
-                task_keywords = set(word.lower() for word in task_description.split() if len(word) > 2)
-                
-                for flow_id, flow_info in flows_by_id.items():
-                    # Check flow file name
-                    flow_file = flow_info.get("flow_file", "").lower()
-                    file_keywords = set(flow_file.replace("-flow.json", "").replace("-", " ").split())
+            for theme_flows in flows_by_theme.values():
+                for flow in theme_flows:
+                    flow_id = flow["flow_id"]
+                    if flow_id not in flows_by_id:
+                        flows_by_id[flow_id] = dict(flow)
+                        flows_by_id[flow_id]["relevance_score"] = 0
                     
-                    keyword_matches = len(task_keywords.intersection(file_keywords))
-                    flows_by_id[flow_id]["relevance_score"] += keyword_matches * 0.5
+                    # Base relevance score from theme relationship
+                    relevance_order = flow.get("relevance_order") or 1
+                    flows_by_id[flow_id]["relevance_score"] += 1.0 / relevance_order
+            
+            if not flows_by_id:
+                return selected_flows
+            
+            flows = list(flows_by_id.values())
+            scores = [flow["relevance_score"] for flow in flows]
             
             # Historical success pattern scoring if session available
+            successful_flows = set()
             if session_id and self.session_queries:
                 try:
                     success_patterns = await self.session_queries.get_flow_success_patterns(
@@ -414,40 +419,61 @@ class FlowIntelligence:
                         task_themes=task_themes,
                         task_keywords=task_description.lower().split()[:5]
                     )
-                    
                     if success_patterns:
-                        for flow_id in flows_by_id:
-                            if flow_id in success_patterns.get("successful_flows", []):
-                                flows_by_id[flow_id]["relevance_score"] += 1.0
-                                
+                        successful_flows = set(success_patterns.get("successful_flows", []))
+                        
                 except Exception as e:
                     logger.debug(f"Could not get historical success patterns: {e}")
             
             # Flow status boost (prioritize in-progress flows)
-            for flow_id in flows_by_id:
-                try:
-                    flow_status = await self.theme_flow_queries.get_flow_status(flow_id)
-                    if flow_status:
-                        status = flow_status.get("status", "")
-                        if status == "in-progress":
-                            flows_by_id[flow_id]["relevance_score"] += 0.8
-                        elif status == "needs-review":
-                            flows_by_id[flow_id]["relevance_score"] += 0.5
-                        
-                        # Completion percentage factor
-                        completion = flow_status.get("completion_percentage", 0)
-                        if 20 <= completion < 80:  # Partially complete flows are more relevant
-                            flows_by_id[flow_id]["relevance_score"] += 0.3
-                            
-                except Exception as e:
-                    logger.debug(f"Could not get flow status for {flow_id}: {e}")
+            try:
+                statuses = self.theme_flow_queries.get_flow_statuses_bulk(list(flows_by_id))
+            except Exception as e:
+                logger.debug(f"Could not get flow statuses: {e}")
+                statuses = {}
+            
+            for i, flow in enumerate(flows):
+                if flow["flow_id"] in successful_flows:
+                    scores[i] += 1.0
+                
+                flow_status = statuses.get(flow["flow_id"])
+                if flow_status:
+                    status = flow_status.get("status", "")
+                    if status == "in-progress":
+                        scores[i] += 0.8
+                    elif status == "needs-review":
+                        scores[i] += 0.5
+                    
+                    # Completion percentage factor
+                    completion = flow_status.get("completion_percentage") or 0
+                    if 20 <= completion < 80:  # Partially complete flows are more relevant
+                        scores[i] += 0.3
+            
+            # Enhanced scoring with task description (exact flow file name terms)
+            if task_description:
+                task_keywords = set(word.lower() for word in task_description.split() if len(word) > 2)
+                index = get_term_index_cache().get(
+                    scope=("theme-flows", str(getattr(self.theme_flow_queries.db, "db_path", "")),
+                           tuple(sorted(task_themes))),
+                    stamp=tuple((flow["flow_id"], flow.get("flow_file")) for flow in flows),
+                    build=lambda: [
+                        (flow["flow_id"], {"file": self._flow_file_terms(flow.get("flow_file"))})
+                        for flow in flows
+                    ]
+                )
+                scores = index.score(task_keywords, {"file": 0.5}, base=scores)
             
             # Sort by relevance score and select top flows
-            sorted_flows = sorted(flows_by_id.values(), key=lambda x: x["relevance_score"], reverse=True)
-            selected_flows = sorted_flows[:max_flows]
+            for i in rank(scores, limit=max_flows):
+                flows[i]["relevance_score"] = scores[i]
+                selected_flows.append(flows[i])
             
         except Exception as e:
             logger.error(f"Error in database-intelligent flow selection: {e}")
         
         return selected_flows
-    
\ No newline at end of file
+    
+    @staticmethod
+    def _flow_file_terms(flow_file: Optional[str]) -> List[str]:
+        """Keyword terms of a flow file name (e.g. user-auth-flow.json -> user, auth)."""
+        return (flow_file or "").lower().replace("-flow.json", "").replace("-", " ").split()
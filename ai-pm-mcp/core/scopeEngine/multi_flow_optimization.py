@@ -10,6 +10,7 @@ from .compressed_context import ContextResult, ContextMode
 
 # Import utilities from parent module paths
 from ...utils.project_paths import get_themes_path
+from ...utils.relevance_scoring import get_term_index_cache, rank, MATCH_SUBSTRING
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +26,11 @@ class MultiFlowOptimization:
         self.session_queries = parent_instance.session_queries
         self.file_metadata_queries = parent_instance.file_metadata_queries
     
+    @property
+    def max_memory_mb(self) -> int:
+        """Context memory budget in MB, shared with ContextLoading."""
+        return self.parent._context_loading.max_memory_mb
+    
     async def _analyze_cross_flow_dependencies_for_context(self, flow_ids: List[str]) -> List[Dict[str, Any]]:
         """Analyze cross-flow dependencies for context loading optimization."""
         dependencies = []
@@ -206,6 +212,10 @@ class MultiFlowOptimization:
     
     async def _estimate_memory_usage(self, context: ContextResult) -> int:
         """Estimate memory usage in MB for the loaded context."""
+        # Measured sizes from the budgeting stage when available
+        if context.budget:
+            return int(context.budget["used_bytes"] / (1024 * 1024))
+        
         # Rough estimates
         files_mb = len(context.files) * 0.1  # ~100KB per file average
         readmes_mb = sum(len(content) for content in context.readmes.values()) / (1024 * 1024)
@@ -290,7 +300,10 @@ class MultiFlowOptimization:
         return True, new_mode, reason
     
     async def get_context_summary(self, context: ContextResult) -> str:
-        """Get a human-readable summary of the loaded context."""
+        """Get a human-readable summary of the loaded context (only the changes when it carries a delta)."""
+        if context.delta:
+            return self._get_delta_summary(context)
+        
         summary_parts = [
             f"Context Mode: {context.mode.value}",
             f"Primary Theme: {context.primary_theme}",
@@ -301,6 +314,9 @@ class MultiFlowOptimization:
             f"Memory Usage: ~{context.memory_estimate}MB"
         ]
         
+        if context.version:
+            summary_parts.append(f"Context Version: {context.version}")
+        
         if context.shared_files:
             summary_parts.append(f"Shared Files: {len(context.shared_files)} files shared across themes")
         
@@ -311,46 +327,74 @@ class MultiFlowOptimization:
         
         return "\n".join(summary_parts)
     
+    def _get_delta_summary(self, context: ContextResult) -> str:
+        """Summary of only what changed since the version the caller already holds."""
+        delta = context.delta
+        summary_parts = [
+            f"Context Version: {context.version}",
+            f"Base Version: {delta['base_version']}"
+        ]
+        if delta.get("unchanged"):
+            summary_parts.append("Unchanged - the context loaded for the base version is still current")
+            return "\n".join(summary_parts)
+        
+        summary_parts.append(f"Changes: {delta['change_count']}")
+        for key in ("added_themes", "removed_themes", "added_files", "removed_files",
+                    "added_paths", "removed_paths", "added_flows", "removed_flows", "removed_readmes"):
+            if delta.get(key):
+                summary_parts.append(f"  {key.replace('_', ' ').capitalize()}: {', '.join(delta[key])}")
+        if delta.get("changed_readmes"):
+            summary_parts.append(f"  Changed readmes: {', '.join(delta['changed_readmes'])}")
+        return "\n".join(summary_parts)
+    
     async def filter_files_by_relevance(self, context: ContextResult, 
-                                       task_description: str) -> List[str]:
-        """Filter context files by relevance to a specific task."""
+                                       task_description: str,
+                                       max_files: Optional[int] = None) -> List[str]:
+        """
+        Filter context files by relevance to a specific task.
+        
+        Files are tokenized once into a cached term index per context file
+        set; each task keyword found within a path term adds 1, and files
+        under one of the first three context paths get a 0.5 boost.
+        
+        Args:
+            context: Loaded context
+            task_description: Task text to score against
+            max_files: Optional cap on returned files
+            
+        Returns:
+            Relevant files, most relevant first
+        """
         if not task_description:
-            return context.files
+            return context.files[:max_files] if max_files else context.files
         
         # Extract keywords from task description
         task_keywords = set(word.lower().strip('.,!?:;') 
                            for word in task_description.split() 
                            if len(word) > 2)
         
-        # Score files based on keyword matches
-        file_scores = {}
-        for file_path in context.files:
-            score = 0
-            file_parts = file_path.lower().replace('/', ' ').replace('_', ' ').replace('-', ' ')
-            
-            for keyword in task_keywords:
-                if keyword in file_parts:
-                    score += 1
-            
-            # Boost score for files in primary theme
-            if any(theme_path in file_path for theme_path in context.paths[:3]):
-                score += 0.5
-            
-            file_scores[file_path] = score
+        files = context.files
+        index = get_term_index_cache().get(
+            scope=("files", context.primary_theme),
+            stamp=hash(tuple(files)),
+            build=lambda: [(file_path, {"path": file_path}) for file_path in files]
+        )
+        
+        # Boost score for files in primary theme
+        primary_paths = context.paths[:3]
+        in_primary = [any(theme_path in file_path for theme_path in primary_paths) for file_path in files]
+        base = [0.5 if flag else 0.0 for flag in in_primary]
+        
+        scores = index.score(task_keywords, {"path": 1.0}, match=MATCH_SUBSTRING, base=base)
         
         # Return files sorted by relevance (minimum score of 0.5)
-        relevant_files = [
-            file_path for file_path, score in file_scores.items() 
-            if score >= 0.5
-        ]
+        relevant_files = [files[i] for i in rank(scores, limit=max_files, min_score=0.5)]
         
         # If no relevant files found, return top N files from primary theme
-        if not relevant_files and context.files:
-            primary_theme_files = [
-                f for f in context.files 
-                if any(theme_path in f for theme_path in context.paths[:3])
-            ]
-            relevant_files = primary_theme_files[:10] if primary_theme_files else context.files[:10]
+        if not relevant_files and files:
+            primary_theme_files = [f for f, flag in zip(files, in_primary) if flag]
+            fallback_count = min(max_files or 10, 10)
+            relevant_files = (primary_theme_files or files)[:fallback_count]
         
         return relevant_files
     
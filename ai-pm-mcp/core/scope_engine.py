@@ -22,6 +22,7 @@ from ..utils.project_paths import get_project_management_path, get_themes_path,
 # Import modular components
 from .scopeEngine.compressed_context import CompressedContextManager, ContextMode, ContextResult
 from .scopeEngine.context_loading import ContextLoading
+from .scopeEngine.context_cache import ContextResultCache
 from .scopeEngine.database_loading import DatabaseLoading
 from .scopeEngine.flow_intelligence import FlowIntelligence
 from .scopeEngine.multi_flow_optimization import MultiFlowOptimization
@@ -38,7 +39,8 @@ class ScopeEngine:
                  theme_flow_queries: Optional[ThemeFlowQueries] = None,
                  session_queries: Optional[SessionQueries] = None, 
                  file_metadata_queries: Optional[FileMetadataQueries] = None,
-                 config_manager=None):
+                 config_manager=None,
+                 user_preference_queries=None):
         # Initialize compressed context manager
         self.compressed_context_manager = CompressedContextManager(mcp_server_path)
         
@@ -47,6 +49,10 @@ class ScopeEngine:
         self.session_queries = session_queries
         self.file_metadata_queries = file_metadata_queries
         self.config_manager = config_manager
+        self.user_preference_queries = user_preference_queries
+        
+        # Assembled context results shared by all sessions of this engine
+        self.context_cache = ContextResultCache()
         
         # Initialize modular components
         self._context_loading = ContextLoading(self)
@@ -72,9 +78,18 @@ class ScopeEngine:
     
     async def load_context(self, project_path: Path, primary_theme: str, 
                           context_mode: ContextMode = ContextMode.THEME_FOCUSED,
-                          force_mode: bool = False) -> ContextResult:
+                          force_mode: bool = False,
+                          expansion_depth: Optional[int] = None) -> ContextResult:
         """Load context with intelligent mode determination and file optimization"""
-        return await self._context_loading.load_context(project_path, primary_theme, context_mode, force_mode)
+        return await self._context_loading.load_context(project_path, primary_theme, context_mode, force_mode, expansion_depth)
+    
+    def get_context_cache_stats(self) -> Dict[str, Any]:
+        """Get context result cache hit rate and memory use"""
+        return self.context_cache.get_stats()
+    
+    def get_prefetch_stats(self) -> Dict[str, Any]:
+        """Get context prefetch hit rate and budget counters"""
+        return self._context_loading.prefetcher.get_stats()
     
     async def _load_theme(self, themes_dir: Path, theme_name: str) -> Optional[Dict[str, Any]]:
         """Load theme data from file"""
@@ -87,9 +102,10 @@ class ScopeEngine:
     
     async def _load_context_by_mode(self, project_path: Path, themes_dir: Path, 
                                   primary_theme: str, primary_theme_data: Dict[str, Any],
-                                  mode: ContextMode) -> ContextResult:
+                                  mode: ContextMode,
+                                  expansion_depth: Optional[int] = None) -> ContextResult:
         """Load context based on determined mode"""
-        return await self._context_loading._load_context_by_mode(project_path, themes_dir, primary_theme, primary_theme_data, mode)
+        return await self._context_loading._load_context_by_mode(project_path, themes_dir, primary_theme, primary_theme_data, mode, expansion_depth)
     
     async def _get_global_paths(self, project_path: Path) -> List[str]:
         """Get global paths that should always be included"""
@@ -108,10 +124,15 @@ class ScopeEngine:
         return await self._database_loading._load_database_metadata(project_path, paths)
     
     async def load_context_with_database_optimization(self, project_path: Path, primary_theme: str,
+                                                    context_mode: ContextMode = ContextMode.THEME_FOCUSED,
                                                     task_id: Optional[str] = None,
-                                                    session_id: Optional[str] = None) -> ContextResult:
-        """Load context with database optimization"""
-        return await self._database_loading.load_context_with_database_optimization(project_path, primary_theme, task_id, session_id)
+                                                    session_id: Optional[str] = None,
+                                                    since_version: Optional[str] = None) -> ContextResult:
+        """Load context with database optimization (delta against since_version when given)"""
+        return await self._database_loading.load_context_with_database_optimization(
+            project_path, primary_theme, context_mode=context_mode, task_id=task_id,
+            session_id=session_id, since_version=since_version
+        )
     
     async def _track_context_usage(self, session_id: str, context: ContextResult, task_id: Optional[str]):
         """Track context usage for optimization"""
@@ -162,10 +183,13 @@ class ScopeEngine:
         return await self._flow_intelligence.get_context_with_selective_flows(project_path, primary_theme, task_themes, max_flows, session_id)
     
     async def _select_flows_with_database_intelligence(self, task_themes: List[str],
-                                                     session_id: Optional[str] = None,
-                                                     max_flows: int = 3) -> List[str]:
+                                                     task_description: str = "",
+                                                     max_flows: int = 3,
+                                                     session_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """Select flows using database intelligence"""
-        return await self._flow_intelligence._select_flows_with_database_intelligence(task_themes, session_id, max_flows)
+        return await self._flow_intelligence._select_flows_with_database_intelligence(
+            task_themes, task_description=task_description, max_flows=max_flows, session_id=session_id
+        )
 
     # ============================================================================
     # MULTI-FLOW OPTIMIZATION - Delegates to MultiFlowOptimization
@@ -196,10 +220,10 @@ class ScopeEngine:
         return await self._multi_flow_optimization._estimate_memory_usage(context)
     
     async def _generate_recommendations(self, context: ContextResult, 
-                                      theme_files: Dict[str, Dict[str, Any]],
-                                      project_path: Path) -> List[str]:
+                                      actual_mode: ContextMode,
+                                      requested_mode: ContextMode) -> List[str]:
         """Generate context recommendations"""
-        return await self._multi_flow_optimization._generate_recommendations(context, theme_files, project_path)
+        return await self._multi_flow_optimization._generate_recommendations(context, actual_mode, requested_mode)
     
     async def assess_context_escalation(self, current_context: ContextResult, 
                                       task_description: str,
@@ -213,7 +237,7 @@ class ScopeEngine:
     
     async def filter_files_by_relevance(self, context: ContextResult, 
                                       task_description: str,
-                                      max_files: Optional[int] = None) -> ContextResult:
+                                      max_files: Optional[int] = None) -> List[str]:
         """Filter files by relevance to task"""
         return await self._multi_flow_optimization.filter_files_by_relevance(context, task_description, max_files)
     
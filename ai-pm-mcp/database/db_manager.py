@@ -21,6 +21,12 @@ except ImportError:
     # Fallback if import fails
     ConfigManager = None
 
+# Directive profiler spans for database hooks (optional)
+try:
+    from ..core.directive_modules.profiler import profile_span
+except ImportError:
+    profile_span = None
+
 class DatabaseManager:
     """
     Enhanced database manager for AI Project Manager.
@@ -300,7 +306,12 @@ class DatabaseManager:
                 "project_path": str(self.project_path),
                 "timestamp": datetime.now().isoformat()
             }
-            await self.server_instance.on_core_operation_complete(context, "databaseIntegration")
+            if profile_span:
+                async with profile_span(f"db_hook:{trigger}", category="database_hook",
+                                        operation_type=operation_data.get("operation_type")):
+                    await self.server_instance.on_core_operation_complete(context, "databaseIntegration")
+            else:
+                await self.server_instance.on_core_operation_complete(context, "databaseIntegration")
         except Exception as e:
             # Don't fail the database operation if hook fails
             self.logger.warning(f"Database hook error: {e}")
@@ -8,6 +8,7 @@ This module provides file metadata operations split into focused components:
 - impact_analysis: Impact analysis and file relationships
 - initialization_tracking: Initialization progress tracking
 - modification_logging: File modification logging and history
+- scan_manifest: Incremental project scans keyed by mtime, size and content hash
 """
 
 from .directory_ops import DirectoryOperations
@@ -17,6 +18,7 @@ from .impact_analysis import ImpactAnalysis
 from .initialization_tracking import InitializationTracking
 from .modification_logging import ModificationLogging
 from .theme_operations import ThemeOperations
+from .scan_manifest import ScanManifest, ScanResult
 
 __all__ = [
     'DirectoryOperations',
@@ -25,5 +27,7 @@ __all__ = [
     'ImpactAnalysis',
     'InitializationTracking',
     'ModificationLogging',
-    'ThemeOperations'
+    'ThemeOperations',
+    'ScanManifest',
+    'ScanResult'
 ]
\ No newline at end of file
@@ -2,6 +2,15 @@ import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from ..db_manager import DatabaseManager
+try:
+    from ...utils.content_classifier import read_analyzable_text
+except ImportError:
+    # Script context (flat imports of the database package)
+    from utils.content_classifier import read_analyzable_text
+try:
+    from ...utils.code_analysis import get_code_analysis_service
+except ImportError:
+    from utils.code_analysis import get_code_analysis_service
 
 class DependencyAnalysis:
     def __init__(self, db_manager: DatabaseManager):
@@ -25,12 +34,13 @@ class DependencyAnalysis:
             if not file_obj.exists():
                 return self._empty_dependency_analysis()
             
-            # Read file content
+            # Read file content; binary, minified and generated files are skipped
             try:
-                with open(file_obj, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                content, _ = read_analyzable_text(file_obj, errors='strict')
             except (UnicodeDecodeError, IOError):
-                # Skip binary files or files we can't read
+                # Skip files we can't read
+                return self._empty_dependency_analysis()
+            if content is None:
                 return self._empty_dependency_analysis()
             
             # Analyze based on file extension
@@ -64,76 +74,26 @@ class DependencyAnalysis:
         }
     
     def _analyze_python_dependencies(self, content: str, file_path: str) -> Dict[str, Any]:
-        """Analyze Python file dependencies"""
-        import re
-        
-        imports = []
-        exports = []
-        
-        # Find import statements
-        import_patterns = [
-            r'import\s+([a-zA-Z_][a-zA-Z0-9_\.]*)',
-            r'from\s+([a-zA-Z_][a-zA-Z0-9_\.]*)\s+import',
-            r'from\s+\.([a-zA-Z_][a-zA-Z0-9_\.]*)\s+import',  # relative imports
-        ]
-        
-        for pattern in import_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            imports.extend(matches)
-        
-        # Find class and function definitions (exports)
-        export_patterns = [
-            r'class\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-            r'def\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-            r'^([A-Z_][A-Z0-9_]*)\s*=',  # Constants
-        ]
-        
-        for pattern in export_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            exports.extend(matches)
+        """Analyze Python file dependencies (parsed once by the shared code analysis service)"""
+        analysis = get_code_analysis_service().analyze(content, 'python')
         
         return {
-            "imports": list(set(imports)),
-            "exports": list(set(exports)),
-            "dependencies": list(set(imports)),
+            "imports": list(analysis["imports"]),
+            "exports": list(analysis["exports"]),
+            "dependencies": list(analysis["imports"]),
             "dependents": [],  # Would need project-wide analysis
             "language": "python",
             "analysis_timestamp": datetime.now().isoformat()
         }
     
     def _analyze_javascript_dependencies(self, content: str, file_path: str) -> Dict[str, Any]:
-        """Analyze JavaScript/TypeScript file dependencies"""
-        import re
-        
-        imports = []
-        exports = []
-        
-        # Find import statements
-        import_patterns = [
-            r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',
-            r'import\s+[\'"]([^\'"]+)[\'"]',
-            r'require\s*\(\s*[\'"]([^\'"]+)[\'"]\s*\)',
-        ]
-        
-        for pattern in import_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            imports.extend(matches)
-        
-        # Find export statements
-        export_patterns = [
-            r'export\s+(?:default\s+)?(?:class|function|const|let|var)\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-            r'export\s*\{\s*([^}]+)\s*\}',
-            r'module\.exports\s*=\s*([a-zA-Z_][a-zA-Z0-9_]*)',
-        ]
-        
-        for pattern in export_patterns:
-            matches = re.findall(pattern, content, re.MULTILINE)
-            exports.extend(matches)
+        """Analyze JavaScript/TypeScript file dependencies (scanned once by the shared code analysis service)"""
+        analysis = get_code_analysis_service().analyze(content, 'javascript')
         
         return {
-            "imports": list(set(imports)),
-            "exports": list(set(exports)),
-            "dependencies": list(set(imports)),
+            "imports": list(analysis["imports"]),
+            "exports": list(analysis["exports"]),
+            "dependencies": list(analysis["imports"]),
             "dependents": [],
             "language": "javascript",
             "analysis_timestamp": datetime.now().isoformat()
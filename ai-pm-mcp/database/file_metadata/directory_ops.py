@@ -4,10 +4,20 @@ Directory Operations Module
 Handles directory metadata management for intelligent file discovery.
 """
 
+import json
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional
 from ..db_manager import DatabaseManager
 
+# Stay well below SQLite's default host-parameter limit (999 on older builds)
+SQLITE_PARAMETER_CHUNK = 900
+
+
+def _chunked(values: List[str], size: int = SQLITE_PARAMETER_CHUNK) -> Iterable[List[str]]:
+    """Split a list of query parameters into chunks SQLite accepts."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
 
 class DirectoryOperations:
     """Directory metadata management operations."""
@@ -75,4 +85,107 @@ class DirectoryOperations:
             
         except Exception as e:
             self.db.logger.error(f"Error getting directory metadata: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def get_directory_metadata_bulk(self, directory_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get directory metadata for many paths with one IN (...) query per chunk.
+        
+        Args:
+            directory_paths: Directory paths to look up
+            
+        Returns:
+            Dictionary mapping each found directory path to its metadata
+        """
+        metadata = {}
+        unique_paths = list(dict.fromkeys(directory_paths))
+        try:
+            for chunk in _chunked(unique_paths):
+                placeholders = ",".join("?" for _ in chunk)
+                query = f"""
+                    SELECT directory_path, purpose, description, last_updated
+                    FROM directory_metadata
+                    WHERE directory_path IN ({placeholders})
+                """
+                for row in self.db.execute_query(query, tuple(chunk)):
+                    metadata[row['directory_path']] = {
+                        'directory_path': row['directory_path'],
+                        'purpose': row['purpose'],
+                        'description': row['description'],
+                        'last_updated': row['last_updated']
+                    }
+        except Exception as e:
+            self.db.logger.error(f"Error getting bulk directory metadata: {e}")
+        return metadata
+    
+    def get_file_relationships(self, directory_path: str) -> List[Dict[str, Any]]:
+        """
+        Get dependency relationships of the files directly inside a directory.
+        
+        Args:
+            directory_path: Path to the directory
+            
+        Returns:
+            List of relationship dictionaries, most depended-on files first
+        """
+        return self.get_file_relationships_bulk([directory_path]).get(directory_path, [])
+    
+    def get_file_relationships_bulk(self, directory_paths: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Get file relationships for many directories in chunked range queries.
+        
+        Each directory becomes an index-friendly file_path range condition,
+        restricted in SQL to direct children (no '/' after the prefix), so the
+        whole list is fetched in one query per chunk instead of one query per
+        directory, without reading the rest of each subtree.
+        
+        Args:
+            directory_paths: Directory paths to look up
+            
+        Returns:
+            Dictionary mapping directory path to its file relationships
+        """
+        relationships: Dict[str, List[Dict[str, Any]]] = {}
+        # Spellings with and without a trailing slash share one prefix
+        prefixes: Dict[str, List[str]] = {}
+        for path in dict.fromkeys(directory_paths):
+            prefixes.setdefault(path.rstrip('/') + '/', []).append(path)
+        try:
+            # Three parameters per directory (range start, range end, name offset)
+            for chunk in _chunked(list(prefixes), SQLITE_PARAMETER_CHUNK // 3):
+                conditions = " OR ".join(
+                    "(file_path >= ? AND file_path < ? AND instr(substr(file_path, ?), '/') = 0)"
+                    for _ in chunk
+                )
+                params = []
+                for prefix in chunk:
+                    # '0' sorts right after '/'; substr() is 1-based
+                    params.extend((prefix, prefix[:-1] + '0', len(prefix) + 1))
+                query = f"""
+                    SELECT file_path, dependencies, dependents
+                    FROM file_metadata
+                    WHERE {conditions}
+                """
+                for row in self.db.execute_query(query, tuple(params)):
+                    file_path = row['file_path']
+                    directories = prefixes[file_path.rpartition('/')[0] + '/']
+                    dependencies = json.loads(row['dependencies'] or '[]')
+                    dependents = json.loads(row['dependents'] or '[]')
+                    if dependents:
+                        relationship_type = f"used by {len(dependents)} files"
+                    elif dependencies:
+                        relationship_type = f"depends on {len(dependencies)} files"
+                    else:
+                        continue
+                    for directory in directories:
+                        relationships.setdefault(directory, []).append({
+                            'file_path': file_path,
+                            'relationship_type': relationship_type,
+                            'dependencies': dependencies,
+                            'dependents': dependents
+                        })
+            for entries in relationships.values():
+                entries.sort(key=lambda r: (len(r['dependents']), len(r['dependencies'])), reverse=True)
+        except Exception as e:
+            self.db.logger.error(f"Error getting bulk file relationships: {e}")
+        return relationships
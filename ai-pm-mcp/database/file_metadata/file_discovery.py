@@ -4,23 +4,21 @@ File Discovery Module
 Handles project file discovery, categorization, and filtering.
 """
 
-import os
 import fnmatch
 from pathlib import Path
 from typing import Dict, List
 from ..db_manager import DatabaseManager
 try:
-    from ...utils.project_paths import get_management_folder_name
+    from ...utils.project_walker import ProjectWalker
 except ImportError:
     # Enhanced marker-file based fallback
     try:
         from ...utils.paths import add_mcp_server_to_path
         add_mcp_server_to_path()
-        from utils.project_paths import get_management_folder_name
+        from utils.project_walker import ProjectWalker
     except ImportError:
         # Direct marker-file discovery (paths.py approach)
         import sys
-        from pathlib import Path
         
         def find_mcp_root():
             current_path = Path(__file__).parent.absolute()
@@ -31,20 +29,18 @@ except ImportError:
                 current_path = current_path.parent
             raise RuntimeError("MCP server root not found - .ai-pm-mcp-root marker missing")
         
-        try:
-            mcp_root = find_mcp_root()
-            if str(mcp_root) not in sys.path:
-                sys.path.insert(0, str(mcp_root))
-            from utils.project_paths import get_management_folder_name
-        except Exception:
-            # Ultimate fallback - use default value
-            def get_management_folder_name(config_manager=None):
-                return "projectManagement"
+        mcp_root = find_mcp_root()
+        if str(mcp_root) not in sys.path:
+            sys.path.insert(0, str(mcp_root))
+        from utils.project_walker import ProjectWalker
 
 
 class FileDiscovery:
     """File discovery and categorization operations."""
     
+    # Directories never descended into, at any depth
+    PRUNED_DIRS = frozenset({'.git', '.svn', '.hg', '__pycache__', 'node_modules'})
+    
     def __init__(self, db_manager: DatabaseManager, config_manager=None):
         """Initialize with database manager."""
         self.db = db_manager
@@ -76,18 +72,17 @@ class FileDiscovery:
             if file_patterns is None:
                 file_patterns = ['*']
             
-            # Default exclude patterns
-            management_folder = get_management_folder_name(self.config_manager)
+            # Default exclude patterns (management-folder backups and session
+            # files are always excluded by the project walker)
             default_excludes = [
                 '__pycache__/*', '*.pyc', '*.pyo', '.git/*', '.idea/*', '.vscode/*',
-                'node_modules/*', '*.log', '.DS_Store', '*.swp', '*.swo',
-                f'{management_folder}/database/backups/*', f'{management_folder}/.mcp-session-*'
+                'node_modules/*', '*.log', '.DS_Store', '*.swp', '*.swo'
             ]
             
             if exclude_patterns is None:
                 exclude_patterns = default_excludes
             else:
-                exclude_patterns.extend(default_excludes)
+                exclude_patterns = list(exclude_patterns) + default_excludes
             
             categorized_files = {
                 "source_files": [],
@@ -98,31 +93,22 @@ class FileDiscovery:
                 "data_files": []
             }
             
-            # Walk through the project directory
-            for root, dirs, files in os.walk(project_root):
-                # Convert to relative path
-                rel_root = os.path.relpath(root, project_root)
-                if rel_root == '.':
-                    rel_root = ''
+            # Walk through the project directory, pruning excluded and gitignored directories
+            walker = ProjectWalker(
+                project_root,
+                excluded_dirs=self.PRUNED_DIRS,
+                exclude_patterns=exclude_patterns,
+                config_manager=self.config_manager
+            )
+            for entry in walker.walk():
+                # Check if file matches include patterns
+                if not self._matches_include_patterns(entry.name, file_patterns):
+                    continue
                 
-                for file in files:
-                    if rel_root:
-                        file_path = f"{rel_root}/{file}"
-                    else:
-                        file_path = file
-                    
-                    # Check if file should be excluded
-                    if self._should_exclude_file(file_path, exclude_patterns):
-                        continue
-                    
-                    # Check if file matches include patterns
-                    if not self._matches_include_patterns(file, file_patterns):
-                        continue
-                    
-                    # Categorize the file
-                    category = self._categorize_file(file_path, file)
-                    if category in categorized_files:
-                        categorized_files[category].append(file_path)
+                # Categorize the file
+                category = self._categorize_file(entry.rel_path, entry.name)
+                if category in categorized_files:
+                    categorized_files[category].append(entry.rel_path)
             
             # Sort file lists for consistency
             for category in categorized_files:
@@ -145,13 +131,6 @@ class FileDiscovery:
             "data_files": []
         }
     
-    def _should_exclude_file(self, file_path: str, exclude_patterns: List[str]) -> bool:
-        """Check if file should be excluded based on patterns"""
-        for pattern in exclude_patterns:
-            if fnmatch.fnmatch(file_path, pattern) or fnmatch.fnmatch(file_path.lower(), pattern.lower()):
-                return True
-        return False
-    
     def _matches_include_patterns(self, filename: str, file_patterns: List[str]) -> bool:
         """Check if file matches include patterns"""
         if '*' in file_patterns:
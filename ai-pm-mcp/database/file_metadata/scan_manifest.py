@@ -0,0 +1,346 @@
+"""
+Scan Manifest Module
+
+Incremental project scans. For every scanner (theme keyword extraction,
+structure analysis, ...) the manifest stores each file's mtime_ns, size,
+content hash, analysis version and analysis result in project.db. A scan then
+diffs the tree against the manifest:
+
+- same mtime and size: cached result reused without reading the file
+- stat changed but same content hash (touch, checkout): cached result reused
+- new or changed content, or a bumped analysis version: file re-analyzed
+- files no longer present: rows removed
+"""
+
+import hashlib
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+HASH_BLOCK_SIZE = 1024 * 1024
+SQLITE_PARAMETER_CHUNK = 900
+# Files handed to analyze_many at once; results are persisted per batch
+ANALYZE_BATCH_SIZE = 2048
+
+
+def fast_file_hash(path: str) -> Optional[str]:
+    """BLAKE2b-128 of a file's content (None when unreadable)."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, "rb") as handle:
+            for block in iter(lambda: handle.read(HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+@dataclass
+class ScanResult:
+    """Per-file results of an incremental scan, in scan order."""
+    results: Dict[str, Any] = field(default_factory=dict)
+    unchanged: int = 0
+    rehashed: int = 0
+    analyzed: int = 0
+    removed: int = 0
+    errors: int = 0
+    duration_ms: float = 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters for reporting."""
+        return {
+            "files": self.unchanged + self.rehashed + self.analyzed,
+            "unchanged": self.unchanged,
+            "rehashed": self.rehashed,
+            "analyzed": self.analyzed,
+            "removed": self.removed,
+            "errors": self.errors,
+            "duration_ms": round(self.duration_ms, 1)
+        }
+
+
+class ScanManifest:
+    """Manifest of one scanner's per-file state and results."""
+
+    def __init__(self, db_manager, scanner: str, analysis_version: int):
+        """
+        Initialize the manifest.
+
+        Args:
+            db_manager: DatabaseManager instance (None disables persistence)
+            scanner: Scanner name; each scanner keeps its own rows
+            analysis_version: Bump to invalidate every cached result
+        """
+        self.db = db_manager
+        self.scanner = scanner
+        self.analysis_version = analysis_version
+
+    def _load(self) -> Dict[str, Tuple[int, int, Optional[str], int, Optional[str]]]:
+        """Current rows keyed by file path (one query)."""
+        if self.db is None:
+            return {}
+        try:
+            rows = self.db.execute_query(
+                """
+                SELECT file_path, mtime_ns, file_size, content_hash, analysis_version, result
+                FROM scan_manifest WHERE scanner = ?
+                """,
+                (self.scanner,)
+            )
+        except Exception as e:
+            logger.debug(f"Scan manifest unavailable for {self.scanner}: {e}")
+            return {}
+        return {
+            row["file_path"]: (row["mtime_ns"], row["file_size"], row["content_hash"],
+                               row["analysis_version"], row["result"])
+            for row in rows
+        }
+
+    def scan(self, entries: Iterable[Any], analyze: Optional[Callable[[Any], Any]] = None,
+             prune_missing: bool = True,
+             analyze_many: Optional[Callable[[List[Any]], Dict[str, Any]]] = None,
+             transform: Optional[Callable[[Any], Any]] = None) -> ScanResult:
+        """
+        Analyze new and changed files, reusing cached results for the rest.
+
+        Args:
+            entries: WalkEntry-like objects (rel_path, fs_path, size, mtime_ns)
+            analyze: Returns a JSON-serializable result for one entry
+            prune_missing: Remove rows of files not among entries
+            analyze_many: Alternative to analyze that receives the entries
+                needing analysis in batches of ANALYZE_BATCH_SIZE (e.g. to fan
+                out to a process pool) and returns results keyed by rel_path
+            transform: Applied to every result (cached or new) before it is
+                kept in ScanResult.results, e.g. to convert it to a compact
+                record; the manifest always stores the untransformed result
+
+        Returns:
+            ScanResult with a result for every entry that could be analyzed
+        """
+        started = time.perf_counter()
+        manifest = self._load()
+        scan = ScanResult()
+        upserts: List[Tuple] = []
+        pending: List[Tuple[Any, int, int, Optional[str]]] = []
+        now = datetime.now().isoformat()
+
+        def cached(result_json: Optional[str]) -> Any:
+            result = json.loads(result_json) if result_json else None
+            return transform(result) if transform is not None and result is not None else result
+
+        for entry in entries:
+            rel_path = entry.rel_path
+            try:
+                mtime_ns, size = entry.mtime_ns, entry.size
+            except OSError:
+                scan.errors += 1
+                continue
+
+            previous = manifest.get(rel_path)
+            current_version = previous is not None and previous[3] == self.analysis_version
+            if current_version and previous[0] == mtime_ns and previous[1] == size:
+                scan.results[rel_path] = cached(previous[4])
+                scan.unchanged += 1
+                continue
+
+            content_hash = fast_file_hash(entry.fs_path)
+            if current_version and content_hash is not None and previous[2] == content_hash:
+                scan.results[rel_path] = cached(previous[4])
+                upserts.append((self.scanner, rel_path, mtime_ns, size, content_hash,
+                                self.analysis_version, previous[4], now))
+                scan.rehashed += 1
+                continue
+
+            # Placeholder keeps results in scan order
+            scan.results[rel_path] = None
+            pending.append((entry, mtime_ns, size, content_hash))
+
+        # Analyze and persist in batches so raw results never pile up
+        for start in range(0, len(pending), ANALYZE_BATCH_SIZE):
+            batch = pending[start:start + ANALYZE_BATCH_SIZE]
+            if analyze_many is not None:
+                analyzed = analyze_many([entry for entry, _, _, _ in batch])
+            else:
+                analyzed = {}
+                for entry, _, _, _ in batch:
+                    try:
+                        analyzed[entry.rel_path] = analyze(entry)
+                    except Exception as e:
+                        logger.debug(f"Error analyzing {entry.rel_path}: {e}")
+
+            for entry, mtime_ns, size, content_hash in batch:
+                rel_path = entry.rel_path
+                if rel_path not in analyzed:
+                    del scan.results[rel_path]
+                    scan.errors += 1
+                    continue
+                result = analyzed.pop(rel_path)
+                upserts.append((self.scanner, rel_path, mtime_ns, size, content_hash,
+                                self.analysis_version, json.dumps(result, default=str), now))
+                scan.results[rel_path] = transform(result) if transform is not None and result is not None else result
+                scan.analyzed += 1
+            self._save(upserts, [])
+            upserts = []
+
+        removed = [path for path in manifest if path not in scan.results] if prune_missing else []
+        scan.removed = len(removed)
+        self._save(upserts, removed)
+        scan.duration_ms = (time.perf_counter() - started) * 1000
+        logger.debug(f"Scan '{self.scanner}': {scan.summary()}")
+        return scan
+
+    def stream(self, entries: Iterable[Any], analyze: Callable[[Any], Any],
+               scan: Optional[ScanResult] = None, batch_size: int = 256,
+               keep_going: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Incremental scan that yields (rel_path, result) pairs as it goes.
+
+        Unlike scan(), neither the manifest nor the results are held in
+        memory: manifest rows are looked up and written one batch of entries
+        at a time. Rows of files not seen are removed only when the stream
+        ran to completion.
+
+        Args:
+            entries: WalkEntry-like objects (rel_path, fs_path, size, mtime_ns)
+            analyze: Returns a JSON-serializable result for one entry
+            scan: Optional ScanResult whose counters are updated (results stay empty)
+            batch_size: Entries per manifest lookup/write
+            keep_going: Checked before each entry; returning False stops the
+                stream early (e.g. when a time or byte budget is spent)
+
+        Yields:
+            (relative path, result) for every entry that could be analyzed
+        """
+        started = time.perf_counter()
+        scan = scan if scan is not None else ScanResult()
+        seen: Set[str] = set()
+        batch: List[Any] = []
+        completed = True
+
+        for entry in entries:
+            if keep_going is not None and not keep_going():
+                completed = False
+                break
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                yield from self._stream_batch(batch, analyze, scan, seen, keep_going)
+                batch = []
+                if keep_going is not None and not keep_going():
+                    completed = False
+                    break
+        else:
+            if batch:
+                yield from self._stream_batch(batch, analyze, scan, seen, keep_going)
+                if keep_going is not None and not keep_going():
+                    completed = False
+
+        if completed and self.db is not None:
+            existing = [row["file_path"] for row in self.db.execute_query(
+                "SELECT file_path FROM scan_manifest WHERE scanner = ?", (self.scanner,))]
+            removed = [path for path in existing if path not in seen]
+            scan.removed = len(removed)
+            self._save([], removed)
+        scan.duration_ms = (time.perf_counter() - started) * 1000
+
+    def _stream_batch(self, batch: List[Any], analyze: Callable[[Any], Any], scan: ScanResult,
+                      seen: Set[str], keep_going: Optional[Callable[[], bool]]) -> Iterator[Tuple[str, Any]]:
+        """Look up, analyze and persist one batch of entries."""
+        manifest = self._load_paths([entry.rel_path for entry in batch])
+        upserts: List[Tuple] = []
+        now = datetime.now().isoformat()
+        try:
+            for entry in batch:
+                if keep_going is not None and not keep_going():
+                    return
+                rel_path = entry.rel_path
+                seen.add(rel_path)
+                try:
+                    mtime_ns, size = entry.mtime_ns, entry.size
+                except OSError:
+                    scan.errors += 1
+                    continue
+
+                previous = manifest.get(rel_path)
+                current_version = previous is not None and previous[3] == self.analysis_version
+                if current_version and previous[0] == mtime_ns and previous[1] == size:
+                    scan.unchanged += 1
+                    yield rel_path, json.loads(previous[4]) if previous[4] else None
+                    continue
+
+                content_hash = fast_file_hash(entry.fs_path)
+                if current_version and content_hash is not None and previous[2] == content_hash:
+                    upserts.append((self.scanner, rel_path, mtime_ns, size, content_hash,
+                                    self.analysis_version, previous[4], now))
+                    scan.rehashed += 1
+                    yield rel_path, json.loads(previous[4]) if previous[4] else None
+                    continue
+
+                try:
+                    result = analyze(entry)
+                except Exception as e:
+                    logger.debug(f"Error analyzing {rel_path}: {e}")
+                    scan.errors += 1
+                    continue
+                upserts.append((self.scanner, rel_path, mtime_ns, size, content_hash,
+                                self.analysis_version, json.dumps(result, default=str), now))
+                scan.analyzed += 1
+                yield rel_path, result
+        finally:
+            self._save(upserts, [])
+
+    def _load_paths(self, paths: List[str]) -> Dict[str, Tuple[int, int, Optional[str], int, Optional[str]]]:
+        """Rows for the given paths (chunked IN (...) queries)."""
+        if self.db is None or not paths:
+            return {}
+        rows = {}
+        try:
+            for start in range(0, len(paths), SQLITE_PARAMETER_CHUNK):
+                chunk = paths[start:start + SQLITE_PARAMETER_CHUNK]
+                placeholders = ",".join("?" for _ in chunk)
+                for row in self.db.execute_query(
+                    f"""
+                    SELECT file_path, mtime_ns, file_size, content_hash, analysis_version, result
+                    FROM scan_manifest WHERE scanner = ? AND file_path IN ({placeholders})
+                    """,
+                    (self.scanner, *chunk)
+                ):
+                    rows[row["file_path"]] = (row["mtime_ns"], row["file_size"], row["content_hash"],
+                                              row["analysis_version"], row["result"])
+        except Exception as e:
+            logger.debug(f"Scan manifest unavailable for {self.scanner}: {e}")
+        return rows
+
+    def _save(self, upserts: List[Tuple], removed: List[str]):
+        """Write changed rows and delete removed ones in one transaction."""
+        if self.db is None or not (upserts or removed):
+            return
+        try:
+            with self.db.transaction() as connection:
+                if upserts:
+                    connection.executemany(
+                        """
+                        INSERT OR REPLACE INTO scan_manifest
+                        (scanner, file_path, mtime_ns, file_size, content_hash, analysis_version, result, scanned_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        upserts
+                    )
+                if removed:
+                    connection.executemany(
+                        "DELETE FROM scan_manifest WHERE scanner = ? AND file_path = ?",
+                        [(self.scanner, path) for path in removed]
+                    )
+        except Exception as e:
+            logger.warning(f"Could not update scan manifest for {self.scanner}: {e}")
+
+    def clear(self):
+        """Forget every file of this scanner (forces a full rescan)."""
+        if self.db is None:
+            return
+        with self.db.transaction() as connection:
+            connection.execute("DELETE FROM scan_manifest WHERE scanner = ?", (self.scanner,))
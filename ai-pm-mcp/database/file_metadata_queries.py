@@ -60,6 +60,18 @@ class FileMetadataQueries:
         """Get directory metadata for a specific path."""
         return self.directory_ops.get_directory_metadata(directory_path)
     
+    def get_directory_metadata_bulk(self, directory_paths: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get directory metadata for many paths in chunked IN (...) queries."""
+        return self.directory_ops.get_directory_metadata_bulk(directory_paths)
+    
+    def get_file_relationships(self, directory_path: str) -> List[Dict[str, Any]]:
+        """Get dependency relationships of the files inside a directory."""
+        return self.directory_ops.get_file_relationships(directory_path)
+    
+    def get_file_relationships_bulk(self, directory_paths: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Get file relationships for many directories in chunked queries."""
+        return self.directory_ops.get_file_relationships_bulk(directory_paths)
+    
     # ========================================================================
     # FILE DISCOVERY - Delegate to FileDiscovery
     # ========================================================================
@@ -45,6 +45,16 @@ CREATE TABLE IF NOT EXISTS session_context (
     FOREIGN KEY (session_id) REFERENCES sessions(session_id)
 );
 
+-- Content-addressed, zlib-compressed sub-documents shared by context
+-- snapshots (task_queue.context_snapshot) and session_context.files_accessed
+CREATE TABLE IF NOT EXISTS context_blobs (
+    hash TEXT PRIMARY KEY, -- SHA-256 of the canonical JSON payload
+    data BLOB NOT NULL, -- zlib-compressed canonical JSON
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
 -- Work Activity Tracking (Activity-Based Session Management)
 CREATE TABLE IF NOT EXISTS work_activities (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -267,6 +277,19 @@ CREATE TABLE IF NOT EXISTS file_metadata (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Incremental scan manifest: per-scanner file state and cached analysis result
+CREATE TABLE IF NOT EXISTS scan_manifest (
+    scanner TEXT NOT NULL, -- 'theme_keywords', 'file_analysis', etc.
+    file_path TEXT NOT NULL, -- relative to project root
+    mtime_ns INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    content_hash TEXT, -- BLAKE2b-128 of file content
+    analysis_version INTEGER NOT NULL,
+    result TEXT, -- JSON analysis result
+    scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (scanner, file_path)
+);
+
 -- Task Completion Metrics
 CREATE TABLE IF NOT EXISTS task_metrics (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -8,6 +8,7 @@ from datetime import datetime
 from typing import Dict, Any, Optional
 from ..db_manager import DatabaseManager
 from ..event_queries import EventQueries
+from .snapshot_store import SnapshotStore
 
 
 class BootContextManager:
@@ -16,6 +17,7 @@ class BootContextManager:
     def __init__(self, db_manager: DatabaseManager):
         """Initialize with database manager."""
         self.db = db_manager
+        self.snapshots = SnapshotStore(db_manager)
     
     def get_boot_context(self, project_path: str) -> Dict[str, Any]:
         """
@@ -149,11 +151,7 @@ class BootContextManager:
             
             if result:
                 row = result[0]
-                
-                try:
-                    files_accessed = json.loads(row[3]) if row[3] else []
-                except json.JSONDecodeError:
-                    files_accessed = []
+                files_accessed = self.snapshots.unpack_value(row[3], [])
                 
                 return {
                     "loaded_themes": row[0].split(",") if row[0] else [],
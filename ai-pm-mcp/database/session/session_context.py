@@ -7,6 +7,7 @@ import json
 from datetime import datetime
 from typing import List, Dict, Optional, Any
 from ..db_manager import DatabaseManager
+from .snapshot_store import SnapshotStore
 
 
 class SessionContextManager:
@@ -15,6 +16,7 @@ class SessionContextManager:
     def __init__(self, db_manager: DatabaseManager):
         """Initialize with database manager."""
         self.db = db_manager
+        self.snapshots = SnapshotStore(db_manager)
     
     def save_session_context(
         self,
@@ -41,15 +43,16 @@ class SessionContextManager:
         ) VALUES (?, ?, ?, ?, ?, ?)
         """
         
-        params = (
-            session_id,
-            ",".join(loaded_themes),
-            ",".join(loaded_flows),
-            context_escalations,
-            json.dumps(files_accessed)
-        )
-        
-        self.db.execute_update(query, params)
+        with self.db.transaction() as connection:
+            params = (
+                session_id,
+                ",".join(loaded_themes),
+                ",".join(loaded_flows),
+                context_escalations,
+                self.snapshots.pack_value(connection, files_accessed),
+                datetime.now().isoformat()
+            )
+            connection.execute(query, params)
     
     def update_session_context(self, session_id: str, context_data: Dict[str, Any]):
         """
@@ -86,7 +89,9 @@ class SessionContextManager:
             Optional[Dict[str, Any]]: Session context data
         """
         query = """
-        SELECT * FROM session_context 
+        SELECT session_id, loaded_themes, loaded_flows, context_escalations,
+               files_accessed, created_at
+        FROM session_context 
         WHERE session_id = ? 
         ORDER BY created_at DESC 
         LIMIT 1
@@ -95,18 +100,13 @@ class SessionContextManager:
         result = self.db.execute_query(query, (session_id,))
         if result:
             row = result[0]
-            try:
-                files_accessed = json.loads(row[4]) if row[4] else []
-            except json.JSONDecodeError:
-                files_accessed = []
-            
             return {
-                "session_id": row[0],
-                "loaded_themes": row[1].split(",") if row[1] else [],
-                "loaded_flows": row[2].split(",") if row[2] else [],
-                "context_escalations": row[3] if row[3] else 0,
-                "files_accessed": files_accessed,
-                "created_at": row[5]
+                "session_id": row["session_id"],
+                "loaded_themes": row["loaded_themes"].split(",") if row["loaded_themes"] else [],
+                "loaded_flows": row["loaded_flows"].split(",") if row["loaded_flows"] else [],
+                "context_escalations": row["context_escalations"] or 0,
+                "files_accessed": self.snapshots.unpack_value(row["files_accessed"], []),
+                "created_at": row["created_at"]
             }
         return None
     
@@ -130,6 +130,9 @@ class SessionContextManager:
             
         Returns:
             int: Snapshot ID for reference
+        
+        Large parts of context_data are stored compressed and deduplicated
+        against earlier snapshots (see SnapshotStore).
         """
         query = """
         INSERT INTO task_queue (
@@ -138,15 +141,14 @@ class SessionContextManager:
         ) VALUES (?, ?, ?, ?, ?, ?)
         """
         
-        context_json = json.dumps(context_data or {})
-        
-        params = (
-            session_id, task_id, sidequest_id, context_json,
-            queue_position, datetime.now().isoformat()
-        )
-        
-        cursor = self.db.execute_update(query, params)
-        return cursor.lastrowid if hasattr(cursor, 'lastrowid') else 0
+        with self.db.transaction() as connection:
+            params = (
+                session_id, task_id, sidequest_id,
+                self.snapshots.pack(connection, context_data or {}),
+                queue_position, datetime.now().isoformat()
+            )
+            cursor = connection.execute(query, params)
+        return cursor.lastrowid or 0
     
     def get_context_snapshot(self, task_id: Optional[str] = None, sidequest_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
@@ -159,11 +161,12 @@ class SessionContextManager:
         Returns:
             Optional[Dict[str, Any]]: Context snapshot data
         """
+        columns = "id, session_id, task_id, sidequest_id, context_snapshot, queue_position, created_at"
         if task_id:
-            query = "SELECT * FROM task_queue WHERE task_id = ? ORDER BY created_at DESC LIMIT 1"
+            query = f"SELECT {columns} FROM task_queue WHERE task_id = ? ORDER BY created_at DESC LIMIT 1"
             params = (task_id,)
         elif sidequest_id:
-            query = "SELECT * FROM task_queue WHERE sidequest_id = ? ORDER BY created_at DESC LIMIT 1"
+            query = f"SELECT {columns} FROM task_queue WHERE sidequest_id = ? ORDER BY created_at DESC LIMIT 1"
             params = (sidequest_id,)
         else:
             return None
@@ -171,28 +174,28 @@ class SessionContextManager:
         result = self.db.execute_query(query, params)
         if result:
             row = result[0]
-            try:
-                context_data = json.loads(row[3]) if row[3] else {}
-            except json.JSONDecodeError:
-                context_data = {}
-                
             return {
-                "id": row[0],
-                "session_id": row[1], 
-                "task_id": row[2],
-                "sidequest_id": row[3],
-                "context_snapshot": context_data,
-                "queue_position": row[5],
-                "created_at": row[6]
+                "id": row["id"],
+                "session_id": row["session_id"], 
+                "task_id": row["task_id"],
+                "sidequest_id": row["sidequest_id"],
+                "context_snapshot": self.snapshots.unpack(row["context_snapshot"]),
+                "queue_position": row["queue_position"],
+                "created_at": row["created_at"]
             }
         return None
     
     def clear_context_snapshot(self, task_id: Optional[str] = None, sidequest_id: Optional[str] = None):
         """Clear context snapshot after successful resumption."""
-        if task_id:
-            self.db.execute_update("DELETE FROM task_queue WHERE task_id = ?", (task_id,))
-        elif sidequest_id:
-            self.db.execute_update("DELETE FROM task_queue WHERE sidequest_id = ?", (sidequest_id,))
+        if not (task_id or sidequest_id):
+            return
+        with self.db.transaction() as connection:
+            if task_id:
+                connection.execute("DELETE FROM task_queue WHERE task_id = ?", (task_id,))
+            else:
+                connection.execute("DELETE FROM task_queue WHERE sidequest_id = ?", (sidequest_id,))
+        # Drop blobs no other snapshot shares
+        self.snapshots.collect_garbage()
     
     def update_active_themes(self, session_id: str, active_themes: List[str]):
         """Update active themes for a session."""
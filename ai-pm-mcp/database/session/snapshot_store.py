@@ -0,0 +1,237 @@
+"""
+Context Snapshot Storage
+Compressed, content-addressed storage for session context snapshots.
+
+Consecutive snapshots of a session are nearly identical (same loaded themes,
+same file lists). Each large top-level sub-document of a snapshot is stored
+once in context_blobs, zlib-compressed and keyed by the SHA-256 of its
+canonical JSON; the snapshot row itself only keeps a small manifest. Reads
+rehydrate manifests transparently, and rows written before this format (plain
+JSON) are returned unchanged.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_KEY = "__snapshot_manifest__"
+BLOB_REF_PREFIX = "zblob:"
+
+# Sub-documents smaller than this stay inline in the manifest
+MIN_BLOB_BYTES = 256
+COMPRESSION_LEVEL = 6
+SQLITE_PARAMETER_CHUNK = 900
+
+
+def _canonical(value: Any) -> bytes:
+    """Canonical JSON encoding used for hashing and storage."""
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class SnapshotStore:
+    """Packs snapshot documents into manifests plus deduplicated zlib blobs."""
+
+    def __init__(self, db_manager, cache_size: int = 256):
+        """
+        Initialize the store.
+
+        Args:
+            db_manager: DatabaseManager instance
+            cache_size: Number of decompressed blobs kept in memory (LRU)
+        """
+        self.db = db_manager
+        self.cache_size = cache_size
+        # Blobs are immutable (content-addressed), so cached payloads never go stale
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"blobs_written": 0, "blobs_deduplicated": 0, "raw_bytes": 0, "stored_bytes": 0}
+
+    # Writing
+
+    def pack(self, connection: sqlite3.Connection, document: Dict[str, Any]) -> str:
+        """
+        Store the large parts of a document as blobs and return its manifest.
+
+        Args:
+            connection: Connection of the surrounding write transaction
+            document: Snapshot document
+
+        Returns:
+            Manifest JSON to store in place of the document
+        """
+        inline, blobs = {}, {}
+        for key, value in document.items():
+            encoded = _canonical(value)
+            if len(encoded) < MIN_BLOB_BYTES:
+                inline[key] = value
+            else:
+                blobs[key] = self._put(connection, encoded)
+        return json.dumps({MANIFEST_KEY: 1, "inline": inline, "blobs": blobs})
+
+    def pack_value(self, connection: sqlite3.Connection, value: Any) -> str:
+        """
+        Store a single JSON value, as a blob reference when it is large.
+
+        Returns:
+            Plain JSON for small values, otherwise "zblob:<hash>"
+        """
+        encoded = _canonical(value)
+        if len(encoded) < MIN_BLOB_BYTES:
+            return encoded.decode("utf-8")
+        return BLOB_REF_PREFIX + self._put(connection, encoded)
+
+    def _put(self, connection: sqlite3.Connection, encoded: bytes) -> str:
+        """Insert a blob unless an identical one exists; return its hash."""
+        digest = hashlib.sha256(encoded).hexdigest()
+        compressed = zlib.compress(encoded, COMPRESSION_LEVEL)
+        cursor = connection.execute(
+            """
+            INSERT OR IGNORE INTO context_blobs (hash, data, raw_size, stored_size, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (digest, compressed, len(encoded), len(compressed), datetime.now().isoformat())
+        )
+        if cursor.rowcount:
+            self.stats["blobs_written"] += 1
+            self.stats["raw_bytes"] += len(encoded)
+            self.stats["stored_bytes"] += len(compressed)
+        else:
+            self.stats["blobs_deduplicated"] += 1
+        self._remember(digest, encoded)
+        return digest
+
+    # Reading
+
+    def unpack(self, stored: Optional[str]) -> Dict[str, Any]:
+        """
+        Rehydrate a stored snapshot (manifest or legacy plain JSON).
+
+        Args:
+            stored: Value of the snapshot column
+
+        Returns:
+            The original document ({} for empty or unreadable values)
+        """
+        if not stored:
+            return {}
+        try:
+            document = json.loads(stored)
+        except (json.JSONDecodeError, TypeError):
+            return {}
+        if not isinstance(document, dict) or MANIFEST_KEY not in document:
+            return document
+
+        result = dict(document.get("inline", {}))
+        refs = document.get("blobs", {})
+        payloads = self._get_many(refs.values())
+        for key, digest in refs.items():
+            payload = payloads.get(digest)
+            if payload is None:
+                logger.warning(f"Missing context blob {digest} for snapshot key '{key}'")
+                continue
+            result[key] = json.loads(payload)
+        return result
+
+    def unpack_value(self, stored: Optional[str], default: Any = None) -> Any:
+        """Rehydrate a value written by pack_value (or legacy plain JSON)."""
+        if not stored:
+            return default
+        if stored.startswith(BLOB_REF_PREFIX):
+            payload = self._get_many([stored[len(BLOB_REF_PREFIX):]]).get(stored[len(BLOB_REF_PREFIX):])
+            return json.loads(payload) if payload is not None else default
+        try:
+            return json.loads(stored)
+        except json.JSONDecodeError:
+            return default
+
+    def _get_many(self, digests: Iterable[str]) -> Dict[str, bytes]:
+        """Fetch decompressed payloads, from memory or with chunked IN (...) queries."""
+        payloads, missing = {}, []
+        with self._lock:
+            for digest in dict.fromkeys(digests):
+                if digest in self._cache:
+                    self._cache.move_to_end(digest)
+                    payloads[digest] = self._cache[digest]
+                else:
+                    missing.append(digest)
+
+        for start in range(0, len(missing), SQLITE_PARAMETER_CHUNK):
+            chunk = missing[start:start + SQLITE_PARAMETER_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            rows = self.db.execute_query(
+                f"SELECT hash, data FROM context_blobs WHERE hash IN ({placeholders})", tuple(chunk)
+            )
+            for row in rows:
+                payload = zlib.decompress(row["data"])
+                payloads[row["hash"]] = payload
+                self._remember(row["hash"], payload)
+        return payloads
+
+    def _remember(self, digest: str, payload: bytes):
+        with self._lock:
+            self._cache[digest] = payload
+            self._cache.move_to_end(digest)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # Maintenance
+
+    @staticmethod
+    def referenced_hashes(stored_values: Iterable[Optional[str]]) -> Set[str]:
+        """Blob hashes referenced by stored manifests and blob references."""
+        hashes: Set[str] = set()
+        for stored in stored_values:
+            if not stored:
+                continue
+            if stored.startswith(BLOB_REF_PREFIX):
+                hashes.add(stored[len(BLOB_REF_PREFIX):])
+            elif MANIFEST_KEY in stored:
+                try:
+                    hashes.update(json.loads(stored).get("blobs", {}).values())
+                except (json.JSONDecodeError, AttributeError):
+                    continue
+        return hashes
+
+    def collect_garbage(self) -> int:
+        """
+        Delete blobs no longer referenced by any snapshot or session context.
+
+        Returns:
+            Number of blobs deleted
+        """
+        stored = [row[0] for row in self.db.execute_query("SELECT context_snapshot FROM task_queue")]
+        stored += [row[0] for row in self.db.execute_query("SELECT files_accessed FROM session_context")]
+        referenced = self.referenced_hashes(stored)
+
+        existing = [row[0] for row in self.db.execute_query("SELECT hash FROM context_blobs")]
+        orphaned = [digest for digest in existing if digest not in referenced]
+        if orphaned:
+            with self.db.transaction() as connection:
+                connection.executemany("DELETE FROM context_blobs WHERE hash = ?",
+                                       [(digest,) for digest in orphaned])
+            with self._lock:
+                for digest in orphaned:
+                    self._cache.pop(digest, None)
+        return len(orphaned)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write counters and on-disk totals."""
+        totals = self.db.execute_query(
+            "SELECT COUNT(*) AS blobs, COALESCE(SUM(raw_size), 0) AS raw, "
+            "COALESCE(SUM(stored_size), 0) AS stored FROM context_blobs"
+        )[0]
+        return {
+            **self.stats,
+            "blobs": totals["blobs"],
+            "total_raw_bytes": totals["raw"],
+            "total_stored_bytes": totals["stored"],
+            "compression_ratio": round(totals["raw"] / totals["stored"], 2) if totals["stored"] else 0.0
+        }
@@ -8,6 +8,19 @@ from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime
 from .db_manager import DatabaseManager
 
+# Theme graph cache invalidation (optional; flat script imports of the database package have no parent package)
+try:
+    from ..utils.theme_graph import invalidate_theme_graphs
+except ImportError:
+    try:
+        from utils.theme_graph import invalidate_theme_graphs
+    except ImportError:
+        def invalidate_theme_graphs():
+            """No theme graph cache is loaded, so there is nothing to invalidate."""
+
+# Stay below SQLite's default bound-parameter limit
+SQLITE_PARAMETER_CHUNK = 900
+
 class ThemeFlowQueries:
     """
     Enhanced theme-flow relationship management with comprehensive database operations.
@@ -50,6 +63,7 @@ class ThemeFlowQueries:
                 """,
                 (theme_name, flow_id, f"{flow_id}.json", relevance_order)
             )
+            invalidate_theme_graphs()
             return True
         except Exception as e:
             self.db.logger.error(f"Error adding theme-flow relationship: {e}")
@@ -133,6 +147,7 @@ class ThemeFlowQueries:
                         (theme_name, flow_id, flow_file, order)
                     )
             
+            invalidate_theme_graphs()
             return True
             
         except Exception as e:
@@ -160,6 +175,7 @@ class ThemeFlowQueries:
                 """,
                 (theme_name, flow_id, flow_file, relevance_order)
             )
+            invalidate_theme_graphs()
             return True
             
         except Exception as e:
@@ -182,6 +198,7 @@ class ThemeFlowQueries:
                 "DELETE FROM theme_flows WHERE theme_name = ? AND flow_id = ?",
                 (theme_name, flow_id)
             )
+            invalidate_theme_graphs()
             return affected_rows > 0
             
         except Exception as e:
@@ -562,21 +579,44 @@ class ThemeFlowQueries:
         result = self.db.execute_query(query, (flow_id,))
         
         if result:
-            row = result[0]
-            return {
-                "flow_id": row["flow_id"],
-                "flow_file": row["flow_file"],
-                "name": row["name"],
-                "status": row["status"],
-                "completion_percentage": row["completion_percentage"],
-                "primary_themes": json.loads(row["primary_themes"]) if row["primary_themes"] else [],
-                "secondary_themes": json.loads(row["secondary_themes"]) if row["secondary_themes"] else [],
-                "created_at": row["created_at"],
-                "last_updated": row["last_updated"],
-                "completed_at": row["completed_at"]
-            }
+            return self._flow_status_from_row(result[0])
         return None
     
+    def get_flow_statuses_bulk(self, flow_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the status of many flows with chunked IN (...) queries.
+        
+        Args:
+            flow_ids: Flow IDs to look up
+            
+        Returns:
+            Dictionary mapping flow IDs to status dictionaries (missing flows omitted)
+        """
+        statuses = {}
+        flow_ids = list(dict.fromkeys(flow_ids))
+        for start in range(0, len(flow_ids), SQLITE_PARAMETER_CHUNK):
+            chunk = flow_ids[start:start + SQLITE_PARAMETER_CHUNK]
+            placeholders = ",".join("?" for _ in chunk)
+            query = f"SELECT * FROM flow_status WHERE flow_id IN ({placeholders})"
+            for row in self.db.execute_query(query, tuple(chunk)):
+                statuses[row["flow_id"]] = self._flow_status_from_row(row)
+        return statuses
+    
+    @staticmethod
+    def _flow_status_from_row(row) -> Dict[str, Any]:
+        return {
+            "flow_id": row["flow_id"],
+            "flow_file": row["flow_file"],
+            "name": row["name"],
+            "status": row["status"],
+            "completion_percentage": row["completion_percentage"],
+            "primary_themes": json.loads(row["primary_themes"]) if row["primary_themes"] else [],
+            "secondary_themes": json.loads(row["secondary_themes"]) if row["secondary_themes"] else [],
+            "created_at": row["created_at"],
+            "last_updated": row["last_updated"],
+            "completed_at": row["completed_at"]
+        }
+    
     def get_flows_by_status(self, status: str) -> List[Dict[str, Any]]:
         """Get flows by status."""
         query = """
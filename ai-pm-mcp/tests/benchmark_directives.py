@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Directive execution benchmark for the AI Project Manager MCP Server.
+
+Drives DirectiveProcessor for every directive key / trigger combination that
+ActionDeterminer handles, at each escalation tier:
+
+- tier 1: execute_directive() with compressed directives
+- tier 2: escalate_directive() (JSON directive files)
+- tier 3: escalate_to_markdown() (Markdown directive files)
+
+Two modes are measured:
+
+- stub: every action is answered by a no-op executor, isolating directive
+  processing overhead
+- database: real action executors against a temporary project database, with
+  database hooks routed back into the processor like the server does
+
+Per case it reports latency (min/median/p95/mean), tracemalloc allocations
+(net and peak bytes) and, for tier 1, the number of cascaded database hooks.
+Escalations run outside the cascade guard, so hooks they trigger are not
+counted as cascades of the measured directive and tiers 2/3 report no hook
+counts. Results are emitted as JSON keyed by
+"mode:tier:directive:trigger" so runs from different commits can be compared.
+Cases whose directive fails outright at a tier (e.g. no escalation files for
+that directive) are listed under "unavailable" with their error instead of
+being timed.
+
+Usage:
+    python tests/benchmark_directives.py --output before.json
+    python tests/benchmark_directives.py --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+# Add the parent directory and deps to Python path for server imports
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(parent_dir / "deps"))
+
+# Dual import strategy for MCP server context vs script context
+try:
+    from ..core.directive_processor import create_directive_processor
+    from ..core.action_executor import create_action_executor
+    from ..database.db_manager import DatabaseManager
+except ImportError:
+    try:
+        from core.directive_processor import create_directive_processor
+        from core.action_executor import create_action_executor
+        from database.db_manager import DatabaseManager
+    except ImportError as e:
+        print(f"❌ Import failed in both contexts: {e}")
+        sys.exit(1)
+
+
+# (directive_key, trigger, extra context) for every ActionDeterminer branch
+BENCHMARK_CASES = [
+    ("sessionManagement", "session_start", {"session_context": {"active_themes": ["core"]}}),
+    ("sessionManagement", "work_pause", {"pause_context": {"reason": "benchmark"}}),
+    ("sessionManagement", "conversation_to_action_transition", {"conversation_context": {"topic": "benchmark"}}),
+    ("fileOperations", "file_edit_completion", {"file_path": "src/example.py",
+                                                "changes_made": {"lines_changed": 5}}),
+    ("taskManagement", "task_completion", {"task_id": "TASK-BENCH-001",
+                                           "completion_result": {"status": "done"}}),
+    ("projectInitialization", "project_initialization", {"initialization_request": {"project_name": "bench"}}),
+    ("themeManagement", "theme_discovery", {"current_themes": []}),
+    ("systemInitialization", "system_start", {}),
+    ("databaseIntegration", "database_insert_complete", {"operation_type": "execute_insert"}),
+    ("loggingDocumentation", "log_event", {})
+]
+
+TIERS = {
+    1: "compressed",
+    2: "json",
+    3: "markdown"
+}
+
+
+class StubActionExecutor:
+    """Executor that accepts every action type without doing any work."""
+
+    def __init__(self, action_types: List[str]):
+        self.action_types = action_types
+
+    def get_supported_actions(self) -> List[str]:
+        return self.action_types
+
+    async def execute_action(self, action_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "success", "action_type": action_type, "stub": True}
+
+
+class BenchmarkHookServer:
+    """Routes database hooks back into the processor, mirroring MCPServer.on_core_operation_complete."""
+
+    def __init__(self):
+        self.directive_processor = None
+        self.hooks_fired = 0
+
+    async def on_core_operation_complete(self, context: Dict[str, Any], directive_key: str) -> Dict[str, Any]:
+        self.hooks_fired += 1
+        enhanced_context = {
+            **context,
+            "project_context": {},
+            "server_state": {"ready": True},
+            "timestamp": "now"
+        }
+        return await self.directive_processor.execute_directive(directive_key, enhanced_context)
+
+
+class DirectiveBenchmark:
+    """Benchmark runner for directive execution."""
+
+    def __init__(self, iterations: int = 20, warmup: int = 2, modes: Optional[List[str]] = None,
+                 tiers: Optional[List[int]] = None):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.modes = modes or ["stub", "database"]
+        self.tiers = tiers or sorted(TIERS)
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every case in every mode and tier."""
+        results = {}
+        unavailable = {}
+        skipped_modes = {}
+        for mode in self.modes:
+            with tempfile.TemporaryDirectory(prefix="aipm-bench-") as temp_dir:
+                try:
+                    processor, hook_server, db_manager = await self._build_processor(mode, Path(temp_dir))
+                except Exception as e:
+                    print(f"⚠️  Skipping {mode} mode: {e}")
+                    skipped_modes[mode] = str(e)
+                    continue
+                try:
+                    for tier in self.tiers:
+                        for directive_key, trigger, extra in BENCHMARK_CASES:
+                            case_id = f"{mode}:{TIERS[tier]}:{directive_key}:{trigger}"
+                            case = {"mode": mode, "tier": tier, "directive_key": directive_key, "trigger": trigger}
+                            error = await self._probe(processor, tier, directive_key, trigger, extra)
+                            if error:
+                                print(f"  {case_id} (unavailable: {error})")
+                                unavailable[case_id] = {**case, "error": error}
+                                continue
+                            print(f"  {case_id}")
+                            results[case_id] = await self._run_case(
+                                processor, hook_server, tier, directive_key, trigger, extra
+                            )
+                            results[case_id].update(case)
+                finally:
+                    if db_manager:
+                        db_manager.close()
+
+        return {
+            "benchmark": "directive_execution",
+            "created": datetime.now().isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "iterations": self.iterations,
+            "warmup": self.warmup,
+            "skipped_modes": skipped_modes,
+            "unavailable": unavailable,
+            "results": results
+        }
+
+    async def _build_processor(self, mode: str, project_path: Path):
+        """Create a processor wired for the given mode."""
+        hook_server = BenchmarkHookServer()
+        db_manager = None
+
+        if mode == "database":
+            db_manager = DatabaseManager(str(project_path), server_instance=hook_server)
+            await db_manager.initialize_database()
+            action_executor = create_action_executor({}, db_manager=db_manager)
+        else:
+            action_executor = create_action_executor({}, db_manager=None)
+            stub = StubActionExecutor(action_executor.get_available_actions())
+            action_executor.action_mapping = {action_type: stub for action_type in stub.get_supported_actions()}
+
+        processor = create_directive_processor(action_executor)
+        hook_server.directive_processor = processor
+        return processor, hook_server, db_manager
+
+    async def _execute(self, processor, tier: int, directive_key: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one directive at the requested tier."""
+        if tier == 1:
+            return await processor.execute_directive(directive_key, context)
+        if tier == 2:
+            return await processor.escalate_directive(directive_key, context, "benchmark")
+        return await processor.escalate_to_markdown(directive_key, context, "benchmark")
+
+    async def _probe(self, processor, tier: int, directive_key: str, trigger: str,
+                     extra: Dict[str, Any]) -> Optional[str]:
+        """Run a case once; returns its error when the directive cannot run at this tier."""
+        processor.reset_cascade_guard()
+        result = await self._execute(processor, tier, directive_key,
+                                     {"trigger": trigger, "project_path": "", "benchmark_iteration": 0, **extra})
+        return result.get("error") or None
+
+    async def _run_case(self, processor, hook_server: BenchmarkHookServer, tier: int,
+                        directive_key: str, trigger: str, extra: Dict[str, Any]) -> Dict[str, Any]:
+        """Measure latency, allocations and (tier 1 only) cascades for one case."""
+        def make_context(iteration: int) -> Dict[str, Any]:
+            # A distinct iteration id keeps the cascade guard from treating
+            # repeated runs as duplicates of each other
+            return {"trigger": trigger, "project_path": "", "benchmark_iteration": iteration, **extra}
+
+        for i in range(self.warmup):
+            processor.reset_cascade_guard()
+            await self._execute(processor, tier, directive_key, make_context(-1 - i))
+
+        latencies_ns = []
+        hooks, cascaded, suppressed, actions, errors = [], [], [], 0, 0
+        for i in range(self.iterations):
+            processor.reset_cascade_guard()
+            hook_server.hooks_fired = 0
+            start = time.perf_counter_ns()
+            result = await self._execute(processor, tier, directive_key, make_context(i))
+            latencies_ns.append(time.perf_counter_ns() - start)
+
+            stats = processor.get_cascade_stats()
+            hooks.append(hook_server.hooks_fired)
+            cascaded.append(max(stats["executed"] - 1, 0))
+            suppressed.append(stats["suppressed_total"])
+            actions = len(result.get("actions_taken", result.get("actions", [])))
+            errors += 1 if result.get("error") else 0
+
+        # Allocations are measured in a separate pass so tracing overhead does
+        # not distort the latency numbers
+        processor.reset_cascade_guard()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            await self._execute(processor, tier, directive_key, make_context(self.iterations))
+            after, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        latencies_ms = sorted(ns / 1_000_000 for ns in latencies_ns)
+        p95_index = min(len(latencies_ms) - 1, int(round(0.95 * (len(latencies_ms) - 1))))
+        result = {
+            "latency_ms": {
+                "min": round(latencies_ms[0], 4),
+                "median": round(statistics.median(latencies_ms), 4),
+                "p95": round(latencies_ms[p95_index], 4),
+                "mean": round(statistics.mean(latencies_ms), 4)
+            },
+            "allocations": {
+                "net_bytes": after - before,
+                "peak_bytes": peak - before
+            },
+            "actions": actions,
+            "errors": errors
+        }
+        if tier == 1:
+            result["hooks"] = {
+                "fired_per_run": round(statistics.mean(hooks), 2),
+                "cascaded_directives_per_run": round(statistics.mean(cascaded), 2),
+                "suppressed_per_run": round(statistics.mean(suppressed), 2)
+            }
+        return result
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Compare two benchmark result files case by case.
+
+    Returns:
+        One entry per case present in both runs with median latency, peak
+        allocation and hook deltas (positive = current run is slower/larger;
+        hooks_change is None for escalation tiers)
+    """
+    comparison = []
+    for case_id, result in current.get("results", {}).items():
+        previous = baseline.get("results", {}).get(case_id)
+        if not previous:
+            continue
+        old_median = previous["latency_ms"]["median"]
+        old_hooks, new_hooks = previous.get("hooks"), result.get("hooks")
+        new_median = result["latency_ms"]["median"]
+        comparison.append({
+            "case": case_id,
+            "median_ms": [old_median, new_median],
+            "median_change_pct": round((new_median - old_median) / old_median * 100, 1) if old_median else None,
+            "peak_bytes_change": result["allocations"]["peak_bytes"] - previous["allocations"]["peak_bytes"],
+            "hooks_change": (round(new_hooks["fired_per_run"] - old_hooks["fired_per_run"], 2)
+                             if old_hooks and new_hooks else None)
+        })
+    return comparison
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit of the server tree, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=str(parent_dir),
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Parse arguments, run the benchmark and write/compare results."""
+    parser = argparse.ArgumentParser(description="Benchmark directive execution")
+    parser.add_argument("--iterations", type=int, default=20, help="Measured runs per case")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured runs per case")
+    parser.add_argument("--mode", choices=["stub", "database", "all"], default="all")
+    parser.add_argument("--tier", type=int, choices=sorted(TIERS), action="append",
+                        help="Escalation tier to run (repeatable, default: all)")
+    parser.add_argument("--output", type=Path, help="Write JSON results to this file")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON results to compare against")
+    args = parser.parse_args(argv)
+
+    # Directive modules log every step at INFO; keep benchmark output readable
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    modes = ["stub", "database"] if args.mode == "all" else [args.mode]
+    print("⏱️  Benchmarking directive execution...")
+    benchmark = DirectiveBenchmark(iterations=args.iterations, warmup=args.warmup, modes=modes, tiers=args.tier)
+    results = await benchmark.run()
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+        print(f"✅ Results written to {args.output}")
+
+    if args.compare:
+        results["comparison"] = compare_results(json.loads(args.compare.read_text()), results)
+
+    return results
+
+
+if __name__ == "__main__":
+    try:
+        results = asyncio.run(main())
+
+        print("\nJSON Results:")
+        print(json.dumps(results.get("comparison", results), indent=2))
+        sys.exit(0)
+
+    except KeyboardInterrupt:
+        print("\nBenchmark interrupted by user")
+        sys.exit(1)
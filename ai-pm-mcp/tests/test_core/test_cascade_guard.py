@@ -0,0 +1,122 @@
+"""
+Tests for directive cascade protection (depth limit, cycles, deduplication).
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import core.directive_modules.cascade_guard as cascade_guard
+from core.directive_modules.cascade_guard import CascadeGuard
+from core.directive_processor import DirectiveProcessor
+
+
+DB_HOOK = {"trigger": "database_operation", "operation_type": "update", "query_type": "UPDATE",
+           "rows_affected": 1, "success": True, "project_path": "/p"}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cascade_guard.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_top_level_executions_are_never_deduplicated():
+    guard = CascadeGuard()
+    # Two different single-row updates produce identical hook payloads
+    assert guard.check("databaseIntegration", dict(DB_HOOK)) == (True, "allowed")
+    assert guard.check("databaseIntegration", dict(DB_HOOK)) == (True, "allowed")
+    assert guard.get_stats()["suppressed_duplicate"] == 0
+    assert guard.get_stats()["tracked_hashes"] == 0
+
+
+def test_depth_limit():
+    guard = CascadeGuard(max_depth=2, dedup_window_seconds=0)
+    with guard.track("a", {"trigger": "t1"}):
+        with guard.track("b", {"trigger": "t2"}):
+            assert guard.current_depth() == 2
+            allowed, reason = guard.check("c", {"trigger": "t3"})
+            assert not allowed and "depth limit 2" in reason
+    assert guard.current_depth() == 0
+    stats = guard.get_stats()
+    assert (stats["executed"], stats["suppressed_depth"], stats["max_depth_seen"]) == (2, 1, 2)
+
+
+def test_cycle_detection():
+    guard = CascadeGuard(dedup_window_seconds=0)
+    with guard.track("a", {"trigger": "t"}):
+        allowed, reason = guard.check("a", {"trigger": "t"})
+        assert not allowed and "cycle" in reason
+        # Same directive from a different trigger is not a cycle
+        assert guard.check("a", {"trigger": "other"})[0]
+    assert guard.get_stats()["suppressed_cycle"] == 1
+
+
+def test_nested_duplicates_within_window(clock):
+    guard = CascadeGuard(dedup_window_seconds=2.0)
+    with guard.track("parent", {"trigger": "p"}):
+        assert guard.check("child", {**DB_HOOK, "timestamp": 1})[0]
+        # Volatile keys do not make an execution distinct
+        allowed, reason = guard.check("child", {**DB_HOOK, "timestamp": 2})
+        assert not allowed and "Duplicate" in reason
+        assert guard.check("child", {**DB_HOOK, "rows_affected": 2})[0]
+
+        clock[0] += 2.5
+        assert guard.check("child", dict(DB_HOOK))[0]
+    assert guard.get_stats()["suppressed_duplicate"] == 1
+
+
+def test_tracked_hashes_are_bounded(clock):
+    guard = CascadeGuard(max_tracked=3)
+    with guard.track("parent", {"trigger": "p"}):
+        for i in range(5):
+            assert guard.check("child", {"trigger": "t", "n": i})[0]
+        assert guard.get_stats()["tracked_hashes"] == 3
+        # The oldest hash was evicted, so it runs again
+        assert guard.check("child", {"trigger": "t", "n": 0})[0]
+
+
+def test_concurrent_tasks_have_separate_chains():
+    guard = CascadeGuard(max_depth=1)
+
+    async def hook(key):
+        with guard.track(key, {"trigger": "t"}):
+            await asyncio.sleep(0)
+            return guard.current_depth()
+
+    async def run():
+        return await asyncio.gather(hook("a"), hook("b"))
+
+    assert asyncio.run(run()) == [1, 1]
+
+
+def test_reset_clears_state(clock):
+    guard = CascadeGuard()
+    with guard.track("parent", {"trigger": "p"}):
+        guard.check("child", dict(DB_HOOK))
+        assert not guard.check("child", dict(DB_HOOK))[0]
+        guard.reset()
+        assert guard.check("child", dict(DB_HOOK))[0]
+    assert guard.get_stats()["suppressed_total"] == 0
+
+
+def test_processor_reset_cascade_guard():
+    processor = DirectiveProcessor()
+    context = {"trigger": "test", "project_path": ""}
+
+    async def run():
+        await processor.execute_directive("projectInitialization", context)
+        await processor.execute_directive("projectInitialization", context)
+
+    asyncio.run(run())
+    stats = processor.get_cascade_stats()
+    assert (stats["executed"], stats["suppressed_total"]) == (2, 0)
+    processor.reset_cascade_guard()
+    assert processor.get_cascade_stats()["executed"] == 0
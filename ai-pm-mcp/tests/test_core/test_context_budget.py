@@ -0,0 +1,124 @@
+"""
+Tests for context budget selection and relevance scoring.
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from itertools import combinations
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import core.scopeEngine.context_budget as context_budget
+from core.scopeEngine.context_budget import BudgetItem, ContextBudget, select_within_budget
+
+
+def make_items(rng, count, max_size=40):
+    return [BudgetItem("file", f"f{i}", rng.randint(1, max_size), round(rng.uniform(0.1, 2.0), 3))
+            for i in range(count)]
+
+
+def brute_force_best(items, capacity):
+    best = 0.0
+    for size in range(len(items) + 1):
+        for subset in combinations(items, size):
+            if sum(item.size_bytes for item in subset) <= capacity:
+                best = max(best, sum(item.score for item in subset))
+    return best
+
+
+def total(items, attribute):
+    return sum(getattr(item, attribute) for item in items)
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_exact_selection_matches_brute_force(seed):
+    rng = random.Random(seed)
+    items = make_items(rng, rng.randint(2, 10))
+    smallest = min(item.size_bytes for item in items)
+    capacity = rng.randint(smallest, total(items, "size_bytes") - 1)
+
+    selected, dropped, method = select_within_budget(items, capacity)
+    assert method == "exact"
+    assert total(selected, "size_bytes") <= capacity
+    assert total(selected, "score") == pytest.approx(brute_force_best(items, capacity))
+    assert sorted(map(id, selected + dropped)) == sorted(map(id, items))
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_greedy_fallback_is_feasible_and_within_half_of_optimum(seed, monkeypatch):
+    monkeypatch.setattr(context_budget, "EXACT_SELECTION_LIMIT", 0)
+    rng = random.Random(seed)
+    items = make_items(rng, rng.randint(2, 10))
+    capacity = max(1, total(items, "size_bytes") // 2)
+
+    selected, dropped, method = select_within_budget(items, capacity)
+    assert method == "greedy"
+    assert total(selected, "size_bytes") <= capacity
+    assert total(selected, "score") >= brute_force_best(items, capacity) / 2 - 1e-9
+
+
+def test_greedy_prefers_best_single_item_over_dense_small_ones(monkeypatch):
+    monkeypatch.setattr(context_budget, "EXACT_SELECTION_LIMIT", 0)
+    small = BudgetItem("file", "small", 1, 0.2)
+    large = BudgetItem("file", "large", 10, 1.0)
+    selected, dropped, method = select_within_budget([small, large], 10)
+    assert (selected, dropped, method) == ([large], [small], "greedy")
+
+
+def test_everything_fits():
+    items = [BudgetItem("file", "a", 5, 1.0), BudgetItem("readme", "b", 5, 0.1)]
+    assert select_within_budget(items, 10) == (items, [], "all")
+
+
+def test_oversized_items_are_dropped_and_zero_size_items_kept():
+    empty = BudgetItem("file", "empty", 0, 0.01)
+    huge = BudgetItem("file", "huge", 1000, 100.0)
+    fits = BudgetItem("file", "fits", 8, 1.0)
+    other = BudgetItem("file", "other", 8, 0.5)
+
+    selected, dropped, method = select_within_budget([huge, empty, fits, other], 10)
+    assert method == "exact"
+    assert selected == [empty, fits]
+    assert dropped == [other, huge]
+
+    # Only oversized and empty items: nothing to choose between
+    selected, dropped, _ = select_within_budget([huge, empty], 10)
+    assert (selected, dropped) == ([empty], [huge])
+
+
+def test_bucketed_exact_selection_stays_within_capacity():
+    rng = random.Random(7)
+    items = make_items(rng, 30, max_size=50_000)
+    capacity = total(items, "size_bytes") // 3
+    selected, _, method = select_within_budget(items, capacity)
+    assert method == "exact"
+    assert total(selected, "size_bytes") <= capacity
+
+
+def test_recency_scores_treat_database_timestamps_as_utc():
+    now = datetime.now(timezone.utc)
+    rows = [
+        # SQLite CURRENT_TIMESTAMP format: naive UTC
+        {"file_path": "now.py", "timestamp": now.strftime("%Y-%m-%d %H:%M:%S")},
+        {"file_path": "week.py", "timestamp": (now - timedelta(days=7)).strftime("%Y-%m-%d %H:%M:%S")},
+        {"file_path": "offset.py", "timestamp": (now - timedelta(days=7)).astimezone(
+            timezone(timedelta(hours=-5))).isoformat()},
+        {"file_path": "zulu.py", "timestamp": now.strftime("%Y-%m-%dT%H:%M:%SZ")},
+        {"file_path": "bad.py", "timestamp": None},
+    ]
+    queries = SimpleNamespace(get_file_modifications=lambda days: rows)
+    budget = ContextBudget(SimpleNamespace(file_metadata_queries=queries))
+
+    scores = budget._recency_scores()
+    assert scores["now.py"] == pytest.approx(1.0, abs=1e-3)
+    assert scores["zulu.py"] == pytest.approx(1.0, abs=1e-3)
+    assert scores["week.py"] == pytest.approx(0.5, abs=1e-3)
+    assert scores["offset.py"] == pytest.approx(0.5, abs=1e-3)
+    assert "bad.py" not in scores
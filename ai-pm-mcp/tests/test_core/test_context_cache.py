@@ -0,0 +1,170 @@
+"""
+Tests for the shared ContextResult cache: keys, LRU eviction and stamps.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import core.scopeEngine.context_cache as context_cache_module
+from core.scopeEngine.compressed_context import ContextMode, ContextResult
+from core.scopeEngine.context_cache import ContextResultCache, estimate_context_bytes
+
+
+class FakeDB:
+    def __init__(self):
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute("CREATE TABLE t (value INTEGER)")
+
+    def connect(self):
+        return self.connection
+
+    def write(self):
+        self.connection.execute("INSERT INTO t VALUES (1)")
+        self.connection.commit()
+
+
+def make_context(theme="auth", files=(), readmes=None):
+    return ContextResult(
+        mode=ContextMode.THEME_FOCUSED, primary_theme=theme, loaded_themes=[theme],
+        files=list(files), paths=["src"], readmes=dict(readmes or {}), shared_files={},
+        recommendations=[], memory_estimate=0
+    )
+
+
+def touch(path, content):
+    path.write_text(content)
+    # Force a distinct mtime even on coarse-grained filesystems
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def themes_dir(tmp_path):
+    themes = tmp_path / "Themes"
+    themes.mkdir()
+    (themes / "auth.json").write_text(json.dumps({"files": []}))
+    (themes / "themes.json").write_text("{}")
+    return themes
+
+
+def key_for(cache, tmp_path, themes_dir, db=None, **request):
+    return cache.make_key("base", tmp_path, themes_dir, {"primary_theme": "auth", **request}, db)
+
+
+def test_key_changes_with_request_themes_and_database(tmp_path, themes_dir):
+    cache = ContextResultCache()
+    db = FakeDB()
+    key = key_for(cache, tmp_path, themes_dir, db)
+    assert key == key_for(cache, tmp_path, themes_dir, db)
+    assert key != key_for(cache, tmp_path, themes_dir, db, context_mode="project-wide")
+
+    touch(themes_dir / "auth.json", json.dumps({"files": ["a.py"]}))
+    theme_key = key_for(cache, tmp_path, themes_dir, db)
+    assert theme_key != key
+
+    touch(themes_dir / "themes.json", '{"auth": {}}')
+    index_key = key_for(cache, tmp_path, themes_dir, db)
+    assert index_key != theme_key
+
+    (themes_dir / "billing.json").write_text("{}")
+    added_key = key_for(cache, tmp_path, themes_dir, db)
+    assert added_key != index_key
+
+    db.write()
+    assert key_for(cache, tmp_path, themes_dir, db) != added_key
+
+
+def test_untracked_writes_do_not_change_key(tmp_path, themes_dir):
+    cache = ContextResultCache()
+    db = FakeDB()
+    key = key_for(cache, tmp_path, themes_dir, db)
+    with cache.untracked_writes(db):
+        db.write()
+        db.write()
+    assert key_for(cache, tmp_path, themes_dir, db) == key
+
+    db.write()
+    assert key_for(cache, tmp_path, themes_dir, db) != key
+
+
+def test_results_are_private_copies():
+    cache = ContextResultCache()
+    context = make_context(files=["a.py"])
+    token = cache.put("k", context)
+    context.files.append("mutated.py")
+
+    cached, cached_token = cache.lookup("k")
+    assert cached.files == ["a.py"] and cached_token == token
+    cached.files.append("again.py")
+    assert cache.get("k").files == ["a.py"]
+    assert cache.get("missing") is None
+    assert cache.get_stats()["hits"] == 2 and cache.get_stats()["misses"] == 1
+
+
+def test_lru_eviction_by_size():
+    size = estimate_context_bytes(make_context(theme="a", files=["x" * 100]))
+    cache = ContextResultCache(max_bytes=size * 2)
+    for name in ("a", "b"):
+        cache.put(name, make_context(theme=name, files=["x" * 100]))
+    cache.get("a")  # a becomes most recently used
+    cache.put("c", make_context(theme="c", files=["x" * 100]))
+
+    assert "a" in cache and "c" in cache and "b" not in cache
+    stats = cache.get_stats()
+    assert stats["evictions"] == 1 and stats["bytes"] == size * 2
+
+    # A result larger than the whole budget is not cached and evicts nothing
+    assert cache.put("huge", make_context(files=["x" * (size * 3)])) is None
+    assert cache.get_stats()["entries"] == 2
+
+
+def test_contains_does_not_count():
+    cache = ContextResultCache()
+    cache.put("k", make_context())
+    assert "k" in cache and "other" not in cache
+    stats = cache.get_stats()
+    assert stats["hits"] == stats["misses"] == 0
+
+
+def test_entries_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(context_cache_module.time, "monotonic", lambda: now[0])
+    cache = ContextResultCache(max_age_seconds=10)
+    cache.put("k", make_context())
+    now[0] += 5
+    assert cache.get("k") is not None
+    now[0] += 6
+    assert cache.get("k") is None
+    assert cache.get_stats()["expired"] == 1
+
+
+def test_watched_readme_edit_create_and_delete_invalidate(tmp_path):
+    readme = tmp_path / "README.md"
+    other = tmp_path / "readme.txt"
+    readme.write_text("# Project")
+    cache = ContextResultCache(max_age_seconds=0)
+
+    cache.put("k", make_context(readmes={".": "# Project"}), [readme, other])
+    assert cache.get("k") is not None
+
+    touch(readme, "# Project, edited")
+    assert cache.get("k") is None
+    assert cache.get_stats()["stale"] == 1 and "k" not in cache
+
+    cache.put("k", make_context(), [readme, other])
+    other.write_text("new readme")
+    assert cache.get("k") is None
+
+    cache.put("k", make_context(), [readme, other])
+    readme.unlink()
+    assert cache.get("k") is None
+    assert cache.get_stats()["stale"] == 3
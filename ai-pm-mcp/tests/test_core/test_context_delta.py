@@ -0,0 +1,103 @@
+"""
+Tests for per-session context versions and deltas.
+"""
+
+import sys
+from pathlib import Path
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from core.scopeEngine.compressed_context import ContextMode, ContextResult
+from core.scopeEngine.context_delta import ContextDeltaTracker, snapshot_context
+
+
+def make_context(files=None, paths=("src",), flows=("login",), readmes=None,
+                 themes=("auth", "users"), mode=ContextMode.THEME_FOCUSED, primary="auth"):
+    return ContextResult(
+        mode=mode, primary_theme=primary, loaded_themes=list(themes),
+        files=list(files if files is not None else [f"src/f{i}.py" for i in range(10)]),
+        paths=list(paths), readmes=dict(readmes or {"src/README.md": "Source"}),
+        shared_files={}, recommendations=[], memory_estimate=0, flows=list(flows)
+    )
+
+
+def test_version_is_content_derived():
+    first, second = make_context(), make_context()
+    assert snapshot_context(first).version == snapshot_context(second).version
+    # Order of files does not matter, README content does
+    assert snapshot_context(make_context(files=reversed(first.files))).version == snapshot_context(first).version
+    assert snapshot_context(make_context(readmes={"src/README.md": "Changed"})).version != \
+        snapshot_context(first).version
+
+
+def test_delta_against_previous_version():
+    tracker = ContextDeltaTracker()
+    base = make_context()
+    assert tracker.record("s1", base) is None
+    assert base.version and base.delta is None
+
+    files = base.files[1:] + ["src/new.py"]
+    current = make_context(files=files, flows=("login", "signup"),
+                           readmes={"src/README.md": "Updated", "docs/README.md": "Docs"})
+    delta = tracker.record("s1", current, since_version=base.version)
+
+    assert delta is not None and not delta.unchanged
+    assert (delta.base_version, delta.version) == (base.version, current.version)
+    assert delta.added_files == ["src/new.py"] and delta.removed_files == ["src/f0.py"]
+    assert delta.added_flows == ["signup"] and delta.removed_flows == []
+    assert delta.changed_readmes == {"src/README.md": "Updated", "docs/README.md": "Docs"}
+    assert current.delta == delta.to_dict()
+    assert "added_paths" not in current.delta
+    assert tracker.get_stats()["delta"] == 1
+
+
+def test_unchanged_context_and_input_key_short_circuit():
+    tracker = ContextDeltaTracker()
+    base = make_context()
+    tracker.record("s1", base, input_key="cache-entry-1")
+
+    # Same inputs: the context is not re-snapshotted at all
+    stale_looking = make_context(files=["other.py"])
+    delta = tracker.record("s1", stale_looking, since_version=base.version, input_key="cache-entry-1")
+    assert delta.unchanged and stale_looking.version == base.version
+
+    # Different inputs with identical content
+    same = make_context()
+    delta = tracker.record("s1", same, since_version=base.version, input_key="cache-entry-2")
+    assert delta.unchanged and same.delta["unchanged"] and delta.change_count == 0
+    assert tracker.get_stats()["unchanged"] == 2
+
+
+def test_large_delta_and_mode_change_fall_back_to_full_context():
+    tracker = ContextDeltaTracker(max_delta_ratio=0.5)
+    base = make_context()
+    tracker.record("s1", base)
+
+    replaced = make_context(files=[f"lib/g{i}.py" for i in range(10)])
+    assert tracker.record("s1", replaced, since_version=base.version) is None
+    assert replaced.delta is None and replaced.version != base.version
+
+    expanded = make_context(mode=ContextMode.THEME_EXPANDED)
+    assert tracker.record("s1", expanded, since_version=base.version) is None
+    assert tracker.get_stats()["fallback_large"] == 2
+
+
+def test_unknown_and_evicted_versions_fall_back_to_full_context():
+    tracker = ContextDeltaTracker(max_sessions=1, versions_per_session=2)
+    contexts = [make_context(files=[f"src/f{i}.py" for i in range(n, n + 10)]) for n in range(3)]
+    for context in contexts:
+        tracker.record("s1", context)
+
+    # Oldest version was evicted from the session
+    assert tracker.record("s1", make_context(), since_version=contexts[0].version) is None
+    # Another session never saw this version, and evicts s1
+    assert tracker.record("s2", make_context(), since_version=contexts[2].version) is None
+    assert tracker.record("s1", make_context(), since_version=contexts[2].version) is None
+
+    stats = tracker.get_stats()
+    assert stats["fallback_unknown"] == 3 and stats["sessions"] == 1
+
+    tracker.forget("s1")
+    assert tracker.get_stats()["sessions"] == 0
@@ -0,0 +1,237 @@
+"""
+Tests for context prefetch prediction, budgets, cancellation and scoring.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from core.scopeEngine.context_prefetch import ContextPrefetcher
+from utils.project_paths import get_themes_path
+
+
+class FlowQueries:
+    def __init__(self, flows, statuses):
+        self.flows = flows
+        self.statuses = statuses
+
+    def get_flows_for_theme(self, theme):
+        return [{"flow_id": flow_id} for flow_id in self.flows.get(theme, [])]
+
+    def get_flow_statuses_bulk(self, flow_ids):
+        return {flow_id: self.statuses[flow_id] for flow_id in flow_ids if flow_id in self.statuses}
+
+    def get_flow_theme_summary(self):
+        return []
+
+
+class SessionQueries:
+    def __init__(self, loaded_themes, active_themes):
+        self.loaded_themes = loaded_themes
+        self.active_themes = active_themes
+
+    def get_latest_session(self, project_path):
+        return {"session_id": "s1", "active_themes": self.active_themes}
+
+    def get_session_context(self, session_id):
+        return {"loaded_themes": self.loaded_themes}
+
+
+class ContextLoading:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.warmed = []
+
+    async def warm_context(self, project_path, theme, context_mode):
+        await asyncio.sleep(self.delay)
+        self.warmed.append((theme, context_mode))
+        return True
+
+
+def write_theme(themes_dir, name, **data):
+    themes_dir.mkdir(parents=True, exist_ok=True)
+    (themes_dir / f"{name}.json").write_text(json.dumps(data))
+
+
+@pytest.fixture
+def project(tmp_path):
+    themes_dir = get_themes_path(tmp_path)
+    write_theme(themes_dir, "auth", linkedThemes=["ui"], paths=["src/auth"])
+    for name in ("ui", "api", "billing", "db", "cache", "done"):
+        write_theme(themes_dir, name, paths=[f"src/{name}"])
+        (tmp_path / "src" / name).mkdir(parents=True)
+    return tmp_path, themes_dir
+
+
+def make_prefetcher(flow_queries=None, session_queries=None, preference=None, loading=None,
+                    max_predictions=3):
+    parent = SimpleNamespace(
+        config_manager=None,
+        theme_flow_queries=flow_queries,
+        session_queries=session_queries,
+        user_preference_queries=preference,
+        _context_loading=loading or ContextLoading()
+    )
+    return ContextPrefetcher(parent, max_predictions=max_predictions)
+
+
+def full_prefetcher(max_predictions):
+    flows = FlowQueries({"auth": ["f1", "f2"]}, {
+        "f1": {"completion_percentage": 100, "primary_themes": ["done"], "secondary_themes": []},
+        "f2": {"completion_percentage": 40, "primary_themes": ["auth", "api"], "secondary_themes": ["api"]},
+    })
+    sessions = SessionQueries(loaded_themes=["db", "billing"], active_themes=["cache"])
+    return make_prefetcher(flows, sessions, max_predictions=max_predictions)
+
+
+def test_predictions_follow_source_priority(project):
+    project_path, themes_dir = project
+    prefetcher = full_prefetcher(max_predictions=6)
+    # No running loop: transitions are recorded but nothing is scheduled
+    prefetcher.on_context_loaded(project_path, "auth")
+    prefetcher.on_context_loaded(project_path, "billing")
+    prefetcher.on_context_loaded(project_path, "auth")
+
+    # Observed transitions, then incomplete flows, then the latest session, then the graph
+    assert prefetcher.predict(project_path, themes_dir, "auth") == ["billing", "api", "db", "cache", "ui"]
+    assert full_prefetcher(2).predict(project_path, themes_dir, "auth") == ["api", "db"]
+
+
+def test_predictions_without_database_use_theme_graph(project):
+    project_path, themes_dir = project
+    assert make_prefetcher().predict(project_path, themes_dir, "auth") == ["ui"]
+    assert make_prefetcher().predict(project_path, themes_dir, "missing") == []
+
+
+def test_failing_source_is_skipped(project):
+    project_path, themes_dir = project
+
+    class BrokenSessions:
+        def get_latest_session(self, project_path):
+            raise RuntimeError("database locked")
+
+    prefetcher = make_prefetcher(session_queries=BrokenSessions())
+    assert prefetcher.predict(project_path, themes_dir, "auth") == ["ui"]
+
+
+def test_warm_stops_at_byte_budget(project):
+    project_path, themes_dir = project
+    prefetcher = make_prefetcher()
+    prefetcher.budget_ms = 10_000
+    prefetcher.budget_bytes = 1
+
+    prefetcher._warm(project_path, themes_dir, ["ui", "api"])
+    stats = prefetcher.get_stats()
+    assert stats["documents_warmed"] == 1
+    assert stats["directories_warmed"] == 0
+    assert stats["budget_exhausted"] == 1
+
+    prefetcher.budget_bytes = 8 * 1024 * 1024
+    prefetcher._warm(project_path, themes_dir, ["ui", "api"])
+    # ui is already cached, so only api is parsed; both directory listings are warmed
+    stats = prefetcher.get_stats()
+    assert (stats["documents_warmed"], stats["directories_warmed"]) == (2, 2)
+
+
+def test_warm_stops_at_time_budget_and_on_cancel(project):
+    project_path, themes_dir = project
+    prefetcher = make_prefetcher()
+    prefetcher.budget_ms = -1
+    prefetcher._warm(project_path, themes_dir, ["db"])
+    assert prefetcher.get_stats()["budget_exhausted"] == 1
+
+    prefetcher.budget_ms = 10_000
+    cancelled = threading.Event()
+    cancelled.set()
+    prefetcher._warm(project_path, themes_dir, ["db"], cancelled)
+    stats = prefetcher.get_stats()
+    assert stats["documents_warmed"] == 0
+    assert stats["budget_exhausted"] == 1
+
+
+def test_prefetch_assembles_top_prediction_and_scores_loads(project):
+    project_path, themes_dir = project
+    prefetcher = full_prefetcher(max_predictions=2)
+
+    async def load(theme):
+        prefetcher.on_context_loaded(project_path, theme, "theme-expanded")
+        await prefetcher._tasks[str(project_path)][0]
+
+    async def run():
+        await load("auth")
+        await load("db")  # predicted: hit
+        await load("ui")  # not predicted after db: miss
+
+    asyncio.run(run())
+    stats = prefetcher.get_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+    assert stats["runs"] == 3
+    assert prefetcher.parent._context_loading.warmed[0] == ("api", "theme-expanded")
+    assert stats["contexts_warmed"] == 3
+
+
+def test_learned_mode_preference_is_used_for_assembly(project):
+    project_path, themes_dir = project
+
+    class Preferences:
+        def get_context_recommendations(self, task_context):
+            return {"recommended_mode": "project-wide", "should_suggest": True}
+
+    prefetcher = make_prefetcher(preference=Preferences())
+
+    async def run():
+        prefetcher.on_context_loaded(project_path, "auth")
+        await prefetcher._tasks[str(project_path)][0]
+
+    asyncio.run(run())
+    assert prefetcher.parent._context_loading.warmed == [("ui", "project-wide")]
+
+
+def test_newer_load_cancels_running_prefetch(project):
+    project_path, themes_dir = project
+    loading = ContextLoading(delay=10)
+    prefetcher = make_prefetcher(loading=loading)
+
+    async def run():
+        prefetcher.on_context_loaded(project_path, "auth")
+        first_task, first_cancelled = prefetcher._tasks[str(project_path)]
+        # Wait until the first run is assembling its prediction
+        while not prefetcher.get_stats()["predictions"]:
+            await asyncio.sleep(0.01)
+        loading.delay = 0
+        prefetcher.on_context_loaded(project_path, "ui")
+        await prefetcher._tasks[str(project_path)][0]
+        return first_task, first_cancelled
+
+    first_task, first_cancelled = asyncio.run(run())
+    assert first_task.cancelled() and first_cancelled.is_set()
+    stats = prefetcher.get_stats()
+    assert stats["cancelled"] == 1
+    # Only the second run's assembly completed
+    assert loading.warmed == [("auth", "theme-focused")]
+
+
+def test_assembly_is_bounded_by_its_budget(project):
+    project_path, themes_dir = project
+    loading = ContextLoading(delay=10)
+    prefetcher = make_prefetcher(loading=loading)
+    prefetcher.assemble_budget_ms = 10
+
+    async def run():
+        prefetcher.on_context_loaded(project_path, "auth")
+        await prefetcher._tasks[str(project_path)][0]
+
+    asyncio.run(run())
+    stats = prefetcher.get_stats()
+    assert stats["contexts_warmed"] == 0
+    assert stats["budget_exhausted"] == 1
+    assert loading.warmed == []
@@ -0,0 +1,154 @@
+"""
+Tests for the opt-in directive profiler and escalation runs.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from core.directive_modules.profiler import DirectiveProfiler, profile_span
+from core.directive_processor import DirectiveProcessor
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.delenv("AI_PM_PROFILE_DIRECTIVES", raising=False)
+    return DirectiveProfiler(max_runs=3)
+
+
+def span_names(span):
+    return [span["name"], [span_names(child) for child in span["children"]]]
+
+
+def test_disabled_profiler_records_nothing(profiler):
+    async def run():
+        async with profiler.directive_run("blueprint", {"trigger": "t"}) as run_span:
+            assert run_span is None
+            async with profile_span("inner") as span:
+                assert span is None
+
+    asyncio.run(run())
+    assert profiler.get_runs() == []
+    assert profiler.get_summary()["runs_recorded"] == 0
+
+
+def test_profile_span_outside_run_is_noop():
+    async def run():
+        async with profile_span("orphan") as span:
+            return span
+
+    assert asyncio.run(run()) is None
+
+
+def test_spans_nest_and_nested_directives_attach_to_parent(profiler):
+    profiler.enable()
+
+    async def run():
+        async with profiler.directive_run("outer", {"trigger": "hook"}) as run_span:
+            async with profile_span("determine_actions", category="determination", tier=1) as span:
+                span.attributes["action_count"] = 2
+                async with profile_span("load"):
+                    pass
+            async with profile_span("execute_actions"):
+                async with profiler.directive_run("inner", {"trigger": "db"}) as inner:
+                    assert inner.attributes["nested"] is True
+            return run_span
+
+    run_span = asyncio.run(run())
+    runs = profiler.get_runs()
+    assert len(runs) == 1
+    assert span_names(runs[0]) == ["directive:outer", [
+        ["determine_actions", [["load", []]]],
+        ["execute_actions", [["directive:inner", []]]],
+    ]]
+    assert runs[0]["children"][0]["attributes"] == {"tier": 1, "action_count": 2}
+    assert run_span.end_ns >= run_span.start_ns
+
+
+def test_ring_buffer_summary_and_trace(profiler, tmp_path):
+    profiler.enable()
+
+    async def run(key):
+        async with profiler.directive_run(key, {}):
+            async with profile_span("step"):
+                pass
+
+    for key in ("a", "b", "c", "d"):
+        asyncio.run(run(key))
+
+    assert [run["name"] for run in profiler.get_runs()] == ["directive:b", "directive:c", "directive:d"]
+    assert [run["name"] for run in profiler.get_runs(limit=1)] == ["directive:d"]
+    summary = profiler.get_summary()
+    assert summary["spans"]["step"]["count"] == 3
+
+    trace = profiler.export_chrome_trace(tmp_path / "trace.json")
+    assert json.loads((tmp_path / "trace.json").read_text()) == trace
+    assert {event["tid"] for event in trace["traceEvents"]} == {1, 2, 3}
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in trace["traceEvents"])
+
+    profiler.disable()
+    asyncio.run(run("e"))
+    assert len(profiler.get_runs()) == 3
+    profiler.clear()
+    assert profiler.get_runs() == []
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.delenv("AI_PM_PROFILE_DIRECTIVES", raising=False)
+    processor = DirectiveProcessor()
+    processor.enable_profiling()
+    return processor
+
+
+def test_escalations_are_profiled_as_runs(processor):
+    context = {"trigger": "test", "project_path": ""}
+
+    async def run():
+        await processor.execute_directive("projectInitialization", context)
+        await processor.escalate_directive("projectInitialization", context, "test")
+        await processor.escalate_to_markdown("projectInitialization", context, "test")
+
+    asyncio.run(run())
+    tier1, tier2, tier3 = processor.get_profile_runs()
+    assert tier1["name"] == "directive:projectInitialization"
+    assert tier1["attributes"]["tier"] == 1
+
+    assert tier2["name"] == "escalation:projectInitialization:tier2"
+    assert tier2["attributes"]["tier"] == 2
+    assert "escalation:load_json" in [child["name"] for child in tier2["children"]]
+
+    assert tier3["attributes"]["tier"] == 3
+    assert "escalation:load_markdown" in [child["name"] for child in tier3["children"]]
+    assert "escalation:load_json" not in [child["name"] for child in tier3["children"]]
+
+
+def test_failed_escalation_records_error(processor):
+    async def run():
+        return await processor.escalate_to_markdown("noSuchDirective", {"trigger": "test"}, "test")
+
+    result = asyncio.run(run())
+    (run_span,) = processor.get_profile_runs()
+    assert run_span["attributes"]["escalation_level"] == result["escalation_level"]
+    assert run_span["attributes"]["error"] == result["error"]
+
+
+def test_escalation_nests_under_current_run(processor):
+    profiler = processor._get_profiler()
+
+    async def run():
+        async with profiler.directive_run("outer", {}):
+            await processor.escalate_to_markdown("projectInitialization", {"trigger": "test"}, "test")
+
+    asyncio.run(run())
+    (outer,) = processor.get_profile_runs()
+    (escalation,) = outer["children"]
+    assert escalation["name"] == "escalation:projectInitialization:tier3"
+    assert escalation["attributes"]["nested"] is True
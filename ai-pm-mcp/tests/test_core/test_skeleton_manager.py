@@ -0,0 +1,119 @@
+"""
+Tests for batched, atomic skeleton file materialization.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import core.directive_modules.skeleton_manager as skeleton_manager
+from core.directive_modules.skeleton_manager import (
+    SKELETON_DIRECTORIES, SKELETON_FILES, SkeletonManager, materialize_files
+)
+
+
+FILES = {"a/one.txt": "one [Name]", "b/two.json": "{}", "empty.txt": ""}
+
+
+def test_creates_files_and_directories(tmp_path):
+    result = materialize_files(tmp_path, FILES, directories=["c/d"], substitutions={"[Name]": "demo"})
+    assert sorted(result["created"]) == sorted(FILES)
+    assert (tmp_path / "a/one.txt").read_text() == "one demo"
+    assert (tmp_path / "c/d").is_dir()
+    # No temporary files are left behind
+    assert not [path for path in tmp_path.rglob("*.tmp")]
+
+
+def test_identical_and_existing_files_are_skipped(tmp_path):
+    materialize_files(tmp_path, FILES)
+    (tmp_path / "b/two.json").write_text('{"edited": true}')
+    before = (tmp_path / "a/one.txt").stat().st_mtime_ns
+
+    result = materialize_files(tmp_path, FILES)
+    assert sorted(result["skipped_identical"]) == ["a/one.txt", "empty.txt"]
+    assert result["skipped_existing"] == ["b/two.json"]
+    assert result["created"] == result["updated"] == []
+    assert (tmp_path / "b/two.json").read_text() == '{"edited": true}'
+    assert (tmp_path / "a/one.txt").stat().st_mtime_ns == before
+
+
+def test_overwrite_and_replace_empty(tmp_path):
+    materialize_files(tmp_path, FILES)
+    (tmp_path / "b/two.json").write_text("")
+    (tmp_path / "a/one.txt").write_text("changed")
+
+    result = materialize_files(tmp_path, FILES, replace_empty=True)
+    assert result["updated"] == ["b/two.json"]
+    assert result["skipped_existing"] == ["a/one.txt"]
+
+    result = materialize_files(tmp_path, FILES, overwrite=True)
+    assert result["updated"] == ["a/one.txt"]
+    assert (tmp_path / "a/one.txt").read_text() == "one [Name]"
+
+
+def test_replacement_is_atomic(tmp_path, monkeypatch):
+    materialize_files(tmp_path, FILES)
+    target = tmp_path / "a/one.txt"
+    inode = target.stat().st_ino
+    replaced = []
+    real_replace = os.replace
+
+    def replace(src, dst):
+        # The complete new content is on disk before it becomes visible
+        assert Path(src).parent == target.parent and Path(src).read_text() == "new"
+        assert target.read_text() == "one [Name]"
+        replaced.append(dst)
+        real_replace(src, dst)
+
+    monkeypatch.setattr(skeleton_manager.os, "replace", replace)
+    materialize_files(tmp_path, {"a/one.txt": "new"}, overwrite=True)
+    assert replaced == [target]
+    assert target.read_text() == "new"
+    assert target.stat().st_ino != inode
+
+
+def test_failed_write_keeps_original_and_cleans_up(tmp_path, monkeypatch):
+    materialize_files(tmp_path, FILES)
+
+    def fail(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(skeleton_manager.os, "replace", fail)
+    with pytest.raises(OSError):
+        materialize_files(tmp_path, {"a/one.txt": "new"}, overwrite=True)
+    assert (tmp_path / "a/one.txt").read_text() == "one [Name]"
+    assert list((tmp_path / "a").iterdir()) == [tmp_path / "a/one.txt"]
+
+
+def test_templates_override_inline_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(skeleton_manager, "load_template", lambda name: f"template {name} for [Name]")
+    materialize_files(tmp_path, {"bp.md": "inline"}, substitutions={"[Name]": "demo"},
+                      templates={"bp.md": "blueprint.md"})
+    assert (tmp_path / "bp.md").read_text() == "template blueprint.md for demo"
+
+    def missing(name):
+        raise FileNotFoundError(name)
+
+    monkeypatch.setattr(skeleton_manager, "load_template", missing)
+    materialize_files(tmp_path, {"other.md": "inline"}, templates={"other.md": "nope.md"})
+    assert (tmp_path / "other.md").read_text() == "inline"
+
+
+def test_create_skeleton_files(tmp_path):
+    manager = SkeletonManager()
+    result = asyncio.run(manager.create_skeleton_files(tmp_path, "initialization", "demo"))
+    assert result["status"] == "success"
+    assert sorted(result["files_created"]) == sorted(SKELETON_FILES)
+    assert all((tmp_path / directory).is_dir() for directory in SKELETON_DIRECTORIES)
+
+    again = asyncio.run(manager.create_skeleton_files(tmp_path, "themes", "demo"))
+    assert again["files_created"] == [] and again["files_skipped"] == ["Themes/themes.json"]
+
+    assert asyncio.run(manager.create_skeleton_files(tmp_path, "unknown", "demo"))["status"] == "error"
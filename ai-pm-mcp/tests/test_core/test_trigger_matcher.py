@@ -0,0 +1,75 @@
+"""
+Tests for the one-pass trigger matcher used by directive escalation.
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from core.scopeEngine.compressed_context import CompressedContextManager, _TriggerMatcher
+
+
+def list_order_search(triggers, text):
+    """The loop the matcher replaced: first trigger in list order contained in the text."""
+    text_lower = text.lower()
+    for trigger in triggers:
+        if trigger.lower() in text_lower:
+            return trigger
+    return None
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_list_order_loop(seed):
+    rng = random.Random(seed)
+    alphabet = "abAB .*"
+    triggers = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+                for _ in range(rng.randint(1, 8))]
+    matcher = _TriggerMatcher(triggers)
+    for _ in range(50):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 20)))
+        assert matcher.search(text) == list_order_search(triggers, text)
+
+
+def test_earlier_trigger_wins_over_earlier_or_longer_match():
+    matcher = _TriggerMatcher(["database", "data", "migration"])
+    assert matcher.search("run migration on data") == "data"
+    assert matcher.search("the DATABASE failed") == "database"
+    # Overlapping phrases starting at the same position
+    assert _TriggerMatcher(["data", "database"]).search("database") == "data"
+    # Same phrase listed twice with different spelling keeps the first spelling
+    assert _TriggerMatcher(["Schema", "schema"]).search("SCHEMA change") == "Schema"
+
+
+def test_empty_and_invalid_triggers():
+    assert _TriggerMatcher([]).search("anything") is None
+    assert _TriggerMatcher(["", None, 3]).search("anything") is None
+    assert _TriggerMatcher(["x"]).search("") is None
+
+
+def test_core_context_triggers_match_list_order_loop():
+    manager = CompressedContextManager(parent_dir)
+    asyncio.run(manager.load_core_context())
+    escalation = manager._core_context.get("directive-compressed", {}).get("directiveEscalation", {})
+    when_to_escalate = escalation.get("whenToEscalate", {})
+    json_triggers = when_to_escalate.get("forceJSON", []) + when_to_escalate.get("autoJSON", [])
+    md_triggers = when_to_escalate.get("autoMD", [])
+    context_triggers = (manager._core_context.get("workflow-triggers", {}).get("commonScenarios", {})
+                        .get("context_escalation_needed", {}).get("triggers", []))
+    assert json_triggers and md_triggers and context_triggers
+
+    # Texts that contain several triggers, in reverse list order
+    for triggers, matcher in ((json_triggers, manager._json_trigger_matcher),
+                              (md_triggers, manager._md_trigger_matcher),
+                              (context_triggers, manager._context_escalation_matcher)):
+        for start in range(len(triggers)):
+            text = " and ".join(reversed(triggers[start:])).upper()
+            assert matcher.search(text) == list_order_search(triggers, text)
+        assert matcher.search("routine update of a readme") == list_order_search(
+            triggers, "routine update of a readme")
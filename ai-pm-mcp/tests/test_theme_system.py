@@ -206,7 +206,7 @@ async def test_theme_discovery():
         
         # Test theme discovery
         theme_discovery = ThemeDiscovery()
-        result = theme_discovery.discover_themes(project_path)
+        result = await theme_discovery.discover_themes_async(project_path)
         
         themes = result.get('themes', {})
         print(f"✓ Discovered {len(themes)} themes")
@@ -0,0 +1,110 @@
+"""
+Tests for the time and byte budgets of basic theme discovery and its coverage report.
+"""
+
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from tools.theme.discovery_operations import ThemeDiscoveryOperations
+
+SOURCE_FILES = 10
+SOURCE_BYTES = 600
+
+
+class ManifestDB:
+    """In-memory database with the scan_manifest table from schema.sql."""
+
+    def __init__(self):
+        schema = (parent_dir / "database" / "schema.sql").read_text()
+        ddl = re.search(r"CREATE TABLE IF NOT EXISTS scan_manifest \(.*?\);", schema, re.S).group(0)
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(ddl)
+
+    def execute_query(self, query, params=()):
+        return self.connection.execute(query, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield self.connection
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+
+def discovery(budget_seconds=0, budget_bytes=0, db=None):
+    project = SimpleNamespace(theme_discovery_budget_seconds=budget_seconds,
+                              theme_discovery_budget_mb=budget_bytes / (1024 * 1024))
+    config_manager = SimpleNamespace(get_config=lambda: SimpleNamespace(project=project))
+    return ThemeDiscoveryOperations(file_metadata_queries=SimpleNamespace(db=db),
+                                    config_manager=config_manager)
+
+
+@pytest.fixture
+def project(tmp_path):
+    for index in range(SOURCE_FILES):
+        source = f"import payment\n\ndef checkout_{index}():\n    return 'payment checkout'\n"
+        (tmp_path / f"payment_{index}.py").write_text(source.ljust(SOURCE_BYTES - 1) + "\n")
+    # Lockfiles are skipped unread and must not spend the byte budget
+    (tmp_path / "package-lock.json").write_text('{"lockfileVersion": 3}\n' * 5000)
+    # Files of 1MB and more are never analyzed
+    (tmp_path / "dump.txt").write_text("x" * (1024 * 1024))
+    return tmp_path
+
+
+def test_unlimited_budget_covers_everything(project):
+    coverage = discovery()._discover_themes_sync(project)["coverage"]
+    assert coverage["eligible_files"] == SOURCE_FILES + 2
+    assert coverage["skipped_large_files"] == 1
+    assert coverage["analyzed_files"] == SOURCE_FILES + 1
+    assert (coverage["coverage"], coverage["complete"], coverage["stopped_by"]) == (1.0, True, None)
+    assert coverage["bytes_read"] == SOURCE_FILES * SOURCE_BYTES
+
+
+def test_byte_budget_stops_discovery_and_repeated_runs_extend_coverage(project):
+    db = ManifestDB()
+    analyzable = SOURCE_FILES + 1
+    previous = 0
+    for _ in range(SOURCE_FILES):
+        result = discovery(budget_bytes=int(2.5 * SOURCE_BYTES), db=db)._discover_themes_sync(project)
+        coverage = result["coverage"]
+        # Eligible files are counted even when the budget stopped analysis
+        assert coverage["eligible_files"] == SOURCE_FILES + 2
+        assert coverage["analyzed_files"] == result["files_analyzed"]
+        assert coverage["coverage"] == round(coverage["analyzed_files"] / analyzable, 3)
+        if coverage["complete"]:
+            break
+        assert coverage["stopped_by"] == "byte_budget"
+        # Cached files cost nothing, so each run analyzes three new files
+        assert coverage["bytes_read"] == 3 * SOURCE_BYTES
+        assert coverage["analyzed_files"] > previous
+        previous = coverage["analyzed_files"]
+    assert coverage["complete"] and coverage["analyzed_files"] == analyzable
+    assert previous >= 3
+
+
+def test_time_budget_stops_discovery(project):
+    result = discovery(budget_seconds=1e-9)._discover_themes_sync(project)
+    coverage = result["coverage"]
+    assert (coverage["stopped_by"], coverage["complete"]) == ("time_budget", False)
+    assert coverage["analyzed_files"] == 0 and coverage["coverage"] == 0.0
+    assert coverage["eligible_files"] == SOURCE_FILES + 2
+    assert result["themes"] == {}
+
+
+def test_budget_defaults_and_configuration():
+    assert ThemeDiscoveryOperations()._get_discovery_budget() == (
+        ThemeDiscoveryOperations.DISCOVERY_BUDGET_SECONDS, ThemeDiscoveryOperations.DISCOVERY_BUDGET_MB * 1024 * 1024)
+    assert discovery(budget_seconds=5, budget_bytes=1024 * 1024)._get_discovery_budget() == (5.0, 1024 * 1024)
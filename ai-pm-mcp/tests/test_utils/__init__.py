@@ -0,0 +1 @@
+# Utility module tests
\ No newline at end of file
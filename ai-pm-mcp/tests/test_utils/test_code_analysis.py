@@ -0,0 +1,181 @@
+"""
+Tests for the shared code analysis service (analyzers and memoization caches).
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.code_analysis import (
+    CodeAnalysisService, analyze_javascript, analyze_python, language_for_extension
+)
+
+PYTHON_SOURCE = '''
+import os, sys as system
+from django.db import models
+from . import views
+from ..utils.helpers import slugify
+
+MAX_ITEMS = 10
+name = "lowercase is not a constant"
+
+class Article(models.Model):
+    def save(self):
+        def inner():
+            pass
+
+async def fetch():
+    pass
+'''
+
+JAVASCRIPT_SOURCE = '''
+import React, { useState } from 'react';
+import type { Props } from "./types";
+import './styles.css';
+export * from './reexported';
+const lazy = import('./lazy');
+const fs = require('fs');
+// import fake from 'commented-out';
+const text = "function notAFunction() {}";
+/* class NotAClass {} */
+export default class App extends React.Component {}
+export async function load() {}
+export const answer = 42;
+export { helper as publicHelper, other };
+const arrow = async (a, b) => a + b;
+const handlers = { click: function () {} };
+function helper() {}
+module.exports = App;
+'''
+
+
+@pytest.fixture
+def service(tmp_path):
+    return CodeAnalysisService(cache_dir=tmp_path / "cache")
+
+
+def test_language_for_extension():
+    assert language_for_extension(".PY") == "python"
+    assert language_for_extension(".tsx") == "javascript"
+    assert language_for_extension(".rb") is None
+
+
+def test_python_ast_analysis():
+    result = analyze_python(PYTHON_SOURCE)
+    assert result["parsed"] is True
+    assert result["imports"] == ["os", "sys", "django.db", "views", "utils.helpers"]
+    assert result["classes"] == ["Article"]
+    assert sorted(result["functions"]) == ["fetch", "inner", "save"]
+    assert result["constants"] == ["MAX_ITEMS"]
+    assert result["exports"] == ["Article", "fetch", "MAX_ITEMS"]
+    assert result["frameworks"] == ["django"]
+
+
+def test_python_tokenize_fallback_for_unparseable_source():
+    broken = "import os\nfrom flask import Flask, request\nMAX = 1\nclass App:\n    def run(self:\n"
+    result = analyze_python(broken)
+    assert result["parsed"] is False
+    assert result["imports"] == ["os", "flask"]
+    assert result["classes"] == ["App"] and result["functions"] == ["run"]
+    assert result["constants"] == ["MAX"]
+    assert result["frameworks"] == ["flask"]
+
+
+def test_javascript_scanner_skips_comments_and_strings():
+    result = analyze_javascript(JAVASCRIPT_SOURCE)
+    assert result["imports"] == ["react", "./types", "./styles.css", "./reexported", "./lazy", "fs"]
+    assert result["exports"] == ["App", "load", "answer", "publicHelper", "other"]
+    assert result["classes"] == ["App"]
+    assert result["functions"] == ["load", "arrow", "click", "helper"]
+    assert result["frameworks"] == ["react"]
+
+
+def test_unknown_language_is_rejected(service):
+    with pytest.raises(ValueError):
+        service.analyze("puts 1", "ruby")
+
+
+def test_memory_and_disk_cache_hits(service, tmp_path):
+    first = service.analyze(PYTHON_SOURCE, "python")
+    assert service.analyze(PYTHON_SOURCE, "python") is first
+    assert (service.stats["analyzed"], service.stats["memory_hits"]) == (1, 1)
+
+    entries = list((tmp_path / "cache").glob("*/*.json"))
+    assert [entry.stem for entry in entries] == [service.content_key(PYTHON_SOURCE, "python")]
+
+    # Another process or session reads the on-disk entry
+    other = CodeAnalysisService(cache_dir=tmp_path / "cache")
+    assert other.analyze(PYTHON_SOURCE, "python") == first
+    assert (other.stats["analyzed"], other.stats["disk_hits"]) == (0, 1)
+
+    # The same content analyzed as another language is a different entry
+    assert service.content_key(PYTHON_SOURCE, "python") != service.content_key(PYTHON_SOURCE, "javascript")
+
+
+def test_unreadable_disk_entries_are_reanalyzed(service, tmp_path):
+    key = service.content_key(PYTHON_SOURCE, "python")
+    path = tmp_path / "cache" / key[:2] / f"{key}.json"
+    path.parent.mkdir(parents=True)
+    path.write_text("{truncated")
+    assert service.analyze(PYTHON_SOURCE, "python")["classes"] == ["Article"]
+    assert service.stats["analyzed"] == 1
+
+
+def test_memory_only_service_writes_nothing(tmp_path):
+    service = CodeAnalysisService(cache_dir=tmp_path / "cache", use_disk=False, memory_entries=1)
+    service.analyze("a = 1", "python")
+    service.analyze("b = 2", "python")
+    service.analyze("a = 1", "python")
+    assert service.stats["analyzed"] == 3
+    assert not (tmp_path / "cache").exists()
+
+
+def write_entry(root, name, size, age):
+    path = root / name[:2] / f"{name}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_prune_removes_stale_then_least_recently_used_entries(tmp_path):
+    root = tmp_path / "cache"
+    service = CodeAnalysisService(cache_dir=root, max_disk_bytes=1000, max_disk_age_seconds=3600)
+    stale = write_entry(root, "aa_stale", 100, age=7200)
+    leftover = write_entry(root, "bb_tmp", 100, age=7200).rename(root / "bb" / "bb_tmp.json.1.2.tmp")
+    recent_tmp = write_entry(root, "bc_tmp", 100, age=10).rename(root / "bc" / "bc_tmp.json.1.2.tmp")
+    oldest = write_entry(root, "cc_oldest", 400, age=300)
+    older = write_entry(root, "dd_older", 400, age=200)
+    newest = write_entry(root, "ee_newest", 400, age=100)
+
+    summary = service.prune()
+    # 1200 bytes left after removing the stale entry; LRU pruning goes down to 800
+    assert not stale.exists() and not leftover.exists() and recent_tmp.exists()
+    assert not oldest.exists() and older.exists() and newest.exists()
+    assert summary == {"removed": 3, "removed_bytes": 600, "kept_bytes": 800}
+    assert service.stats["pruned_entries"] == 3
+
+
+def test_first_write_prunes_in_background(tmp_path):
+    root = tmp_path / "cache"
+    stale = write_entry(root, "aa_stale", 10, age=7200)
+    service = CodeAnalysisService(cache_dir=root, max_disk_age_seconds=3600)
+    service.analyze("x = 1", "python")
+    deadline = time.time() + 5
+    while (service._pruning or stale.exists()) and time.time() < deadline:
+        time.sleep(0.01)
+    assert not stale.exists()
+    # Reading refreshes the entry's last-use time
+    key = service.content_key("x = 1", "python")
+    path = root / key[:2] / f"{key}.json"
+    os.utime(path, (0, 0))
+    CodeAnalysisService(cache_dir=root).analyze("x = 1", "python")
+    assert path.stat().st_mtime > time.time() - 60
@@ -0,0 +1,125 @@
+"""
+Tests for the directory listing cache, prefix reads and the shared I/O pool.
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.concurrent_io import DirectoryListingCache, read_prefix, run_io
+
+
+def bump_mtime(directory, seconds=10):
+    """Move a directory's mtime forward (filesystems with coarse timestamps may not change it)."""
+    stat = os.stat(directory)
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "README.md").write_text("# Project\n")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "index.js").write_text("")
+    (tmp_path / "src" / "index.ts").write_text("")
+    (tmp_path / "src" / "app.py").write_text("")
+    return tmp_path
+
+
+def test_listing_is_reused_while_mtime_is_unchanged(tree):
+    cache = DirectoryListingCache()
+    assert cache.listing(tree) == {"README.md": False, "docs": True, "src": True}
+    assert cache.listing(tree) is cache.listing(tree)
+    assert cache.stats == {"hits": 2, "scans": 1}
+
+
+def test_listing_is_revalidated_when_mtime_changes(tree):
+    cache = DirectoryListingCache()
+    assert "new.md" not in cache.listing(tree)
+
+    (tree / "new.md").write_text("")
+    bump_mtime(tree)
+    assert cache.listing(tree)["new.md"] is False
+    assert cache.stats["scans"] == 2
+
+    (tree / "README.md").unlink()
+    bump_mtime(tree, seconds=20)
+    assert "README.md" not in cache.listing(tree)
+    assert cache.stats["scans"] == 3
+
+    # Changing a file's contents does not touch the directory, so the listing stays cached
+    (tree / "new.md").write_text("changed")
+    cache.listing(tree)
+    assert cache.stats == {"hits": 1, "scans": 3}
+
+
+def test_missing_directories_and_files(tree):
+    cache = DirectoryListingCache()
+    cache.listing(tree / "docs")
+    (tree / "docs").rmdir()
+    assert cache.listing(tree / "docs") == {}
+    assert cache.listing(tree / "README.md") == {}
+    assert cache.listing(tree / "absent") == {}
+    assert cache.stats["scans"] == 1
+
+
+def test_find_first_and_match(tree):
+    cache = DirectoryListingCache()
+    # Directories never satisfy a file probe
+    assert cache.find_first(tree, ["docs", "readme.md", "README.md"]) == "README.md"
+    assert cache.find_first(tree, ["docs"]) is None
+    assert cache.match(tree, "src/index.*") == ["src/index.js", "src/index.ts"]
+    assert cache.match(tree, "src/app.py") == ["src/app.py"]
+    assert cache.match(tree, "src/missing.py") == []
+    assert cache.match(tree, "docs") == ["docs"]
+    assert cache.stats["scans"] == 2
+
+
+def test_lru_eviction_and_invalidation(tree):
+    cache = DirectoryListingCache(max_entries=2)
+    cache.listing(tree)
+    cache.listing(tree / "src")
+    cache.listing(tree)
+    cache.listing(tree / "docs")
+    # tree was used most recently before docs was added, so src was evicted
+    cache.listing(tree)
+    cache.listing(tree / "src")
+    assert cache.stats == {"hits": 2, "scans": 4}
+
+    cache.invalidate(tree / "src")
+    cache.listing(tree / "src")
+    cache.clear()
+    cache.listing(tree)
+    assert cache.stats["scans"] == 6
+
+
+def test_read_prefix(tmp_path):
+    path = tmp_path / "notes.txt"
+    path.write_text("line\n" * 1000)
+    prefix = read_prefix(path, max_bytes=50)
+    assert prefix.text == "line\n" * 10
+    assert (prefix.size_bytes, prefix.truncated, prefix.line_count_estimated) == (5000, True, True)
+    assert prefix.line_count == 1000
+
+    prefix = read_prefix(path, max_bytes=10_000, max_lines=3)
+    assert prefix.text == "line\nline\nline"
+    assert prefix.truncated and not prefix.line_count_estimated
+    assert prefix.line_count == 1001
+
+    with pytest.raises(OSError):
+        read_prefix(tmp_path / "missing.txt")
+
+
+def test_run_io_keeps_order_and_returns_exceptions(tree):
+    paths = [tree / "README.md", tree / "missing.md", tree / "src" / "app.py"]
+    results = asyncio.run(run_io(lambda path: read_prefix(path).size_bytes, paths))
+    assert results[0] == len("# Project\n") and results[2] == 0
+    assert isinstance(results[1], FileNotFoundError)
+    assert asyncio.run(run_io(str, [])) == []
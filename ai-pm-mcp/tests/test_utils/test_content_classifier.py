@@ -0,0 +1,105 @@
+"""
+Tests for pre-read file classification (binary, minified, lockfile, generated).
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.content_classifier import (
+    ACTION_READ, ACTION_SAMPLE, ACTION_SKIP, MAX_LINE_LENGTH, SAMPLE_BYTES, SNIFF_BYTES,
+    classify_name, classify_prefix, get_classifier_stats, read_analyzable_text
+)
+
+
+def write(root, name, data):
+    path = root / name
+    path.write_bytes(data if isinstance(data, bytes) else data.encode("utf-8"))
+    return path
+
+
+@pytest.mark.parametrize("name,reason", [
+    ("package-lock.json", "lockfile"), ("Cargo.lock", "lockfile"), ("go.sum", "lockfile"),
+    ("app.min.js", "generated_name"), ("bundle.js.map", "generated_name"),
+    ("messages_pb2.py", "generated_name"), ("main.py", None), ("lock.json", None),
+])
+def test_classify_name(name, reason):
+    assert classify_name(name) == reason
+
+
+def test_lockfiles_are_skipped_unread(tmp_path):
+    path = write(tmp_path, "yarn.lock", "dependency@1.0.0:\n  version 1.0.0\n" * 1000)
+    before = get_classifier_stats()
+    content, classification = read_analyzable_text(path)
+    assert content is None
+    assert (classification.action, classification.kind, classification.reason) == (ACTION_SKIP, "generated", "lockfile")
+    assert classification.bytes_read == 0 and not classification.analyzable
+    assert get_classifier_stats()["bytes_avoided"] - before["bytes_avoided"] == path.stat().st_size
+
+
+def test_nul_bytes_and_control_characters_are_binary(tmp_path):
+    content, classification = read_analyzable_text(write(tmp_path, "data.json", b'{"a": 1}\x00\x01rest'))
+    assert content is None and (classification.kind, classification.reason) == ("binary", "nul_bytes")
+
+    content, classification = read_analyzable_text(write(tmp_path, "data.txt", bytes(range(1, 9)) * 10))
+    assert content is None and classification.reason == "control_characters"
+
+    # Tabs, newlines and carriage returns are ordinary text
+    assert classify_prefix(b"a\tb\r\nc\x0c\n" * 10, complete=True)[0] == ACTION_READ
+
+
+def test_minified_code_is_skipped_but_prose_is_not(tmp_path):
+    minified = "var a=1;" * (MAX_LINE_LENGTH // 4)
+    content, classification = read_analyzable_text(write(tmp_path, "app.js", minified))
+    assert content is None and (classification.kind, classification.reason) == ("minified", "long_lines")
+
+    # Consistently long (but not over-long) lines
+    bundled = ("x" * 400 + "\n") * 10
+    assert classify_prefix(bundled.encode(), complete=True)[:2] == (ACTION_SKIP, "minified")
+
+    paragraph = "A long paragraph written on one line. " * 60
+    content, classification = read_analyzable_text(write(tmp_path, "README.md", paragraph))
+    assert content == paragraph and classification.action == ACTION_READ
+
+
+def test_incomplete_last_line_does_not_count_as_long():
+    head = b"short line\n" * 10 + b"y" * (MAX_LINE_LENGTH + 10)
+    assert classify_prefix(head, complete=False)[0] == ACTION_READ
+    assert classify_prefix(head, complete=True)[0] == ACTION_SKIP
+
+
+def test_generated_markers_only_sample_the_file(tmp_path):
+    body = "# @generated by protoc. DO NOT EDIT.\n" + "value = 1\n" * (SAMPLE_BYTES // 5)
+    content, classification = read_analyzable_text(write(tmp_path, "schema.py", body))
+    assert (classification.action, classification.reason) == (ACTION_SAMPLE, "generated_marker")
+    assert len(content) == SAMPLE_BYTES and body.startswith(content)
+    assert classification.bytes_read == SAMPLE_BYTES
+
+    # Markers further down do not count
+    late = "value = 1\n" * 200 + "# DO NOT EDIT\n"
+    assert classify_prefix(late.encode(), complete=True)[0] == ACTION_READ
+
+
+def test_plain_text_is_read_in_full(tmp_path):
+    small = "def main():\n    return 1\n"
+    content, classification = read_analyzable_text(write(tmp_path, "main.py", small))
+    assert content == small and classification.reason == "text" and classification.bytes_read == len(small)
+
+    large = "print('hello')\n" * (2 * SNIFF_BYTES // 15)
+    content, classification = read_analyzable_text(write(tmp_path, "large.py", large))
+    assert content == large and classification.bytes_read == len(large)
+
+    content, classification = read_analyzable_text(write(tmp_path, "empty.py", ""))
+    assert content == "" and classification.reason == "empty"
+
+
+def test_strict_decoding_raises_on_invalid_utf8(tmp_path):
+    path = write(tmp_path, "latin.txt", "caf\xe9\n".encode("latin-1"))
+    assert read_analyzable_text(path)[0] == "caf\n"
+    with pytest.raises(UnicodeDecodeError):
+        read_analyzable_text(path, errors="strict")
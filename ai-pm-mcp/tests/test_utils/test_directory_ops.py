@@ -0,0 +1,123 @@
+"""
+Tests for bulk directory metadata and file relationship queries.
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from database.file_metadata.directory_ops import DirectoryOperations, SQLITE_PARAMETER_CHUNK
+
+
+class MetadataDB:
+    """In-memory database with the file and directory metadata tables from schema.sql."""
+
+    def __init__(self):
+        schema = (parent_dir / "database" / "schema.sql").read_text()
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.row_factory = sqlite3.Row
+        for table in ("directory_metadata", "file_metadata"):
+            ddl = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \(.*?\);", schema, re.S).group(0)
+            self.connection.execute(ddl)
+        self.logger = logging.getLogger("test_directory_ops")
+        self.queries = []
+        self.rows_fetched = 0
+
+    def execute_query(self, query, params=()):
+        self.queries.append(query)
+        rows = self.connection.execute(query, params).fetchall()
+        self.rows_fetched += len(rows)
+        return rows
+
+
+def expected_relationships(files, directory):
+    """Reference: files directly inside directory with dependencies or dependents."""
+    entries = []
+    for file_path, (dependencies, dependents) in files.items():
+        if file_path.rpartition('/')[0] != directory.rstrip('/'):
+            continue
+        if dependents:
+            relationship_type = f"used by {len(dependents)} files"
+        elif dependencies:
+            relationship_type = f"depends on {len(dependencies)} files"
+        else:
+            continue
+        entries.append({'file_path': file_path, 'relationship_type': relationship_type,
+                        'dependencies': dependencies, 'dependents': dependents})
+    return entries
+
+
+@pytest.fixture
+def populated():
+    rng = random.Random(5)
+    db = MetadataDB()
+    directories = [f"src/pkg{i}" for i in range(1000)] + [f"src/pkg{i}/sub" for i in range(0, 1000, 7)]
+    files = {}
+    for directory in directories:
+        for index in range(rng.randint(0, 3)):
+            dependencies = [f"dep{n}" for n in range(rng.randint(0, 2))]
+            dependents = [f"user{n}" for n in range(rng.randint(0, 2))]
+            files[f"{directory}/file{index}.py"] = (dependencies, dependents)
+    # Siblings whose names share a prefix with requested directories
+    files["src/pkg1-old/file.py"] = (["dep"], [])
+    files["src/pkg10.py"] = (["dep"], [])
+    db.connection.executemany(
+        "INSERT INTO file_metadata (file_path, dependencies, dependents) VALUES (?, ?, ?)",
+        [(path, json.dumps(deps), json.dumps(users)) for path, (deps, users) in files.items()]
+    )
+    db.connection.executemany(
+        "INSERT INTO directory_metadata (directory_path, purpose) VALUES (?, ?)",
+        [(directory, f"purpose of {directory}") for directory in directories[::2]]
+    )
+    return db, directories, files
+
+
+def sort_key(entry):
+    return entry['file_path']
+
+
+def test_bulk_relationships_match_per_path_and_reference(populated):
+    db, directories, files = populated
+    operations = DirectoryOperations(db)
+    requested = directories + ["src/missing", "src/pkg3/"]
+
+    bulk = operations.get_file_relationships_bulk(requested)
+    # More directories than one chunk of parameters holds; both spellings of src/pkg3 share a prefix
+    assert len(db.queries) == math.ceil((len(requested) - 1) / (SQLITE_PARAMETER_CHUNK // 3)) > 1
+
+    for directory in requested:
+        per_path = operations.get_file_relationships(directory)
+        assert bulk.get(directory, []) == per_path
+        assert sorted(per_path, key=sort_key) == sorted(expected_relationships(files, directory), key=sort_key)
+        # Most depended-on files first
+        ranks = [(len(entry['dependents']), len(entry['dependencies'])) for entry in per_path]
+        assert ranks == sorted(ranks, reverse=True)
+
+
+def test_bulk_relationships_exclude_deeper_rows_in_sql(populated):
+    db, directories, files = populated
+    DirectoryOperations(db).get_file_relationships_bulk(["src/pkg0", "src"])
+    direct_children = [path for path in files
+                       if path.rpartition('/')[0] in ("src/pkg0", "src")]
+    assert db.rows_fetched == len(direct_children)
+
+
+def test_bulk_directory_metadata_matches_per_path(populated):
+    db, directories, _ = populated
+    operations = DirectoryOperations(db)
+    bulk = operations.get_directory_metadata_bulk(directories + directories[:3])
+    assert len(db.queries) == math.ceil(len(directories) / SQLITE_PARAMETER_CHUNK) > 1
+    assert set(bulk) == set(directories[::2])
+    for directory in directories:
+        assert bulk.get(directory) == operations.get_directory_metadata(directory)
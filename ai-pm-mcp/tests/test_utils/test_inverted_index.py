@@ -0,0 +1,54 @@
+"""
+Tests for the posting-list index used by theme membership and relationships.
+"""
+
+import random
+import sys
+from itertools import combinations
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.inverted_index import PostingIndex
+
+
+def build(sets):
+    index = PostingIndex()
+    for set_id, items in enumerate(sets):
+        index.add(set_id, items)
+    return index
+
+
+def test_add_posting_and_members():
+    index = build([["auth", "login", "auth"], ["db"], [], ["auth", "db"]])
+    assert len(index) == 3
+    assert index.set_count == 4
+    assert list(index.posting("auth")) == [0, 3]
+    assert list(index.posting("missing")) == []
+    assert index.members(["db", "login"]) == [0, 1, 3]
+    assert index.members(["missing"]) == []
+
+
+def test_pair_overlaps_list_shared_items_in_insertion_order():
+    index = build([["a", "b", "c"], ["c", "b"], ["d"], ["a", "d"]])
+    assert index.pair_overlaps() == {(0, 1): ["b", "c"], (0, 3): ["a"], (2, 3): ["d"]}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    items = [f"k{i}" for i in range(15)]
+    sets = [rng.sample(items, rng.randint(0, 5)) for _ in range(12)]
+    index = build(sets)
+
+    for _ in range(5):
+        query = rng.sample(items, rng.randint(0, 4))
+        assert index.members(query) == [i for i, s in enumerate(sets) if set(s) & set(query)]
+
+    expected = {(i, j): set(sets[i]) & set(sets[j])
+                for i, j in combinations(range(len(sets)), 2) if set(sets[i]) & set(sets[j])}
+    assert {pair: set(shared) for pair, shared in index.pair_overlaps().items()} == expected
@@ -0,0 +1,82 @@
+"""
+Tests for multi-pattern substring matching, including nested fragments.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import utils.multi_pattern as multi_pattern
+from utils.multi_pattern import MultiPatternMatcher
+
+
+def brute_force(patterns, text):
+    """The per-fragment loop the matcher replaces."""
+    lowered = text.lower()
+    return sorted(payload for fragment, payload in patterns if fragment and fragment.lower() in lowered)
+
+
+def test_nested_fragments_are_all_reported():
+    matcher = MultiPatternMatcher([("authentication", "long"), ("auth", "prefix"),
+                                   ("then", "inner"), ("cat", "inner2"), ("ion", "suffix")])
+    assert sorted(matcher.find("src/authentication.py")) == ["inner", "inner2", "long", "prefix", "suffix"]
+    assert matcher.find("author") == ["prefix"]
+
+
+def test_overlapping_fragments_at_different_positions():
+    matcher = MultiPatternMatcher([("abc", 1), ("bcd", 2), ("cd", 3)])
+    assert matcher.find("abcd") == [1, 2, 3]
+    assert matcher.find("xbcdx") == [2, 3]
+
+
+def test_case_insensitive_and_duplicate_fragments():
+    matcher = MultiPatternMatcher([("Auth", "a"), ("auth", "b"), ("", "ignored"), (None, "ignored")])
+    assert len(matcher) == 1
+    assert matcher.find("USER_AUTH") == ["a", "b"]
+    assert matcher.find("") == []
+    assert MultiPatternMatcher([]).find("anything") == []
+
+
+def test_payloads_follow_registration_order():
+    matcher = MultiPatternMatcher([("zeta", "z"), ("alpha", "a"), ("alp", "a")])
+    assert matcher.find("alphazeta") == ["z", "a", "a"]
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_brute_force(seed):
+    rng = random.Random(seed)
+    alphabet = "abc"  # a small alphabet makes nested and overlapping fragments common
+    patterns = [("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 5))), i) for i in range(25)]
+    matcher = MultiPatternMatcher(patterns)
+    for _ in range(20):
+        text = "".join(rng.choice(alphabet + "AB/") for _ in range(rng.randint(0, 30)))
+        assert sorted(matcher.find(text)) == brute_force(patterns, text), text
+        assert sorted(matcher.find_in_path(text)) == brute_force(patterns, text.replace("/", "\0")), text
+
+
+def test_find_in_path_matches_segments():
+    matcher = MultiPatternMatcher([("auth", "auth"), ("api", "api")])
+    assert matcher._segmentable
+    assert matcher.find_in_path("src/api/auth_handler.py") == ["auth", "api"]
+    # Fragments never match across a separator when matching segment by segment
+    assert matcher.find_in_path("au/th") == []
+
+
+def test_fragment_with_separator_matches_whole_path():
+    matcher = MultiPatternMatcher([("api/v1", "versioned"), ("v1", "v1")])
+    assert not matcher._segmentable
+    assert matcher.find_in_path("src/api/v1/users.py") == ["versioned", "v1"]
+
+
+def test_memo_is_bounded(monkeypatch):
+    monkeypatch.setattr(multi_pattern, "MAX_MEMO_ENTRIES", 4)
+    matcher = MultiPatternMatcher([("a", 1)])
+    for i in range(10):
+        assert matcher.find(f"a{i}") == [1]
+    assert len(matcher._memo) <= 4
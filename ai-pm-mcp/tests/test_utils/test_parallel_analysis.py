@@ -0,0 +1,78 @@
+"""
+Tests for process-pool file analysis (results must match serial analysis).
+"""
+
+import sys
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import utils.file_utils as file_utils
+from utils.file_utils import PARALLEL_CHUNK_SIZE, FileAnalyzer, shutdown_process_executor
+
+SOURCES = {
+    ".py": "import os\nfrom flask import Flask\n\nclass Service{n}:\n    def handle_{n}(self):\n        return {n}\n",
+    ".js": "import React from 'react';\nexport function Widget{n}() {{ return {n}; }}\n",
+    ".md": "# Module {n}\nAuthentication and payment notes for module {n}.\n",
+    ".json": '{{"name": "module-{n}", "version": "1.0.{n}"}}\n',
+}
+
+
+@pytest.fixture
+def entries(tmp_path):
+    """More files than one pool chunk, across several languages."""
+    result = []
+    for n in range(PARALLEL_CHUNK_SIZE * 2 + 5):
+        extension = list(SOURCES)[n % len(SOURCES)]
+        path = tmp_path / f"pkg{n % 7}" / f"module_{n}{extension}"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(SOURCES[extension].format(n=n))
+        result.append(SimpleNamespace(rel_path=f"pkg{n % 7}/{path.name}", fs_path=str(path),
+                                      size=path.stat().st_size))
+    return result
+
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    shutdown_process_executor()
+    yield
+    shutdown_process_executor()
+
+
+def test_pool_results_match_serial_results(entries):
+    analyzer = FileAnalyzer()
+    serial, serial_stats = analyzer.analyze_files(entries, parallel=False)
+    parallel, parallel_stats = analyzer.analyze_files(entries, parallel=True, max_workers=2)
+
+    assert list(parallel) == [entry.rel_path for entry in entries]
+    assert parallel == serial
+    assert any(info["imports"] for info in serial.values())
+    assert (serial_stats["mode"], serial_stats["workers"]) == ("serial", 1)
+    assert (parallel_stats["mode"], parallel_stats["workers"]) == ("parallel", 2)
+    assert parallel_stats["files"] == len(entries)
+    assert parallel_stats["bytes"] == sum(entry.size for entry in entries)
+
+
+def test_small_batches_stay_serial(entries):
+    _, stats = FileAnalyzer().analyze_files(entries[:3], max_workers=4)
+    assert stats["mode"] == "serial"
+    _, stats = FileAnalyzer().analyze_files([], parallel=True)
+    assert (stats["mode"], stats["files"]) == ("serial", 0)
+
+
+def test_broken_pool_falls_back_to_serial(entries, monkeypatch):
+    def broken_pool(workers):
+        raise BrokenProcessPool("worker died")
+
+    analyzer = FileAnalyzer()
+    serial, _ = analyzer.analyze_files(entries, parallel=False)
+    monkeypatch.setattr(file_utils, "get_process_executor", broken_pool)
+    results, stats = analyzer.analyze_files(entries, parallel=True, max_workers=2)
+    assert results == serial
+    assert (stats["mode"], stats["workers"]) == ("serial", 1)
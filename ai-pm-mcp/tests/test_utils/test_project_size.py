@@ -0,0 +1,181 @@
+"""
+Tests for the staged project size estimator and its verdict cache.
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.project_paths import get_database_path, get_themes_path
+from utils.project_size import (
+    SIZE_LARGE, SIZE_MEDIUM, SIZE_SMALL, ProjectSizeEstimator,
+    clear_project_size_cache, get_project_size_estimate
+)
+
+requires_git = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def make_tree(root, depth, fanout, files_per_dir):
+    """Regular tree; returns the number of entries (directories and files) below root."""
+    root.mkdir(parents=True, exist_ok=True)
+    entries = 0
+    for index in range(files_per_dir):
+        (root / f"file{index}.txt").write_text("x")
+        entries += 1
+    if depth:
+        for index in range(fanout):
+            entries += 1 + make_tree(root / f"dir{index}", depth - 1, fanout, files_per_dir)
+    return entries
+
+
+def git(root, *args):
+    subprocess.run(["git", *args], cwd=root, check=True, capture_output=True,
+                   env={"GIT_AUTHOR_NAME": "t", "GIT_AUTHOR_EMAIL": "t@t", "GIT_COMMITTER_NAME": "t",
+                        "GIT_COMMITTER_EMAIL": "t@t", "HOME": str(root), "PATH": "/usr/bin:/bin"})
+
+
+def estimator(root, **options):
+    options.setdefault("seed", 1)
+    return ProjectSizeEstimator(root, **options)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    clear_project_size_cache()
+    yield
+    clear_project_size_cache()
+
+
+def test_theme_count_short_circuits(tmp_path):
+    themes_dir = get_themes_path(tmp_path)
+    themes_dir.mkdir(parents=True)
+    for index in range(4):
+        (themes_dir / f"theme{index}.json").write_text("{}")
+
+    estimate = estimator(tmp_path, theme_threshold=3).estimate()
+    assert (estimate.size_class, estimate.method, estimate.confidence) == (SIZE_LARGE, "theme_count", 1.0)
+    assert estimate.estimated_files is None
+    assert estimate.signals["themes"] == 4
+
+
+def test_database_size_short_circuits(tmp_path):
+    db_path = get_database_path(tmp_path)
+    db_path.parent.mkdir(parents=True)
+    db_path.write_bytes(b"\0" * 2048)
+
+    estimate = estimator(tmp_path, db_bytes_threshold=1024).estimate()
+    assert (estimate.is_large, estimate.method) == (True, "database_size")
+    assert estimate.signals["database_bytes"] == 2048
+
+
+@requires_git
+def test_branch_count_and_git_file_count_short_circuit(tmp_path):
+    git(tmp_path, "init", "-q")
+    for index in range(6):
+        (tmp_path / f"f{index}.txt").write_text("x")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    for index in range(3):
+        git(tmp_path, "branch", f"ai-pm-org-{index}")
+
+    estimate = estimator(tmp_path, branch_threshold=2).estimate()
+    assert (estimate.method, estimate.signals["ai_branches"]) == ("branch_count", 3)
+
+    estimate = estimator(tmp_path, file_threshold=5).estimate()
+    assert (estimate.size_class, estimate.method, estimate.confidence) == (SIZE_LARGE, "git_ls_files", 1.0)
+    assert estimate.signals["tracked_files"] > 5
+
+
+def test_bounded_walk_is_exact_for_small_projects(tmp_path):
+    entries = make_tree(tmp_path, depth=2, fanout=2, files_per_dir=2)
+    estimate = estimator(tmp_path, file_threshold=1000).estimate()
+    assert (estimate.size_class, estimate.method, estimate.confidence) == (SIZE_SMALL, "walk", 1.0)
+    assert estimate.estimated_files == entries
+
+
+def test_bounded_walk_exits_early_for_large_projects(tmp_path):
+    make_tree(tmp_path, depth=3, fanout=3, files_per_dir=3)
+    estimate = estimator(tmp_path, file_threshold=20, walk_entry_budget=1000).estimate()
+    assert (estimate.size_class, estimate.method, estimate.confidence) == (SIZE_LARGE, "walk", 1.0)
+    assert 20 < estimate.estimated_files
+
+
+def test_knuth_probes_are_exact_on_regular_trees(tmp_path):
+    entries = make_tree(tmp_path, depth=3, fanout=3, files_per_dir=2)
+    estimate = estimator(tmp_path, file_threshold=1000, walk_entry_budget=10, probe_count=8).estimate()
+    assert estimate.method == "sampled_walk"
+    assert estimate.estimated_files == entries
+    assert estimate.signals["standard_error"] == 0
+    assert estimate.size_class == SIZE_MEDIUM and estimate.confidence == 0.99
+
+
+def test_knuth_probes_estimate_irregular_trees(tmp_path):
+    # One deep, wide branch next to many shallow ones
+    make_tree(tmp_path / "deep", depth=3, fanout=4, files_per_dir=3)
+    for index in range(6):
+        make_tree(tmp_path / f"shallow{index}", depth=0, fanout=0, files_per_dir=2)
+    walker = ProjectSizeEstimator(tmp_path)._walker()
+    actual = sum(len(subdirs) + len(files) for _, subdirs, files in walker.walk_dirs())
+
+    estimate = estimator(tmp_path, file_threshold=100_000, walk_entry_budget=10,
+                         probe_count=400, seed=3).estimate()
+    assert estimate.method == "sampled_walk"
+    assert estimate.signals["standard_error"] > 0
+    assert abs(estimate.estimated_files - actual) <= 4 * estimate.signals["standard_error"] + 1
+
+
+@requires_git
+def test_untracked_directories_are_not_hidden_by_git_count(tmp_path):
+    git(tmp_path, "init", "-q")
+    (tmp_path / "tracked.txt").write_text("x")
+    git(tmp_path, "add", ".")
+    git(tmp_path, "commit", "-q", "-m", "init")
+    # A large untracked (not ignored) directory
+    untracked = make_tree(tmp_path / "generated", depth=3, fanout=4, files_per_dir=4)
+
+    estimate = estimator(tmp_path, file_threshold=200, walk_entry_budget=50).estimate()
+    assert estimate.signals["tracked_files"] == 1
+    assert estimate.method == "sampled_walk"
+    assert estimate.size_class == SIZE_LARGE
+    assert estimate.estimated_files >= untracked
+
+
+def test_verdict_cache_reuse_and_invalidation(tmp_path, monkeypatch):
+    make_tree(tmp_path, depth=1, fanout=2, files_per_dir=2)
+    calls = []
+    real_estimate = ProjectSizeEstimator.estimate
+
+    def counting_estimate(self):
+        calls.append(1)
+        return real_estimate(self)
+
+    monkeypatch.setattr(ProjectSizeEstimator, "estimate", counting_estimate)
+
+    first = get_project_size_estimate(tmp_path)
+    assert get_project_size_estimate(tmp_path) is first
+    assert len(calls) == 1
+
+    # Different thresholds are cached separately
+    get_project_size_estimate(tmp_path, file_threshold=5)
+    assert len(calls) == 2
+
+    # A new file changes the root directory's mtime, which changes the stamp
+    (tmp_path / "new.txt").write_text("x")
+    second = get_project_size_estimate(tmp_path)
+    assert second is not first and second.estimated_files == first.estimated_files + 1
+    assert len(calls) == 3
+
+    assert get_project_size_estimate(tmp_path, force=True) is not second
+    assert get_project_size_estimate(tmp_path, max_age_seconds=-1) is not second
+    assert len(calls) == 5
+
+    clear_project_size_cache()
+    get_project_size_estimate(tmp_path)
+    assert len(calls) == 6
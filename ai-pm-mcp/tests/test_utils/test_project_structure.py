@@ -0,0 +1,132 @@
+"""
+Tests for the compact ProjectStructure records and their plain dict form.
+"""
+
+import asyncio
+import json
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.file_utils import FileAnalyzer
+from utils.project_structure import DirectoryRecord, FileRecord, ProjectStructure
+
+
+class ManifestDB:
+    """In-memory database with the scan_manifest table from schema.sql."""
+
+    def __init__(self):
+        schema = (parent_dir / "database" / "schema.sql").read_text()
+        ddl = re.search(r"CREATE TABLE IF NOT EXISTS scan_manifest \(.*?\);", schema, re.S).group(0)
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(ddl)
+
+    def execute_query(self, query, params=()):
+        return self.connection.execute(query, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield self.connection
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+
+PROJECT_FILES = {
+    "main.py": "import os\nfrom auth.login import check\n\ndef main():\n    return check()\n",
+    "auth/login.py": "import hashlib\n\nclass LoginService:\n    def check(self):\n        return True\n",
+    "auth/README.md": "# Authentication\nLogin and user accounts.\n",
+    "components/Button.jsx": "import React from 'react';\nexport function Button() { return null; }\n",
+    "components/forms/Form.tsx": "import React from 'react';\nexport const Form = () => null;\n",
+    "styles/main.css": "body { margin: 0; }\n",
+    "config/settings.json": '{"debug": true}\n',
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    for rel_path, content in PROJECT_FILES.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def legacy_structure(analyzer, root):
+    """The plain dict form analyze_project_structure returned before records were introduced."""
+    directories, files, imports = {}, [], {}
+    for rel_dir in sorted({str(Path(p).parent) for p in PROJECT_FILES} - {"."}):
+        names = sorted(Path(p).name for p in PROJECT_FILES if str(Path(p).parent) == rel_dir)
+        subdirs = sorted({Path(p).parent.name for p in PROJECT_FILES if str(Path(p).parent.parent) == rel_dir})
+        directories[rel_dir] = {'files': names, 'subdirs': subdirs,
+                                'purpose': analyzer._analyze_directory_purpose(root / rel_dir, names)}
+    for rel_path in sorted(PROJECT_FILES):
+        file_info = analyzer._analyze_file(root / rel_path)
+        file_info['path'] = rel_path
+        file_info['directory'] = str(Path(rel_path).parent)
+        files.append(file_info)
+        if file_info['imports']:
+            imports[rel_path] = file_info['imports']
+    return directories, files, imports
+
+
+def test_to_dict_matches_legacy_form(project):
+    analyzer = FileAnalyzer(db_manager=ManifestDB())
+    structure = asyncio.run(analyzer.analyze_project_structure(project, parallel=False))
+    assert isinstance(structure, ProjectStructure)
+
+    plain = structure.to_dict()
+    # Fully JSON-serializable, with no tuples left behind
+    assert json.loads(json.dumps(plain)) == plain
+
+    directories, files, imports = legacy_structure(analyzer, project)
+    assert {path: {**entry, 'files': sorted(entry['files']), 'subdirs': sorted(entry['subdirs'])}
+            for path, entry in plain['directories'].items()} == directories
+    by_path = {entry['path']: entry for entry in plain['files']}
+    assert sorted(by_path) == sorted(PROJECT_FILES)
+    for expected in files:
+        actual = by_path[expected['path']]
+        assert actual == expected
+        assert list(actual) == list(expected)
+    assert plain['imports'] == imports
+    assert set(plain['languages']) == {entry['language'] for entry in files if entry['language']}
+    assert plain['keywords'] == structure['keywords']
+    assert {'scan', 'throughput', 'patterns', 'frameworks'} <= set(plain)
+
+
+def test_records_read_like_the_former_dicts():
+    info = {'name': 'login.py', 'extension': '.py', 'size': 12, 'language': 'python',
+            'imports': ['os', 'hashlib'], 'exports': [], 'keywords': ['auth'], 'frameworks': [],
+            'functions': ['check'], 'classes': ['LoginService'], 'type': 'source',
+            'path': 'auth/login.py', 'directory': 'auth'}
+    record = FileRecord.from_info(info)
+
+    assert dict(record) == {**info, 'imports': ('os', 'hashlib'), 'exports': (), 'keywords': ('auth',),
+                            'frameworks': (), 'functions': ('check',), 'classes': ('LoginService',)}
+    assert record.to_dict() == info
+    assert record['language'] == 'python' and record.get('imports') == ('os', 'hashlib')
+    assert record.get('missing') is None
+    with pytest.raises(KeyError):
+        record['missing']
+    # Unknown languages and file types get codes on demand
+    assert FileRecord('x.zig', language='zig', file_type='generated').to_dict()['language'] == 'zig'
+
+
+def test_directories_share_purposes():
+    purpose = {'category': 'auth', 'confidence': 0.8, 'indicators': ['directory_name:auth']}
+    first = DirectoryRecord(subdirs=['a'], purpose=purpose, files=['x.py'])
+    second = DirectoryRecord(purpose=dict(purpose))
+    assert first._purpose is second._purpose
+    assert first.to_dict() == {'files': ['x.py'], 'subdirs': ['a'], 'purpose': purpose}
+    assert DirectoryRecord().purpose == {'category': 'unknown', 'confidence': 0.0, 'indicators': []}
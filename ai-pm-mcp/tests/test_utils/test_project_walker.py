@@ -0,0 +1,154 @@
+"""
+Tests for the pruning project walker and its .gitignore matcher.
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.project_walker import ProjectWalker, _translate_glob, parse_gitignore
+
+
+def ignored(lines, rel_path, is_dir=False, base=""):
+    return ProjectWalker._gitignored(parse_gitignore(lines, base), rel_path, is_dir)
+
+
+@pytest.mark.parametrize("pattern, path, expected", [
+    ("*.log", "debug.log", True),
+    ("*.log", "logs/debug.log", False),
+    ("a/**/b", "a/b", True),
+    ("a/**/b", "a/x/y/b", True),
+    ("**/b", "x/y/b", True),
+    ("a/**", "a/x/y", True),
+    ("a/**", "a", False),
+    ("fo?.txt", "foo.txt", True),
+    ("fo?.txt", "fo/.txt", False),
+    ("[abc].py", "b.py", True),
+    ("[!abc].py", "b.py", False),
+    ("[!abc].py", "d.py", True),
+    ("\\*.txt", "*.txt", True),
+    ("\\*.txt", "a.txt", False),
+    ("a[b", "a[b", True),
+])
+def test_translate_glob(pattern, path, expected):
+    assert (re.fullmatch(_translate_glob(pattern), path) is not None) == expected
+
+
+def test_parse_gitignore_skips_comments_and_blank_lines():
+    rules = parse_gitignore(["# comment\n", "\n", "   \n", "/\n", "*.pyc\n", "!keep.pyc\n"])
+    assert [rule.negate for rule in rules] == [False, True]
+
+
+@pytest.mark.parametrize("lines, path, is_dir, expected", [
+    # Unanchored patterns match at any depth, including parent directories
+    (["*.pyc"], "pkg/mod.pyc", False, True),
+    (["build"], "src/build/out.o", False, True),
+    # A slash anywhere but the end anchors the pattern to the .gitignore directory
+    (["/build"], "build", True, True),
+    (["/build"], "src/build", True, False),
+    (["docs/*.md"], "docs/a.md", False, True),
+    (["docs/*.md"], "x/docs/a.md", False, False),
+    # Trailing slash restricts a pattern to directories
+    (["out/"], "out", True, True),
+    (["out/"], "out", False, False),
+    (["out/"], "src/out", True, True),
+    # The last matching rule wins
+    (["*.log", "!keep.log"], "keep.log", False, False),
+    (["*.log", "!keep.log", "keep.log"], "keep.log", False, True),
+    (["!keep.log", "*.log"], "keep.log", False, True),
+    # A leading backslash escapes "!" and "#"
+    (["\\!important"], "!important", False, True),
+    (["\\#notes"], "#notes", False, True),
+])
+def test_gitignored(lines, path, is_dir, expected):
+    assert ignored(lines, path, is_dir) == expected
+
+
+def test_nested_gitignore_rules_are_relative_to_their_directory():
+    rules = parse_gitignore(["/generated"], base="src")
+    assert ProjectWalker._gitignored(rules, "src/generated", True)
+    assert not ProjectWalker._gitignored(rules, "generated", True)
+    assert not ProjectWalker._gitignored(rules, "srcx/generated", True)
+
+
+def make_tree(root: Path, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def walked(walker, **kwargs):
+    return sorted(entry.rel_path for entry in walker.walk(**kwargs))
+
+
+TREE = {
+    ".gitignore": "*.log\nbuild/\n!keep.log\n",
+    "app.py": "",
+    "debug.log": "",
+    "keep.log": "",
+    "build/out.o": "",
+    "src/main.py": "",
+    "src/.gitignore": "/generated\n*.tmp\n",
+    "src/generated/code.py": "",
+    "src/cache.tmp": "",
+    "src/lib/generated/ok.py": "",
+    "node_modules/pkg/index.js": "",
+    ".hidden/secret.txt": "",
+}
+
+
+def test_walk_applies_gitignore_and_excluded_dirs(tmp_path):
+    make_tree(tmp_path, TREE)
+    walker = ProjectWalker(tmp_path)
+    assert walked(walker) == [
+        ".gitignore", ".hidden/secret.txt", "app.py", "keep.log",
+        "src/.gitignore", "src/lib/generated/ok.py", "src/main.py",
+    ]
+    assert walker.stats["pruned"] >= 3  # build, src/generated, node_modules
+    assert walker.stats["ignored"] == 2  # debug.log, src/cache.tmp
+
+
+def test_walk_options(tmp_path):
+    make_tree(tmp_path, TREE)
+    assert ".hidden/secret.txt" not in walked(ProjectWalker(tmp_path, exclude_hidden=True))
+    assert "debug.log" in walked(ProjectWalker(tmp_path, respect_gitignore=False))
+    assert walked(ProjectWalker(tmp_path), max_depth=1) == [".gitignore", "app.py", "keep.log"]
+    assert "src/main.py" not in walked(ProjectWalker(tmp_path, exclude_patterns=["src/*"]))
+
+
+def test_walk_from_subdirectory_applies_parent_rules(tmp_path):
+    make_tree(tmp_path, {**TREE, "src/debug.log": ""})
+    assert walked(ProjectWalker(tmp_path), start=tmp_path / "src") == [
+        "src/.gitignore", "src/lib/generated/ok.py", "src/main.py",
+    ]
+
+
+def test_pruned_subdirs_are_not_descended(tmp_path):
+    make_tree(tmp_path, TREE)
+    visited = []
+    for rel_dir, subdirs, _ in ProjectWalker(tmp_path).walk_dirs():
+        visited.append(rel_dir)
+        subdirs[:] = [entry for entry in subdirs if entry.name != "src"]
+    assert "src" not in visited and "src/lib" not in visited
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_matches_git_check_ignore(tmp_path):
+    make_tree(tmp_path, TREE)
+    subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+    paths = [path for path in TREE if not path.startswith(("node_modules/", ".hidden/"))]
+    result = subprocess.run(["git", "check-ignore", "--no-index", "--stdin"], cwd=tmp_path,
+                            input="\n".join(paths), capture_output=True, text=True)
+    git_ignored = set(result.stdout.split())
+    walker_files = set(walked(ProjectWalker(tmp_path)))
+    for path in paths:
+        assert (path in git_ignored) == (path not in walker_files), path
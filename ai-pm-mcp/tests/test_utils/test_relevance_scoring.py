@@ -0,0 +1,142 @@
+"""
+Tests for batch relevance scoring against the per-candidate loops it replaced.
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import utils.relevance_scoring as relevance_scoring
+from utils.relevance_scoring import MATCH_SUBSTRING, TermIndex, TermIndexCache, rank, tokenize
+
+
+WORDS = ["auth", "login", "user", "session", "db", "model", "api", "test", "util", "main.py",
+         "handler", "token", "cache", "flow", "userauth", "log"]
+
+
+@pytest.fixture(params=["python", "numpy"])
+def backend(request, monkeypatch):
+    """Run each test against both the NumPy and the pure-Python accumulation."""
+    if request.param == "numpy":
+        if not relevance_scoring.HAS_NUMPY:
+            pytest.skip("numpy not installed")
+    else:
+        monkeypatch.setattr(relevance_scoring, "HAS_NUMPY", False)
+    return request.param
+
+
+def random_paths(rng, count):
+    return ["/".join(rng.choice(WORDS).replace(".py", "") + rng.choice(["", "_x", "-y"])
+                     for _ in range(rng.randint(1, 4))) + rng.choice(["", ".py"])
+            for _ in range(count)]
+
+
+def random_keywords(rng):
+    return {rng.choice(WORDS)[:rng.randint(2, 6)] for _ in range(rng.randint(1, 5))}
+
+
+def old_file_scores(files, keywords, primary_paths):
+    """The original filter_files_by_relevance scoring loop."""
+    scores = {}
+    for file_path in files:
+        score = 0
+        file_parts = file_path.lower().replace('/', ' ').replace('_', ' ').replace('-', ' ')
+        for keyword in keywords:
+            if keyword in file_parts:
+                score += 1
+        if any(theme_path in file_path for theme_path in primary_paths):
+            score += 0.5
+        scores[file_path] = score
+    return scores
+
+
+def old_flow_file_scores(flow_files, keywords, base):
+    """The original flow-file keyword loop of database flow selection."""
+    scores = list(base)
+    for i, flow_file in enumerate(flow_files):
+        file_keywords = set(flow_file.lower().replace("-flow.json", "").replace("-", " ").split())
+        scores[i] += len(keywords.intersection(file_keywords)) * 0.5
+    return scores
+
+
+def test_tokenize():
+    assert tokenize("Src/User_Auth-Flow  main.py") == ["src", "user", "auth", "flow", "main.py"]
+    assert tokenize("a.b/c", separators=".") == ["a", "b/c"]
+    assert tokenize("") == []
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_substring_scores_match_file_loop(backend, seed):
+    rng = random.Random(seed)
+    files = list(dict.fromkeys(random_paths(rng, 60)))
+    keywords = random_keywords(rng)
+    primary_paths = [path.split("/")[0] for path in files[:2]]
+
+    index = TermIndex([(path, {"path": path}) for path in files])
+    base = [0.5 if any(p in path for p in primary_paths) else 0.0 for path in files]
+    scores = index.score(keywords, {"path": 1.0}, match=MATCH_SUBSTRING, base=base)
+
+    expected = old_file_scores(files, keywords, primary_paths)
+    assert scores == pytest.approx([expected[path] for path in files])
+    assert {files[i] for i in rank(scores, min_score=0.5)} == \
+        {path for path, score in expected.items() if score >= 0.5}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_exact_scores_match_flow_file_loop(backend, seed):
+    rng = random.Random(seed)
+    flow_files = ["-".join(rng.choice(WORDS[:12]) for _ in range(rng.randint(1, 3))) + "-flow.json"
+                  for _ in range(30)]
+    keywords = {rng.choice(WORDS) for _ in range(4)}
+    base = [rng.choice([0.0, 0.5, 1.0, 1.3]) for _ in flow_files]
+
+    index = TermIndex([(i, {"file": flow_file.replace("-flow.json", "").replace("-", " ").split()})
+                       for i, flow_file in enumerate(flow_files)])
+    scores = index.score(keywords, {"file": 0.5}, base=base)
+
+    expected = old_flow_file_scores(flow_files, keywords, base)
+    assert scores == pytest.approx(expected)
+    # Stable descending sort, as sorted(..., reverse=True) produced
+    old_order = sorted(range(len(expected)), key=lambda i: expected[i], reverse=True)
+    assert rank(scores, limit=5) == old_order[:5]
+
+
+def test_keyword_counts_once_per_field_with_strongest_term(backend):
+    index = TermIndex([
+        ("a", {"name": {"auth": 0.4, "authentication": 0.9}, "tags": ["auth"]}),
+        ("b", {"name": "user auth auth", "tags": None}),
+    ])
+    scores = index.score(["auth", "auth"], {"name": 1.0, "tags": 2.0}, match=MATCH_SUBSTRING)
+    assert scores == pytest.approx([0.9 + 2.0, 1.0])
+    assert index.score(["auth"], {"missing": 1.0}) == [0.0, 0.0]
+
+
+def test_rank_ties_limit_and_threshold(backend):
+    scores = [1.0, 3.0, 1.0, 0.2, 3.0]
+    assert rank(scores) == [1, 4, 0, 2, 3]
+    assert rank(scores, limit=2) == [1, 4]
+    assert rank(scores, min_score=1.0) == [1, 4, 0, 2]
+    assert rank([]) == []
+
+
+def test_index_cache_rebuilds_on_stamp_change():
+    cache = TermIndexCache(max_indexes=1)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return [("a", {"path": "a/b"})]
+
+    first = cache.get("scope", 1, build)
+    assert cache.get("scope", 1, build) is first
+    assert cache.get("scope", 2, build) is not first
+    cache.get("other", 1, build)
+    cache.get("scope", 2, build)
+    assert len(builds) == 4
+    assert cache.get_stats()["indexes"] == 1
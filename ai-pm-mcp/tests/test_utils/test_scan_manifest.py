@@ -0,0 +1,224 @@
+"""
+Tests for the incremental scan manifest (scan, stream and pruning paths).
+"""
+
+import os
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+import database.file_metadata.scan_manifest as scan_manifest
+from database.file_metadata.scan_manifest import ScanManifest, fast_file_hash
+
+
+class ManifestDB:
+    """In-memory database with the scan_manifest table from schema.sql."""
+
+    def __init__(self):
+        schema = (parent_dir / "database" / "schema.sql").read_text()
+        ddl = re.search(r"CREATE TABLE IF NOT EXISTS scan_manifest \(.*?\);", schema, re.S).group(0)
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute(ddl)
+
+    def execute_query(self, query, params=()):
+        return self.connection.execute(query, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield self.connection
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+    def rows(self, scanner="test"):
+        return {row["file_path"]: dict(row) for row in self.execute_query(
+            "SELECT * FROM scan_manifest WHERE scanner = ?", (scanner,))}
+
+
+class Entry:
+    """WalkEntry-like file entry."""
+
+    def __init__(self, root: Path, rel_path: str):
+        self.rel_path = rel_path
+        self.fs_path = str(root / rel_path)
+        stat = os.stat(self.fs_path)
+        self.size = stat.st_size
+        self.mtime_ns = stat.st_mtime_ns
+
+
+class Analyzer:
+    """Counts calls and returns the file's word count."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, entry):
+        self.calls.append(entry.rel_path)
+        return {"words": len(Path(entry.fs_path).read_text().split())}
+
+    def many(self, entries):
+        return {entry.rel_path: self(entry) for entry in entries}
+
+
+@pytest.fixture
+def project(tmp_path):
+    for name, content in {"a.py": "one two", "b.py": "one", "sub/c.py": "one two three"}.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+def entries(root):
+    return [Entry(root, path.relative_to(root).as_posix()) for path in sorted(root.rglob("*.py"))]
+
+
+def bump_mtime(path: Path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_fast_file_hash(tmp_path):
+    path = tmp_path / "f"
+    path.write_bytes(b"data")
+    assert fast_file_hash(str(path)) == fast_file_hash(str(path))
+    assert len(fast_file_hash(str(path))) == 32
+    assert fast_file_hash(str(tmp_path / "missing")) is None
+
+
+def test_scan_reuses_unchanged_and_rehashed_files(project):
+    db, analyze = ManifestDB(), Analyzer()
+    manifest = ScanManifest(db, "test", analysis_version=1)
+
+    first = manifest.scan(entries(project), analyze)
+    assert first.summary()["analyzed"] == 3
+    assert first.results == {"a.py": {"words": 2}, "b.py": {"words": 1}, "sub/c.py": {"words": 3}}
+    assert set(db.rows()) == {"a.py", "b.py", "sub/c.py"}
+
+    analyze.calls.clear()
+    second = manifest.scan(entries(project), analyze)
+    assert (second.unchanged, second.analyzed, analyze.calls) == (3, 0, [])
+    assert second.results == first.results
+
+    # Touched but identical content: rehashed, not re-analyzed, stat refreshed
+    bump_mtime(project / "a.py")
+    (project / "b.py").write_text("one two three four")
+    third = manifest.scan(entries(project), analyze)
+    assert (third.unchanged, third.rehashed, third.analyzed) == (1, 1, 1)
+    assert analyze.calls == ["b.py"]
+    assert third.results["b.py"] == {"words": 4}
+    assert db.rows()["a.py"]["mtime_ns"] == (project / "a.py").stat().st_mtime_ns
+
+
+def test_scan_version_bump_reanalyzes(project):
+    db, analyze = ManifestDB(), Analyzer()
+    ScanManifest(db, "test", 1).scan(entries(project), analyze)
+    analyze.calls.clear()
+    result = ScanManifest(db, "test", 2).scan(entries(project), analyze)
+    assert result.analyzed == 3 and len(analyze.calls) == 3
+    assert {row["analysis_version"] for row in db.rows().values()} == {2}
+
+
+def test_scan_prunes_missing_files_per_scanner(project):
+    db, analyze = ManifestDB(), Analyzer()
+    ScanManifest(db, "test", 1).scan(entries(project), analyze)
+    ScanManifest(db, "other", 1).scan(entries(project), analyze)
+
+    (project / "sub" / "c.py").unlink()
+    kept = ScanManifest(db, "test", 1).scan(entries(project), analyze, prune_missing=False)
+    assert kept.removed == 0 and "sub/c.py" in db.rows()
+
+    pruned = ScanManifest(db, "test", 1).scan(entries(project), analyze)
+    assert pruned.removed == 1
+    assert set(db.rows()) == {"a.py", "b.py"}
+    assert "sub/c.py" in db.rows("other")
+
+
+def test_scan_batches_analyze_many_and_transforms_results(project, monkeypatch):
+    monkeypatch.setattr(scan_manifest, "ANALYZE_BATCH_SIZE", 2)
+    db, analyze = ManifestDB(), Analyzer()
+    batches = []
+
+    def analyze_many(batch):
+        batches.append([entry.rel_path for entry in batch])
+        results = analyze.many(batch)
+        results.pop("b.py", None)  # a failed file is reported as an error
+        return results
+
+    manifest = ScanManifest(db, "test", 1)
+    result = manifest.scan(entries(project), analyze_many=analyze_many, transform=lambda r: r["words"])
+    assert batches == [["a.py", "b.py"], ["sub/c.py"]]
+    assert result.results == {"a.py": 2, "sub/c.py": 3}
+    assert (result.analyzed, result.errors) == (2, 1)
+    # The manifest stores untransformed results
+    assert manifest.scan(entries(project), analyze, transform=lambda r: r).results["a.py"] == {"words": 2}
+
+
+def test_scan_without_database_analyzes_everything(project):
+    analyze = Analyzer()
+    manifest = ScanManifest(None, "test", 1)
+    manifest.scan(entries(project), analyze)
+    assert manifest.scan(entries(project), analyze).analyzed == 3
+    manifest.clear()
+
+
+def test_stream_yields_and_persists_per_batch(project):
+    db, analyze = ManifestDB(), Analyzer()
+    manifest = ScanManifest(db, "test", 1)
+    streamed = dict(manifest.stream(entries(project), analyze, batch_size=2))
+    assert streamed == {"a.py": {"words": 2}, "b.py": {"words": 1}, "sub/c.py": {"words": 3}}
+
+    analyze.calls.clear()
+    bump_mtime(project / "b.py")
+    (project / "sub" / "c.py").unlink()
+    counters = scan_manifest.ScanResult()
+    assert dict(manifest.stream(entries(project), analyze, scan=counters)) == \
+        {"a.py": {"words": 2}, "b.py": {"words": 1}}
+    assert analyze.calls == []
+    assert (counters.unchanged, counters.rehashed, counters.removed) == (1, 1, 1)
+    assert counters.results == {}
+    assert set(db.rows()) == {"a.py", "b.py"}
+
+
+def test_stream_stopped_early_keeps_unseen_rows(project):
+    db, analyze = ManifestDB(), Analyzer()
+    manifest = ScanManifest(db, "test", 1)
+    manifest.scan(entries(project), analyze)
+
+    streamed = []
+    counters = scan_manifest.ScanResult()
+    for rel_path, _ in manifest.stream(entries(project), analyze, scan=counters,
+                                       keep_going=lambda: len(streamed) < 2):
+        streamed.append(rel_path)
+    assert streamed == ["a.py", "b.py"]
+    assert counters.removed == 0
+    assert set(db.rows()) == {"a.py", "b.py", "sub/c.py"}
+
+
+def test_stream_closed_early_persists_analyzed_files(project):
+    db, analyze = ManifestDB(), Analyzer()
+    manifest = ScanManifest(db, "test", 1)
+    stream = manifest.stream(entries(project), analyze, batch_size=10)
+    assert next(stream)[0] == "a.py"
+    stream.close()
+    assert set(db.rows()) == {"a.py"}
+
+
+def test_clear_forces_full_rescan(project):
+    db, analyze = ManifestDB(), Analyzer()
+    manifest = ScanManifest(db, "test", 1)
+    manifest.scan(entries(project), analyze)
+    manifest.clear()
+    assert db.rows() == {}
+    assert manifest.scan(entries(project), analyze).analyzed == 3
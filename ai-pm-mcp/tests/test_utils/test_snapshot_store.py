@@ -0,0 +1,145 @@
+"""
+Tests for compressed, content-addressed session snapshot storage.
+"""
+
+import json
+import re
+import sqlite3
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from database.session.snapshot_store import BLOB_REF_PREFIX, MANIFEST_KEY, SnapshotStore
+
+
+class SnapshotDB:
+    """In-memory database with the snapshot tables from schema.sql."""
+
+    def __init__(self):
+        schema = (parent_dir / "database" / "schema.sql").read_text()
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.row_factory = sqlite3.Row
+        for table in ("session_context", "context_blobs", "task_queue"):
+            ddl = re.search(rf"CREATE TABLE IF NOT EXISTS {table} \(.*?\);", schema, re.S).group(0)
+            self.connection.execute(ddl)
+        self.queries = 0
+
+    def execute_query(self, query, params=()):
+        self.queries += 1
+        return self.connection.execute(query, params).fetchall()
+
+    @contextmanager
+    def transaction(self):
+        try:
+            yield self.connection
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+    def blob_count(self):
+        return self.connection.execute("SELECT COUNT(*) FROM context_blobs").fetchone()[0]
+
+
+def make_document(theme="auth", files=200):
+    return {
+        "primary_theme": theme,
+        "loaded_themes": [theme, "shared"],
+        "files": [f"src/{theme}/module_{i}.py" for i in range(files)],
+        "readmes": {"src/README.md": "Project sources. " * 40}
+    }
+
+
+def test_pack_round_trip_and_small_values_stay_inline():
+    db = SnapshotDB()
+    store = SnapshotStore(db)
+    document = make_document()
+    with db.transaction() as connection:
+        stored = store.pack(connection, document)
+
+    manifest = json.loads(stored)
+    assert manifest[MANIFEST_KEY] == 1
+    assert set(manifest["inline"]) == {"primary_theme", "loaded_themes"}
+    assert set(manifest["blobs"]) == {"files", "readmes"}
+    assert len(stored) < len(json.dumps(document)) // 10
+
+    # Read back through a fresh store so the payloads come from the database
+    assert SnapshotStore(db).unpack(stored) == document
+
+
+def test_identical_sub_documents_are_stored_once():
+    db = SnapshotDB()
+    store = SnapshotStore(db)
+    with db.transaction() as connection:
+        first = store.pack(connection, make_document())
+        # Same file list and README, different inline theme list
+        second = store.pack(connection, {**make_document(), "loaded_themes": ["auth"]})
+        third = store.pack(connection, make_document(theme="billing"))
+
+    assert json.loads(first)["blobs"] == json.loads(second)["blobs"]
+    assert db.blob_count() == 3
+    stats = store.get_stats()
+    assert (stats["blobs_written"], stats["blobs_deduplicated"], stats["blobs"]) == (3, 3, 3)
+    assert stats["compression_ratio"] > 1
+    assert store.unpack(third)["files"][0] == "src/billing/module_0.py"
+
+
+def test_pack_value_round_trip():
+    db = SnapshotDB()
+    store = SnapshotStore(db)
+    files = [f"src/file_{i}.py" for i in range(100)]
+    with db.transaction() as connection:
+        small = store.pack_value(connection, ["a.py"])
+        large = store.pack_value(connection, files)
+
+    assert small == '["a.py"]'
+    assert large.startswith(BLOB_REF_PREFIX)
+    assert SnapshotStore(db).unpack_value(large) == files
+    assert store.unpack_value(small) == ["a.py"]
+    assert store.unpack_value(None, default=[]) == []
+    assert store.unpack_value(BLOB_REF_PREFIX + "0" * 64, default=[]) == []
+
+
+def test_legacy_plain_json_rows_are_returned_unchanged():
+    store = SnapshotStore(SnapshotDB())
+    legacy = make_document(files=3)
+    assert store.unpack(json.dumps(legacy)) == legacy
+    assert store.unpack_value(json.dumps(["a.py", "b.py"])) == ["a.py", "b.py"]
+    assert store.unpack("") == {} and store.unpack("not json") == {}
+
+
+def test_reads_use_the_blob_cache():
+    db = SnapshotDB()
+    store = SnapshotStore(db, cache_size=1)
+    with db.transaction() as connection:
+        stored = store.pack(connection, make_document())
+
+    reader = SnapshotStore(db, cache_size=8)
+    reader.unpack(stored)
+    queries = db.queries
+    reader.unpack(stored)
+    assert db.queries == queries
+
+
+def test_collect_garbage_keeps_referenced_blobs():
+    db = SnapshotDB()
+    store = SnapshotStore(db)
+    with db.transaction() as connection:
+        kept = store.pack(connection, make_document())
+        # Shares its README blob with the kept snapshot; only its file list is orphaned
+        store.pack(connection, make_document(theme="billing"))
+        files = store.pack_value(connection, [f"src/file_{i}.py" for i in range(100)])
+        connection.execute("INSERT INTO task_queue (task_id, context_snapshot) VALUES (?, ?)",
+                           ("task-1", kept))
+        connection.execute("INSERT INTO session_context (session_id, files_accessed) VALUES (?, ?)",
+                           ("s1", files))
+
+    assert SnapshotStore.referenced_hashes([kept, files, None, "[]"]) == \
+        set(json.loads(kept)["blobs"].values()) | {files[len(BLOB_REF_PREFIX):]}
+    assert store.collect_garbage() == 1
+    assert db.blob_count() == 3
+    assert SnapshotStore(db).unpack(kept) == make_document()
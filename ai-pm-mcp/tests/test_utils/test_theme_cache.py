@@ -0,0 +1,67 @@
+"""
+Tests for the shared theme document cache and its read-only views.
+"""
+
+import copy
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.theme_cache import FrozenDict, FrozenList, ThemeDocumentCache, freeze, thaw
+
+
+THEME = {"name": "auth", "files": ["src/auth.py", "src/login.py"], "sharedFiles": {"src/db.py": ["data"]}}
+
+
+def test_views_keep_container_types():
+    view = freeze(THEME)
+    assert isinstance(view, dict) and isinstance(view, FrozenDict)
+    assert isinstance(view["files"], list) and isinstance(view["files"], FrozenList)
+    assert isinstance(view["sharedFiles"]["src/db.py"], list)
+    assert view == THEME
+    assert json.loads(json.dumps(view)) == THEME
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda view: view.__setitem__("name", "x"),
+    lambda view: view.update(name="x"),
+    lambda view: view.pop("name"),
+    lambda view: view["files"].append("x"),
+    lambda view: view["files"].extend(["x"]),
+    lambda view: view["files"].__setitem__(0, "x"),
+    lambda view: view["files"].sort(),
+    lambda view: view["files"].__iadd__(["x"]),
+    lambda view: view["sharedFiles"]["src/db.py"].clear(),
+])
+def test_views_are_read_only(mutate):
+    view = freeze(THEME)
+    with pytest.raises(TypeError):
+        mutate(view)
+    assert view == THEME
+
+
+def test_thaw_returns_independent_plain_copy():
+    view = freeze(THEME)
+    copy_ = thaw(view)
+    assert type(copy_) is dict and type(copy_["files"]) is list
+    copy_["files"].append("src/new.py")
+    assert view["files"] == THEME["files"]
+    assert copy.deepcopy(view) is view
+
+
+def test_cache_reparses_changed_files(tmp_path):
+    cache = ThemeDocumentCache()
+    path = tmp_path / "auth.json"
+    path.write_text(json.dumps(THEME))
+    first = cache.get(path)
+    assert cache.get(path) is first
+    path.write_text(json.dumps({**THEME, "files": ["src/other.py", "src/more.py", "src/x.py"]}))
+    cache.invalidate(path)
+    assert cache.get(path)["files"] == ["src/other.py", "src/more.py", "src/x.py"]
+    assert cache.get(tmp_path / "missing.json") is None
@@ -0,0 +1,43 @@
+"""
+Tests for the async theme discovery entry point and its synchronous wrapper.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the server root to Python path for flat imports
+parent_dir = Path(__file__).parent.parent.parent  # ai-pm-mcp/
+sys.path.insert(0, str(parent_dir))
+
+from utils.theme_discovery import ThemeDiscovery
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src/auth").mkdir(parents=True)
+    (tmp_path / "src/auth/login.py").write_text("import jwt\n\ndef login():\n    pass\n")
+    (tmp_path / "src/api").mkdir(parents=True)
+    (tmp_path / "src/api/routes.py").write_text("from flask import Flask\n")
+    return tmp_path
+
+
+def test_async_discovery_matches_sync_wrapper(project):
+    discovery = ThemeDiscovery()
+    result = asyncio.run(discovery.discover_themes_async(project))
+    assert {"authentication", "api"} <= set(result["themes"])
+    assert result["metadata"]["total_files"] == 2
+    assert discovery.discover_themes(project) == result
+
+
+def test_sync_wrapper_refuses_to_block_running_loop(project):
+    discovery = ThemeDiscovery()
+
+    async def run():
+        with pytest.raises(RuntimeError, match="discover_themes_async"):
+            discovery.discover_themes(project)
+        return await discovery.discover_themes_async(project)
+
+    assert asyncio.run(run())["themes"]
@@ -127,11 +127,15 @@ Cache Optimization:
             if recommendations_result["success"]:
                 recommendations = recommendations_result["recommendations"]
                 metrics = recommendations_result["project_metrics"]
+                size = metrics.get("size_estimate", {})
+                estimated_files = size.get('estimated_files')
+                files_label = f"~{estimated_files:,}" if estimated_files is not None else "unknown number of"
                 
                 response = f"""📊 Performance Analysis Report
 
 Project Metrics:
 • Large Project: {'Yes' if metrics.get('is_large_project', False) else 'No'}
+• Estimated Size: {size.get('size_class', 'unknown')} ({files_label} files, {size.get('confidence', 0):.0%} confidence)
 • Cache Hit Rate: {metrics.get('cache_hit_rate', 0):.2%}
 • Last Optimization: {metrics.get('last_optimization', 'Never')[:19]}
 
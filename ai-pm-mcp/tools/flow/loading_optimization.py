@@ -12,6 +12,7 @@ from datetime import datetime
 
 from .base_operations import BaseFlowOperations
 from ...utils.project_paths import get_flows_path
+from ...utils.relevance_scoring import get_term_index_cache, rank, MATCH_SUBSTRING
 
 logger = logging.getLogger(__name__)
 
@@ -253,35 +254,39 @@ class FlowLoadingOptimizer(BaseFlowOperations):
         selected_flows = []
         
         try:
-            # Get flows for themes from database
-            all_theme_flows = []
-            for theme in task_themes:
-                theme_flows = await self.theme_flow_queries.get_flows_for_theme(theme)
-                all_theme_flows.extend(theme_flows)
+            # Get flows for all themes from database in one query
+            flows_by_theme = self.theme_flow_queries.get_flows_for_themes_optimized(list(task_themes))
             
             # Remove duplicates and score by relevance
             flows_by_id = {}
-            for flow in all_theme_flows:
-                flow_id = flow["flow_id"]
-                if flow_id not in flows_by_id:
-                    flows_by_id[flow_id] = flow
-                    flows_by_id[flow_id]["relevance_score"] = 0
-                
-                # Increase relevance score
-                flows_by_id[flow_id]["relevance_score"] += 1.0 / (flow.get("relevance_order", 1))
+            for theme_flows in flows_by_theme.values():
+                for flow in theme_flows:
+                    flow_id = flow["flow_id"]
+                    if flow_id not in flows_by_id:
+                        flows_by_id[flow_id] = dict(flow)
+                        flows_by_id[flow_id]["relevance_score"] = 0
+                    
+                    # Increase relevance score
+                    flows_by_id[flow_id]["relevance_score"] += 1.0 / (flow.get("relevance_order") or 1)
+            
+            flows = list(flows_by_id.values())
+            scores = [flow["relevance_score"] for flow in flows]
             
             # Add task description relevance scoring
-            if task_description:
-                task_keywords = set(task_description.lower().split())
-                for flow_id, flow_info in flows_by_id.items():
-                    flow_name = flow_info.get("flow_file", "").lower()
-                    keyword_matches = sum(1 for keyword in task_keywords if keyword in flow_name)
-                    flows_by_id[flow_id]["relevance_score"] += keyword_matches * 0.5
+            if task_description and flows:
+                index = get_term_index_cache().get(
+                    scope=("db-flows", str(getattr(self.theme_flow_queries.db, "db_path", "")),
+                           tuple(sorted(task_themes))),
+                    stamp=tuple((flow["flow_id"], flow.get("flow_file")) for flow in flows),
+                    build=lambda: [(flow["flow_id"], {"file": flow.get("flow_file") or ""}) for flow in flows]
+                )
+                scores = index.score(task_description.lower().split(), {"file": 0.5},
+                                     match=MATCH_SUBSTRING, base=scores)
             
             # Sort by relevance and select top flows
-            sorted_flows = sorted(flows_by_id.values(), 
-                                key=lambda x: x["relevance_score"], reverse=True)
-            selected_flows = sorted_flows[:max_flows]
+            for i in rank(scores, limit=max_flows):
+                flows[i]["relevance_score"] = scores[i]
+                selected_flows.append(flows[i])
             
         except Exception as e:
             logger.error(f"Error in database flow selection: {e}")
@@ -291,46 +296,63 @@ class FlowLoadingOptimizer(BaseFlowOperations):
     async def _select_flows_file_based(self, flow_dir: Path, flow_index: Dict[str, Any],
                                      task_themes: List[str], task_description: str, 
                                      max_flows: int) -> List[Dict[str, Any]]:
-        """Select flows using file-based analysis."""
+        """
+        Select flows using file-based analysis.
+        
+        Every flow in the index is scored in one batch against a term index
+        built once per flow-index revision: primary themes weigh 2, secondary
+        themes 1, and task keywords found in the flow name or description 0.5
+        and 0.3.
+        """
         selected_flows = []
         flow_files = flow_index.get("flowFiles", {})
+        if not flow_files:
+            return selected_flows
         
-        # Score flows based on theme relevance
-        flow_scores = {}
-        for flow_id, flow_info in flow_files.items():
-            score = 0
-            
-            # Theme relevance
-            primary_themes = flow_info.get("primary_themes", [])
-            secondary_themes = flow_info.get("secondary_themes", [])
-            
-            for theme in task_themes:
-                if theme in primary_themes:
-                    score += 2
-                elif theme in secondary_themes:
-                    score += 1
-            
-            # Task description keyword matching
-            if task_description:
-                task_keywords = set(task_description.lower().split())
-                flow_name = flow_info.get("name", "").lower()
-                flow_desc = flow_info.get("description", "").lower()
-                
-                name_matches = sum(1 for keyword in task_keywords if keyword in flow_name)
-                desc_matches = sum(1 for keyword in task_keywords if keyword in flow_desc)
-                
-                score += name_matches * 0.5 + desc_matches * 0.3
-            
-            if score > 0:
-                flow_scores[flow_id] = score
+        index = get_term_index_cache().get(
+            scope=("index-flows", str(flow_dir)),
+            stamp=self._flow_index_stamp(flow_dir, flow_files),
+            build=lambda: [
+                (flow_id, {
+                    "themes": self._theme_weights(flow_info),
+                    "name": flow_info.get("name", ""),
+                    "description": flow_info.get("description", "")
+                })
+                for flow_id, flow_info in flow_files.items()
+            ]
+        )
         
-        # Select top scored flows
-        sorted_flows = sorted(flow_scores.items(), key=lambda x: x[1], reverse=True)
+        # Theme relevance
+        scores = index.score(task_themes, {"themes": 1.0})
         
-        for flow_id, score in sorted_flows[:max_flows]:
+        # Task description keyword matching
+        if task_description:
+            scores = index.score(task_description.lower().split(), {"name": 0.5, "description": 0.3},
+                                 match=MATCH_SUBSTRING, base=scores)
+        
+        # Select top scored flows
+        top_flows = [i for i in rank(scores) if scores[i] > 0][:max_flows]
+        for i in top_flows:
+            flow_id = index.ids[i]
             flow_info = flow_files[flow_id].copy()
             flow_info["flow_id"] = flow_id
-            flow_info["relevance_score"] = score
+            flow_info["relevance_score"] = scores[i]
             selected_flows.append(flow_info)
         
-        return selected_flows
\ No newline at end of file
+        return selected_flows
+    
+    @staticmethod
+    def _theme_weights(flow_info: Dict[str, Any]) -> Dict[str, float]:
+        """Theme term weights of a flow: primary themes 2, secondary themes 1."""
+        weights = {theme: 1.0 for theme in flow_info.get("secondary_themes", []) if isinstance(theme, str)}
+        weights.update({theme: 2.0 for theme in flow_info.get("primary_themes", []) if isinstance(theme, str)})
+        return weights
+    
+    @staticmethod
+    def _flow_index_stamp(flow_dir: Path, flow_files: Dict[str, Any]):
+        """Fingerprint of a loaded flow index: file mtime/size, else its flow IDs."""
+        try:
+            stat = (flow_dir / "flow-index.json").stat()
+            return (stat.st_mtime_ns, stat.st_size, len(flow_files))
+        except OSError:
+            return tuple(flow_files)
@@ -13,6 +13,7 @@ from datetime import datetime
 
 from .base_operations import BaseProjectOperations
 from ...utils.project_paths import get_management_folder_name
+from ...core.directive_modules.skeleton_manager import materialize_files
 
 logger = logging.getLogger(__name__)
 
@@ -169,7 +170,7 @@ class ProjectInitializationOperations(BaseProjectOperations):
         """Create the complete project management structure."""
         project_mgmt_dir = self.get_project_management_dir(project_path)
         
-        # Create directory structure (matching original exactly)
+        # Directory structure (matching original exactly)
         directories = [
             "ProjectBlueprint",
             "ProjectFlow",
@@ -186,9 +187,6 @@ class ProjectInitializationOperations(BaseProjectOperations):
             "database"
         ]
         
-        for dir_path in directories:
-            (project_mgmt_dir / dir_path).mkdir(parents=True, exist_ok=True)
-        
         # Create metadata
         metadata = {
             "projectName": project_name,
@@ -235,10 +233,8 @@ class ProjectInitializationOperations(BaseProjectOperations):
             }, indent=2)
         }
         
-        for file_path, content in files.items():
-            full_path = project_mgmt_dir / file_path
-            if not full_path.exists() or full_path.stat().st_size == 0:
-                full_path.write_text(content, encoding='utf-8')
+        # Batched atomic writes; missing or empty files are (re)written
+        materialize_files(project_mgmt_dir, files, directories=directories, replace_empty=True)
         
         # Initialize database
         await self._initialize_database_fallback(project_path)
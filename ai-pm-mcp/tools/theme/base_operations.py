@@ -10,7 +10,14 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
-from ...utils.project_paths import get_themes_path, get_flows_path
+try:
+    from ...utils.project_paths import get_themes_path, get_flows_path
+    from ...utils.theme_cache import get_theme_cache, load_theme_copy, load_theme_view
+    from ...utils.theme_graph import invalidate_theme_graphs
+except ImportError:
+    from utils.project_paths import get_themes_path, get_flows_path
+    from utils.theme_cache import get_theme_cache, load_theme_copy, load_theme_view
+    from utils.theme_graph import invalidate_theme_graphs
 
 logger = logging.getLogger(__name__)
 
@@ -33,15 +40,13 @@ class BaseThemeOperations:
         return get_flows_path(project_path, self.config_manager)
     
     def load_themes_index(self, themes_dir: Path) -> Optional[Dict[str, Any]]:
-        """Load themes index if it exists."""
+        """Load themes index if it exists (mutable copy, callers update and save it)."""
         themes_index_path = themes_dir / "themes.json"
-        if themes_index_path.exists():
-            try:
-                return json.loads(themes_index_path.read_text())
-            except json.JSONDecodeError as e:
-                logger.error(f"Error reading themes index: {e}")
-                return None
-        return None
+        try:
+            return load_theme_copy(themes_index_path)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error reading themes index: {e}")
+            return None
     
     def save_themes_index(self, themes_dir: Path, themes_index: Dict[str, Any]) -> bool:
         """Save themes index to file."""
@@ -49,21 +54,20 @@ class BaseThemeOperations:
         try:
             themes_dir.mkdir(parents=True, exist_ok=True)
             themes_index_path.write_text(json.dumps(themes_index, indent=2))
+            get_theme_cache().invalidate(themes_index_path)
             return True
         except Exception as e:
             logger.error(f"Error saving themes index: {e}")
             return False
     
     def load_theme(self, themes_dir: Path, theme_name: str) -> Optional[Dict[str, Any]]:
-        """Load a specific theme file."""
+        """Load a specific theme file (read-only view from the shared theme cache)."""
         theme_file_path = themes_dir / f"{theme_name}.json"
-        if theme_file_path.exists():
-            try:
-                return json.loads(theme_file_path.read_text())
-            except json.JSONDecodeError as e:
-                logger.error(f"Error reading theme {theme_name}: {e}")
-                return None
-        return None
+        try:
+            return load_theme_view(theme_file_path)
+        except json.JSONDecodeError as e:
+            logger.error(f"Error reading theme {theme_name}: {e}")
+            return None
     
     def save_theme(self, themes_dir: Path, theme_name: str, theme_data: Dict[str, Any]) -> bool:
         """Save a theme to file."""
@@ -71,6 +75,8 @@ class BaseThemeOperations:
         try:
             themes_dir.mkdir(parents=True, exist_ok=True)
             theme_file_path.write_text(json.dumps(theme_data, indent=2))
+            get_theme_cache().invalidate(theme_file_path)
+            invalidate_theme_graphs()
             return True
         except Exception as e:
             logger.error(f"Error saving theme {theme_name}: {e}")
@@ -196,5 +202,7 @@ class BaseThemeOperations:
         if theme_file_path.exists():
             try:
                 theme_file_path.unlink()
+                get_theme_cache().invalidate(theme_file_path)
+                invalidate_theme_graphs()
             except Exception as e:
                 logger.error(f"Error removing theme file {theme_name}.json: {e}")
\ No newline at end of file
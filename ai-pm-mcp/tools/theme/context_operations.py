@@ -10,6 +10,9 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 
 from .base_operations import BaseThemeOperations
+from ...utils.theme_cache import load_theme_view
+from ...utils.concurrent_io import read_prefix, run_io
+from ...utils.inverted_index import PostingIndex
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +20,10 @@ logger = logging.getLogger(__name__)
 class ThemeContextOperations(BaseThemeOperations):
     """Handles theme context loading and management."""
     
+    # File samples keep the first lines of at most this many bytes
+    sample_max_bytes = 4096
+    sample_max_lines = 10
+    
     async def get_theme_context(self, project_path: Path, primary_theme: str,
                                context_mode: str = "theme-focused") -> str:
         """Get context for themes based on context mode."""
@@ -25,26 +32,24 @@ class ThemeContextOperations(BaseThemeOperations):
             themes_dir = self.get_themes_directory(project_path)
             
             # Load primary theme
-            primary_theme_file = themes_dir / f"{primary_theme}.json"
-            if not primary_theme_file.exists():
+            primary_theme_data = self.load_theme(themes_dir, primary_theme)
+            if primary_theme_data is None:
                 return f"Primary theme '{primary_theme}' not found."
             
-            primary_theme_data = json.loads(primary_theme_file.read_text())
             context = {
                 "contextMode": context_mode,
                 "primaryTheme": primary_theme,
                 "themes": [primary_theme_data],
-                "files": primary_theme_data.get("files", []),
-                "paths": primary_theme_data.get("paths", [])
+                "files": list(primary_theme_data.get("files", [])),
+                "paths": list(primary_theme_data.get("paths", []))
             }
             
             if context_mode == "theme-expanded":
                 # Load linked themes
-                linked_themes = primary_theme_data.get("linkedThemes", [])
+                linked_themes = list(primary_theme_data.get("linkedThemes", []))
                 for linked_theme in linked_themes:
-                    linked_theme_file = themes_dir / f"{linked_theme}.json"
-                    if linked_theme_file.exists():
-                        linked_theme_data = json.loads(linked_theme_file.read_text())
+                    linked_theme_data = self.load_theme(themes_dir, linked_theme)
+                    if linked_theme_data is not None:
                         context["themes"].append(linked_theme_data)
                         context["files"].extend(linked_theme_data.get("files", []))
                         context["paths"].extend(linked_theme_data.get("paths", []))
@@ -53,16 +58,14 @@ class ThemeContextOperations(BaseThemeOperations):
             
             elif context_mode == "project-wide":
                 # Load all themes
-                themes_index = themes_dir / "themes.json"
-                if themes_index.exists():
-                    all_themes = json.loads(themes_index.read_text())
+                all_themes = load_theme_view(themes_dir / "themes.json")
+                if all_themes is not None:
                     context["loadedThemes"] = list(all_themes.keys())
                     
                     for theme_name in all_themes.keys():
                         if theme_name != primary_theme:
-                            theme_file = themes_dir / f"{theme_name}.json"
-                            if theme_file.exists():
-                                theme_data = json.loads(theme_file.read_text())
+                            theme_data = self.load_theme(themes_dir, theme_name)
+                            if theme_data is not None:
                                 context["themes"].append(theme_data)
                                 context["files"].extend(theme_data.get("files", []))
                                 context["paths"].extend(theme_data.get("paths", []))
@@ -114,90 +117,97 @@ class ThemeContextOperations(BaseThemeOperations):
         return context
     
     async def _get_file_samples(self, project_path: Path, file_paths: List[str]) -> List[Dict[str, Any]]:
-        """Get sample content from theme files."""
-        samples = []
+        """Get sample content from theme files (prefixes read in parallel)."""
+        results = await run_io(
+            lambda file_path: self._sample_file(project_path, file_path), file_paths
+        )
         
-        for file_path in file_paths:
-            try:
-                full_path = project_path / file_path
-                if full_path.exists() and full_path.is_file():
-                    # Read file content (limited for context)
-                    file_size = full_path.stat().st_size
-                    if file_size > 10240:  # Skip files larger than 10KB
-                        continue
-                    
-                    try:
-                        content = full_path.read_text(encoding='utf-8', errors='ignore')
-                        # Get first few lines as sample
-                        lines = content.split('\n')[:10]
-                        sample_content = '\n'.join(lines)
-                        
-                        samples.append({
-                            "file_path": file_path,
-                            "file_type": full_path.suffix,
-                            "size_bytes": file_size,
-                            "sample_content": sample_content[:500],  # First 500 characters
-                            "line_count": len(content.split('\n'))
-                        })
-                    except Exception:
-                        # If can't read as text, just include metadata
-                        samples.append({
-                            "file_path": file_path,
-                            "file_type": full_path.suffix,
-                            "size_bytes": file_size,
-                            "sample_content": "[Binary or unreadable content]",
-                            "line_count": 0
-                        })
-            except Exception as e:
-                logger.debug(f"Error sampling file {file_path}: {e}")
+        samples = []
+        for file_path, result in zip(file_paths, results):
+            if isinstance(result, Exception):
+                logger.debug(f"Error sampling file {file_path}: {result}")
+            elif result is not None:
+                samples.append(result)
         
         return samples
     
+    def _sample_file(self, project_path: Path, file_path: str) -> Optional[Dict[str, Any]]:
+        """Read the first lines of one file without loading the whole file (blocking)."""
+        full_path = project_path / file_path
+        if not full_path.is_file():
+            return None
+        
+        try:
+            # Only the prefix is read, so large files can be sampled cheaply
+            prefix = read_prefix(full_path, max_bytes=self.sample_max_bytes, max_lines=self.sample_max_lines)
+            return {
+                "file_path": file_path,
+                "file_type": full_path.suffix,
+                "size_bytes": prefix.size_bytes,
+                "sample_content": prefix.text[:500],  # First 500 characters
+                "line_count": prefix.line_count,
+                "line_count_estimated": prefix.line_count_estimated
+            }
+        except Exception:
+            # If can't read as text, just include metadata
+            try:
+                size_bytes = full_path.stat().st_size
+            except OSError:
+                size_bytes = 0
+            return {
+                "file_path": file_path,
+                "file_type": full_path.suffix,
+                "size_bytes": size_bytes,
+                "sample_content": "[Binary or unreadable content]",
+                "line_count": 0
+            }
+    
     async def _find_theme_relationships(self, themes: Dict[str, Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Find relationships between themes."""
+        """Find relationships between themes.
+        
+        Keywords, files and flows are indexed to the themes that list them, and
+        overlaps are read from the posting lists, so only themes that actually
+        share something are paired.
+        """
         relationships = []
         theme_names = list(themes.keys())
         
-        for i, theme1_name in enumerate(theme_names):
-            for theme2_name in theme_names[i+1:]:
-                theme1 = themes[theme1_name]
-                theme2 = themes[theme2_name]
-                
-                # Find keyword overlaps
-                keywords1 = set(theme1["keywords"])
-                keywords2 = set(theme2["keywords"])
-                keyword_overlap = keywords1.intersection(keywords2)
-                
-                # Find file overlaps
-                files1 = set(theme1["files"])
-                files2 = set(theme2["files"])
-                file_overlap = files1.intersection(files2)
-                
-                # Find flow overlaps
-                flows1 = set(theme1["flows"])
-                flows2 = set(theme2["flows"])
-                flow_overlap = flows1.intersection(flows2)
-                
-                # Calculate relationship strength
-                total_overlap = len(keyword_overlap) + len(file_overlap) + len(flow_overlap)
-                
-                if total_overlap > 0:
-                    relationship_strength = self._calculate_relationship_strength(
-                        keyword_overlap, file_overlap, flow_overlap,
-                        len(keywords1) + len(keywords2),
-                        len(files1) + len(files2),
-                        len(flows1) + len(flows2)
-                    )
-                    
-                    relationships.append({
-                        "theme1": theme1_name,
-                        "theme2": theme2_name,
-                        "strength": relationship_strength,
-                        "keyword_overlap": list(keyword_overlap),
-                        "file_overlap": list(file_overlap),
-                        "flow_overlap": list(flow_overlap),
-                        "total_overlaps": total_overlap
-                    })
+        overlaps = {}
+        totals = {}
+        for field in ("keywords", "files", "flows"):
+            index = PostingIndex()
+            sizes = []
+            for theme_id, theme_name in enumerate(theme_names):
+                items = set(themes[theme_name][field])
+                index.add(theme_id, items)
+                sizes.append(len(items))
+            overlaps[field] = index.pair_overlaps()
+            totals[field] = sizes
+        
+        pairs = set(overlaps["keywords"]) | set(overlaps["files"]) | set(overlaps["flows"])
+        for theme1_id, theme2_id in sorted(pairs):
+            keyword_overlap = set(overlaps["keywords"].get((theme1_id, theme2_id), ()))
+            file_overlap = set(overlaps["files"].get((theme1_id, theme2_id), ()))
+            flow_overlap = set(overlaps["flows"].get((theme1_id, theme2_id), ()))
+            
+            # Calculate relationship strength
+            total_overlap = len(keyword_overlap) + len(file_overlap) + len(flow_overlap)
+            relationship_strength = self._calculate_relationship_strength(
+                keyword_overlap, file_overlap, flow_overlap,
+                totals["keywords"][theme1_id] + totals["keywords"][theme2_id],
+                totals["files"][theme1_id] + totals["files"][theme2_id],
+                totals["flows"][theme1_id] + totals["flows"][theme2_id]
+            )
+            
+            relationships.append({
+                "theme1": theme_names[theme1_id],
+                "theme2": theme_names[theme2_id],
+                "strength": relationship_strength,
+                "keyword_overlap": list(keyword_overlap),
+                "file_overlap": list(file_overlap),
+                "flow_overlap": list(flow_overlap),
+                "total_overlaps": total_overlap
+            })
         
         # Sort by relationship strength
         relationships.sort(key=lambda r: r["strength"], reverse=True)
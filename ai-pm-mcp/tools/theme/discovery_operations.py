@@ -4,14 +4,30 @@ Theme discovery operations.
 Handles automatic theme detection and discovery from project files.
 """
 
+import asyncio
 import json
 import logging
+import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from collections import Counter
 import re
 
 from .base_operations import BaseThemeOperations
+try:
+    from ...utils.project_walker import ProjectWalker
+    from ...utils.inverted_index import PostingIndex
+    from ...utils.content_classifier import read_analyzable_text
+    from ...utils.code_analysis import get_code_analysis_service, language_for_extension
+    from ...utils.concurrent_io import get_io_executor
+    from ...database.file_metadata.scan_manifest import ScanManifest, ScanResult
+except ImportError:
+    from utils.project_walker import ProjectWalker
+    from utils.inverted_index import PostingIndex
+    from utils.content_classifier import read_analyzable_text
+    from utils.code_analysis import get_code_analysis_service, language_for_extension
+    from utils.concurrent_io import get_io_executor
+    from database.file_metadata.scan_manifest import ScanManifest, ScanResult
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +35,13 @@ logger = logging.getLogger(__name__)
 class ThemeDiscoveryOperations(BaseThemeOperations):
     """Handles theme discovery and automatic detection."""
     
+    # Bump when _extract_keywords_from_file changes to invalidate cached keywords
+    KEYWORD_ANALYSIS_VERSION = 3
+    
+    # Defaults when no configuration is available (0 = unlimited)
+    DISCOVERY_BUDGET_SECONDS = 120
+    DISCOVERY_BUDGET_MB = 512
+    
     async def discover_themes(self, project_path: Path, force_rediscovery: bool = False) -> str:
         """Automatically discover themes in a project."""
         try:
@@ -60,6 +83,15 @@ class ThemeDiscoveryOperations(BaseThemeOperations):
             result = f"Theme discovery completed successfully{sync_result}:\n"
             result += f"- Themes discovered: {len(discovery_result['themes'])}\n"
             result += f"- Files analyzed: {discovery_result['files_analyzed']}\n"
+            scan = discovery_result.get("scan")
+            if scan:
+                result += f"- Files re-analyzed: {scan['analyzed']} ({scan['unchanged'] + scan['rehashed']} unchanged)\n"
+            coverage = discovery_result.get("coverage")
+            if coverage:
+                result += f"- Coverage: {coverage['coverage']:.0%} of {coverage['eligible_files']} eligible files"
+                if coverage["stopped_by"]:
+                    result += f" (stopped by {coverage['stopped_by'].replace('_', ' ')})"
+                result += "\n"
             result += f"- Discovery method: {discovery_result['method']}\n"
             result += f"- Themes directory: {themes_dir}\n\n"
             
@@ -82,63 +114,111 @@ class ThemeDiscoveryOperations(BaseThemeOperations):
             return f"Error discovering themes: {str(e)}"
     
     async def _discover_themes_basic(self, project_path: Path) -> Dict[str, Any]:
-        """Perform basic theme discovery using file patterns and content analysis."""
-        themes = {}
-        files_analyzed = 0
+        """
+        Perform basic theme discovery using file patterns and content analysis.
         
-        # Define file patterns to analyze
-        patterns = [
-            "*.py", "*.js", "*.ts", "*.jsx", "*.tsx",
-            "*.java", "*.cpp", "*.c", "*.h", "*.cs",
-            "*.md", "*.txt", "*.json", "*.yaml", "*.yml",
-            "*.html", "*.css", "*.scss", "*.less"
-        ]
+        The walk, file reads, hashing and manifest writes run on the shared I/O
+        executor so a large project does not block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_io_executor(), self._discover_themes_sync, Path(project_path))
+    
+    def _discover_themes_sync(self, project_path: Path) -> Dict[str, Any]:
+        """
+        Blocking part of basic theme discovery.
         
-        # Collect all files to analyze
-        files_to_analyze = []
-        for pattern in patterns:
-            files_to_analyze.extend(project_path.rglob(pattern))
+        Files are streamed from the project walker through the scan manifest;
+        only aggregated keyword counts and an inverted index (keyword -> file
+        ids) are kept, and theme files are the union of their keywords' postings.
+        Analysis stops when the configured time or byte budget is spent, and
+        the result reports how much of the project was covered.
+        """
+        themes = {}
         
-        # Exclude common directories
-        excluded_dirs = {
-            '.git', '.svn', 'node_modules', '__pycache__', '.pytest_cache',
-            'venv', 'env', '.venv', 'build', 'dist', 'target'
+        # Define file types to analyze
+        extensions = {
+            ".py", ".js", ".ts", ".jsx", ".tsx",
+            ".java", ".cpp", ".c", ".h", ".cs",
+            ".md", ".txt", ".json", ".yaml", ".yml",
+            ".html", ".css", ".scss", ".less"
         }
         
-        # Filter out files in excluded directories
-        filtered_files = []
-        for file_path in files_to_analyze:
-            if not any(excluded_dir in file_path.parts for excluded_dir in excluded_dirs):
-                filtered_files.append(file_path)
+        budget_seconds, budget_bytes = self._get_discovery_budget()
+        started = time.perf_counter()
+        counts = {"eligible": 0, "skipped_large": 0, "bytes_read": 0}
+        stopped_by = None
+        
+        def candidates():
+            # One pruning walk (excluded directories, .gitignore and the management
+            # folder are never descended into); files > 1MB are skipped
+            walker = ProjectWalker(project_path, config_manager=self.config_manager, exclude_management=True)
+            for entry in walker.walk():
+                if entry.suffix not in extensions:
+                    continue
+                try:
+                    size = entry.size
+                except OSError as e:
+                    logger.debug(f"Error analyzing file {entry.fs_path}: {e}")
+                    continue
+                counts["eligible"] += 1
+                if size >= 1024 * 1024:
+                    counts["skipped_large"] += 1
+                    continue
+                yield entry
+        
+        def within_budget() -> bool:
+            nonlocal stopped_by
+            if budget_seconds and time.perf_counter() - started > budget_seconds:
+                stopped_by = "time_budget"
+            elif budget_bytes and counts["bytes_read"] >= budget_bytes:
+                stopped_by = "byte_budget"
+            return stopped_by is None
+        
+        def analyze(entry) -> List[str]:
+            keywords, bytes_read = self._extract_keywords_with_size(entry.path, entry.size)
+            counts["bytes_read"] += bytes_read
+            return keywords
         
-        # Analyze files for theme detection
+        # Stream files through the manifest, aggregating as results arrive
         keyword_counter = Counter()
-        file_themes = {}
+        file_paths: List[str] = []
+        keyword_files = PostingIndex()
         
-        for file_path in filtered_files[:500]:  # Limit to first 500 files for performance
-            try:
-                if file_path.is_file() and file_path.stat().st_size < 1024 * 1024:  # Skip files > 1MB
-                    files_analyzed += 1
-                    file_keywords = self._extract_keywords_from_file(file_path)
-                    
-                    if file_keywords:
-                        keyword_counter.update(file_keywords)
-                        file_themes[str(file_path.relative_to(project_path))] = file_keywords
-                        
-            except Exception as e:
-                logger.debug(f"Error analyzing file {file_path}: {e}")
-                continue
+        manifest = ScanManifest(self._get_scan_db(), "theme_keywords", self.KEYWORD_ANALYSIS_VERSION)
+        scan = ScanResult()
+        remaining = candidates()
+        for rel_path, file_keywords in manifest.stream(remaining, analyze, scan=scan, keep_going=within_budget):
+            if file_keywords:
+                keyword_counter.update(file_keywords)
+                keyword_files.add(len(file_paths), file_keywords)
+                file_paths.append(rel_path)
+        files_analyzed = scan.unchanged + scan.rehashed + scan.analyzed
+        
+        # Count what the budget left out (walk only, nothing is read)
+        for _ in remaining:
+            pass
+        
+        analyzable = counts["eligible"] - counts["skipped_large"]
+        coverage = {
+            "eligible_files": counts["eligible"],
+            "skipped_large_files": counts["skipped_large"],
+            "analyzed_files": files_analyzed,
+            "coverage": round(files_analyzed / analyzable, 3) if analyzable else 1.0,
+            "complete": stopped_by is None,
+            "stopped_by": stopped_by,
+            "bytes_read": counts["bytes_read"],
+            "elapsed_seconds": round(time.perf_counter() - started, 2)
+        }
+        if stopped_by:
+            logger.warning(f"Theme discovery stopped by {stopped_by}: analyzed {files_analyzed} of {analyzable} files")
         
         # Group keywords into themes
         theme_groups = self._group_keywords_into_themes(keyword_counter)
         
         # Create theme objects
         for theme_name, theme_keywords in theme_groups.items():
-            # Find files associated with this theme
-            theme_files = []
-            for file_path, file_keywords in file_themes.items():
-                if any(keyword in file_keywords for keyword in theme_keywords):
-                    theme_files.append(file_path)
+            # Files associated with this theme: union of its keywords' postings
+            theme_files = [file_paths[file_id] for file_id in keyword_files.members(theme_keywords)]
             
             # Create theme data structure
             theme_data = self.create_default_theme(
@@ -163,6 +243,8 @@ class ThemeDiscoveryOperations(BaseThemeOperations):
             "themes": themes,
             "files_analyzed": files_analyzed,
             "method": "basic_keyword_analysis",
+            "scan": scan.summary(),
+            "coverage": coverage,
             "statistics": {
                 "total_keywords": len(keyword_counter),
                 "most_common_keywords": keyword_counter.most_common(10),
@@ -170,17 +252,55 @@ class ThemeDiscoveryOperations(BaseThemeOperations):
             }
         }
     
-    def _extract_keywords_from_file(self, file_path: Path) -> List[str]:
+    def _get_discovery_budget(self) -> Tuple[float, int]:
+        """Time (seconds) and byte budgets for basic discovery; 0 means unlimited."""
+        seconds, megabytes = self.DISCOVERY_BUDGET_SECONDS, self.DISCOVERY_BUDGET_MB
+        if self.config_manager:
+            try:
+                project_config = self.config_manager.get_config().project
+                seconds = getattr(project_config, "theme_discovery_budget_seconds", seconds)
+                megabytes = getattr(project_config, "theme_discovery_budget_mb", megabytes)
+            except Exception as e:
+                logger.debug(f"Using default theme discovery budget: {e}")
+        return float(seconds), int(megabytes * 1024 * 1024)
+    
+    def _get_scan_db(self):
+        """Database holding the scan manifest, when database integration is available."""
+        for queries in (self.file_metadata_queries, self.theme_flow_queries):
+            db = getattr(queries, "db", None)
+            if db is not None:
+                return db
+        return None
+    
+    def _extract_keywords_from_file(self, file_path: Path, file_size: Optional[int] = None) -> List[str]:
         """Extract potential theme keywords from a file."""
+        return self._extract_keywords_with_size(file_path, file_size)[0]
+    
+    def _extract_keywords_with_size(self, file_path: Path, file_size: Optional[int] = None) -> Tuple[List[str], int]:
+        """Extract potential theme keywords from a file, with the number of bytes read from it."""
+        bytes_read = 0
         try:
-            # Read file content
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
+            # Read file content (binary, minified and generated files are skipped or sampled)
+            content, classification = read_analyzable_text(file_path, file_size, errors='ignore')
+            bytes_read = classification.bytes_read
+            if content is None:
+                return [], bytes_read
             
             # Extract keywords based on file type
             keywords = set()
             
-            # Common programming keywords and patterns
-            if file_path.suffix in ['.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.cs']:
+            # Python and JavaScript/TypeScript: shared (memoized) code analysis
+            language = language_for_extension(file_path.suffix)
+            if language:
+                analysis = get_code_analysis_service().analyze(content, language)
+                keywords.update(self._normalize_keywords(analysis['classes']))
+                keywords.update(self._normalize_keywords(analysis['functions']))
+                # Root package of each import ("django.db" -> "django", "@scope/pkg/x" -> "scope")
+                import_roots = [re.split(r'[./]', module.lstrip('.@/'))[0] for module in analysis['imports']]
+                keywords.update(self._normalize_keywords(import_roots))
+            
+            # Other programming languages: patterns
+            elif file_path.suffix in ['.java', '.cpp', '.c', '.cs']:
                 # Extract class names
                 class_matches = re.findall(r'class\s+(\w+)', content, re.IGNORECASE)
                 keywords.update(self._normalize_keywords(class_matches))
@@ -227,11 +347,11 @@ class ThemeDiscoveryOperations(BaseThemeOperations):
                 if len(keyword) >= 3 and keyword.lower() not in {'the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can', 'had', 'was', 'one', 'our', 'out', 'get', 'use', 'man', 'new', 'now', 'way', 'its', 'two', 'how', 'may', 'say', 'she', 'has', 'her', 'him', 'his', 'who', 'oil', 'sit', 'set', 'run', 'eat', 'far', 'sea', 'eye'}:
                     filtered_keywords.append(keyword)
             
-            return filtered_keywords[:20]  # Limit to top 20 keywords per file
+            return filtered_keywords[:20], bytes_read  # Limit to top 20 keywords per file
             
         except Exception as e:
             logger.debug(f"Error extracting keywords from {file_path}: {e}")
-            return []
+            return [], bytes_read
     
     def _normalize_keywords(self, keywords: List[str]) -> List[str]:
         """Normalize keywords by cleaning and standardizing them."""
@@ -317,12 +437,10 @@ class ThemeDiscoveryOperations(BaseThemeOperations):
         """Get files in a directory with depth limit."""
         files = []
         try:
-            for item in directory.rglob('*'):
-                if item.is_file() and self._is_source_file(item):
-                    rel_path = item.relative_to(project_path)
-                    # Check depth
-                    if len(rel_path.parts) <= max_depth:
-                        files.append(str(rel_path))
+            walker = ProjectWalker(project_path, config_manager=self.config_manager)
+            for entry in walker.walk(start=directory, max_depth=max_depth):
+                if self._is_source_file(entry.path):
+                    files.append(entry.rel_path)
         except Exception as e:
             logger.warning(f"Error scanning directory {directory}: {e}")
         return files[:50]  # Limit to 50 files per theme
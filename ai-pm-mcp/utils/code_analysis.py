@@ -0,0 +1,506 @@
+"""
+Shared per-language source analysis with content-hash memoization.
+
+FileAnalyzer, DependencyAnalysis and theme keyword extraction each ran their
+own set of regex passes over the same Python and JavaScript files, so one
+project initialization analyzed many files two or three times. This service
+parses a file's content once per language and memoizes the result by content
+hash, in memory and in an on-disk cache shared by processes and sessions
+(bounded in size and age; least recently used entries are pruned):
+
+- Python: one ast.parse() (tokenize-based fallback for files that do not parse)
+- JavaScript/TypeScript: one pass of a combined scanner that skips comments and
+  string literals while collecting imports, exports, functions and classes
+
+Results are plain JSON-compatible dicts and must be treated as read-only.
+"""
+
+import ast
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+import tokenize
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Bump when the analyzers change to invalidate memoized results
+CODE_ANALYSIS_VERSION = 1
+
+# Environment variable overriding the on-disk cache directory ("" disables it)
+CACHE_DIR_ENV = "AI_PM_ANALYSIS_CACHE_DIR"
+# Environment variable overriding the on-disk cache size limit in MB
+CACHE_MB_ENV = "AI_PM_ANALYSIS_CACHE_MB"
+DEFAULT_MEMORY_ENTRIES = 4096
+DEFAULT_DISK_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_MAX_AGE_SECONDS = 30 * 24 * 3600
+# The disk cache is pruned on the first write of a process and then every N writes
+PRUNE_INTERVAL_WRITES = 1000
+# Pruning over the size limit goes down to this share of it
+PRUNE_LOW_WATERMARK = 0.8
+
+LANGUAGE_EXTENSIONS = {
+    '.py': 'python', '.pyw': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.mjs': 'javascript', '.cjs': 'javascript',
+    '.ts': 'javascript', '.tsx': 'javascript', '.mts': 'javascript', '.cts': 'javascript'
+}
+
+PYTHON_FRAMEWORKS = (
+    'django', 'flask', 'fastapi', 'pyramid', 'tornado',
+    'sqlalchemy', 'pandas', 'numpy', 'tensorflow', 'pytorch'
+)
+JAVASCRIPT_FRAMEWORKS = {
+    'react': ('useState', 'useEffect', 'Component', 'jsx', 'tsx'),
+    'vue': ('Vue', 'createApp', 'defineComponent', '.vue'),
+    'angular': ('@Component', '@Injectable', 'NgModule'),
+    'express': ('express()', 'app.get', 'app.post'),
+    'nestjs': ('@Controller', '@Injectable', '@Module'),
+    'next': ('next/', 'getServerSideProps', 'getStaticProps')
+}
+
+_IDENTIFIER = r"[A-Za-z_$][\w$]*"
+_JS_SCANNER = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | \bimport\s+(?:type\s+)?(?:[\w*${}\s,]+?\s+from\s*)?(?P<q1>['"])(?P<import>[^'"\n]+)(?P=q1)
+  | \bexport\s+(?:type\s+)?(?:\*(?:\s+as\s+[\w$]+)?|\{[^}]*\})\s*from\s*(?P<q2>['"])(?P<reexport>[^'"\n]+)(?P=q2)
+  | \b(?:require|import)\s*\(\s*(?P<q3>['"])(?P<dynamic_import>[^'"\n]+)(?P=q3)\s*\)
+  | \bexport\s+(?:default\s+)?(?:declare\s+)?(?:abstract\s+)?(?:async\s+)?
+        (?P<export_kind>class|function\s*\*?|const|let|var|interface|type|enum)\s*(?P<export>""" + _IDENTIFIER + r""")
+  | \bexport\s*\{(?P<export_list>[^}]*)\}
+  | \bmodule\.exports\s*=\s*(?P<module_export>""" + _IDENTIFIER + r""")
+  | \bclass\s+(?P<class>""" + _IDENTIFIER + r""")
+  | \bfunction\s*\*?\s*(?P<function>""" + _IDENTIFIER + r""")
+  | \b(?:const|let|var)\s+(?P<arrow>""" + _IDENTIFIER + r""")\s*=\s*(?:async\s+)?
+        (?:function\b|\([^)]*\)\s*(?::[^=;]+)?=>|""" + _IDENTIFIER + r"""\s*=>)
+  | (?P<method>""" + _IDENTIFIER + r""")\s*:\s*(?:async\s+)?function\b
+  | (?P<string>'(?:\\.|[^'\\\n])*'|"(?:\\.|[^"\\\n])*"|`(?:\\.|[^`\\])*`)
+""", re.S | re.X)
+
+
+def language_for_extension(extension: str) -> Optional[str]:
+    """Analyzer language for a file extension (None when no analyzer applies)."""
+    return LANGUAGE_EXTENSIONS.get(extension.lower())
+
+
+def _unique(values: List[str]) -> List[str]:
+    return list(dict.fromkeys(values))
+
+
+def _empty_result(language: str) -> Dict[str, Any]:
+    return {
+        'language': language,
+        'parsed': True,
+        'imports': [],
+        'exports': [],
+        'functions': [],
+        'classes': [],
+        'constants': [],
+        'frameworks': []
+    }
+
+
+def analyze_python(content: str) -> Dict[str, Any]:
+    """Analyze Python source with one ast.parse() (tokenize fallback on syntax errors)."""
+    result = _empty_result('python')
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return _analyze_python_tokens(content)
+
+    imports, functions, classes = [], [], []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.module:
+                imports.append(node.module)
+            elif node.level:
+                # from . import views
+                imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            functions.append(node.name)
+        elif isinstance(node, ast.ClassDef):
+            classes.append(node.name)
+
+    exports, constants = [], []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            exports.append(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            for target in targets:
+                if isinstance(target, ast.Name) and target.id.isupper():
+                    constants.append(target.id)
+
+    result['imports'] = _unique(imports)
+    result['functions'] = _unique(functions)
+    result['classes'] = _unique(classes)
+    result['constants'] = _unique(constants)
+    result['exports'] = _unique(exports + constants)
+    result['frameworks'] = _python_frameworks(result['imports'])
+    return result
+
+
+def _python_frameworks(imports: List[str]) -> List[str]:
+    return _unique([module.split('.')[0] for module in imports
+                    if any(framework in module.lower() for framework in PYTHON_FRAMEWORKS)])
+
+
+def _analyze_python_tokens(content: str) -> Dict[str, Any]:
+    """Token-level extraction for Python that does not parse (partial on tokenizer errors)."""
+    result = _empty_result('python')
+    result['parsed'] = False
+    imports, functions, classes, constants = [], [], [], []
+    previous: List[tokenize.TokenInfo] = []
+    pending_import: Optional[List[str]] = None
+    at_line_start = True
+    try:
+        for token in tokenize.generate_tokens(io.StringIO(content).readline):
+            if token.type in (tokenize.COMMENT, tokenize.NL, tokenize.INDENT, tokenize.DEDENT):
+                continue
+            if token.type == tokenize.NEWLINE:
+                if pending_import:
+                    imports.append("".join(pending_import))
+                pending_import = None
+                at_line_start = True
+                previous = []
+                continue
+
+            if pending_import is not None:
+                if token.string in ('import', ',', 'as', '('):
+                    if pending_import:
+                        imports.append("".join(pending_import))
+                    # After "from x import", the imported names are not modules
+                    pending_import = [] if token.string == ',' and previous[0].string == 'import' else None
+                elif token.type == tokenize.NAME or token.string == '.':
+                    pending_import.append(token.string)
+            elif at_line_start and token.string in ('import', 'from'):
+                pending_import = []
+            elif previous and token.type == tokenize.NAME:
+                if previous[-1].string == 'def':
+                    functions.append(token.string)
+                elif previous[-1].string == 'class':
+                    classes.append(token.string)
+            elif (token.string == '=' and len(previous) == 1 and previous[0].type == tokenize.NAME
+                  and previous[0].start[1] == 0 and previous[0].string.isupper()):
+                constants.append(previous[0].string)
+
+            at_line_start = False
+            previous.append(token)
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        pass
+
+    result['imports'] = _unique([module.lstrip('.') for module in imports if module.strip('.')])
+    result['functions'] = _unique(functions)
+    result['classes'] = _unique(classes)
+    result['constants'] = _unique(constants)
+    result['exports'] = _unique(classes + functions + constants)
+    result['frameworks'] = _python_frameworks(result['imports'])
+    return result
+
+
+def analyze_javascript(content: str) -> Dict[str, Any]:
+    """Analyze JavaScript/TypeScript with a single pass of the combined scanner."""
+    result = _empty_result('javascript')
+    imports, exports, functions, classes = [], [], [], []
+    for match in _JS_SCANNER.finditer(content):
+        kind = match.lastgroup
+        if kind in ('comment', 'string'):
+            continue
+        if kind in ('import', 'reexport', 'dynamic_import'):
+            imports.append(match.group(kind))
+        elif kind == 'export':
+            name = match.group('export')
+            exports.append(name)
+            export_kind = match.group('export_kind')
+            if export_kind == 'class':
+                classes.append(name)
+            elif export_kind.startswith('function'):
+                functions.append(name)
+        elif kind == 'export_list':
+            for item in match.group('export_list').split(','):
+                # "a as b" exports b
+                name = item.strip().split()[-1] if item.strip() else ''
+                if name:
+                    exports.append(name)
+        elif kind == 'module_export':
+            exports.append(match.group(kind))
+        elif kind == 'class':
+            classes.append(match.group(kind))
+        elif kind in ('function', 'arrow', 'method'):
+            functions.append(match.group(kind))
+
+    result['imports'] = _unique(imports)
+    result['exports'] = _unique(exports)
+    result['functions'] = _unique(functions)
+    result['classes'] = _unique(classes)
+    result['frameworks'] = [framework for framework, indicators in JAVASCRIPT_FRAMEWORKS.items()
+                            if any(indicator in content for indicator in indicators)]
+    return result
+
+
+ANALYZERS = {
+    'python': analyze_python,
+    'javascript': analyze_javascript
+}
+
+
+def _default_disk_bytes() -> int:
+    configured = os.getenv(CACHE_MB_ENV)
+    if configured:
+        try:
+            return int(float(configured) * 1024 * 1024)
+        except ValueError:
+            logger.warning(f"Ignoring invalid {CACHE_MB_ENV}={configured!r}")
+    return DEFAULT_DISK_BYTES
+
+
+def _default_cache_dir() -> Optional[Path]:
+    configured = os.getenv(CACHE_DIR_ENV)
+    if configured is not None:
+        return Path(configured) if configured else None
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "ai-pm-mcp" / "code-analysis"
+
+
+class CodeAnalysisService:
+    """Per-language analysis memoized by content hash (memory LRU + bounded on-disk JSON cache)."""
+
+    def __init__(self, cache_dir: Optional[Union[str, Path]] = None,
+                 memory_entries: int = DEFAULT_MEMORY_ENTRIES, use_disk: bool = True,
+                 max_disk_bytes: Optional[int] = None,
+                 max_disk_age_seconds: float = DEFAULT_DISK_MAX_AGE_SECONDS):
+        """
+        Initialize the service.
+
+        Args:
+            cache_dir: On-disk cache directory (defaults to $AI_PM_ANALYSIS_CACHE_DIR
+                or ~/.cache/ai-pm-mcp/code-analysis)
+            memory_entries: Results kept in the in-memory LRU
+            use_disk: Persist results on disk
+            max_disk_bytes: Size limit of the on-disk cache (defaults to
+                $AI_PM_ANALYSIS_CACHE_MB or 64MB)
+            max_disk_age_seconds: Entries not used for this long are removed (0 = no limit)
+        """
+        self.cache_dir = (Path(cache_dir) if cache_dir is not None else _default_cache_dir()) if use_disk else None
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else _default_disk_bytes()
+        self.max_disk_age_seconds = max_disk_age_seconds
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_until_prune = 0
+        self._pruning = False
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "analyzed": 0, "disk_errors": 0,
+                      "pruned_entries": 0, "pruned_bytes": 0}
+
+    @staticmethod
+    def content_key(content: str, language: str) -> str:
+        """Cache key of a content/language pair (includes the analyzer version)."""
+        digest = hashlib.blake2b(content.encode('utf-8', errors='surrogatepass'), digest_size=16)
+        digest.update(f"\0{language}\0{CODE_ANALYSIS_VERSION}".encode('ascii'))
+        return digest.hexdigest()
+
+    def supports(self, language: Optional[str]) -> bool:
+        return language in ANALYZERS
+
+    def analyze(self, content: str, language: str) -> Dict[str, Any]:
+        """
+        Analyze content, reusing a memoized result for identical content.
+
+        Args:
+            content: Source text
+            language: 'python' or 'javascript' (see language_for_extension)
+
+        Returns:
+            Read-only result dict (language, parsed, imports, exports,
+            functions, classes, constants, frameworks)
+
+        Raises:
+            ValueError: When no analyzer exists for the language
+        """
+        analyzer = ANALYZERS.get(language)
+        if analyzer is None:
+            raise ValueError(f"No code analyzer for language '{language}'")
+
+        key = self.content_key(content, language)
+        with self._lock:
+            result = self._memory.get(key)
+            if result is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return result
+
+        result = self._read_disk(key)
+        if result is not None:
+            with self._lock:
+                self.stats["disk_hits"] += 1
+        else:
+            result = analyzer(content)
+            with self._lock:
+                self.stats["analyzed"] += 1
+            self._write_disk(key, result)
+
+        with self._lock:
+            self._memory[key] = result
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+        return result
+
+    def _disk_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as handle:
+                result = json.load(handle)
+            # The modification time doubles as the last-use time for pruning
+            os.utime(path)
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable code analysis cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, result: Dict[str, Any]):
+        if self.cache_dir is None:
+            return
+        path = self._disk_path(key)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as handle:
+                json.dump(result, handle, separators=(',', ':'))
+            os.replace(temp_path, path)
+            self._maybe_prune()
+        except OSError as e:
+            with self._lock:
+                self.stats["disk_errors"] += 1
+            logger.debug(f"Code analysis cache not writable ({e}); continuing in memory")
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+
+    def _maybe_prune(self):
+        """Start a background prune on the first write and then every PRUNE_INTERVAL_WRITES writes."""
+        with self._lock:
+            self._writes_until_prune -= 1
+            if self._writes_until_prune > 0 or self._pruning:
+                return
+            self._writes_until_prune = PRUNE_INTERVAL_WRITES
+            self._pruning = True
+        threading.Thread(target=self._prune_in_background, name="code-analysis-prune", daemon=True).start()
+
+    def _prune_in_background(self):
+        try:
+            self.prune()
+        except Exception as e:
+            logger.debug(f"Code analysis cache pruning failed: {e}")
+        finally:
+            with self._lock:
+                self._pruning = False
+
+    def prune(self) -> Dict[str, int]:
+        """
+        Remove stale and least recently used on-disk entries.
+
+        Entries unused for max_disk_age_seconds are removed; if the rest exceeds
+        max_disk_bytes, the least recently used ones are removed until the
+        cache is below PRUNE_LOW_WATERMARK of the limit.
+
+        Returns:
+            Counts of removed entries and bytes and of the bytes kept
+        """
+        removed = removed_bytes = 0
+        if self.cache_dir is None or not self.cache_dir.is_dir():
+            return {"removed": 0, "removed_bytes": 0, "kept_bytes": 0}
+
+        def remove(path: str, size: int):
+            nonlocal removed, removed_bytes
+            try:
+                os.unlink(path)
+            except OSError:
+                return
+            removed += 1
+            removed_bytes += size
+
+        now = time.time()
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as buckets:
+            for bucket in buckets:
+                if not bucket.is_dir(follow_symlinks=False):
+                    continue
+                with os.scandir(bucket.path) as files:
+                    for entry in files:
+                        try:
+                            stat = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        age = now - stat.st_mtime
+                        if entry.name.endswith(".tmp"):
+                            # Leftover of an interrupted write
+                            if age > 3600:
+                                remove(entry.path, stat.st_size)
+                        elif self.max_disk_age_seconds and age > self.max_disk_age_seconds:
+                            remove(entry.path, stat.st_size)
+                        else:
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+                            total += stat.st_size
+
+        if self.max_disk_bytes and total > self.max_disk_bytes:
+            target = self.max_disk_bytes * PRUNE_LOW_WATERMARK
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                remove(path, size)
+                total -= size
+
+        with self._lock:
+            self.stats["pruned_entries"] += removed
+            self.stats["pruned_bytes"] += removed_bytes
+        if removed:
+            logger.debug(f"Pruned {removed} code analysis cache entries ({removed_bytes} bytes)")
+        return {"removed": removed, "removed_bytes": removed_bytes, "kept_bytes": total}
+
+    def clear(self, disk: bool = False):
+        """Drop memoized results (and the on-disk cache when disk is True)."""
+        with self._lock:
+            self._memory.clear()
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            for entry in self.cache_dir.glob("*/*.json"):
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "memory_entries": len(self._memory),
+                    "cache_dir": str(self.cache_dir) if self.cache_dir else None,
+                    "max_disk_bytes": self.max_disk_bytes}
+
+
+_service: Optional[CodeAnalysisService] = None
+_service_lock = threading.Lock()
+
+
+def get_code_analysis_service() -> CodeAnalysisService:
+    """Get the process-wide code analysis service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = CodeAnalysisService()
+        return _service
@@ -0,0 +1,217 @@
+"""
+Concurrent file probing and prefix reads.
+
+Context loading probes many candidate paths (global project files, README
+names in every theme path) and reads only the start of each file. This module
+provides:
+
+- DirectoryListingCache: one os.scandir() per directory answers every name
+  probe in it, revalidated by the directory's mtime_ns
+- read_prefix(): reads at most N bytes / N lines instead of the whole file
+- run_io(): runs blocking I/O calls on a bounded shared thread pool from
+  async code
+"""
+
+import asyncio
+import fnmatch
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Bounded pool shared by all callers; file probes are I/O bound
+MAX_IO_WORKERS = min(16, (os.cpu_count() or 1) + 4)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Get the shared bounded I/O thread pool (created on first use)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_IO_WORKERS, thread_name_prefix="aipm-io")
+    return _executor
+
+
+async def run_io(func: Callable[..., Any], items: Iterable[Any]) -> List[Any]:
+    """
+    Run func(item) for every item on the shared I/O pool.
+
+    Args:
+        func: Blocking callable taking one item
+        items: Items to process
+
+    Returns:
+        Results in the same order as items (exceptions are returned, not raised)
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_io_executor()
+    futures = [loop.run_in_executor(executor, func, item) for item in items]
+    if not futures:
+        return []
+    return await asyncio.gather(*futures, return_exceptions=True)
+
+
+@dataclass
+class FilePrefix:
+    """The first bytes/lines of a file."""
+    text: str
+    size_bytes: int
+    truncated: bool
+    line_count: int
+    line_count_estimated: bool
+
+
+def read_prefix(path: Union[str, Path], max_bytes: int = 4096, max_lines: Optional[int] = None,
+                encoding: str = "utf-8") -> FilePrefix:
+    """
+    Read only the start of a file.
+
+    Args:
+        path: File to read
+        max_bytes: Maximum number of bytes read from disk
+        max_lines: Optional maximum number of lines kept from the prefix
+        encoding: Text encoding (undecodable bytes are dropped)
+
+    Returns:
+        FilePrefix; line_count is exact when the whole file fit in max_bytes
+        and otherwise extrapolated from the prefix
+
+    Raises:
+        OSError: If the file cannot be opened
+    """
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        raw = handle.read(max_bytes)
+
+    truncated = size > len(raw)
+    newlines = raw.count(b"\n")
+    if not truncated:
+        line_count = newlines + 1 if raw else 0
+    else:
+        line_count = max(newlines, 1) * size // max(len(raw), 1)
+
+    text = raw.decode(encoding, errors="ignore")
+    if max_lines is not None:
+        lines = text.split("\n")
+        if len(lines) > max_lines:
+            text = "\n".join(lines[:max_lines])
+            truncated = True
+
+    return FilePrefix(text=text, size_bytes=size, truncated=truncated,
+                      line_count=line_count, line_count_estimated=truncated and size > len(raw))
+
+
+class DirectoryListingCache:
+    """
+    Cached directory listings: {name: is_dir} per directory.
+
+    A listing is reused while the directory's mtime_ns is unchanged (adding,
+    removing or renaming an entry updates it), so a single stat replaces one
+    exists()/is_file()/is_dir() call per probed name.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of directory listings retained (LRU)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, Dict[str, bool]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "scans": 0}
+
+    def listing(self, directory: Union[str, Path]) -> Dict[str, bool]:
+        """
+        Get a directory's entries.
+
+        Args:
+            directory: Directory path
+
+        Returns:
+            Mapping of entry name to is_dir (empty if the directory is missing)
+        """
+        key = str(directory)
+        try:
+            mtime_ns = os.stat(key).st_mtime_ns
+        except OSError:
+            self.invalidate(key)
+            return {}
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == mtime_ns:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1]
+
+        names: Dict[str, bool] = {}
+        try:
+            with os.scandir(key) as iterator:
+                for dir_entry in iterator:
+                    try:
+                        names[dir_entry.name] = dir_entry.is_dir()
+                    except OSError:
+                        names[dir_entry.name] = False
+        except (NotADirectoryError, PermissionError, FileNotFoundError):
+            return {}
+
+        with self._lock:
+            self.stats["scans"] += 1
+            self._entries[key] = (mtime_ns, names)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return names
+
+    def find_first(self, directory: Union[str, Path], names: Iterable[str]) -> Optional[str]:
+        """First of names present as a file in directory, in priority order."""
+        listing = self.listing(directory)
+        for name in names:
+            if listing.get(name) is False:
+                return name
+        return None
+
+    def match(self, base: Union[str, Path], pattern: str) -> List[str]:
+        """
+        Resolve a relative path or glob pattern (e.g. "src/index.*") against base.
+
+        Returns:
+            Matching relative paths (files and directories)
+        """
+        parent, _, name = pattern.rpartition("/")
+        directory = Path(base) / parent if parent else Path(base)
+        listing = self.listing(directory)
+        prefix = f"{parent}/" if parent else ""
+        if not any(char in name for char in "*?["):
+            return [pattern] if name in listing else []
+        return sorted(prefix + entry for entry in listing if fnmatch.fnmatchcase(entry, name))
+
+    def invalidate(self, directory: Union[str, Path]):
+        """Drop the cached listing for a directory."""
+        with self._lock:
+            self._entries.pop(str(directory), None)
+
+    def clear(self):
+        """Drop all cached listings."""
+        with self._lock:
+            self._entries.clear()
+
+
+_listing_cache = DirectoryListingCache()
+
+
+def get_listing_cache() -> DirectoryListingCache:
+    """Get the process-wide directory listing cache."""
+    return _listing_cache
@@ -0,0 +1,205 @@
+"""
+Pre-read classification of files before content analysis.
+
+Keyword extraction, source analysis and dependency analysis used to read every
+file with a text extension in full. Lockfiles, minified bundles, source maps
+and binaries saved under text extensions are often the largest files in a
+project and carry no useful theme or dependency information. Before a file is
+read, this module inspects its name and first few KB:
+
+- known generated names (lockfiles, *.min.js, *.map, ...): skipped unread
+- NUL bytes or mostly control characters: binary, skipped
+- very long lines (minified or bundled code): skipped
+- generator markers ("@generated", "DO NOT EDIT", ...): only a sample is read
+- everything else: read in full
+
+When the file fits in the sniffed prefix, that prefix is the content and the
+file is not read a second time.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Prefix inspected before deciding how to read a file
+SNIFF_BYTES = 8192
+# Content read from files that are only sampled
+SAMPLE_BYTES = 64 * 1024
+
+# Lines this long (or a prefix without any newline) indicate minified code
+MAX_LINE_LENGTH = 1000
+MAX_AVERAGE_LINE_LENGTH = 300
+# Share of control characters above which content is treated as binary
+MAX_CONTROL_RATIO = 0.3
+# Prose may legitimately be written one paragraph per line
+PROSE_EXTENSIONS = frozenset({'.md', '.txt', '.rst', '.adoc'})
+
+ACTION_READ = "read"
+ACTION_SAMPLE = "sample"
+ACTION_SKIP = "skip"
+
+GENERATED_FILE_NAMES = frozenset({
+    'package-lock.json', 'npm-shrinkwrap.json', 'yarn.lock', 'pnpm-lock.yaml', 'bun.lockb',
+    'poetry.lock', 'pipfile.lock', 'uv.lock', 'pdm.lock', 'cargo.lock', 'composer.lock',
+    'gemfile.lock', 'go.sum', 'flake.lock', 'packages.lock.json', 'podfile.lock', 'mix.lock'
+})
+GENERATED_SUFFIXES = (
+    '.min.js', '.min.css', '.min.mjs', '.bundle.js', '.chunk.js', '.map',
+    '_pb2.py', '_pb2_grpc.py', '.pb.go', '.pb.cc', '.pb.h', '.g.dart', '.designer.cs'
+)
+GENERATED_MARKERS = (
+    b'@generated', b'do not edit', b'code generated by', b'auto-generated', b'autogenerated',
+    b'this file was automatically generated', b'this file is generated'
+)
+# Markers only count near the top of a file
+MARKER_WINDOW = 1024
+
+# Control characters other than tab, newline, form feed and carriage return
+_CONTROL_BYTES = bytes(range(32)).translate(None, b'\t\n\x0c\r')
+
+
+@dataclass
+class ContentClass:
+    """How a file should be read, and why."""
+    action: str
+    kind: str
+    reason: str
+    size: int
+    # Bytes actually read from the file
+    bytes_read: int = 0
+
+    @property
+    def analyzable(self) -> bool:
+        return self.action != ACTION_SKIP
+
+
+_stats = {"read": 0, "sample": 0, "skip": 0, "bytes_avoided": 0}
+_stats_lock = threading.Lock()
+
+
+def get_classifier_stats() -> dict:
+    """Counters of classified files and of bytes not read because of classification."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _record(classification: ContentClass, bytes_read: int):
+    with _stats_lock:
+        _stats[classification.action] += 1
+        _stats["bytes_avoided"] += max(classification.size - bytes_read, 0)
+
+
+def classify_name(name: str) -> Optional[str]:
+    """Reason a file name is known to be generated, or None."""
+    lowered = name.lower()
+    if lowered in GENERATED_FILE_NAMES:
+        return "lockfile"
+    if lowered.endswith(GENERATED_SUFFIXES):
+        return "generated_name"
+    return None
+
+
+def classify_prefix(head: bytes, complete: bool, prose: bool = False) -> Tuple[str, str, str]:
+    """
+    Classify content from its first bytes.
+
+    Args:
+        head: Prefix of the file
+        complete: Whether head is the entire file
+        prose: Content is prose, where long lines are not a minification sign
+
+    Returns:
+        (action, kind, reason)
+    """
+    if not head:
+        return ACTION_READ, "text", "empty"
+    if b'\x00' in head:
+        return ACTION_SKIP, "binary", "nul_bytes"
+    control = len(head) - len(head.translate(None, _CONTROL_BYTES))
+    if control / len(head) > MAX_CONTROL_RATIO:
+        return ACTION_SKIP, "binary", "control_characters"
+
+    if not prose:
+        lines = head.split(b'\n')
+        if not complete:
+            # The last line may continue past the prefix
+            lines = lines[:-1] or lines
+        longest = max(len(line) for line in lines)
+        average = sum(len(line) for line in lines) / len(lines)
+        if longest > MAX_LINE_LENGTH or (len(lines) > 1 and average > MAX_AVERAGE_LINE_LENGTH):
+            return ACTION_SKIP, "minified", "long_lines"
+
+    top = head[:MARKER_WINDOW].lower()
+    if any(marker in top for marker in GENERATED_MARKERS):
+        return ACTION_SAMPLE, "generated", "generated_marker"
+    return ACTION_READ, "text", "text"
+
+
+def _decode(data: bytes, errors: str) -> str:
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        if errors == 'strict':
+            raise
+        return data.decode('utf-8', errors=errors)
+
+
+def read_analyzable_text(path: Union[str, Path], size: Optional[int] = None,
+                         errors: str = 'ignore') -> Tuple[Optional[str], ContentClass]:
+    """
+    Classify a file and read as much of it as analysis should see.
+
+    Args:
+        path: File to read
+        size: Known file size (skips a stat call)
+        errors: UTF-8 decoding fallback ('ignore', 'replace' or 'strict' to raise)
+
+    Returns:
+        (content, classification); content is None for skipped files and
+        only the first SAMPLE_BYTES for sampled ones
+
+    Raises:
+        OSError: When the file cannot be read
+        UnicodeDecodeError: With errors='strict' and content that is not UTF-8
+    """
+    path = os.fspath(path)
+    name = os.path.basename(path)
+    if size is None:
+        size = os.stat(path).st_size
+
+    reason = classify_name(name)
+    if reason is not None:
+        classification = ContentClass(ACTION_SKIP, "generated", reason, size)
+        _record(classification, 0)
+        return None, classification
+
+    with open(path, 'rb') as handle:
+        head = handle.read(SNIFF_BYTES)
+        complete = len(head) < SNIFF_BYTES or size <= SNIFF_BYTES
+        prose = os.path.splitext(name)[1].lower() in PROSE_EXTENSIONS
+        action, kind, reason = classify_prefix(head, complete, prose)
+        classification = ContentClass(action, kind, reason, size)
+
+        if action == ACTION_SKIP:
+            data = None
+        elif complete:
+            data = head
+        elif action == ACTION_SAMPLE:
+            data = head + handle.read(max(SAMPLE_BYTES - len(head), 0))
+        else:
+            data = head + handle.read()
+
+    classification.bytes_read = len(data) if data is not None else len(head)
+    _record(classification, classification.bytes_read)
+    if data is None:
+        logger.debug(f"Skipping {kind} file {path} ({reason})")
+        return None, classification
+    if action == ACTION_SAMPLE and len(data) >= SAMPLE_BYTES:
+        # Do not cut a multi-byte character in half
+        return data.decode('utf-8', errors='ignore'), classification
+    return _decode(data, errors), classification
@@ -6,21 +6,126 @@ Provides file system operations, analysis, and theme discovery utilities.
 
 import os
 import re
-import ast
 import json
+import time
+import asyncio
 import logging
+import threading
+import multiprocessing
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple, Any
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .project_walker import ProjectWalker, DEFAULT_EXCLUDED_DIRS
+from .concurrent_io import get_io_executor
+from .content_classifier import read_analyzable_text
+from .code_analysis import get_code_analysis_service
+from .project_structure import ProjectStructure, FileRecord, DirectoryRecord, intern_str
+from .project_paths import get_database_path
+try:
+    from ..database.file_metadata.scan_manifest import ScanManifest
+except ImportError:
+    from database.file_metadata.scan_manifest import ScanManifest
 
 logger = logging.getLogger(__name__)
 
+# Parallel analysis: files per process-pool task, and smallest batch worth a pool
+PARALLEL_CHUNK_SIZE = 64
+PARALLEL_MIN_FILES = 256
+
+_process_executor: Optional[ProcessPoolExecutor] = None
+_process_executor_workers = 0
+_process_executor_lock = threading.Lock()
+
+# Per-process analyzer used by pool workers
+_worker_analyzer = None
+
+# Project databases opened for scan manifests when no db_manager is given
+_project_databases: Dict[str, Any] = {}
+_project_databases_lock = threading.Lock()
+
+
+def get_project_database(project_path: Path, config_manager=None):
+    """
+    DatabaseManager for an initialized project's project.db (shared per project).
+
+    Returns:
+        DatabaseManager, or None when the project has no database yet (one is
+        never created here)
+    """
+    db_path = get_database_path(project_path, config_manager)
+    key = str(db_path)
+    with _project_databases_lock:
+        db_manager = _project_databases.get(key)
+        if db_manager is not None or not db_path.is_file():
+            return db_manager
+        try:
+            from ..database.db_manager import DatabaseManager
+        except ImportError:
+            from database.db_manager import DatabaseManager
+        try:
+            db_manager = DatabaseManager(str(project_path), config_manager)
+            db_manager.connect()
+        except Exception as e:
+            logger.debug(f"Project database unavailable for scan manifest: {e}")
+            return None
+        _project_databases[key] = db_manager
+        return db_manager
+
+
+def _process_context():
+    """
+    Start method for pool workers.
+    
+    Forking a server process that already runs event loop and I/O threads can
+    copy held locks into the children, so workers are started from a clean
+    forkserver (or spawned where forkserver is unavailable).
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def get_process_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Get the shared file-analysis process pool, recreating it when the size changes."""
+    global _process_executor, _process_executor_workers
+    workers = max_workers or os.cpu_count() or 1
+    with _process_executor_lock:
+        if _process_executor is None or _process_executor_workers != workers:
+            if _process_executor is not None:
+                _process_executor.shutdown(wait=False)
+            _process_executor = ProcessPoolExecutor(max_workers=workers, mp_context=_process_context())
+            _process_executor_workers = workers
+        return _process_executor
+
+
+def shutdown_process_executor():
+    """Shut down the shared process pool (it is recreated on next use)."""
+    global _process_executor
+    with _process_executor_lock:
+        if _process_executor is not None:
+            _process_executor.shutdown(wait=False)
+            _process_executor = None
+
+
+def _analyze_chunk(chunk: List[Tuple[str, int]]) -> List[Dict[str, Any]]:
+    """Process-pool task: analyze a chunk of (path, size) pairs in order."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = FileAnalyzer()
+    return [_worker_analyzer._analyze_file(Path(path), size) for path, size in chunk]
+
 
 class FileAnalyzer:
     """Analyzes files for theme discovery and dependency tracking."""
     
-    def __init__(self, server_instance=None):
+    # Bump when _analyze_file changes to invalidate cached per-file analysis
+    FILE_ANALYSIS_VERSION = 3
+    
+    def __init__(self, server_instance=None, db_manager=None):
         self.server_instance = server_instance  # For directive hook integration
+        self.db_manager = db_manager  # Scan manifest storage (optional)
         self.programming_extensions = {
             '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.cpp', '.c', '.h',
             '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.scala',
@@ -35,11 +140,27 @@ class FileAnalyzer:
         self.doc_extensions = {
             '.md', '.txt', '.rst', '.adoc'
         }
+        
+        self.excluded_dirs = DEFAULT_EXCLUDED_DIRS | {'deps', 'dependencies'}
     
-    async def analyze_project_structure(self, project_path: Path) -> Dict[str, Any]:
-        """Analyze project structure for theme discovery."""
+    async def analyze_project_structure(self, project_path: Path, parallel: Optional[bool] = None,
+                                        max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyze project structure for theme discovery.
+        
+        Args:
+            project_path: Project root
+            parallel: Analyze files in a process pool (None = automatically for
+                batches of at least PARALLEL_MIN_FILES files on multi-core hosts)
+            max_workers: Process pool size (defaults to the CPU count)
+            
+        Returns:
+            ProjectStructure (a dict whose files and directories are compact
+            FileRecord / DirectoryRecord entries; to_dict() gives plain JSON),
+            including scan counters and analysis throughput
+        """
         try:
-            structure = {
+            structure = ProjectStructure({
                 'directories': {},
                 'files': [],
                 'imports': {},
@@ -47,56 +168,45 @@ class FileAnalyzer:
                 'patterns': {},
                 'frameworks': set(),
                 'languages': set()
-            }
+            })
             
-            # Walk through project directory
-            for root, dirs, files in os.walk(project_path):
-                root_path = Path(root)
-                relative_root = root_path.relative_to(project_path)
+            # Walk and analyze off the event loop; new and changed files are analyzed
+            # (in a process pool for large batches), unchanged ones reuse cached results
+            loop = asyncio.get_running_loop()
+            all_files, scan, throughput = await loop.run_in_executor(
+                get_io_executor(), self._walk_and_scan, Path(project_path), structure, parallel, max_workers
+            )
+            structure['scan'] = scan.summary()
+            structure['throughput'] = throughput
+            
+            results = scan.results
+            for entry in all_files:
+                # Records are handed over one by one so the scan result can be released
+                file_record = results.pop(entry.rel_path, None)
+                if file_record is None:
+                    continue
+                relative_root = entry.parent
+                file_record.path = entry.rel_path
+                file_record.directory = intern_str(relative_root or '.')
                 
-                # Skip hidden directories and common ignore patterns
-                dirs[:] = [d for d in dirs if not d.startswith('.') and d not in {
-                    'node_modules', '__pycache__', 'venv', 'env', 'dist', 'build',
-                    'target', '.git', '.svn', 'deps', 'dependencies'
-                }]
+                structure['files'].append(file_record)
                 
-                # Analyze directory structure
-                if relative_root != Path('.'):
-                    structure['directories'][str(relative_root)] = {
-                        'files': [],
-                        'subdirs': dirs.copy(),
-                        'purpose': self._analyze_directory_purpose(root_path, files)
-                    }
+                # Add to directory files
+                if relative_root in structure['directories']:
+                    structure['directories'][relative_root].files.append(file_record.name)
+                
+                # Collect imports and keywords
+                if file_record.imports:
+                    structure['imports'][entry.rel_path] = file_record.imports
+                
+                for keyword in file_record.keywords:
+                    structure['keywords'][keyword] += 1
                 
-                # Analyze files
-                for file in files:
-                    if file.startswith('.'):
-                        continue
-                        
-                    file_path = root_path / file
-                    relative_file = file_path.relative_to(project_path)
-                    
-                    file_info = self._analyze_file(file_path)
-                    file_info['path'] = str(relative_file)
-                    file_info['directory'] = str(relative_root)
-                    
-                    structure['files'].append(file_info)
-                    
-                    # Add to directory files
-                    if str(relative_root) in structure['directories']:
-                        structure['directories'][str(relative_root)]['files'].append(file)
-                    
-                    # Collect imports and keywords
-                    if file_info.get('imports'):
-                        structure['imports'][str(relative_file)] = file_info['imports']
-                    
-                    for keyword in file_info.get('keywords', []):
-                        structure['keywords'][keyword] += 1
-                    
-                    # Detect frameworks and languages
-                    structure['frameworks'].update(file_info.get('frameworks', []))
-                    if file_info.get('language'):
-                        structure['languages'].add(file_info['language'])
+                # Detect frameworks and languages
+                structure['frameworks'].update(file_record.frameworks)
+                if file_record.language:
+                    structure['languages'].add(file_record.language)
+            del all_files, scan
             
             # Convert sets to lists for JSON serialization
             structure['frameworks'] = list(structure['frameworks'])
@@ -130,6 +240,98 @@ class FileAnalyzer:
             logger.error(f"Error analyzing project structure: {e}")
             return {}
     
+    def _walk_and_scan(self, project_path: Path, structure: Dict[str, Any],
+                       parallel: Optional[bool], max_workers: Optional[int]):
+        """Walk the project, record directories, and analyze files through the scan manifest (blocking)."""
+        walker = ProjectWalker(
+            project_path,
+            excluded_dirs=self.excluded_dirs,
+            exclude_hidden=True,
+            config_manager=getattr(self.server_instance, 'config_manager', None)
+        )
+        all_files = []
+        for relative_root, dirs, files in walker.walk_dirs():
+            file_names = [entry.name for entry in files]
+            
+            # Analyze directory structure
+            if relative_root:
+                structure['directories'][intern_str(relative_root)] = DirectoryRecord(
+                    subdirs=[entry.name for entry in dirs],
+                    purpose=self._analyze_directory_purpose(project_path / relative_root, file_names)
+                )
+            all_files.extend(files)
+        
+        throughput = {'mode': 'cached', 'files': 0}
+        
+        def analyze_many(entries) -> Dict[str, Dict[str, Any]]:
+            results, stats = self.analyze_files(entries, parallel=parallel, max_workers=max_workers)
+            throughput.update(stats)
+            return results
+        
+        manifest = ScanManifest(self._get_scan_db(project_path), "file_analysis", self.FILE_ANALYSIS_VERSION)
+        scan = manifest.scan(all_files, analyze_many=analyze_many, transform=FileRecord.from_info)
+        return all_files, scan, throughput
+    
+    def analyze_files(self, entries: List[Any], parallel: Optional[bool] = None,
+                      max_workers: Optional[int] = None) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+        """
+        Analyze files serially or sharded across a process pool.
+        
+        Chunks of PARALLEL_CHUNK_SIZE files are analyzed by worker processes
+        and merged back in input order, so results do not depend on worker
+        scheduling.
+        
+        Args:
+            entries: WalkEntry-like objects (rel_path, fs_path, size)
+            parallel: Force (True) or disable (False) the process pool
+            max_workers: Process pool size (defaults to the CPU count)
+            
+        Returns:
+            Tuple of (file info keyed by relative path, throughput statistics)
+        """
+        started = time.perf_counter()
+        workers = max_workers or os.cpu_count() or 1
+        if parallel is None:
+            parallel = workers > 1 and len(entries) >= PARALLEL_MIN_FILES
+        
+        items = [(entry.fs_path, entry.size) for entry in entries]
+        chunks = [items[i:i + PARALLEL_CHUNK_SIZE] for i in range(0, len(items), PARALLEL_CHUNK_SIZE)]
+        infos = None
+        if parallel and items:
+            try:
+                executor = get_process_executor(workers)
+                infos = [info for chunk_infos in executor.map(_analyze_chunk, chunks) for info in chunk_infos]
+            except (BrokenProcessPool, OSError, RuntimeError) as e:
+                logger.warning(f"Parallel file analysis unavailable, analyzing serially: {e}")
+                shutdown_process_executor()
+                parallel = False
+        if infos is None:
+            infos = [self._analyze_file(Path(path), size) for path, size in items]
+        
+        results = {entry.rel_path: info for entry, info in zip(entries, infos)}
+        elapsed = time.perf_counter() - started
+        total_bytes = sum(size for _, size in items)
+        throughput = {
+            'mode': 'parallel' if parallel and items else 'serial',
+            'workers': min(workers, len(chunks)) if parallel and items else 1,
+            'files': len(items),
+            'bytes': total_bytes,
+            'seconds': round(elapsed, 3),
+            'files_per_second': round(len(items) / elapsed, 1) if elapsed > 0 else 0.0,
+            'mb_per_second': round(total_bytes / (1024 * 1024) / elapsed, 2) if elapsed > 0 else 0.0
+        }
+        logger.debug(f"Analyzed {len(items)} files: {throughput}")
+        return results, throughput
+    
+    def _get_scan_db(self, project_path: Optional[Path] = None):
+        """Database holding the scan manifest: explicit, from the server instance, or the project's project.db."""
+        if self.db_manager is not None:
+            return self.db_manager
+        db_manager = getattr(self.server_instance, 'db_manager', None)
+        if db_manager is None and project_path is not None:
+            db_manager = get_project_database(project_path, getattr(self.server_instance, 'config_manager', None))
+        return db_manager
+    
     def _analyze_directory_purpose(self, dir_path: Path, files: List[str]) -> Dict[str, Any]:
         """Analyze directory purpose based on name and contents."""
         dir_name = dir_path.name.lower()
@@ -198,8 +400,8 @@ class FileAnalyzer:
         
         return purpose
     
-    def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
-        """Analyze individual file for theme information."""
+    def _analyze_file(self, file_path: Path, file_size: Optional[int] = None) -> Dict[str, Any]:
+        """Analyze individual file for theme information (file_size skips the stat call)."""
         file_info = {
             'name': file_path.name,
             'extension': file_path.suffix.lower(),
@@ -216,7 +418,7 @@ class FileAnalyzer:
         
         try:
             # Get file size
-            file_info['size'] = file_path.stat().st_size
+            file_info['size'] = file_path.stat().st_size if file_size is None else file_size
             
             # Determine file type and language
             extension = file_path.suffix.lower()
@@ -229,13 +431,13 @@ class FileAnalyzer:
             
             if extension in self.programming_extensions:
                 # Analyze source code files
-                content = self._read_file_safely(file_path)
+                content = self._read_file_safely(file_path, file_info['size'])
                 if content:
                     file_info.update(self._analyze_source_code(content, extension))
             
             elif extension in self.config_extensions:
                 # Analyze configuration files
-                content = self._read_file_safely(file_path)
+                content = self._read_file_safely(file_path, file_info['size'])
                 if content:
                     file_info.update(self._analyze_config_file(content, extension))
             
@@ -245,17 +447,17 @@ class FileAnalyzer:
             logger.debug(f"Error analyzing file {file_path}: {e}")
             return file_info
     
-    def _read_file_safely(self, file_path: Path) -> Optional[str]:
-        """Safely read file content with encoding detection."""
+    def _read_file_safely(self, file_path: Path, file_size: Optional[int] = None) -> Optional[str]:
+        """Safely read file content with encoding detection.
+        
+        Binary, minified and generated files (lockfiles, bundles) are
+        recognized from their name and first few KB and skipped (None) or
+        only sampled, so they are never read in full.
+        """
         try:
-            # Try UTF-8 first
-            return file_path.read_text(encoding='utf-8')
-        except UnicodeDecodeError:
-            try:
-                # Try with error handling
-                return file_path.read_text(encoding='utf-8', errors='ignore')
-            except:
-                return None
+            # UTF-8, falling back to ignoring undecodable bytes
+            content, _ = read_analyzable_text(file_path, file_size, errors='ignore')
+            return content
         except Exception:
             return None
     
@@ -332,123 +534,42 @@ class FileAnalyzer:
         return info
     
     def _analyze_python_code(self, content: str) -> Dict[str, Any]:
-        """Analyze Python source code."""
+        """Analyze Python source code (parsed once by the shared code analysis service)."""
+        analysis = get_code_analysis_service().analyze(content, 'python')
+        
         info = {
-            'imports': [],
+            'imports': list(analysis['imports']),
             'exports': [],
             'keywords': [],
-            'frameworks': [],
-            'functions': [],
-            'classes': []
+            'frameworks': list(analysis['frameworks']),
+            'functions': list(analysis['functions']),
+            'classes': list(analysis['classes'])
         }
         
-        try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        info['imports'].append(alias.name)
-                        info['keywords'].extend(alias.name.split('.'))
-                
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        info['imports'].append(node.module)
-                        info['keywords'].extend(node.module.split('.'))
-                        
-                        # Detect frameworks
-                        if any(fw in node.module.lower() for fw in [
-                            'django', 'flask', 'fastapi', 'pyramid', 'tornado',
-                            'sqlalchemy', 'pandas', 'numpy', 'tensorflow', 'pytorch'
-                        ]):
-                            info['frameworks'].append(node.module.split('.')[0])
-                
-                elif isinstance(node, ast.FunctionDef):
-                    info['functions'].append(node.name)
-                    info['keywords'].append(node.name.lower())
-                
-                elif isinstance(node, ast.ClassDef):
-                    info['classes'].append(node.name)
-                    info['keywords'].append(node.name.lower())
-                    
-        except SyntaxError:
-            # Fallback to regex-based analysis
-            info.update(self._analyze_generic_code(content))
+        for module in analysis['imports']:
+            info['keywords'].extend(module.split('.'))
+        info['keywords'].extend(name.lower() for name in analysis['functions'])
+        info['keywords'].extend(name.lower() for name in analysis['classes'])
         
         return info
     
     def _analyze_javascript_code(self, content: str) -> Dict[str, Any]:
-        """Analyze JavaScript/TypeScript source code."""
+        """Analyze JavaScript/TypeScript source code (scanned once by the shared code analysis service)."""
+        analysis = get_code_analysis_service().analyze(content, 'javascript')
+        
         info = {
-            'imports': [],
-            'exports': [],
+            'imports': list(analysis['imports']),
+            'exports': list(analysis['exports']),
             'keywords': [],
-            'frameworks': [],
-            'functions': [],
-            'classes': []
-        }
-        
-        # Import patterns
-        import_patterns = [
-            r'import\s+.*?\s+from\s+[\'"]([^\'"]+)[\'"]',
-            r'require\([\'"]([^\'"]+)[\'"]\)',
-            r'import\([\'"]([^\'"]+)[\'"]\)'
-        ]
-        
-        for pattern in import_patterns:
-            matches = re.findall(pattern, content)
-            info['imports'].extend(matches)
-            for match in matches:
-                info['keywords'].extend(match.split('/'))
-        
-        # Export patterns
-        export_patterns = [
-            r'export\s+(?:default\s+)?(?:class|function|const|let|var)\s+(\w+)',
-            r'export\s*{\s*([^}]+)\s*}',
-            r'module\.exports\s*=\s*(\w+)'
-        ]
-        
-        for pattern in export_patterns:
-            matches = re.findall(pattern, content)
-            if isinstance(matches, list) and matches:
-                if ',' in str(matches[0]):
-                    # Handle multiple exports
-                    exports = [exp.strip() for exp in str(matches[0]).split(',')]
-                    info['exports'].extend(exports)
-                else:
-                    info['exports'].extend(matches)
-        
-        # Function patterns
-        function_patterns = [
-            r'function\s+(\w+)',
-            r'const\s+(\w+)\s*=\s*\(',
-            r'(\w+)\s*:\s*function',
-            r'(\w+)\s*=>\s*{'
-        ]
-        
-        for pattern in function_patterns:
-            matches = re.findall(pattern, content)
-            info['functions'].extend(matches)
-            info['keywords'].extend([m.lower() for m in matches])
-        
-        # Class patterns
-        class_matches = re.findall(r'class\s+(\w+)', content)
-        info['classes'].extend(class_matches)
-        info['keywords'].extend([c.lower() for c in class_matches])
-        
-        # Framework detection
-        framework_indicators = {
-            'react': ['useState', 'useEffect', 'Component', 'jsx', 'tsx'],
-            'vue': ['Vue', 'createApp', 'defineComponent', '.vue'],
-            'angular': ['@Component', '@Injectable', 'NgModule'],
-            'express': ['express()', 'app.get', 'app.post'],
-            'nestjs': ['@Controller', '@Injectable', '@Module'],
-            'next': ['next/', 'getServerSideProps', 'getStaticProps']
+            'frameworks': list(analysis['frameworks']),
+            'functions': list(analysis['functions']),
+            'classes': list(analysis['classes'])
         }
         
-        for framework, indicators in framework_indicators.items():
-            if any(indicator in content for indicator in indicators):
-                info['frameworks'].append(framework)
+        for module in analysis['imports']:
+            info['keywords'].extend(module.split('/'))
+        info['keywords'].extend(name.lower() for name in analysis['functions'])
+        info['keywords'].extend(name.lower() for name in analysis['classes'])
         
         return info
     
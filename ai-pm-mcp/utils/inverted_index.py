@@ -0,0 +1,77 @@
+"""
+Inverted index over numbered item sets.
+
+Theme discovery and theme relationship analysis both ask which sets (files,
+themes) contain some items (keywords, files, flows), and which pairs of sets
+share items. Testing every set against every query, or every pair of sets
+against each other, grows with the product of their sizes. Posting lists
+(item -> ids of the sets containing it) answer both questions while touching
+only the sets that actually contain the items:
+
+- membership: union of the postings of the query items
+- pairwise overlaps: pairs formed within each posting list, so sets that
+  share nothing are never compared
+"""
+
+from array import array
+from itertools import combinations
+from typing import Dict, Hashable, Iterable, List, Tuple
+
+
+class PostingIndex:
+    """Item -> ids of the sets containing it, with ids in insertion order."""
+
+    def __init__(self):
+        self.postings: Dict[Hashable, array] = {}
+        self.set_count = 0
+
+    def __len__(self) -> int:
+        return len(self.postings)
+
+    def add(self, set_id: int, items: Iterable[Hashable]):
+        """
+        Record the items of one set.
+
+        Args:
+            set_id: Non-negative id; add sets in increasing id order so
+                postings stay sorted
+            items: Items of the set (repeats are recorded once)
+        """
+        for item in dict.fromkeys(items):
+            posting = self.postings.get(item)
+            if posting is None:
+                posting = self.postings[item] = array("I")
+            posting.append(set_id)
+        self.set_count = max(self.set_count, set_id + 1)
+
+    def posting(self, item: Hashable) -> array:
+        """Ids of the sets containing an item."""
+        return self.postings.get(item, array("I"))
+
+    def members(self, items: Iterable[Hashable]) -> List[int]:
+        """Sorted ids of the sets containing any of the items."""
+        found = set()
+        for item in items:
+            posting = self.postings.get(item)
+            if posting is not None:
+                found.update(posting)
+        return sorted(found)
+
+    def pair_overlaps(self) -> Dict[Tuple[int, int], List[Hashable]]:
+        """
+        Shared items of every pair of sets that shares at least one.
+
+        Returns:
+            (lower id, higher id) -> shared items, in item insertion order
+        """
+        overlaps: Dict[Tuple[int, int], List[Hashable]] = {}
+        for item, posting in self.postings.items():
+            if len(posting) < 2:
+                continue
+            for pair in combinations(posting, 2):
+                shared = overlaps.get(pair)
+                if shared is None:
+                    overlaps[pair] = [item]
+                else:
+                    shared.append(item)
+        return overlaps
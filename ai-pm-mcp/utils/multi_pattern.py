@@ -0,0 +1,123 @@
+"""
+Multi-pattern substring matching.
+
+Theme discovery tests hundreds of directory and file-name fragments against
+every path. Checking each fragment separately makes the cost grow with the
+size of the pattern table; here all fragments are compiled into one regex
+alternation, so each text is scanned once.
+
+A plain alternation reports a single match per position, which would hide
+fragments nested in longer ones ("auth" inside "authentication"). The
+alternation is therefore tried at every position (zero-width lookahead) with
+longer fragments first, and every fragment is expanded to the fragments it
+contains. Together this yields exactly the set of fragments that occur in the
+text, the same answer as testing `fragment in text` for each of them.
+
+Results are memoized per distinct text, and paths are matched segment by
+segment (when no fragment spans a separator), so the many directories that
+share segment names cost one scan per distinct segment.
+"""
+
+import re
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+# Distinct texts whose matches are remembered before the memo is reset
+MAX_MEMO_ENTRIES = 65536
+
+
+class MultiPatternMatcher:
+    """Case-insensitive substring matcher for a fixed table of (fragment, payload) pairs."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, Any]], path_separator: str = "/"):
+        """
+        Compile the pattern table.
+
+        Args:
+            patterns: (fragment, payload) pairs; a fragment listed several
+                times reports each of its payloads, empty fragments are ignored
+            path_separator: Separator used by find_in_path
+        """
+        self.path_separator = path_separator
+        self._memo: Dict[str, FrozenSet[int]] = {}
+        self._ids: Dict[str, int] = {}
+        self._payloads: List[List[Any]] = []
+        for fragment, payload in patterns:
+            if not isinstance(fragment, str) or not fragment:
+                continue
+            key = fragment.lower()
+            pattern_id = self._ids.get(key)
+            if pattern_id is None:
+                pattern_id = len(self._payloads)
+                self._ids[key] = pattern_id
+                self._payloads.append([])
+            self._payloads[pattern_id].append(payload)
+
+        self._pattern: Optional["re.Pattern"] = None
+        # Fragment -> ids of every fragment occurring inside it (itself included)
+        self._contained: Dict[str, Tuple[int, ...]] = {}
+        if self._ids:
+            fragments = sorted(self._ids, key=len, reverse=True)
+            alternation = "|".join(re.escape(fragment) for fragment in fragments)
+            self._pattern = re.compile(f"(?=({alternation}))")
+            for fragment in fragments:
+                self._contained[fragment] = tuple(
+                    pattern_id for other, pattern_id in self._ids.items()
+                    if len(other) <= len(fragment) and other in fragment
+                )
+        self._segmentable = not any(path_separator in fragment for fragment in self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def find_ids(self, text: str) -> FrozenSet[int]:
+        """Ids of the distinct fragments occurring in text."""
+        if self._pattern is None or not text:
+            return frozenset()
+        lowered = text.lower()
+        found = self._memo.get(lowered)
+        if found is None:
+            ids: Set[int] = set()
+            seen_fragments: Set[str] = set()
+            for match in self._pattern.finditer(lowered):
+                fragment = match.group(1)
+                if fragment not in seen_fragments:
+                    seen_fragments.add(fragment)
+                    ids.update(self._contained[fragment])
+            found = frozenset(ids)
+            if len(self._memo) >= MAX_MEMO_ENTRIES:
+                self._memo.clear()
+            self._memo[lowered] = found
+        return found
+
+    def find_ids_in_path(self, path: str) -> FrozenSet[int]:
+        """Like find_ids, matching a path one (memoized) segment at a time."""
+        if not self._segmentable or self.path_separator not in path:
+            return self.find_ids(path)
+        found: Set[int] = set()
+        for segment in path.split(self.path_separator):
+            found.update(self.find_ids(segment))
+        return frozenset(found)
+
+    def payloads(self, ids: Iterable[int]) -> List[Any]:
+        """
+        Payloads of the given fragment ids.
+
+        Each fragment contributes its payloads once; results follow the order
+        fragments were first added.
+
+        Args:
+            ids: Fragment ids from find_ids / find_ids_in_path
+
+        Returns:
+            Payload list (may contain repeats when a payload was registered
+            for several of the fragments)
+        """
+        return [payload for pattern_id in sorted(ids) for payload in self._payloads[pattern_id]]
+
+    def find(self, text: str) -> List[Any]:
+        """Payloads of every fragment occurring in text."""
+        return self.payloads(self.find_ids(text))
+
+    def find_in_path(self, path: str) -> List[Any]:
+        """Payloads of every fragment occurring in a path."""
+        return self.payloads(self.find_ids_in_path(path))
@@ -0,0 +1,338 @@
+"""
+Cheap project size estimation.
+
+Deciding whether large-project optimizations apply used to walk the whole
+project tree, which is expensive on exactly the projects where the answer is
+"yes". The estimator here stops as soon as the answer is known:
+
+1. Constant-time signals: AI branch count, project.db size and theme count
+   (each enumeration stops once its threshold is passed)
+2. `git ls-files` output is counted as it streams and abandoned once the file
+   threshold is exceeded; a finished count is a lower bound (untracked files
+   are missing from it)
+3. A walk limited to a fixed number of entries; it gives the exact count for
+   small projects and early-exits for large ones
+4. When neither is conclusive, random root-to-leaf probes through the
+   pruning walker estimate the tree size (Knuth's estimator: files at each
+   depth weighted by the product of branching factors above it), floored by
+   the tracked and walked counts. The spread of the probes gives the
+   confidence of the size class.
+
+Verdicts are cached per project and reused until they expire or a cheap stamp
+(root, .git/index, themes directory and database mtimes) changes.
+"""
+
+import logging
+import math
+import os
+import random
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .project_paths import get_database_path, get_themes_path
+from .project_walker import ProjectWalker
+
+logger = logging.getLogger(__name__)
+
+SIZE_SMALL = "small"
+SIZE_MEDIUM = "medium"
+SIZE_LARGE = "large"
+
+DEFAULT_FILE_THRESHOLD = 10000
+DEFAULT_THEME_THRESHOLD = 50
+DEFAULT_DB_BYTES_THRESHOLD = 100 * 1024 * 1024
+DEFAULT_BRANCH_THRESHOLD = 50
+# Projects below this share of the file threshold are "small"
+SMALL_FRACTION = 0.1
+
+WALK_ENTRY_BUDGET = 2000
+PROBE_COUNT = 48
+GIT_TIMEOUT_SECONDS = 5.0
+GIT_READ_CHUNK = 64 * 1024
+VERDICT_TTL_SECONDS = 600.0
+
+
+@dataclass
+class ProjectSizeEstimate:
+    """Estimated project size with the evidence behind it."""
+    size_class: str
+    is_large: bool
+    estimated_files: Optional[int]
+    confidence: float
+    method: str
+    signals: Dict[str, Any] = field(default_factory=dict)
+    elapsed_ms: float = 0.0
+    estimated_at: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _normal_cdf(z: float) -> float:
+    return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+
+class ProjectSizeEstimator:
+    """Size-class estimation for one project with early exits at every step."""
+
+    def __init__(self, project_root: Union[str, Path], config_manager=None,
+                 file_threshold: int = DEFAULT_FILE_THRESHOLD,
+                 theme_threshold: int = DEFAULT_THEME_THRESHOLD,
+                 db_bytes_threshold: int = DEFAULT_DB_BYTES_THRESHOLD,
+                 branch_threshold: int = DEFAULT_BRANCH_THRESHOLD,
+                 walk_entry_budget: int = WALK_ENTRY_BUDGET,
+                 probe_count: int = PROBE_COUNT,
+                 seed: Optional[int] = None):
+        """
+        Configure the estimator.
+
+        Args:
+            project_root: Project root
+            config_manager: Used to resolve management, theme and database paths
+            file_threshold: Files (and directories) above which a project is large
+            theme_threshold: Theme files above which a project is large
+            db_bytes_threshold: project.db size above which a project is large
+            branch_threshold: ai-pm-org-* branches above which a project is large
+            walk_entry_budget: Entries the bounded walk may visit
+            probe_count: Random probes used when the count must be estimated
+            seed: Random seed for reproducible probes
+        """
+        self.project_root = Path(project_root)
+        self.config_manager = config_manager
+        self.file_threshold = file_threshold
+        self.theme_threshold = theme_threshold
+        self.db_bytes_threshold = db_bytes_threshold
+        self.branch_threshold = branch_threshold
+        self.walk_entry_budget = walk_entry_budget
+        self.probe_count = probe_count
+        self._random = random.Random(seed)
+
+    def _walker(self) -> ProjectWalker:
+        return ProjectWalker(self.project_root, config_manager=self.config_manager)
+
+    def size_class_for(self, files: float) -> str:
+        if files > self.file_threshold:
+            return SIZE_LARGE
+        if files < self.file_threshold * SMALL_FRACTION:
+            return SIZE_SMALL
+        return SIZE_MEDIUM
+
+    def _paths(self) -> Tuple[Path, Path]:
+        return (get_database_path(self.project_root, self.config_manager),
+                get_themes_path(self.project_root, self.config_manager))
+
+    def stamp(self) -> Tuple:
+        """Cheap fingerprint that changes when files, commits, themes or the database change."""
+        db_path, themes_dir = self._paths()
+        values = []
+        for path in (self.project_root, self.project_root / ".git" / "index", themes_dir, db_path):
+            try:
+                stat = path.stat()
+                values.append((stat.st_mtime_ns, stat.st_size if path == db_path else 0))
+            except OSError:
+                values.append(None)
+        return tuple(values)
+
+    def estimate(self) -> ProjectSizeEstimate:
+        """Estimate the project size (uncached; see get_project_size_estimate)."""
+        started = time.perf_counter()
+        signals: Dict[str, Any] = {}
+
+        def done(size_class: str, files: Optional[float], confidence: float, method: str) -> ProjectSizeEstimate:
+            return ProjectSizeEstimate(
+                size_class=size_class,
+                is_large=size_class == SIZE_LARGE,
+                estimated_files=None if files is None else int(files),
+                confidence=round(confidence, 3),
+                method=method,
+                signals=signals,
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+                estimated_at=time.time()
+            )
+
+        # 1. Constant-time signals (no file count yet)
+        reason = self._check_signals(signals)
+        if reason:
+            return done(SIZE_LARGE, None, 1.0, reason)
+
+        # 2. Tracked files, counted while git streams them
+        tracked, tracked_complete = self._count_git_files()
+        if tracked is not None:
+            signals["tracked_files"] = tracked
+            if not tracked_complete:
+                return done(SIZE_LARGE, tracked, 1.0, "git_ls_files")
+
+        # 3. Bounded walk: exact for small projects, early exit for large ones
+        walked, walk_complete = self._bounded_walk()
+        signals["walked_entries"] = walked
+        if walk_complete:
+            return done(self.size_class_for(walked), walked, 1.0, "walk")
+        if walked > self.file_threshold:
+            return done(SIZE_LARGE, walked, 1.0, "walk")
+
+        # 4. Random probes; a finished git count alone would miss large
+        # untracked (not ignored) directories the walk did not reach
+        mean, standard_error = self._probe_estimate()
+        files = max(mean, walked, tracked or 0)
+        signals["probes"] = self.probe_count
+        signals["standard_error"] = round(standard_error, 1)
+        size_class = self.size_class_for(files)
+        if standard_error > 0:
+            nearest = min((abs(files - bound) for bound in
+                           (self.file_threshold, self.file_threshold * SMALL_FRACTION)))
+            confidence = _normal_cdf(nearest / standard_error)
+        else:
+            confidence = 0.99
+        return done(size_class, files, min(confidence, 0.99), "sampled_walk")
+
+    def _check_signals(self, signals: Dict[str, Any]) -> Optional[str]:
+        """Record branch, database and theme signals; returns the reason when one marks the project large."""
+        try:
+            result = subprocess.run(
+                ['git', 'for-each-ref', f'--count={self.branch_threshold + 1}', '--format=%(refname)',
+                 'refs/heads/ai-pm-org-*'],
+                capture_output=True, text=True, cwd=self.project_root, timeout=GIT_TIMEOUT_SECONDS
+            )
+            if result.returncode == 0:
+                branches = len([line for line in result.stdout.splitlines() if line.strip()])
+                signals["ai_branches"] = branches
+                if branches > self.branch_threshold:
+                    return "branch_count"
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"Branch count unavailable: {e}")
+
+        db_path, themes_dir = self._paths()
+        try:
+            signals["database_bytes"] = db_path.stat().st_size
+            if signals["database_bytes"] > self.db_bytes_threshold:
+                return "database_size"
+        except OSError:
+            pass
+
+        themes = 0
+        try:
+            with os.scandir(themes_dir) as iterator:
+                for entry in iterator:
+                    if entry.name.endswith(".json"):
+                        themes += 1
+                        if themes > self.theme_threshold:
+                            break
+        except OSError:
+            pass
+        signals["themes"] = themes
+        if themes > self.theme_threshold:
+            return "theme_count"
+        return None
+
+    def _count_git_files(self) -> Tuple[Optional[int], bool]:
+        """Count tracked files, stopping after file_threshold; (None, False) outside a git work tree."""
+        if not (self.project_root / ".git").exists():
+            return None, False
+        try:
+            process = subprocess.Popen(
+                ['git', 'ls-files', '-z'], cwd=self.project_root,
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+            )
+        except OSError as e:
+            logger.debug(f"git ls-files unavailable: {e}")
+            return None, False
+
+        count = 0
+        deadline = time.monotonic() + GIT_TIMEOUT_SECONDS
+        try:
+            while True:
+                chunk = process.stdout.read(GIT_READ_CHUNK)
+                if not chunk:
+                    break
+                count += chunk.count(b"\0")
+                if count > self.file_threshold:
+                    return count, False
+                if time.monotonic() > deadline:
+                    logger.debug("git ls-files timed out; falling back to walking")
+                    return None, False
+            return (count, True) if process.wait(timeout=GIT_TIMEOUT_SECONDS) == 0 else (None, False)
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.debug(f"git ls-files failed: {e}")
+            return None, False
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+
+    def _bounded_walk(self) -> Tuple[int, bool]:
+        """Count entries with the pruning walker until the budget or the threshold is exceeded."""
+        limit = max(self.walk_entry_budget, 0)
+        entries = 0
+        for _, subdirs, files in self._walker().walk_dirs():
+            entries += len(subdirs) + len(files)
+            if entries > limit or entries > self.file_threshold:
+                return entries, False
+        return entries, True
+
+    def _probe_estimate(self) -> Tuple[float, float]:
+        """Mean and standard error of Knuth tree-size estimates over random root-to-leaf probes."""
+        samples = []
+        for _ in range(max(self.probe_count, 1)):
+            weight, total = 1.0, 0.0
+            for _, subdirs, files in self._walker().walk_dirs():
+                total += weight * (len(subdirs) + len(files))
+                if subdirs:
+                    weight *= len(subdirs)
+                    chosen = self._random.choice(subdirs)
+                    # Prune every other subdirectory: the walk follows one random path
+                    subdirs[:] = [chosen]
+            samples.append(total)
+        mean = sum(samples) / len(samples)
+        if len(samples) < 2:
+            return mean, 0.0
+        variance = sum((sample - mean) ** 2 for sample in samples) / (len(samples) - 1)
+        return mean, math.sqrt(variance / len(samples))
+
+
+_verdicts: Dict[Tuple, Tuple[Tuple, float, ProjectSizeEstimate]] = {}
+_verdicts_lock = threading.Lock()
+
+
+def get_project_size_estimate(project_root: Union[str, Path], config_manager=None,
+                              max_age_seconds: float = VERDICT_TTL_SECONDS, force: bool = False,
+                              **options: Any) -> ProjectSizeEstimate:
+    """
+    Get the cached size estimate of a project, re-estimating when it expired or the project changed.
+
+    Args:
+        project_root: Project root
+        config_manager: Used to resolve management, theme and database paths
+        max_age_seconds: Maximum age of a cached verdict
+        force: Ignore the cached verdict
+        **options: ProjectSizeEstimator thresholds
+
+    Returns:
+        ProjectSizeEstimate
+    """
+    estimator = ProjectSizeEstimator(project_root, config_manager, **options)
+    key = (str(Path(project_root).resolve()), tuple(sorted(options.items())))
+    stamp = estimator.stamp()
+    if not force:
+        with _verdicts_lock:
+            cached = _verdicts.get(key)
+        if cached is not None and cached[0] == stamp and time.monotonic() - cached[1] <= max_age_seconds:
+            return cached[2]
+
+    estimate = estimator.estimate()
+    files = "unknown" if estimate.estimated_files is None else f"~{estimate.estimated_files}"
+    logger.debug(f"Project size estimate for {project_root}: {estimate.size_class} "
+                 f"({files} files, confidence {estimate.confidence}, {estimate.method})")
+    with _verdicts_lock:
+        _verdicts[key] = (stamp, time.monotonic(), estimate)
+    return estimate
+
+
+def clear_project_size_cache():
+    """Forget every cached verdict."""
+    with _verdicts_lock:
+        _verdicts.clear()
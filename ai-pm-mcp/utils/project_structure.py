@@ -0,0 +1,221 @@
+"""
+Compact project structure results.
+
+FileAnalyzer.analyze_project_structure used to return one dict per file, each
+with its own lists of imports, exports, keywords, functions and classes, plus
+per-directory dicts. On large repositories most of that memory is container
+overhead and repeated strings ("react", "index.js", the same import path in
+hundreds of files). Here:
+
+- files and directories are __slots__ records holding tuples, not dicts/lists
+- every repeated string (names, keywords, imports, directories) is interned
+- languages and file types are stored as small integer codes
+- directory purposes are shared between directories with the same purpose
+
+Records are read-only mappings with the keys of the old dicts, so callers
+using file_info['name'] or file_info.get('imports') keep working, and
+ProjectStructure.to_dict() produces the plain JSON form.
+"""
+
+import sys
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+_EMPTY: Tuple[str, ...] = ()
+
+
+class CodeTable:
+    """Bidirectional value <-> small integer code table (grows on demand)."""
+
+    def __init__(self, values: Iterable[Any] = ()):
+        self._values: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+        self._lock = threading.Lock()
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value: Any) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self._values)
+                    self._values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def decode(self, code: int) -> Any:
+        return self._values[code]
+
+
+# Code 0 is reserved for "no language" / "unknown" respectively
+LANGUAGE_CODES = CodeTable([
+    None, 'python', 'javascript', 'typescript', 'java', 'cpp', 'c', 'csharp', 'php', 'ruby',
+    'go', 'rust', 'swift', 'kotlin', 'scala', 'vue', 'svelte', 'html', 'css', 'scss', 'sass', 'less'
+])
+FILE_TYPE_CODES = CodeTable(['unknown', 'source', 'config', 'documentation', 'database', 'deployment', 'vcs'])
+
+
+def intern_str(value: Any) -> Any:
+    """Intern strings; other values are returned unchanged."""
+    return sys.intern(value) if type(value) is str else value
+
+
+def intern_tuple(values: Optional[Iterable[Any]]) -> Tuple[Any, ...]:
+    """Tuple of interned strings (the shared empty tuple when there are none)."""
+    if not values:
+        return _EMPTY
+    return tuple(intern_str(value) for value in values)
+
+
+class FileRecord(Mapping):
+    """Analysis of one file; a read-only mapping with the keys of the former file_info dict."""
+
+    __slots__ = ('name', 'path', 'directory', 'extension', 'size', 'language_code', 'type_code',
+                 'imports', 'exports', 'keywords', 'frameworks', 'functions', 'classes')
+
+    # Mapping keys in the order of the former dict
+    KEYS = ('name', 'extension', 'size', 'language', 'imports', 'exports', 'keywords',
+            'frameworks', 'functions', 'classes', 'type', 'path', 'directory')
+    SEQUENCE_KEYS = frozenset({'imports', 'exports', 'keywords', 'frameworks', 'functions', 'classes'})
+
+    def __init__(self, name: str, extension: str = '', size: int = 0, language: Optional[str] = None,
+                 file_type: str = 'unknown', imports: Iterable[str] = (), exports: Iterable[str] = (),
+                 keywords: Iterable[str] = (), frameworks: Iterable[str] = (), functions: Iterable[str] = (),
+                 classes: Iterable[str] = (), path: str = '', directory: str = ''):
+        self.name = intern_str(name)
+        self.path = path
+        self.directory = intern_str(directory)
+        self.extension = intern_str(extension)
+        self.size = size
+        self.language_code = LANGUAGE_CODES.encode(language)
+        self.type_code = FILE_TYPE_CODES.encode(file_type)
+        self.imports = intern_tuple(imports)
+        self.exports = intern_tuple(exports)
+        self.keywords = intern_tuple(keywords)
+        self.frameworks = intern_tuple(frameworks)
+        self.functions = intern_tuple(functions)
+        self.classes = intern_tuple(classes)
+
+    @classmethod
+    def from_info(cls, info: Dict[str, Any]) -> "FileRecord":
+        """Build a record from a file_info dict (as produced by FileAnalyzer._analyze_file)."""
+        return cls(
+            name=info.get('name', ''),
+            extension=info.get('extension', ''),
+            size=info.get('size', 0),
+            language=info.get('language'),
+            file_type=info.get('type', 'unknown'),
+            imports=info.get('imports'),
+            exports=info.get('exports'),
+            keywords=info.get('keywords'),
+            frameworks=info.get('frameworks'),
+            functions=info.get('functions'),
+            classes=info.get('classes'),
+            path=info.get('path', ''),
+            directory=info.get('directory', '')
+        )
+
+    @property
+    def language(self) -> Optional[str]:
+        return LANGUAGE_CODES.decode(self.language_code)
+
+    @property
+    def type(self) -> str:
+        return FILE_TYPE_CODES.decode(self.type_code)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON-compatible dict (sequences as lists)."""
+        return {key: list(value) if key in self.SEQUENCE_KEYS else value
+                for key, value in ((key, getattr(self, key)) for key in self.KEYS)}
+
+    def __repr__(self) -> str:
+        return f"FileRecord({self.path or self.name!r})"
+
+
+_purposes: Dict[Tuple[str, float, Tuple[str, ...]], Tuple[str, float, Tuple[str, ...]]] = {}
+_purposes_lock = threading.Lock()
+
+
+def _shared_purpose(purpose: Optional[Dict[str, Any]]) -> Tuple[str, float, Tuple[str, ...]]:
+    """Intern a directory purpose so directories with the same purpose share one tuple."""
+    purpose = purpose or {}
+    key = (intern_str(purpose.get('category', 'unknown')), purpose.get('confidence', 0.0),
+           intern_tuple(purpose.get('indicators')))
+    with _purposes_lock:
+        return _purposes.setdefault(key, key)
+
+
+class DirectoryRecord(Mapping):
+    """One directory; a read-only mapping with the keys of the former directory dict."""
+
+    __slots__ = ('files', 'subdirs', '_purpose')
+
+    KEYS = ('files', 'subdirs', 'purpose')
+
+    def __init__(self, subdirs: Iterable[str] = (), purpose: Optional[Dict[str, Any]] = None,
+                 files: Optional[List[str]] = None):
+        # files stays a list: the analyzer appends file names after the walk
+        self.files: List[str] = [intern_str(name) for name in files] if files else []
+        self.subdirs = intern_tuple(subdirs)
+        self._purpose = _shared_purpose(purpose)
+
+    @property
+    def purpose(self) -> Dict[str, Any]:
+        category, confidence, indicators = self._purpose
+        return {'category': category, 'confidence': confidence, 'indicators': list(indicators)}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.KEYS)
+
+    def __len__(self) -> int:
+        return len(self.KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON-compatible dict."""
+        return {'files': list(self.files), 'subdirs': list(self.subdirs), 'purpose': self.purpose}
+
+
+class ProjectStructure(dict):
+    """
+    Result of FileAnalyzer.analyze_project_structure.
+
+    A dict with the historical keys (directories, files, imports, keywords,
+    patterns, frameworks, languages, scan, throughput) whose file and
+    directory entries are compact records. Use to_dict() for a fully
+    JSON-serializable copy.
+    """
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON-compatible dict with records expanded to dicts and tuples to lists."""
+        result = {}
+        for key, value in self.items():
+            if key == 'files':
+                result[key] = [record.to_dict() if isinstance(record, FileRecord) else dict(record)
+                               for record in value]
+            elif key == 'directories':
+                result[key] = {path: record.to_dict() if isinstance(record, DirectoryRecord) else dict(record)
+                               for path, record in value.items()}
+            elif key == 'imports':
+                result[key] = {path: list(imports) for path, imports in value.items()}
+            else:
+                result[key] = value
+        return result
@@ -0,0 +1,358 @@
+"""
+Single-pass project tree walker.
+
+Theme discovery, project structure analysis, file discovery and the
+large-project check each used to walk the tree on their own (one of them 19
+times, once per glob) and filtered excluded directories only after descending
+into them. This walker:
+
+- uses one os.scandir() per directory and prunes excluded directories
+  (by name, by relative path pattern, or by .gitignore) before descending
+- honors .gitignore files at every level plus .git/info/exclude
+- always skips the management folder's database backups and session files
+- yields WalkEntry objects whose stat() result is cached
+- visits directories and files in sorted order, so results are deterministic
+"""
+
+import fnmatch
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .project_paths import get_management_folder_name
+
+logger = logging.getLogger(__name__)
+
+# Directories no scanner should descend into
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    '.git', '.svn', '.hg', 'node_modules', '__pycache__', '.pytest_cache',
+    'venv', 'env', '.venv', 'build', 'dist', 'target'
+})
+
+
+def get_management_excludes(config_manager=None) -> List[str]:
+    """Relative path patterns inside the management folder that are never scanned."""
+    management_folder = get_management_folder_name(config_manager)
+    return [f"{management_folder}/database/backups", f"{management_folder}/.mcp-session-*"]
+
+
+class WalkEntry:
+    """A file or directory found by the walker, with a cached stat()."""
+
+    __slots__ = ("fs_path", "rel_path", "name", "is_dir", "_entry", "_stat")
+
+    def __init__(self, entry: os.DirEntry, rel_path: str, is_dir: bool):
+        self.fs_path = entry.path
+        self.rel_path = rel_path
+        self.name = entry.name
+        self.is_dir = is_dir
+        self._entry = entry
+        self._stat = None
+
+    @property
+    def path(self) -> Path:
+        return Path(self.fs_path)
+
+    @property
+    def suffix(self) -> str:
+        index = self.name.rfind(".")
+        return self.name[index:] if 0 < index < len(self.name) - 1 else ""
+
+    @property
+    def parent(self) -> str:
+        """Relative path of the containing directory ("" for the project root)."""
+        index = self.rel_path.rfind("/")
+        return self.rel_path[:index] if index >= 0 else ""
+
+    def stat(self) -> os.stat_result:
+        """stat() of the entry (symlinks followed), fetched at most once."""
+        if self._stat is None:
+            self._stat = self._entry.stat()
+        return self._stat
+
+    @property
+    def size(self) -> int:
+        return self.stat().st_size
+
+    @property
+    def mtime_ns(self) -> int:
+        return self.stat().st_mtime_ns
+
+    def __repr__(self) -> str:
+        return f"WalkEntry({self.rel_path!r}{'/' if self.is_dir else ''})"
+
+
+class _IgnoreRule:
+    """One .gitignore line, compiled against paths relative to its directory."""
+
+    __slots__ = ("base", "regex", "negate", "dir_only")
+
+    def __init__(self, base: str, regex: "re.Pattern", negate: bool, dir_only: bool):
+        self.base = base
+        self.regex = regex
+        self.negate = negate
+        self.dir_only = dir_only
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob to a regex body ('*' stays within one segment)."""
+    result, i = [], 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            result.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            result.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            result.append(".*")
+            i += 2
+        elif char == "*":
+            result.append("[^/]*")
+            i += 1
+        elif char == "?":
+            result.append("[^/]")
+            i += 1
+        elif char == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                result.append(re.escape(char))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                result.append(f"[{body}]")
+                i = end + 1
+        elif char == "\\" and i + 1 < len(pattern):
+            result.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            result.append(re.escape(char))
+            i += 1
+    return "".join(result)
+
+
+def parse_gitignore(lines: Iterable[str], base: str = "") -> List[_IgnoreRule]:
+    """
+    Compile .gitignore lines.
+
+    Args:
+        lines: File lines
+        base: Relative path of the directory holding the .gitignore ("" = root)
+
+    Returns:
+        Rules in file order (the last matching rule wins)
+    """
+    rules = []
+    for raw in lines:
+        line = raw.rstrip("\n").rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        body = _translate_glob(line)
+        if not anchored:
+            body = "(?:.*/)?" + body
+        try:
+            regex = re.compile(f"{body}(?:/.*)?$")
+        except re.error:
+            logger.debug(f"Skipping unparsable .gitignore pattern '{raw.strip()}'")
+            continue
+        rules.append(_IgnoreRule(base, regex, negate, dir_only))
+    return rules
+
+
+def _read_ignore_file(path: str, base: str) -> List[_IgnoreRule]:
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as handle:
+            return parse_gitignore(handle, base)
+    except OSError:
+        return []
+
+
+class ProjectWalker:
+    """
+    Pruning os.scandir() walker over a project tree.
+
+    Exclusion is decided per entry, before a directory is descended into:
+    directory names in excluded_dirs, hidden names (optional), relative paths
+    matching exclude_patterns (fnmatch, case-insensitive), and .gitignore rules.
+    """
+
+    def __init__(self, project_root: Union[str, Path],
+                 excluded_dirs: Iterable[str] = DEFAULT_EXCLUDED_DIRS,
+                 exclude_patterns: Sequence[str] = (),
+                 exclude_hidden: bool = False,
+                 respect_gitignore: bool = True,
+                 exclude_management: bool = False,
+                 config_manager=None):
+        """
+        Configure the walker.
+
+        Args:
+            project_root: Project root; relative paths are relative to it
+            excluded_dirs: Directory names never descended into
+            exclude_patterns: fnmatch patterns on relative paths; a pattern
+                ending in "/*" also prunes the matching directory
+            exclude_hidden: Skip files and directories whose name starts with "."
+            respect_gitignore: Apply .gitignore files and .git/info/exclude
+            exclude_management: Skip the whole management folder
+            config_manager: Used to resolve the management folder name
+        """
+        self.project_root = Path(project_root)
+        self.excluded_dirs = frozenset(excluded_dirs)
+        self.exclude_hidden = exclude_hidden
+        self.respect_gitignore = respect_gitignore
+
+        patterns = list(exclude_patterns) + get_management_excludes(config_manager)
+        if exclude_management:
+            patterns.append(get_management_folder_name(config_manager))
+        self._file_patterns = [pattern.lower() for pattern in patterns]
+        self._dir_patterns = [pattern[:-2] if pattern.endswith("/*") else pattern
+                              for pattern in self._file_patterns]
+        self.stats = {"directories": 0, "files": 0, "pruned": 0, "ignored": 0}
+
+    def _excluded_by_pattern(self, rel_path: str, is_dir: bool) -> bool:
+        lowered = rel_path.lower()
+        patterns = self._dir_patterns if is_dir else self._file_patterns
+        return any(fnmatch.fnmatch(lowered, pattern) for pattern in patterns)
+
+    @staticmethod
+    def _gitignored(rules: List[_IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+        ignored = False
+        for rule in rules:
+            if rule.negate == ignored and rule.matches(rel_path, is_dir):
+                ignored = not rule.negate
+        return ignored
+
+    def _initial_rules(self, start_rel: str) -> List[_IgnoreRule]:
+        """Rules from .git/info/exclude and every .gitignore above the start directory."""
+        if not self.respect_gitignore:
+            return []
+        root = str(self.project_root)
+        rules = _read_ignore_file(os.path.join(root, ".git", "info", "exclude"), "")
+        parts = start_rel.split("/") if start_rel else []
+        for depth in range(len(parts)):
+            base = "/".join(parts[:depth])
+            rules = rules + _read_ignore_file(os.path.join(root, base, ".gitignore"), base)
+        return rules
+
+    def walk_dirs(self, start: Optional[Union[str, Path]] = None,
+                  max_depth: Optional[int] = None) -> Iterator[Tuple[str, List[WalkEntry], List[WalkEntry]]]:
+        """
+        Walk top-down like os.walk, yielding (relative dir, subdirs, files).
+
+        Removing entries from the yielded subdirs list prunes them as well.
+
+        Args:
+            start: Directory to start from (defaults to the project root)
+            max_depth: Maximum number of path segments of yielded entries,
+                counted from the project root
+
+        Yields:
+            Tuples of relative directory path ("" for the root), subdirectory
+            entries and file entries
+        """
+        root = str(self.project_root)
+        start_path = Path(start) if start is not None else self.project_root
+        try:
+            start_rel = start_path.resolve().relative_to(self.project_root.resolve()).as_posix()
+        except ValueError:
+            start_rel = ""
+            root = str(start_path)
+        if start_rel == ".":
+            start_rel = ""
+
+        stack = [(start_rel, self._initial_rules(start_rel))]
+        while stack:
+            rel_dir, rules = stack.pop()
+            dir_path = os.path.join(root, rel_dir) if rel_dir else root
+            if self.respect_gitignore:
+                local_rules = _read_ignore_file(os.path.join(dir_path, ".gitignore"), rel_dir)
+                if local_rules:
+                    rules = rules + local_rules
+            try:
+                with os.scandir(dir_path) as iterator:
+                    entries = sorted(iterator, key=lambda entry: entry.name)
+            except OSError as e:
+                logger.debug(f"Cannot scan {dir_path}: {e}")
+                continue
+            self.stats["directories"] += 1
+
+            depth = rel_dir.count("/") + 1 if rel_dir else 0
+            subdirs, files = [], []
+            for entry in entries:
+                name = entry.name
+                if self.exclude_hidden and name.startswith("."):
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    is_file = not is_dir and entry.is_file()
+                except OSError:
+                    continue
+                if not is_dir and not is_file:
+                    continue
+                if is_dir and name in self.excluded_dirs:
+                    self.stats["pruned"] += 1
+                    continue
+                if self._excluded_by_pattern(rel_path, is_dir):
+                    self.stats["pruned" if is_dir else "ignored"] += 1
+                    continue
+                if rules and self._gitignored(rules, rel_path, is_dir):
+                    self.stats["pruned" if is_dir else "ignored"] += 1
+                    continue
+                if max_depth is not None and depth + 1 > max_depth:
+                    continue
+                (subdirs if is_dir else files).append(WalkEntry(entry, rel_path, is_dir))
+
+            self.stats["files"] += len(files)
+            yield rel_dir, subdirs, files
+            # Push in reverse so subdirectories are visited in sorted order
+            for subdir in reversed(subdirs):
+                stack.append((subdir.rel_path, rules))
+
+    def walk(self, start: Optional[Union[str, Path]] = None,
+             max_depth: Optional[int] = None) -> Iterator[WalkEntry]:
+        """Yield every non-excluded file below start (see walk_dirs)."""
+        for _, _, files in self.walk_dirs(start, max_depth):
+            yield from files
+
+
+def walk_project(project_root: Union[str, Path], start: Optional[Union[str, Path]] = None,
+                 max_depth: Optional[int] = None, **options: Any) -> Iterator[WalkEntry]:
+    """
+    Yield the files of a project with the shared exclusion rules.
+
+    Args:
+        project_root: Project root
+        start: Optional subdirectory to walk
+        max_depth: Optional maximum path depth (segments from the project root)
+        **options: ProjectWalker options
+
+    Returns:
+        Iterator of WalkEntry
+    """
+    return ProjectWalker(project_root, **options).walk(start, max_depth)
@@ -0,0 +1,269 @@
+"""
+Batch relevance scoring over sparse term vectors.
+
+Relevance filtering used to re-split every candidate string (file path, flow
+file, flow name) and test every task keyword against it on each call. Here
+candidates are tokenized once into per-field sparse term vectors (inverted
+postings: term -> candidate indices and weights), cached per project scope,
+and a task is scored against all candidates in one pass:
+
+- exact matching looks each keyword up in the vocabulary
+- substring matching scans the (much smaller, deduplicated) vocabulary once
+  per keyword instead of every candidate string
+
+A keyword counts at most once per candidate and field, weighted by the
+strongest matching term. NumPy is used for the accumulation when installed;
+otherwise an equivalent pure-Python path is used.
+"""
+
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+# Separators used by the original path/flow keyword matching
+DEFAULT_SEPARATORS = "/_-"
+
+MATCH_EXACT = "exact"
+MATCH_SUBSTRING = "substring"
+
+_separator_patterns: Dict[str, "re.Pattern"] = {}
+
+
+def tokenize(text: str, separators: str = DEFAULT_SEPARATORS) -> List[str]:
+    """Lowercase and split text on whitespace and the given separator characters."""
+    pattern = _separator_patterns.get(separators)
+    if pattern is None:
+        pattern = re.compile(f"[\\s{re.escape(separators)}]+")
+        _separator_patterns[separators] = pattern
+    return [token for token in pattern.split(text.lower()) if token]
+
+
+class TermIndex:
+    """
+    Per-field sparse term vectors for a fixed list of candidates.
+
+    Field values may be a string (lowercased and tokenized with the index
+    separators), an iterable of terms (weight 1.0), or a mapping of
+    term -> weight; terms given directly are used as-is.
+    """
+
+    def __init__(self, candidates: Sequence[Tuple[Hashable, Mapping[str, Any]]],
+                 separators: str = DEFAULT_SEPARATORS):
+        """
+        Tokenize candidates and build the postings.
+
+        Args:
+            candidates: (candidate id, {field: value}) pairs, in ranking order
+            separators: Extra token separators for string field values
+        """
+        self.ids: List[Hashable] = [candidate_id for candidate_id, _ in candidates]
+        self.vocabulary: Dict[str, int] = {}
+        self._terms: List[str] = []
+        # field -> term id -> ([candidate indices], [weights])
+        postings: Dict[str, Dict[int, Tuple[List[int], List[float]]]] = {}
+
+        for index, (_, fields) in enumerate(candidates):
+            for field_name, value in fields.items():
+                field_postings = postings.setdefault(field_name, {})
+                for term, weight in self._terms_of(value, separators).items():
+                    term_id = self.vocabulary.get(term)
+                    if term_id is None:
+                        term_id = len(self._terms)
+                        self.vocabulary[term] = term_id
+                        self._terms.append(term)
+                    indices, weights = field_postings.setdefault(term_id, ([], []))
+                    indices.append(index)
+                    weights.append(weight)
+
+        if HAS_NUMPY:
+            self._postings = {
+                field_name: {term_id: (np.asarray(indices, dtype=np.int64), np.asarray(weights, dtype=np.float64))
+                             for term_id, (indices, weights) in field_postings.items()}
+                for field_name, field_postings in postings.items()
+            }
+        else:
+            self._postings = postings
+        self._substring_matches: Dict[str, Tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _terms_of(value: Any, separators: str) -> Dict[str, float]:
+        if value is None:
+            return {}
+        if isinstance(value, str):
+            return dict.fromkeys(tokenize(value, separators), 1.0)
+        if isinstance(value, Mapping):
+            return {str(term): float(weight) for term, weight in value.items()}
+        return dict.fromkeys((str(term) for term in value), 1.0)
+
+    def _matching_terms(self, keyword: str, match: str) -> Tuple[int, ...]:
+        """Vocabulary term ids a keyword matches."""
+        if match == MATCH_EXACT:
+            term_id = self.vocabulary.get(keyword)
+            return (term_id,) if term_id is not None else ()
+        cached = self._substring_matches.get(keyword)
+        if cached is None:
+            cached = tuple(term_id for term_id, term in enumerate(self._terms) if keyword in term)
+            self._substring_matches[keyword] = cached
+        return cached
+
+    def score(self, keywords: Iterable[str], field_weights: Mapping[str, float],
+              match: str = MATCH_EXACT, base: Optional[Sequence[float]] = None) -> List[float]:
+        """
+        Score every candidate against a set of keywords in one batch.
+
+        Args:
+            keywords: Query keywords (lowercased by the caller's rules)
+            field_weights: Weight per field; a keyword adds at most one
+                (weight x strongest matching term weight) per field
+            match: MATCH_EXACT or MATCH_SUBSTRING
+            base: Optional starting score per candidate
+
+        Returns:
+            Scores aligned with self.ids
+        """
+        keywords = list(dict.fromkeys(keywords))
+        if HAS_NUMPY:
+            return self._score_numpy(keywords, field_weights, match, base)
+        return self._score_python(keywords, field_weights, match, base)
+
+    def _score_numpy(self, keywords, field_weights, match, base) -> List[float]:
+        count = len(self.ids)
+        scores = np.zeros(count, dtype=np.float64) if base is None else np.asarray(base, dtype=np.float64).copy()
+        for field_name, field_weight in field_weights.items():
+            field_postings = self._postings.get(field_name)
+            if not field_postings:
+                continue
+            for keyword in keywords:
+                matched = [field_postings[t] for t in self._matching_terms(keyword, match) if t in field_postings]
+                if not matched:
+                    continue
+                if len(matched) == 1:
+                    indices, weights = matched[0]
+                    scores[indices] += field_weight * weights
+                    continue
+                best = np.zeros(count, dtype=np.float64)
+                for indices, weights in matched:
+                    np.maximum.at(best, indices, weights)
+                scores += field_weight * best
+        return scores.tolist()
+
+    def _score_python(self, keywords, field_weights, match, base) -> List[float]:
+        scores = [0.0] * len(self.ids) if base is None else [float(value) for value in base]
+        for field_name, field_weight in field_weights.items():
+            field_postings = self._postings.get(field_name)
+            if not field_postings:
+                continue
+            for keyword in keywords:
+                best: Dict[int, float] = {}
+                for term_id in self._matching_terms(keyword, match):
+                    posting = field_postings.get(term_id)
+                    if posting is None:
+                        continue
+                    for index, weight in zip(*posting):
+                        if weight > best.get(index, 0.0):
+                            best[index] = weight
+                for index, weight in best.items():
+                    scores[index] += field_weight * weight
+        return scores
+
+
+def rank(scores: Sequence[float], limit: Optional[int] = None,
+         min_score: Optional[float] = None) -> List[int]:
+    """
+    Candidate indices by descending score, ties kept in candidate order.
+
+    Args:
+        scores: Scores from TermIndex.score
+        limit: Maximum number of indices returned
+        min_score: Drop candidates scoring below this
+
+    Returns:
+        Candidate indices
+    """
+    if HAS_NUMPY and len(scores) > 0:
+        values = np.asarray(scores, dtype=np.float64)
+        order = np.argsort(-values, kind="stable")
+        if min_score is not None:
+            order = order[values[order] >= min_score]
+        return order[:limit].tolist() if limit is not None else order.tolist()
+    order = sorted(range(len(scores)), key=lambda index: -scores[index])
+    if min_score is not None:
+        order = [index for index in order if scores[index] >= min_score]
+    return order[:limit] if limit is not None else order
+
+
+class TermIndexCache:
+    """LRU of term indexes keyed by scope (project + candidate kind) and a content stamp."""
+
+    def __init__(self, max_indexes: int = 32):
+        self.max_indexes = max_indexes
+        self._indexes: "OrderedDict[Hashable, Tuple[Hashable, TermIndex]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "builds": 0}
+
+    def get(self, scope: Hashable, stamp: Hashable,
+            build: Callable[[], Sequence[Tuple[Hashable, Mapping[str, Any]]]],
+            separators: str = DEFAULT_SEPARATORS) -> TermIndex:
+        """
+        Get the index for a scope, rebuilding it when the stamp changed.
+
+        Args:
+            scope: Cache scope, e.g. ("flows", project path)
+            stamp: Cheap fingerprint of the candidates (ids, mtimes, ...)
+            build: Returns the candidates when the index must be (re)built
+            separators: Token separators for string field values
+
+        Returns:
+            TermIndex
+        """
+        with self._lock:
+            entry = self._indexes.get(scope)
+            if entry is not None and entry[0] == stamp:
+                self._indexes.move_to_end(scope)
+                self.stats["hits"] += 1
+                return entry[1]
+
+        index = TermIndex(build(), separators)
+        with self._lock:
+            self._indexes[scope] = (stamp, index)
+            self._indexes.move_to_end(scope)
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+            self.stats["builds"] += 1
+        logger.debug(f"Built term index for {scope} ({len(index)} candidates, {len(index.vocabulary)} terms)")
+        return index
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "indexes": len(self._indexes), "numpy": HAS_NUMPY}
+
+
+_index_cache: Optional[TermIndexCache] = None
+_index_cache_lock = threading.Lock()
+
+
+def get_term_index_cache() -> TermIndexCache:
+    """Get the process-wide term index cache."""
+    global _index_cache
+    with _index_cache_lock:
+        if _index_cache is None:
+            _index_cache = TermIndexCache()
+        return _index_cache
@@ -0,0 +1,201 @@
+"""
+Process-wide cache of parsed theme documents.
+
+Theme files (Themes/*.json and Themes/themes.json) are read by the scope
+engine on every context load and again by the theme tools. This cache parses
+each file once per (path, mtime_ns, size) and hands out an immutable view, so
+repeated context loads on large projects stop re-reading and re-parsing JSON.
+
+Views are read-only: dicts become FrozenDict and lists become FrozenList.
+Both are subclasses of dict/list, so isinstance checks and json.dumps keep
+working unchanged. Callers that need to modify a document
+should use thaw() (or load_theme_copy()) to get an independent mutable copy.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+class FrozenDict(dict):
+    """Read-only dict used for cached theme documents."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached theme documents are read-only; use thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __ior__(self, other):
+        self._readonly()
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class FrozenList(list):
+    """Read-only list used for cached theme documents."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Cached theme documents are read-only; use thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = remove = pop = clear = sort = reverse = _readonly
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert parsed JSON into an immutable view."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert an immutable view back into plain dicts and lists."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ThemeDocumentCache:
+    """
+    Parsed JSON documents keyed by path and validated by (mtime_ns, size).
+
+    A changed file is detected by its stat signature and re-parsed on the next
+    access. Writers in this process should also call invalidate() so edits
+    within the filesystem timestamp granularity are never served stale.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of parsed documents retained (LRU)
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def get(self, path: Union[str, Path]) -> Optional[Any]:
+        """
+        Get the immutable parsed view of a JSON file.
+
+        Args:
+            path: JSON file path
+
+        Returns:
+            Frozen document, or None if the file does not exist
+
+        Raises:
+            json.JSONDecodeError: If the file contains invalid JSON
+        """
+        return self._lookup(path)[0]
+
+    def warm(self, path: Union[str, Path]) -> bool:
+        """
+        Make sure a JSON file is parsed into the cache.
+
+        Returns:
+            True if the file was parsed now, False if it was cached or is missing
+
+        Raises:
+            json.JSONDecodeError: If the file contains invalid JSON
+        """
+        return self._lookup(path)[1]
+
+    def _lookup(self, path: Union[str, Path]) -> Tuple[Optional[Any], bool]:
+        """(document, parsed now) for a JSON file."""
+        key = str(path)
+        try:
+            stat = Path(path).stat()
+        except (FileNotFoundError, NotADirectoryError):
+            self.invalidate(path)
+            return None, False
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[:2] == signature:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[2], False
+
+        document = freeze(json.loads(Path(path).read_text(encoding="utf-8")))
+
+        with self._lock:
+            self.stats["misses"] += 1
+            self._entries[key] = (signature[0], signature[1], document)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return document, True
+
+    def invalidate(self, path: Union[str, Path]):
+        """Drop the cached document for a path."""
+        with self._lock:
+            if self._entries.pop(str(path), None) is not None:
+                self.stats["invalidations"] += 1
+
+    def clear(self):
+        """Drop all cached documents."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss counters."""
+        with self._lock:
+            total = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "entries": len(self._entries),
+                "hit_rate": round(self.stats["hits"] / total, 3) if total else 0.0
+            }
+
+
+_theme_cache = ThemeDocumentCache()
+
+
+def get_theme_cache() -> ThemeDocumentCache:
+    """Get the process-wide theme document cache."""
+    return _theme_cache
+
+
+def load_theme_view(path: Union[str, Path]) -> Optional[Any]:
+    """Immutable parsed view of a theme JSON file (None if missing)."""
+    return _theme_cache.get(path)
+
+
+def load_theme_copy(path: Union[str, Path]) -> Optional[Any]:
+    """Mutable copy of a theme JSON file (None if missing)."""
+    document = _theme_cache.get(path)
+    return thaw(document) if document is not None else None
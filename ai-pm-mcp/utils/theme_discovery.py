@@ -4,12 +4,14 @@ Theme discovery engine for the AI Project Manager MCP Server.
 Automatically discovers and categorizes themes from project structure analysis.
 """
 
+import asyncio
 import logging
 from pathlib import Path
 from typing import Dict, List, Set, Optional, Tuple, Any
 from collections import defaultdict, Counter
 
-from ..utils.file_utils import FileAnalyzer
+from .file_utils import FileAnalyzer
+from .multi_pattern import MultiPatternMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -17,8 +19,9 @@ logger = logging.getLogger(__name__)
 class ThemeDiscovery:
     """Discovers themes from project structure and code analysis."""
     
-    def __init__(self):
-        self.file_analyzer = FileAnalyzer()
+    def __init__(self, db_manager=None):
+        # Scan manifest storage; without one the project's project.db is used when it exists
+        self.file_analyzer = FileAnalyzer(db_manager=db_manager)
         
         # Predefined theme categories and their indicators
         self.theme_categories = {
@@ -167,13 +170,16 @@ class ThemeDiscovery:
                 }
             }
         }
+        
+        # All category indicators compiled once for single-pass matching
+        self._theme_patterns = _ThemePatterns(self.theme_categories)
     
-    def discover_themes(self, project_path: Path) -> Dict[str, Any]:
+    async def discover_themes_async(self, project_path: Path) -> Dict[str, Any]:
         """Discover themes from project structure analysis."""
         try:
             # Analyze project structure
             logger.info(f"Analyzing project structure at {project_path}")
-            structure = self.file_analyzer.analyze_project_structure(project_path)
+            structure = await self.file_analyzer.analyze_project_structure(Path(project_path))
             
             # Discover themes
             discovered_themes = self._identify_themes(structure)
@@ -199,21 +205,38 @@ class ThemeDiscovery:
             logger.error(f"Error discovering themes: {e}")
             return {'themes': {}, 'metadata': {}}
     
+    def discover_themes(self, project_path: Path) -> Dict[str, Any]:
+        """Discover themes from a synchronous caller (no running event loop).
+        
+        Coroutines must await discover_themes_async instead; blocking a
+        running loop until discovery finishes would stall every other task.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.discover_themes_async(project_path))
+        raise RuntimeError("discover_themes() called from a running event loop; "
+                           "await discover_themes_async() instead")
+    
     def _identify_themes(self, structure: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Identify themes based on structure analysis."""
         discovered_themes = {}
         
+        # One pass over the structure matches every theme of every category
+        theme_hits = self._theme_patterns.match(structure)
+        
         # Score each theme category
         for category_name, category_themes in self.theme_categories.items():
             for theme_name, theme_config in category_themes.items():
-                score = self._calculate_theme_score(theme_config, structure)
+                hits = theme_hits[(category_name, theme_name)]
+                score = self._calculate_theme_score(theme_config, structure, hits)
                 
                 if score > 0.05:  # Very sensitive detection threshold
                     discovered_themes[theme_name] = {
                         'category': category_name,
                         'score': score,
                         'config': theme_config,
-                        'evidence': self._collect_theme_evidence(theme_config, structure)
+                        'evidence': self._collect_theme_evidence(theme_config, structure, hits)
                     }
         
         # Discover custom themes from directory structure
@@ -222,85 +245,59 @@ class ThemeDiscovery:
         
         return discovered_themes
     
-    def _calculate_theme_score(self, theme_config: Dict[str, Any], structure: Dict[str, Any]) -> float:
-        """Calculate relevance score for a theme."""
+    @staticmethod
+    def _single_theme_hits(theme_config: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, Any]:
+        """Match one theme configuration that is not part of theme_categories."""
+        return _ThemePatterns({'': {'': theme_config}}).match(structure)[('', '')]
+    
+    def _calculate_theme_score(self, theme_config: Dict[str, Any], structure: Dict[str, Any],
+                               hits: Optional[Dict[str, Any]] = None) -> float:
+        """Calculate relevance score for a theme.
+        
+        Args:
+            theme_config: Theme indicators (keywords, directories, files, frameworks)
+            structure: Project structure analysis
+            hits: Matches of this theme from _ThemePatterns.match (computed when omitted)
+        """
+        if hits is None:
+            hits = self._single_theme_hits(theme_config, structure)
+        
         score = 0.0
         total_weight = 0.0
         
-        # Directory matching (high weight)
+        # Directory matching (high weight): one match per directory x theme directory pair
         directory_weight = 0.4
-        directory_matches = 0
-        for directory in structure.get('directories', {}):
-            for theme_dir in theme_config.get('directories', []):
-                if theme_dir.lower() in directory.lower():
-                    directory_matches += 1
-        
         if theme_config.get('directories'):
-            score += (directory_matches / len(theme_config['directories'])) * directory_weight
+            score += (len(hits['directories']) / len(theme_config['directories'])) * directory_weight
         total_weight += directory_weight
         
         # Keyword matching (medium weight)
         keyword_weight = 0.3
-        keyword_matches = 0
-        keywords = structure.get('keywords', {})
-        for keyword in theme_config.get('keywords', []):
-            if keyword.lower() in keywords:
-                keyword_matches += keywords[keyword.lower()]
-        
         if theme_config.get('keywords'):
-            normalized_keyword_score = min(keyword_matches / (len(theme_config['keywords']) * 2), 1.0)
+            normalized_keyword_score = min(hits['keyword_count'] / (len(theme_config['keywords']) * 2), 1.0)
             score += normalized_keyword_score * keyword_weight
         total_weight += keyword_weight
         
         # Framework matching (high weight)
         framework_weight = 0.3
-        framework_matches = 0
-        frameworks = set(fw.lower() for fw in structure.get('frameworks', []))
-        for framework in theme_config.get('frameworks', []):
-            if framework.lower() in frameworks:
-                framework_matches += 1
-        
         if theme_config.get('frameworks'):
-            score += (framework_matches / len(theme_config['frameworks'])) * framework_weight
+            score += (len(hits['frameworks']) / len(theme_config['frameworks'])) * framework_weight
         total_weight += framework_weight
         
         return score / total_weight if total_weight > 0 else 0.0
     
-    def _collect_theme_evidence(self, theme_config: Dict[str, Any], structure: Dict[str, Any]) -> Dict[str, List[str]]:
+    def _collect_theme_evidence(self, theme_config: Dict[str, Any], structure: Dict[str, Any],
+                                hits: Optional[Dict[str, Any]] = None) -> Dict[str, List[str]]:
         """Collect evidence for theme detection."""
-        evidence = {
-            'directories': [],
-            'files': [],
-            'keywords': [],
-            'frameworks': []
+        if hits is None:
+            hits = self._single_theme_hits(theme_config, structure)
+        
+        return {
+            'directories': list(hits['directories']),
+            'files': list(hits['files']),
+            'keywords': [keyword for _, keyword in sorted(hits['keywords'])],
+            'frameworks': [framework for _, framework in sorted(hits['frameworks'])]
         }
-        
-        # Collect directory evidence
-        for directory in structure.get('directories', {}):
-            for theme_dir in theme_config.get('directories', []):
-                if theme_dir.lower() in directory.lower():
-                    evidence['directories'].append(directory)
-        
-        # Collect file evidence
-        for file_info in structure.get('files', []):
-            file_name = file_info.get('name', '').lower()
-            for theme_file in theme_config.get('files', []):
-                if theme_file.lower() in file_name:
-                    evidence['files'].append(file_info.get('path', ''))
-        
-        # Collect keyword evidence
-        keywords = structure.get('keywords', {})
-        for keyword in theme_config.get('keywords', []):
-            if keyword.lower() in keywords:
-                evidence['keywords'].append(keyword)
-        
-        # Collect framework evidence
-        frameworks = structure.get('frameworks', [])
-        for framework in theme_config.get('frameworks', []):
-            if framework.lower() in [fw.lower() for fw in frameworks]:
-                evidence['frameworks'].append(framework)
-        
-        return evidence
     
     def _discover_custom_themes(self, structure: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
         """Discover custom themes from project-specific patterns."""
@@ -491,4 +488,74 @@ class ThemeDiscovery:
                     shared_files[shared_file]['sharedWith'].append(other_theme_name)
                     shared_files[shared_file]['description'] = f'Shared between multiple themes'
         
-        return shared_files
\ No newline at end of file
+        return shared_files
+
+
+class _ThemePatterns:
+    """Theme category indicators compiled for single-pass matching.
+    
+    Directory and file-name fragments of every theme go into one
+    MultiPatternMatcher each, keywords and frameworks into lookup tables, so
+    matching a project structure scans each directory, file name, keyword and
+    framework once instead of once per theme.
+    """
+    
+    def __init__(self, theme_categories: Dict[str, Dict[str, Dict[str, Any]]]):
+        self.theme_keys: List[Tuple[str, str]] = []
+        directory_patterns, file_patterns = [], []
+        # lowercased keyword / framework -> [(theme key, position in theme list, original spelling)]
+        self.keywords: Dict[str, List[Tuple[Tuple[str, str], int, str]]] = defaultdict(list)
+        self.frameworks: Dict[str, List[Tuple[Tuple[str, str], int, str]]] = defaultdict(list)
+        
+        for category_name, category_themes in theme_categories.items():
+            for theme_name, theme_config in category_themes.items():
+                key = (category_name, theme_name)
+                self.theme_keys.append(key)
+                directory_patterns.extend((fragment, key) for fragment in theme_config.get('directories', []))
+                file_patterns.extend((fragment, key) for fragment in theme_config.get('files', []))
+                for position, keyword in enumerate(theme_config.get('keywords', [])):
+                    self.keywords[keyword.lower()].append((key, position, keyword))
+                for position, framework in enumerate(theme_config.get('frameworks', [])):
+                    self.frameworks[framework.lower()].append((key, position, framework))
+        
+        self.directory_matcher = MultiPatternMatcher(directory_patterns)
+        self.file_matcher = MultiPatternMatcher(file_patterns)
+    
+    def match(self, structure: Dict[str, Any]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Match a project structure against every theme at once.
+        
+        Args:
+            structure: Project structure analysis (directories, files, keywords, frameworks)
+            
+        Returns:
+            Per (category, theme): matched directories (one entry per matching
+            theme directory, as the per-theme scan did), matched file paths,
+            (position, keyword) and (position, framework) hits, and the summed
+            project counts of the matched keywords
+        """
+        hits = {key: {'directories': [], 'files': [], 'keywords': [], 'frameworks': [], 'keyword_count': 0}
+                for key in self.theme_keys}
+        
+        for directory in structure.get('directories', {}):
+            for key in self.directory_matcher.find_in_path(directory):
+                hits[key]['directories'].append(directory)
+        
+        for file_info in structure.get('files', []):
+            keys = self.file_matcher.find(file_info.get('name', ''))
+            if keys:
+                file_path = file_info.get('path', '')
+                for key in keys:
+                    hits[key]['files'].append(file_path)
+        
+        keywords = structure.get('keywords', {})
+        for keyword, count in keywords.items():
+            for key, position, original in self.keywords.get(keyword, ()):
+                hits[key]['keywords'].append((position, original))
+                hits[key]['keyword_count'] += count
+        
+        for framework in set(fw.lower() for fw in structure.get('frameworks', [])):
+            for key, position, original in self.frameworks.get(framework, ()):
+                hits[key]['frameworks'].append((position, original))
+        
+        return hits
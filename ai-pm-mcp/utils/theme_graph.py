@@ -0,0 +1,222 @@
+"""
+In-memory theme link graph.
+
+Built once per themes directory from the theme files (through the shared
+theme document cache) plus theme-flow relationships from the database, and
+rebuilt only when a theme file changes or theme-flow rows are written. Context
+expansion is then a bounded-depth weighted BFS over the graph instead of
+loading linked themes one by one.
+
+Edge weights:
+- linkedThemes (declared link): 1.0, reverse direction 0.6
+- sharedFiles (sharedWith): 0.75 in both directions
+- a flow used by both themes: 0.5 in both directions
+"""
+
+import logging
+import os
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+from .theme_cache import load_theme_view
+
+logger = logging.getLogger(__name__)
+
+LINK_WEIGHT = 1.0
+REVERSE_LINK_WEIGHT = 0.6
+SHARED_FILE_WEIGHT = 0.75
+SHARED_FLOW_WEIGHT = 0.5
+
+# Theme files that are indexes rather than theme definitions
+NON_THEME_FILES = {"themes.json"}
+
+
+def _intern_all(values: Iterable[Any]) -> FrozenSet[str]:
+    """Intern path strings so merged sets across themes share one object per path."""
+    return frozenset(sys.intern(value) for value in values if isinstance(value, str))
+
+
+@dataclass
+class ThemeNode:
+    """Files, paths and flows of one theme, with interned path strings."""
+    name: str
+    files: FrozenSet[str]
+    paths: FrozenSet[str]
+    flows: Tuple[str, ...]
+    shared_files: Dict[str, Tuple[str, ...]]
+    linked_themes: Tuple[str, ...]
+    edges: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class ExpandedTheme:
+    """A theme reached by expansion, with its BFS depth and path weight."""
+    name: str
+    depth: int
+    weight: float
+
+
+class ThemeGraph:
+    """Theme nodes and weighted edges for one themes directory."""
+
+    def __init__(self, nodes: Dict[str, ThemeNode], signature: Tuple, generation: int):
+        self.nodes = nodes
+        self.signature = signature
+        self.generation = generation
+
+    @classmethod
+    def build(cls, themes_dir: Path, signature: Tuple, generation: int,
+              theme_flow_queries=None) -> "ThemeGraph":
+        """Build the graph from theme files and database theme-flow rows."""
+        nodes: Dict[str, ThemeNode] = {}
+        for name, _, _ in signature:
+            theme_name = name[:-len(".json")]
+            try:
+                data = load_theme_view(themes_dir / name)
+            except ValueError:
+                logger.warning(f"Skipping invalid theme file in graph: {themes_dir / name}")
+                continue
+            if not isinstance(data, dict):
+                continue
+            shared = {}
+            for file_path, info in data.get("sharedFiles", {}).items():
+                shared_with = info.get("sharedWith", ()) if isinstance(info, dict) else ()
+                shared[sys.intern(file_path)] = tuple(shared_with)
+            nodes[theme_name] = ThemeNode(
+                name=theme_name,
+                files=_intern_all(data.get("files", ())),
+                paths=_intern_all(data.get("paths", ())),
+                flows=tuple(flow for flow in data.get("flows", ()) if isinstance(flow, str)),
+                shared_files=shared,
+                linked_themes=tuple(data.get("linkedThemes", ()))
+            )
+
+        def connect(source: str, target: str, weight: float):
+            if source == target or source not in nodes or target not in nodes:
+                return
+            edges = nodes[source].edges
+            edges[target] = max(edges.get(target, 0.0), weight)
+
+        flow_themes: Dict[str, set] = {}
+        for node in nodes.values():
+            for linked in node.linked_themes:
+                connect(node.name, linked, LINK_WEIGHT)
+                connect(linked, node.name, REVERSE_LINK_WEIGHT)
+            for shared_with in node.shared_files.values():
+                for other in shared_with:
+                    connect(node.name, other, SHARED_FILE_WEIGHT)
+                    connect(other, node.name, SHARED_FILE_WEIGHT)
+            for flow_id in node.flows:
+                flow_themes.setdefault(flow_id, set()).add(node.name)
+
+        if theme_flow_queries:
+            try:
+                for row in theme_flow_queries.get_flow_theme_summary() or []:
+                    flow_themes.setdefault(row["flow_id"], set()).update(row.get("themes", []))
+            except Exception as e:
+                logger.debug(f"Theme graph built without database flow links: {e}")
+
+        for themes in flow_themes.values():
+            for source in themes:
+                for target in themes:
+                    connect(source, target, SHARED_FLOW_WEIGHT)
+
+        logger.debug(f"Built theme graph for {themes_dir} ({len(nodes)} themes)")
+        return cls(nodes, signature, generation)
+
+    def expand(self, primary_theme: str, max_depth: int = 1, min_weight: float = 0.0,
+               max_themes: Optional[int] = None) -> List[ExpandedTheme]:
+        """
+        Bounded-depth weighted BFS from a theme.
+
+        A theme's depth is its hop distance and its weight the highest product
+        of edge weights seen while walking at most max_depth edges; edges that
+        would drop a path below min_weight are not followed.
+
+        Args:
+            primary_theme: Starting theme
+            max_depth: Maximum number of edges followed
+            min_weight: Minimum path weight for a theme to be included
+            max_themes: Optional cap on returned themes (highest weight first)
+
+        Returns:
+            Reached themes (excluding the primary), by depth then weight
+        """
+        if primary_theme not in self.nodes:
+            return []
+
+        best: Dict[str, ExpandedTheme] = {primary_theme: ExpandedTheme(primary_theme, 0, 1.0)}
+        frontier = [primary_theme]
+        for depth in range(1, max_depth + 1):
+            next_frontier = []
+            for source in frontier:
+                source_weight = best[source].weight
+                for target, edge_weight in self.nodes[source].edges.items():
+                    weight = source_weight * edge_weight
+                    if weight < min_weight:
+                        continue
+                    current = best.get(target)
+                    if current is None:
+                        best[target] = ExpandedTheme(target, depth, weight)
+                        next_frontier.append(target)
+                    elif weight > current.weight and target != primary_theme:
+                        current.weight = weight
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        reached = [theme for name, theme in best.items() if name != primary_theme]
+        reached.sort(key=lambda theme: (theme.depth, -theme.weight, theme.name))
+        if max_themes is not None and len(reached) > max_themes:
+            keep = {theme.name for theme in sorted(reached, key=lambda t: -t.weight)[:max_themes]}
+            reached = [theme for theme in reached if theme.name in keep]
+        return reached
+
+
+_graphs: Dict[str, ThemeGraph] = {}
+_graphs_lock = threading.Lock()
+_generation = 0
+
+
+def get_themes_signature(themes_dir: Path) -> Tuple:
+    """Sorted (name, mtime_ns, size) of theme files; one scandir per call."""
+    entries = []
+    try:
+        with os.scandir(themes_dir) as iterator:
+            for entry in iterator:
+                if entry.name.endswith(".json") and entry.name not in NON_THEME_FILES and entry.is_file():
+                    entry_stat = entry.stat()
+                    entries.append((entry.name, entry_stat.st_mtime_ns, entry_stat.st_size))
+    except OSError:
+        return ()
+    return tuple(sorted(entries))
+
+
+def get_theme_graph(themes_dir: Union[str, Path], theme_flow_queries=None) -> ThemeGraph:
+    """
+    Get the theme graph for a themes directory, rebuilding it only when a
+    theme file changed or theme-flow relationships were written.
+    """
+    themes_dir = Path(themes_dir)
+    key = str(themes_dir)
+    signature = get_themes_signature(themes_dir)
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        generation = _generation
+    if graph is not None and graph.signature == signature and graph.generation == generation:
+        return graph
+
+    graph = ThemeGraph.build(themes_dir, signature, generation, theme_flow_queries)
+    with _graphs_lock:
+        _graphs[key] = graph
+    return graph
+
+
+def invalidate_theme_graphs():
+    """Force every theme graph to rebuild on next use (theme-flow rows changed)."""
+    global _generation
+    with _graphs_lock:
+        _generation += 1